@@ -11,6 +11,29 @@ from .eos_cli import (
     VlanDynamic,
     EvpnRouteTypes
 )
+from .watch import SessionLogWatcher
+from .render import TextSink, JsonSink, HtmlSink, MultiSink
+from .html_report import HtmlReport
+from .records import BgpNeighbor, BgpEvpnNeighbor, BgpSession, Vtep, InterfacePort, MacEntry, VlanRow, RouteEntry, EvpnPath
+from .evpn import route_key_counts, diff_evpn_routes, parse_evpn_paths, EvpnRouteStats
+from .mac_table import MacTable, MacDiff, diff_mac_tables, mac_to_int, int_to_mac
+from .capture import (normalize_capture, normalize_text, normalize_file, read_capture, map_capture,
+                      DeviceCapture, split_devices)
+from .tables import ColumnSpec, find_table
+from .bgp import BgpSummary, parse_bgp_summaries, diff_bgp_summaries, BgpDiff
+from .interfaces import InterfaceIndex, InterfaceDiff, diff_interfaces, port_id, port_name
+from .routes import RouteTable, route_summary_counts
+from .route_summary import RouteSummaryMatrix, RouteSummaryDelta, diff_route_summaries
+from .vlans import VlanSet, diff_vlan_sets, capture_vlan_sets, PortVlanMatrix, PortVlanDiff, diff_port_vlans
+from .vxlan import VxlanIndex, ImetIndex, VxlanImetJoin, join_imet
+from .consistency import EvpnMacIndex, ConsistencyReport, check_consistency, check_capture
+from .rules import Rule, RulePlan, load_rules, compile_rules
+from .api import (capture_text, capture_sections, parse_interfaces, parse_bgp, parse_routes, parse_route_summary,
+                  parse_mac_table, parse_evpn, parse_vlans, parse_vxlan, summarize_interfaces, summarize_bgp,
+                  summarize_routes, summarize_mac_table, summarize_evpn, summarize_vlans, summarize_vxlan,
+                  summarize_capture, diff_captures)
+from .service import CheckService, ServiceBusy, make_server
+from .parallel import parse_sections, section_ranges, parse_evpn_chunked
 
 __all__ = [
     "NetworkParsers",
@@ -21,4 +44,94 @@ __all__ = [
     "VlanBrief",
     "VlanDynamic",
     "EvpnRouteTypes",
+    "SessionLogWatcher",
+    "TextSink",
+    "JsonSink",
+    "HtmlSink",
+    "MultiSink",
+    "HtmlReport",
+    "MacTable",
+    "MacDiff",
+    "diff_mac_tables",
+    "mac_to_int",
+    "int_to_mac",
+    "route_key_counts",
+    "diff_evpn_routes",
+    "parse_evpn_paths",
+    "EvpnRouteStats",
+    "BgpNeighbor",
+    "BgpEvpnNeighbor",
+    "BgpSession",
+    "Vtep",
+    "InterfacePort",
+    "MacEntry",
+    "VlanRow",
+    "RouteEntry",
+    "EvpnPath",
+    "normalize_capture",
+    "normalize_text",
+    "normalize_file",
+    "read_capture",
+    "map_capture",
+    "DeviceCapture",
+    "split_devices",
+    "ColumnSpec",
+    "find_table",
+    "BgpSummary",
+    "parse_bgp_summaries",
+    "diff_bgp_summaries",
+    "BgpDiff",
+    "InterfaceIndex",
+    "InterfaceDiff",
+    "diff_interfaces",
+    "port_id",
+    "port_name",
+    "RouteTable",
+    "route_summary_counts",
+    "RouteSummaryMatrix",
+    "RouteSummaryDelta",
+    "diff_route_summaries",
+    "VlanSet",
+    "diff_vlan_sets",
+    "capture_vlan_sets",
+    "PortVlanMatrix",
+    "PortVlanDiff",
+    "diff_port_vlans",
+    "VxlanIndex",
+    "ImetIndex",
+    "VxlanImetJoin",
+    "join_imet",
+    "EvpnMacIndex",
+    "ConsistencyReport",
+    "check_consistency",
+    "check_capture",
+    "Rule",
+    "RulePlan",
+    "load_rules",
+    "compile_rules",
+    "capture_text",
+    "capture_sections",
+    "parse_interfaces",
+    "parse_bgp",
+    "parse_routes",
+    "parse_route_summary",
+    "parse_mac_table",
+    "parse_evpn",
+    "parse_vlans",
+    "parse_vxlan",
+    "summarize_interfaces",
+    "summarize_bgp",
+    "summarize_routes",
+    "summarize_mac_table",
+    "summarize_evpn",
+    "summarize_vlans",
+    "summarize_vxlan",
+    "summarize_capture",
+    "diff_captures",
+    "CheckService",
+    "ServiceBusy",
+    "make_server",
+    "parse_sections",
+    "section_ranges",
+    "parse_evpn_chunked",
 ]
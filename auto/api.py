@@ -0,0 +1,308 @@
+from typing import Dict, Optional, Union
+
+try:
+    from .capture import normalize_capture, DeviceCapture
+    from .sections import iter_command_blocks
+    from .interfaces import InterfaceIndex, diff_interfaces, INTERFACE_DIFF_KINDS
+    from .bgp import BgpSummary, parse_bgp_summaries, diff_bgp_summaries, BGP_DIFF_KINDS
+    from .routes import RouteTable
+    from .route_summary import RouteSummaryMatrix, diff_route_summaries
+    from .mac_table import MacTable, diff_mac_tables, MAC_DIFF_KINDS
+    from .evpn import route_key_counts, diff_evpn_routes
+    from .vlans import VlanSet, capture_vlan_sets, diff_vlan_sets, PortVlanMatrix, diff_port_vlans
+    from .vxlan import VxlanIndex, ImetIndex, join_imet
+    from .consistency import EvpnMacIndex, check_consistency
+except ImportError:
+    from capture import normalize_capture, DeviceCapture
+    from sections import iter_command_blocks
+    from interfaces import InterfaceIndex, diff_interfaces, INTERFACE_DIFF_KINDS
+    from bgp import BgpSummary, parse_bgp_summaries, diff_bgp_summaries, BGP_DIFF_KINDS
+    from routes import RouteTable
+    from route_summary import RouteSummaryMatrix, diff_route_summaries
+    from mac_table import MacTable, diff_mac_tables, MAC_DIFF_KINDS
+    from evpn import route_key_counts, diff_evpn_routes
+    from vlans import VlanSet, capture_vlan_sets, diff_vlan_sets, PortVlanMatrix, diff_port_vlans
+    from vxlan import VxlanIndex, ImetIndex, join_imet
+    from consistency import EvpnMacIndex, check_consistency
+
+__all__ = [
+    "capture_text",
+    "capture_sections",
+    "parse_interfaces",
+    "parse_bgp",
+    "parse_routes",
+    "parse_route_summary",
+    "parse_mac_table",
+    "parse_evpn",
+    "parse_vlans",
+    "parse_vxlan",
+    "summarize_interfaces",
+    "summarize_bgp",
+    "summarize_routes",
+    "summarize_mac_table",
+    "summarize_evpn",
+    "summarize_vlans",
+    "summarize_vxlan",
+    "summarize_capture",
+    "diff_captures",
+]
+
+# Side-effect-free entry points for embedding (services, notebooks, other
+# tools). Every function takes the capture as str, bytes or a DeviceCapture
+# and returns data: nothing is printed, no file is opened, and no state is
+# kept between calls beyond the bounded memo caches of a few pure helpers,
+# so any number of threads can call them at once.
+#
+#   parse_*      the repo's own objects (InterfaceIndex, BgpSummary, MacTable, ...)
+#   summarize_*  plain dicts / lists / numbers, ready for json.dumps
+#
+# summarize_capture() and diff_captures() split the capture into command
+# blocks once and hand each parser only its own sections.
+
+Source = Union[str, bytes, bytearray, memoryview, DeviceCapture]
+_EVPN_TYPES = {
+    "evpn_auto_discovery": "auto-discovery",
+    "evpn_mac_ip": "mac-ip",
+    "evpn_imet": "imet",
+    "evpn_ethernet_segment": "ethernet-segment",
+}
+
+
+def capture_text(src: Source, normalize: bool = True) -> str:
+    """
+    Capture as str: DeviceCapture.text(), bytes decoded as UTF-8, str as is.
+    With normalize, terminal residue (ANSI codes, --More--, CRs, cut
+    prompts) is cleaned up first (see auto.capture.normalize_capture).
+    """
+    if isinstance(src, DeviceCapture):
+        return src.text(normalize)
+    if isinstance(src, str):
+        if not normalize or not src:
+            return src
+        src = src.encode("utf-8", "surrogateescape")
+    data = normalize_capture(src) if normalize else bytes(src)
+    return data.decode("utf-8", "ignore")
+
+
+def capture_sections(src: Source, normalize: bool = True) -> Dict[str, str]:
+    """{section key: text of its command blocks, prompt lines included}, one pass."""
+    parts: Dict[str, list] = {}
+    for block in iter_command_blocks(capture_text(src, normalize)):
+        if block.key is not None:
+            parts.setdefault(block.key, []).extend(block.lines)
+    return {key: "\n".join(lines) for key, lines in parts.items()}
+
+
+# ---- parse_*: library objects ----
+def parse_interfaces(src: Source, normalize: bool = True) -> InterfaceIndex:
+    return InterfaceIndex.from_text(capture_text(src, normalize))
+
+
+def parse_bgp(src: Source, normalize: bool = True) -> Dict[str, BgpSummary]:
+    """{'bgp_summary': BgpSummary, 'bgp_evpn_summary': BgpSummary} (captured ones only)."""
+    return parse_bgp_summaries(capture_text(src, normalize))
+
+
+def parse_routes(src: Source, normalize: bool = True) -> RouteTable:
+    """'show ip route [vrf all]' plus the route summary counters of the same capture."""
+    return RouteTable.from_text(capture_text(src, normalize))
+
+
+def parse_route_summary(src: Source, normalize: bool = True) -> RouteSummaryMatrix:
+    return RouteSummaryMatrix.from_text(capture_text(src, normalize))
+
+
+def parse_mac_table(src: Source, normalize: bool = True) -> MacTable:
+    return MacTable.from_text(capture_text(src, normalize))
+
+
+def parse_evpn(src: Source, normalize: bool = True) -> Dict[str, Dict[str, int]]:
+    """{route type: {route key: paths}} for every captured 'sh bgp evpn route-type ...'."""
+    sections = capture_sections(src, normalize)
+    return {rtype: route_key_counts(sections[key]) for key, rtype in _EVPN_TYPES.items() if key in sections}
+
+
+def parse_vlans(src: Source, normalize: bool = True) -> Dict[str, VlanSet]:
+    return capture_vlan_sets(capture_text(src, normalize))
+
+
+def parse_vxlan(src: Source, normalize: bool = True) -> VxlanIndex:
+    return VxlanIndex.from_text(capture_text(src, normalize))
+
+
+# ---- summarize_*: JSON-ready data ----
+def _interfaces_summary(index: InterfaceIndex) -> dict:
+    return {"ports": len(index), "status": index.counts("STATUS"), "ip_status": index.counts("IP_STATUS")}
+
+
+def _bgp_summary(summaries: Dict[str, BgpSummary]) -> dict:
+    return {key: {"neighbors": len(s), "established": s.established(), "per_vrf": s.per_vrf()}
+            for key, s in summaries.items()}
+
+
+def _routes_summary(table: RouteTable) -> dict:
+    return {
+        "summary": table.summary,
+        "prefixes": {vrf: len(routes) for vrf, routes in table.routes.items()},
+        "mismatches": table.mismatches(),
+    }
+
+
+def _mac_summary(table: MacTable) -> dict:
+    return {"total": len(table), "moved": len(table.moved()), "per_vlan": table.per_vlan(),
+            "per_port": table.per_port()}
+
+
+def _evpn_summary(routes: Dict[str, Dict[str, int]]) -> dict:
+    return {rtype: {"routes": len(keys), "paths": sum(keys.values())} for rtype, keys in routes.items()}
+
+
+def _vlans_summary(sets: Dict[str, VlanSet]) -> dict:
+    return {key: {"count": len(s), "vlans": str(s)} for key, s in sets.items()}
+
+
+def _vxlan_summary(index: VxlanIndex, imet: ImetIndex) -> dict:
+    out = {
+        "vteps": sorted(index.vteps),
+        "vnis": len(index.vni_vlan),
+        "flood_vlans": len(index.flood),
+        "remote_macs": len(index.addresses),
+    }
+    if len(imet):
+        out["imet_join"] = join_imet(index, imet).counts()
+    return out
+
+
+def summarize_interfaces(src: Source, normalize: bool = True) -> dict:
+    return _interfaces_summary(parse_interfaces(src, normalize))
+
+
+def summarize_bgp(src: Source, normalize: bool = True) -> dict:
+    return _bgp_summary(parse_bgp(src, normalize))
+
+
+def summarize_routes(src: Source, normalize: bool = True) -> dict:
+    return _routes_summary(parse_routes(src, normalize))
+
+
+def summarize_mac_table(src: Source, normalize: bool = True) -> dict:
+    return _mac_summary(parse_mac_table(src, normalize))
+
+
+def summarize_evpn(src: Source, normalize: bool = True) -> dict:
+    return _evpn_summary(parse_evpn(src, normalize))
+
+
+def summarize_vlans(src: Source, normalize: bool = True) -> dict:
+    return _vlans_summary(parse_vlans(src, normalize))
+
+
+def summarize_vxlan(src: Source, normalize: bool = True) -> dict:
+    text = capture_text(src, normalize)
+    return _vxlan_summary(VxlanIndex.from_text(text), ImetIndex.from_text(text))
+
+
+# ---- whole capture ----
+class _Parsed:
+    """Every library object of one capture, each section parsed once."""
+    __slots__ = ("interfaces", "bgp", "routes", "route_matrix", "macs", "evpn", "vlans", "ports",
+                 "vxlan", "imet", "evpn_macs")
+
+    def __init__(self, src: Source, normalize: bool):
+        sections = capture_sections(src, normalize)
+        get = sections.get
+
+        def joined(*keys):
+            return "\n".join(sections[k] for k in keys if k in sections)
+
+        self.interfaces = InterfaceIndex.from_text(joined("interfaces_status", "ip_interface_brief"))
+        self.bgp = parse_bgp_summaries(joined("bgp_summary", "bgp_evpn_summary"))
+        self.routes = RouteTable.from_text(joined("ip_route", "ip_route_summary"))
+        self.route_matrix = RouteSummaryMatrix.from_text(get("ip_route_summary", ""))
+        self.macs = MacTable.from_text(get("mac_address_table_dynamic", ""))
+        self.evpn = {rtype: route_key_counts(sections[key]) for key, rtype in _EVPN_TYPES.items() if key in sections}
+        self.vlans = capture_vlan_sets(joined("vlan_brief", "vlan_dynamic", "igmp_snooping_querier"))
+        self.ports = PortVlanMatrix.from_text(get("vlan_brief", ""))
+        self.vxlan = VxlanIndex.from_text(joined("vxlan_vtep_detail", "vxlan_vni", "vxlan_flood_vtep",
+                                                 "vxlan_address_table"))
+        self.imet = ImetIndex.from_text(get("evpn_imet", ""))
+        self.evpn_macs = EvpnMacIndex.from_text(joined("evpn_mac_ip", "evpn_ethernet_segment"), self.vxlan.vlan_of)
+
+
+def summarize_capture(src: Source, normalize: bool = True) -> dict:
+    """
+    Every summary of one capture in one dict (sections the capture lacks
+    give empty values), plus the cross-table consistency counts.
+    """
+    p = _Parsed(src, normalize)
+    out = {
+        "interfaces": _interfaces_summary(p.interfaces),
+        "bgp": _bgp_summary(p.bgp),
+        "routes": _routes_summary(p.routes),
+        "mac_table": _mac_summary(p.macs),
+        "evpn": _evpn_summary(p.evpn),
+        "vlans": _vlans_summary(p.vlans),
+        "vxlan": _vxlan_summary(p.vxlan, p.imet),
+    }
+    if len(p.macs) or len(p.evpn_macs):
+        out["consistency"] = check_consistency(p.macs, p.evpn_macs, p.vxlan).counts()
+    return out
+
+
+def _kind_entries(diff, kinds, limit: Optional[int]) -> dict:
+    out = {}
+    for kind in kinds:
+        rows = []
+        for e in diff.entries(kind):
+            if limit is not None and len(rows) >= limit:
+                break
+            rows.append(e)
+        if rows:
+            out[kind] = rows
+    return out
+
+
+def diff_captures(pre: Source, post: Source, normalize: bool = True, limit: Optional[int] = 100,
+                  bgp_tolerance: float = 0.0) -> dict:
+    """
+    Pre/post diff of two captures as JSON-ready data: per area a 'counts'
+    dict and up to `limit` entries per kind (None for all). Areas a
+    capture lacks are left out.
+    """
+    a, b = _Parsed(pre, normalize), _Parsed(post, normalize)
+    out: dict = {}
+    if len(a.interfaces) and len(b.interfaces):
+        d = diff_interfaces(a.interfaces, b.interfaces)
+        out["interfaces"] = {"counts": d.counts(), "entries": _kind_entries(d, INTERFACE_DIFF_KINDS, limit)}
+    bgp = {}
+    for key in sorted(a.bgp.keys() & b.bgp.keys()):
+        d = diff_bgp_summaries(a.bgp[key], b.bgp[key], bgp_tolerance)
+        bgp[key] = {"counts": d.counts(), "entries": _kind_entries(d, BGP_DIFF_KINDS, limit)}
+    if bgp:
+        out["bgp"] = bgp
+    if len(a.route_matrix) and len(b.route_matrix):
+        delta = diff_route_summaries(a.route_matrix, b.route_matrix)
+        changes = list(delta.changes())
+        out["route_summary"] = {"changed": len(changes), "entries": changes[:limit] if limit is not None else changes}
+    if len(a.macs) and len(b.macs):
+        d = diff_mac_tables(a.macs, b.macs)
+        out["mac_table"] = {"counts": d.counts(), "entries": _kind_entries(d, MAC_DIFF_KINDS, limit)}
+    evpn = {}
+    for rtype in sorted(a.evpn.keys() & b.evpn.keys()):
+        d = diff_evpn_routes(a.evpn[rtype], b.evpn[rtype])
+        evpn[rtype] = {"withdrawn": len(d["withdrawn"]), "new": len(d["new"]),
+                       "paths_changed": len(d["paths_changed"])}
+    if evpn:
+        out["evpn"] = evpn
+    vlans = {}
+    for key in sorted(a.vlans.keys() & b.vlans.keys()):
+        missing, added = diff_vlan_sets(a.vlans[key], b.vlans[key])
+        vlans[key] = {"missing": str(missing), "added": str(added)}
+    if vlans:
+        out["vlans"] = vlans
+    if len(a.ports) and len(b.ports):
+        out["vlan_members"] = diff_port_vlans(a.ports, b.ports).counts()
+    for side, p in (("pre", a), ("post", b)):
+        if len(p.vxlan) or p.vxlan.flood:
+            out.setdefault("vxlan_imet_join", {})[side] = join_imet(p.vxlan, p.imet).counts()
+    return out
@@ -0,0 +1,264 @@
+"""
+Micro-benchmarks on synthetic captures.
+
+    python -m auto.bench              # run everything
+    python -m auto.bench records      # one benchmark by name
+
+Numbers are printed, nothing is asserted; run before/after a change.
+"""
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+try:
+    from .records import MacEntry
+    from .evpn import iter_evpn_paths
+    from .mac_table import int_to_mac
+    from .parallel import parse_evpn_chunked
+    from .bgp import BgpSummary
+except ImportError:
+    from records import MacEntry
+    from evpn import iter_evpn_paths
+    from mac_table import int_to_mac
+    from parallel import parse_evpn_chunked
+    from bgp import BgpSummary
+
+__all__ = ["BENCHMARKS", "synthetic_mac_table", "synthetic_evpn_mac_ip", "synthetic_bgp_summary", "main"]
+
+
+# ---- synthetic captures ----
+def synthetic_mac_table(rows: int, seed: int = 1) -> str:
+    """'show mac address-table dynamic' with `rows` entries over 4000 VLANs / 96 ports."""
+    rnd = random.Random(seed)
+    lines = [
+        "leaf1#show mac address-table dynamic",
+        "          Mac Address Table",
+        "------------------------------------------------------------------",
+        "",
+        "Vlan    Mac Address       Type        Ports      Moves   Last Move",
+        "----    -----------       ----        -----      -----   ---------",
+    ]
+    for i in range(rows):
+        port = f"Po{1000 + i % 64}" if i % 3 else f"Et{1 + i % 32}/1"
+        lines.append(f"{1 + i % 4000:<8}{int_to_mac(rnd.getrandbits(48)):<18}DYNAMIC     "
+                     f"{port:<11}{1 + (i % 97 == 0):<8}{i % 200} days, 7:10:02 ago")
+    lines.append(f"Total Mac Addresses for this criterion: {rows}")
+    return "\n".join(lines) + "\n"
+
+
+def synthetic_evpn_mac_ip(routes: int, ecmp: int = 2, seed: int = 1) -> str:
+    """'show bgp evpn route-type mac-ip' with `routes` routes, each with `ecmp` paths."""
+    rnd = random.Random(seed)
+    lines = [
+        "leaf1#sh bgp evpn route-type mac-ip",
+        "BGP routing table information for VRF default",
+        "          Network                Next Hop              Metric  LocPref Weight  Path",
+    ]
+    for i in range(routes):
+        rd = f"10.4.{i % 250}.{1 + i % 8}:{1000 + i % 3000}"
+        mac = int_to_mac(rnd.getrandbits(48))
+        nh = f"10.4.228.{100 + i % 24}"
+        for j in range(ecmp):
+            status = " * >Ec   " if j == 0 else " *  ec   "
+            lines.append(f"{status} RD: {rd} mac-ip {mac}")
+            lines.append(f"                                 {nh:<22}-       100     0       64100.2100{j} 64100.21016 i")
+    return "\n".join(lines) + "\n"
+
+
+def synthetic_bgp_summary(vrfs: int, peers: int, seed: int = 1) -> str:
+    """'show bgp summary vrf all' with `vrfs` VRFs of `peers` neighbors (two AFI/SAFI rows each)."""
+    rnd = random.Random(seed)
+    lines = ["leaf1#show bgp summary vrf all"]
+    for v in range(vrfs):
+        lines += [
+            f"BGP summary information for VRF {'default' if v == 0 else f'TENANT-{v:04d}'}",
+            "Router identifier 10.4.228.5, local AS number 64100.21005",
+            "Neighbor              AS Session State AFI/SAFI                AFI/SAFI State   NLRI Rcd   NLRI Acc",
+            "------------ ----------- ------------- ----------------------- -------------- ---------- ----------",
+        ]
+        for p in range(peers):
+            peer = f"10.{v // 250}.{v % 250}.{p + 1}"
+            state = "Established" if rnd.random() > 0.02 else "Active"
+            for afi in ("IPv4 Unicast", "L2VPN EVPN"):
+                n = rnd.randrange(5000)
+                lines.append(f"{peer:<12} {'64100.' + str(21000 + p):>11} {state:<13} {afi:<23} "
+                             f"{'Negotiated':<14} {n:>10} {n:>10}")
+        lines.append("")
+    lines.append("leaf1#")
+    return "\n".join(lines) + "\n"
+
+
+def _measure(build):
+    """(seconds, MiB retained by the result) for build(). Timed without tracemalloc."""
+    gc.collect()
+    t0 = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - t0
+    del result
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, current / (1024 * 1024)
+
+
+# ---- benchmarks ----
+def bench_records(rows: int = 1_000_000):
+    """Dict rows vs slotted, interned records on a 1M-row capture."""
+    mac_text = synthetic_mac_table(rows)
+    lines = [l.split(None, 5) for l in mac_text.splitlines()[6:-1]]
+
+    def mac_dicts():
+        return [{"VLAN": p[0], "MAC": p[1], "TYPE": p[2], "PORTS": p[3], "MOVES": int(p[4]),
+                 "LAST_MOVE": p[5]} for p in lines]
+
+    def mac_records():
+        return [MacEntry(p[0], p[1], p[2], p[3], int(p[4]), p[5]) for p in lines]
+
+    evpn_text = synthetic_evpn_mac_ip(rows // 2, ecmp=2)
+
+    def evpn_dicts():
+        return list(_evpn_dict_rows(evpn_text))
+
+    def evpn_records():
+        return list(iter_evpn_paths(evpn_text))
+
+    print(f"records: {rows:,} rows (memory held by the result list)")
+    print(f"  {'rows'.ljust(22)}{'seconds'.rjust(10)}{'MiB'.rjust(10)}")
+    for label, fn in (("mac dicts", mac_dicts), ("mac records", mac_records),
+                      ("evpn path dicts", evpn_dicts), ("evpn path records", evpn_records)):
+        secs, mib = _measure(fn)
+        print(f"  {label.ljust(22)}{secs:10.2f}{mib:10.1f}")
+
+
+def _evpn_dict_rows(text):
+    # Old-style rows: one dict per path, values straight from split() (no interning).
+    lines = text.splitlines()
+    for i, line in enumerate(lines):
+        pos = line.find("RD:")
+        if pos < 0 or i + 1 >= len(lines):
+            continue
+        rd, rtype, *nlri = line[pos + 3:].split()
+        attrs = lines[i + 1].split()
+        yield {"TYPE": rtype, "RD": rd, "NLRI": " ".join(nlri), "STATUS": line[:pos].strip(),
+               "NEXT_HOP": attrs[0], "METRIC": attrs[1], "LOCPREF": int(attrs[2]),
+               "WEIGHT": int(attrs[3]), "PATH": " ".join(attrs[4:-1]), "ORIGIN": attrs[-1]}
+
+
+def bench_evpn_chunks(paths: int = 2_000_000):
+    """Chunked multi-core parse of one mac-ip section: throughput per worker count."""
+    data = synthetic_evpn_mac_ip(paths // 2, ecmp=2).encode()
+    cpus = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, 8, cpus} & set(range(1, cpus + 1))) or [1]
+    print(f"evpn_chunks: {paths:,} paths, {len(data) / 1e6:.0f} MB, {cpus} CPU(s)")
+    print(f"  {'jobs'.ljust(8)}{'seconds'.rjust(10)}{'MB/s'.rjust(10)}{'speedup'.rjust(10)}")
+    base = None
+    for jobs in counts:
+        gc.collect()
+        t0 = time.perf_counter()
+        parse_evpn_chunked(data, jobs=jobs)
+        secs = time.perf_counter() - t0
+        base = base or secs
+        print(f"  {str(jobs).ljust(8)}{secs:10.2f}{len(data) / 1e6 / secs:10.0f}{base / secs:10.2f}")
+
+
+def _bgp_implementations():
+    # (label, fn(text) -> rows). Existing implementations are imported lazily;
+    # the ones needing TextFSM are reported as skipped when it is missing.
+    impls = [("auto.bgp BgpSummary (vrf all)", lambda t: list(BgpSummary.from_text(t)))]
+
+    def _fallback():
+        from auto.eos_cli import _fallback_parse_bgp_summary
+        return _fallback_parse_bgp_summary
+
+    def _bgp_status():
+        from auto.eos_cli import BgpStatus
+        return lambda t: BgpStatus(t)._parse_bgp_summary_table()
+
+    def _manual():
+        from auto.script_pre_check import _manual_bgp_summary_neighbors
+        return _manual_bgp_summary_neighbors
+
+    def _cli_parsers():
+        from auto.cli_parsers import NetworkParsers
+        return NetworkParsers().parse_bgp_summary
+
+    def _textfsm():
+        from network_parsers import NetworkParsers
+        return NetworkParsers().parse_bgp_summary
+
+    def _test_py():
+        from test import BGP
+        return lambda t: BGP(t).parse_bgp_summary()[2]
+
+    for label, load in (("_fallback_parse_bgp_summary", _fallback),
+                        ("BgpStatus._parse_bgp_summary_table", _bgp_status),
+                        ("_manual_bgp_summary_neighbors", _manual),
+                        ("cli_parsers parse_bgp_summary", _cli_parsers),
+                        ("TextFSM bgp_summary template", _textfsm),
+                        ("test.py BGP.parse_bgp_summary", _test_py)):
+        try:
+            impls.append((label, load()))
+        except Exception as e:
+            impls.append((label, f"skipped ({type(e).__name__}: {e})"))
+    return impls
+
+
+# Why a legacy implementation's row count is not comparable with the engine's.
+_BGP_NOT_COMPARABLE = {
+    "BgpStatus._parse_bgp_summary_table": "only skips all-dash lines, so it stops at the "
+                                          "'---- ----' separator of EOS output",
+    "_manual_bgp_summary_neighbors": "per-VRF parser, reads the first VRF table only",
+    "cli_parsers parse_bgp_summary": "per-VRF parser, reads the first VRF table only",
+}
+
+
+def bench_bgp_summary(vrfs: int = 300, peers: int = 10):
+    """One BGP summary engine vs the per-VRF implementations on 'show bgp summary vrf all'."""
+    text = synthetic_bgp_summary(vrfs, peers)
+    print(f"bgp_summary: {vrfs} VRFs x {peers} peers ({vrfs * peers:,} sessions, {len(text) / 1e6:.1f} MB)")
+    print(f"  {'implementation'.ljust(38)}{'rows'.rjust(8)}{'seconds'.rjust(10)}")
+    left_out = []
+    for label, fn in _bgp_implementations():
+        if isinstance(fn, str):
+            print(f"  {label.ljust(38)}{fn}")
+            left_out.append((label, fn))
+            continue
+        gc.collect()
+        t0 = time.perf_counter()
+        rows = fn(text)
+        secs = time.perf_counter() - t0
+        print(f"  {label.ljust(38)}{len(rows):8,}{secs:10.3f}")
+        if len(rows) < vrfs * peers:
+            left_out.append((label, f"{len(rows):,} rows for {vrfs * peers:,} sessions, "
+                                    f"{_BGP_NOT_COMPARABLE.get(label, 'misses sessions')}"))
+    if left_out:
+        print("  left out of the comparison:")
+        for label, why in left_out:
+            print(f"    {label}: {why}")
+
+
+BENCHMARKS = {
+    "records": bench_records,
+    "evpn_chunks": bench_evpn_chunks,
+    "bgp_summary": bench_bgp_summary,
+}
+
+
+def main(argv=None):
+    names = (argv if argv is not None else sys.argv[1:]) or list(BENCHMARKS)
+    for name in names:
+        fn = BENCHMARKS.get(name)
+        if fn is None:
+            print(f"unknown benchmark {name!r}; choose from {', '.join(BENCHMARKS)}")
+            continue
+        fn()
+
+
+if __name__ == "__main__":
+    main()
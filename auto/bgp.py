@@ -0,0 +1,307 @@
+import sys
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    from .records import BgpSession
+    from .sections import iter_command_blocks
+except ImportError:
+    from records import BgpSession
+    from sections import iter_command_blocks
+
+__all__ = [
+    "BgpSummary",
+    "normalize_state",
+    "parse_bgp_summaries",
+    "uptime_seconds",
+    "BGP_DIFF_KINDS",
+    "BgpDiff",
+    "diff_bgp_summaries",
+]
+
+# One parser for every BGP summary table EOS prints:
+#
+#   show bgp summary [vrf all]          (multi-agent layout, one row per AFI/SAFI)
+#   Neighbor              AS Session State AFI/SAFI                AFI/SAFI State   NLRI Rcd   NLRI Acc
+#   ------------ ----------- ------------- ----------------------- -------------- ---------- ----------
+#   10.4.224.1   64100.21001 Established   IPv4 Unicast            Negotiated             59         59
+#
+#   show bgp evpn summary / show ip bgp summary   (classic layout)
+#     Neighbor   V AS           MsgRcvd   MsgSent  InQ OutQ  Up/Down State   PfxRcd PfxAcc
+#     10.4.228.1 4 64100.21001  10817487  12924096    0    0  191d18h Estab   3839   3839
+#
+# 'vrf all' repeats the block per VRF after 'BGP summary information for VRF <name>'.
+# Rows are cut with str.split() and read from both ends (AFI/SAFI names
+# contain blanks), so a pass costs about one split per line.
+
+_VRF_MARKER = "BGP summary information for VRF"
+_ROUTER_ID = "Router identifier"
+
+# Memo of normalize_state(); bounded so a long-running process fed odd
+# tokens cannot grow it without limit.
+_STATE_CACHE: Dict[str, str] = {}
+_STATE_CACHE_MAX = 4096
+
+
+def normalize_state(tok: str) -> str:
+    """
+    'Established' / 'Estab' / 'Establi6shed' -> 'Established', 'Idle(Admin)' -> 'Idle',
+    'Active' -> 'Active'; anything else with digits removed. Cached per token.
+    """
+    state = _STATE_CACHE.get(tok)
+    if state is None:
+        clean = "".join(ch for ch in tok if not ch.isdigit())
+        low = clean.lower()
+        if low.startswith("estab"):
+            state = "Established"
+        elif low.startswith("idle"):
+            state = "Idle"
+        elif low.startswith("active"):
+            state = "Active"
+        else:
+            state = clean
+        state = sys.intern(state)
+        if len(_STATE_CACHE) < _STATE_CACHE_MAX:
+            _STATE_CACHE[tok] = state
+    return state
+
+
+class BgpSummary:
+    """
+    Neighbor table of one or more BGP summary outputs keyed by (vrf, peer).
+      sessions  {(vrf, peer): BgpSession}   insertion (= output) order
+      vrfs      {vrf: {'ROUTER_ID': str, 'LOCAL_AS': str}}
+    A peer listed once per AFI/SAFI is one session; its NLRI counts are summed.
+    """
+    __slots__ = ("sessions", "vrfs")
+
+    def __init__(self):
+        self.sessions: Dict[Tuple[str, str], BgpSession] = {}
+        self.vrfs: Dict[str, dict] = {}
+
+    @classmethod
+    def from_text(cls, text: str, vrf: str = "default") -> "BgpSummary":
+        summary = cls()
+        summary.feed(text, vrf)
+        return summary
+
+    def feed(self, text: str, vrf: str = "default") -> "BgpSummary":
+        """Parse `text` into this table (tables without a VRF line go to `vrf`)."""
+        if not text:
+            return self
+        sessions, vrfs = self.sessions, self.vrfs
+        intern = sys.intern
+        layout = None          # None, 'afi' or 'classic'
+        for line in text.splitlines():
+            parts = line.split()
+            if not parts:
+                layout = None
+                continue
+            first = parts[0]
+            if layout is not None and "#" not in first and ("." in first or ":" in first):
+                key = (vrf, first)
+                if layout == "afi":
+                    if len(parts) < 3:
+                        continue
+                    if len(parts) >= 6 and parts[-1].isdigit() and parts[-2].isdigit():
+                        afi, rcd, acc = " ".join(parts[3:-3]), int(parts[-2]), int(parts[-1])
+                    else:
+                        afi, rcd, acc = " ".join(parts[3:]), None, None
+                    s = sessions.get(key)
+                    if s is None:
+                        sessions[key] = BgpSession(vrf, first, parts[1], normalize_state(parts[2]), afi, rcd, acc)
+                        continue
+                    if afi and afi not in s.AFI_SAFI.split(", "):
+                        s.AFI_SAFI = intern(f"{s.AFI_SAFI}, {afi}" if s.AFI_SAFI else afi)
+                    if rcd is not None:
+                        s.NLRI_RCD = (s.NLRI_RCD or 0) + rcd
+                        s.NLRI_ACC = (s.NLRI_ACC or 0) + acc
+                    continue
+                # classic: Neighbor V AS MsgRcvd MsgSent InQ OutQ Up/Down State [PfxRcd PfxAcc]
+                if len(parts) < 9:
+                    continue
+                rcd = int(parts[9]) if len(parts) > 9 and parts[9].isdigit() else None
+                acc = int(parts[10]) if len(parts) > 10 and parts[10].isdigit() else None
+                sessions[key] = BgpSession(
+                    vrf, first, parts[2], normalize_state(parts[8]), "", rcd, acc, parts[7],
+                    int(parts[3]) if parts[3].isdigit() else None,
+                    int(parts[4]) if parts[4].isdigit() else None,
+                )
+                continue
+            if first == "Neighbor":
+                layout = "afi" if "AFI/SAFI" in line else "classic"
+            elif line.startswith(_VRF_MARKER):
+                vrf = intern(parts[-1])
+                vrfs.setdefault(vrf, {"ROUTER_ID": None, "LOCAL_AS": None})
+                layout = None
+            elif line.startswith(_ROUTER_ID):
+                # Router identifier 10.4.228.5, local AS number 64100.21005
+                info = vrfs.setdefault(vrf, {"ROUTER_ID": None, "LOCAL_AS": None})
+                info["ROUTER_ID"] = parts[2].rstrip(",")
+                info["LOCAL_AS"] = parts[-1]
+            elif "#" in first:
+                layout = None
+        return self
+
+    def merge(self, other: "BgpSummary") -> "BgpSummary":
+        """Add the sessions / VRFs of `other` (its rows win on a key clash)."""
+        self.sessions.update(other.sessions)
+        for vrf, info in other.vrfs.items():
+            self.vrfs.setdefault(vrf, info)
+        return self
+
+    # ---- lookups ----
+    def __len__(self):
+        return len(self.sessions)
+
+    def __iter__(self) -> Iterator[BgpSession]:
+        return iter(self.sessions.values())
+
+    def get(self, vrf: str, peer: str) -> Optional[BgpSession]:
+        return self.sessions.get((vrf, peer))
+
+    def in_vrf(self, vrf: str) -> List[BgpSession]:
+        return [s for (v, _), s in self.sessions.items() if v == vrf]
+
+    def established(self) -> int:
+        return sum(1 for s in self.sessions.values() if s.STATE == "Established")
+
+    def per_vrf(self) -> Dict[str, Dict[str, int]]:
+        """{vrf: {'NEIGHBORS': n, 'ESTABLISHED': n, 'NLRI_RCD': n, 'NLRI_ACC': n}}"""
+        out: Dict[str, Dict[str, int]] = {}
+        for s in self.sessions.values():
+            b = out.get(s.VRF)
+            if b is None:
+                b = out[s.VRF] = {"NEIGHBORS": 0, "ESTABLISHED": 0, "NLRI_RCD": 0, "NLRI_ACC": 0}
+            b["NEIGHBORS"] += 1
+            if s.STATE == "Established":
+                b["ESTABLISHED"] += 1
+            b["NLRI_RCD"] += s.NLRI_RCD or 0
+            b["NLRI_ACC"] += s.NLRI_ACC or 0
+        return out
+
+
+def parse_bgp_summaries(text: str) -> Dict[str, BgpSummary]:
+    """
+    Every BGP summary block of a capture, by section key:
+      {'bgp_summary': BgpSummary, 'bgp_evpn_summary': BgpSummary}
+    ('sh bgp summary vrf all' is part of 'bgp_summary'). Keys whose command
+    is absent are missing from the result.
+    """
+    result: Dict[str, BgpSummary] = {}
+    for block in iter_command_blocks(text):
+        if block.key in ("bgp_summary", "bgp_evpn_summary"):
+            summary = result.get(block.key)
+            if summary is None:
+                summary = result[block.key] = BgpSummary()
+            summary.feed(block.text)
+    return result
+
+
+# ---- per-session pre/post diff ----
+_UNIT_SECONDS = {"y": 365 * 86400, "w": 7 * 86400, "d": 86400, "h": 3600, "m": 60, "s": 1}
+
+
+def uptime_seconds(value: Optional[str]) -> Optional[int]:
+    """'191d18h' / '5w2d' / '1y2w' / '01:02:03' -> seconds; None when unknown ('never', '')."""
+    if not value:
+        return None
+    if ":" in value:
+        parts = value.split(":")
+        if all(p.isdigit() for p in parts):
+            total = 0
+            for p in parts:
+                total = total * 60 + int(p)
+            return total
+        return None
+    total, num = 0, ""
+    for ch in value:
+        if ch.isdigit():
+            num += ch
+        elif ch in _UNIT_SECONDS and num:
+            total += int(num) * _UNIT_SECONDS[ch]
+            num = ""
+        else:
+            return None
+    return total if not num else None
+
+
+BGP_DIFF_KINDS = ("down", "missing", "new", "asn_changed", "nlri_changed", "flapped")
+
+
+class BgpDiff:
+    """
+    Session-level difference of two BgpSummary tables (see diff_bgp_summaries).
+    Each kind is a list of (vrf, peer) keys in pre order (post order for 'new');
+    nlri holds {(vrf, peer): (pre_rcd, post_rcd, pre_acc, post_acc)} for nlri_changed.
+    """
+    __slots__ = ("pre", "post", "down", "missing", "new", "asn_changed", "nlri_changed", "flapped", "nlri")
+
+    def __init__(self, pre: BgpSummary, post: BgpSummary):
+        self.pre = pre
+        self.post = post
+        for kind in BGP_DIFF_KINDS:
+            setattr(self, kind, [])
+        self.nlri: Dict[Tuple[str, str], tuple] = {}
+
+    def counts(self) -> Dict[str, int]:
+        return {kind: len(getattr(self, kind)) for kind in BGP_DIFF_KINDS}
+
+    def entries(self, kind: str) -> Iterator[dict]:
+        """Yield {VRF, NEIGHBOR, PRE, POST} per session of one kind (PRE/POST are short strings)."""
+        for key in getattr(self, kind):
+            a, b = self.pre.sessions.get(key), self.post.sessions.get(key)
+            if kind == "asn_changed":
+                pre_s, post_s = a.AS, b.AS
+            elif kind == "nlri_changed":
+                r0, r1, c0, c1 = self.nlri[key]
+                pre_s, post_s = f"{r0}/{c0}", f"{r1}/{c1}"
+            elif kind == "flapped":
+                pre_s, post_s = a.UP_DOWN, b.UP_DOWN
+            else:
+                pre_s = a.STATE if a is not None else "-"
+                post_s = b.STATE if b is not None else "-"
+            yield {"VRF": key[0], "NEIGHBOR": key[1], "PRE": pre_s, "POST": post_s}
+
+
+def _nlri_moved(a, b, tolerance: float, min_delta: int) -> bool:
+    if a is None or b is None:
+        return a is not b
+    return abs(b - a) > max(min_delta, tolerance * a)
+
+
+def diff_bgp_summaries(pre: BgpSummary, post: BgpSummary, tolerance: float = 0.0,
+                       min_delta: int = 0) -> BgpDiff:
+    """
+    Hash join of two summaries on (vrf, peer):
+      down          Established before, not Established after
+      missing       peer gone from the post table
+      new           peer only in post
+      asn_changed   remote AS differs
+      nlri_changed  NLRI Rcd or Acc moved by more than max(min_delta, tolerance * pre)
+      flapped       Established in both but the Up/Down timer went backwards
+    Order of rows in the two outputs does not matter.
+    """
+    d = BgpDiff(pre, post)
+    post_get = post.sessions.get
+    for key, a in pre.sessions.items():
+        b = post_get(key)
+        if b is None:
+            d.missing.append(key)
+            continue
+        was_up, is_up = a.STATE == "Established", b.STATE == "Established"
+        if was_up and not is_up:
+            d.down.append(key)
+        if a.AS != b.AS:
+            d.asn_changed.append(key)
+        if (_nlri_moved(a.NLRI_RCD, b.NLRI_RCD, tolerance, min_delta)
+                or _nlri_moved(a.NLRI_ACC, b.NLRI_ACC, tolerance, min_delta)):
+            d.nlri_changed.append(key)
+            d.nlri[key] = (a.NLRI_RCD, b.NLRI_RCD, a.NLRI_ACC, b.NLRI_ACC)
+        if was_up and is_up:
+            t0, t1 = uptime_seconds(a.UP_DOWN), uptime_seconds(b.UP_DOWN)
+            if t0 is not None and t1 is not None and t1 < t0:
+                d.flapped.append(key)
+    if len(post.sessions) > len(pre.sessions) - len(d.missing):
+        pre_keys = pre.sessions
+        d.new.extend(k for k in post.sessions if k not in pre_keys)
+    return d
@@ -0,0 +1,295 @@
+import mmap
+import re
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+__all__ = [
+    "detect_hostname",
+    "normalize_capture",
+    "normalize_text",
+    "normalize_file",
+    "read_capture",
+    "map_capture",
+    "DeviceCapture",
+    "split_devices",
+    "iter_prompts",
+]
+
+# Cleanup of raw terminal captures (putty / SecureCRT session logs), on bytes.
+# Each step is a single C-level pass over the buffer: bytes.replace,
+# bytes.translate with a delete table, or one precompiled regex .sub. Steps
+# that cannot apply (no ESC byte, no pager prompt, no CR) are skipped after an
+# `in` test, so a clean multi-GB capture costs a few memchr-speed scans.
+
+# ESC ] ... BEL|ST (window title) and ESC [ ... final (colours, cursor moves),
+# plus the two-byte ESC sequences some terminals emit (ESC =, ESC >, ESC 7 ...).
+_ANSI_RE = re.compile(rb'\x1b\][^\x07\x1b]*(?:\x07|\x1b\\)|\x1b\[[0-9;?]*[ -/]*[@-~]|\x1b[()][A-Z0-9]|\x1b[=>78DEHMc]')
+
+# Pager residue: ' --More-- ' followed by whatever the terminal used to erase
+# it (backspaces, CR + spaces + CR, or nothing when the log cut it short).
+_MORE_RE = re.compile(rb' ?--More-- ?(?:[\x08]+ *[\x08]+|\r +\r|\r)?')
+
+# Line endings: CRLF, CR runs in front of LF ('\r\r\n'), and a lone CR
+# (carriage return redraw) all become one LF, so no two lines run together.
+_CR_RE = re.compile(rb'\r+\n?')
+
+# Control characters other than TAB, LF and CR (handled above), deleted in
+# one translate() pass.
+_CTRL_DELETE = bytes(c for c in range(32) if c not in (9, 10, 13)) + b"\x7f"
+
+# Prompt at the start of a line; group 1 is the host, group 2 the rest
+# ('(config)#cmd'). Same shape as sections.PROMPT_RE, on bytes.
+_PROMPT_B = re.compile(rb'^([A-Za-z0-9][A-Za-z0-9._-]*)((?:\([^)\n]*\))?#[^\n]*)$', re.MULTILINE)
+# Host part in front of '#' (match() bounded to the text before the '#').
+_HOST_B = re.compile(rb'([A-Za-z0-9][A-Za-z0-9._-]*)(?:\([^)\n]*\))?$')
+
+_Data = Union[bytes, bytearray, memoryview]
+
+
+def detect_hostname(data: _Data, sample: int = 4 << 20) -> Optional[str]:
+    """
+    Most common prompt host in the first `sample` bytes, e.g.
+    'EMEA-UK-LON-THN2-MBL51'. None when no prompt is found.
+    """
+    counts: Dict[bytes, int] = {}
+    for m in _PROMPT_B.finditer(bytes(data[:sample])):
+        h = m.group(1)
+        counts[h] = counts.get(h, 0) + 1
+    if not counts:
+        return None
+    return max(counts, key=counts.get).decode("ascii")
+
+
+def _repair_prompts(data: bytes, host: bytes) -> bytes:
+    """
+    Restore prompts of `host` that are visibly cut short:
+      'EMEA-UK-LON...#show vlan'          -> 'EMEA-UK-LON-THN2-MBL51#show vlan'
+      'MEA-UK-LON-THN2-MBL51#sh bgp ...'  -> 'EMEA-UK-LON-THN2-MBL51#sh bgp ...'
+    The second form (a redraw that lost leading characters) is only repaired
+    on the line right after a bare 'EMEA-UK-LON-THN2-MBL51#', and never when
+    the shorter host also prompts elsewhere, i.e. is a device of its own
+    (leaf1 next to leaf10). Lines without '#' are never turned into prompts.
+    A host shorter than half the full name is left alone (too ambiguous).
+    """
+    floor = max(len(host) // 2, 1)
+    fixes = []          # (line start, host end, replacement)
+    redraws = []        # (line start, host end, short host), kept if it is not a real host
+    seen = set()        # hosts prompting anywhere but in a redraw position
+    bare_end = -1       # offset after the last bare prompt line of `host`
+    for ls, i, h in iter_prompts(data):
+        nl = data.find(b"\n", i)
+        le = len(data) if nl < 0 else nl
+        if h != host and len(h) >= floor:
+            piece = h.rstrip(b".")
+            if len(piece) + 3 <= len(h) and host.startswith(piece):
+                fixes.append((ls, ls + len(h), host))
+            elif ls == bare_end and host.endswith(h):
+                redraws.append((ls, ls + len(h), h))
+            else:
+                seen.add(h)
+        else:
+            seen.add(h)
+        bare_end = le + 1 if h == host and not data[i + 1:le].strip() else -1
+    fixes.extend((a, b, host) for a, b, h in redraws if h not in seen)
+
+    if not fixes:
+        return data
+    fixes.sort()
+    out, pos = [], 0
+    for a, b, rep in fixes:
+        out.append(data[pos:a])
+        out.append(rep)
+        pos = b
+    out.append(data[pos:])
+    return b"".join(out)
+
+
+def normalize_capture(data: _Data, hostname: Optional[str] = None, repair_prompts: bool = True) -> bytes:
+    """
+    Clean a raw capture (bytes in, bytes out):
+      - ANSI escape sequences removed
+      - '--More--' pager residue removed
+      - CRLF / CR line endings -> LF
+      - other control characters (BS, BEL, NUL, ...) removed
+      - truncated prompts repaired against `hostname` (detected when None)
+    """
+    if not isinstance(data, bytes):
+        data = bytes(data)
+    if b"\x1b" in data:
+        data = _ANSI_RE.sub(b"", data)
+    if b"--More--" in data:
+        data = _MORE_RE.sub(b"", data)
+    if b"\r" in data:
+        data = _CR_RE.sub(b"\n", data)
+    data = data.translate(None, _CTRL_DELETE)
+    if repair_prompts:
+        host = hostname or detect_hostname(data)
+        if host:
+            data = _repair_prompts(data, host.encode("ascii"))
+    return data
+
+
+def normalize_text(text: str, hostname: Optional[str] = None, repair_prompts: bool = True) -> str:
+    """normalize_capture() for str input (UTF-8 round trip)."""
+    if not text:
+        return ""
+    data = normalize_capture(text.encode("utf-8", "surrogateescape"), hostname, repair_prompts)
+    return data.decode("utf-8", "ignore")
+
+
+def read_capture(path: str, hostname: Optional[str] = None) -> str:
+    """Read a capture file and return it normalized as str ('' when unreadable)."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return ""
+    return normalize_capture(data, hostname).decode("utf-8", "ignore")
+
+
+def normalize_file(src: str, dst: str, hostname: Optional[str] = None, chunk_size: int = 64 << 20) -> str:
+    """
+    Stream `src` to `dst` through normalize_capture in line-aligned chunks,
+    so a multi-GB session log never has to fit in memory. The hostname is
+    detected from the first chunk when not given. Returns the hostname used.
+    """
+    host = hostname
+    tail = b""
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        while True:
+            block = fin.read(chunk_size)
+            if not block:
+                break
+            block = tail + block
+            cut = block.rfind(b"\n") + 1
+            if cut == 0:
+                tail = block
+                continue
+            block, tail = block[:cut], block[cut:]
+            if host is None:
+                host = detect_hostname(block)
+            fout.write(normalize_capture(block, host, repair_prompts=host is not None))
+        if tail:
+            fout.write(normalize_capture(tail, host, repair_prompts=host is not None))
+    return host
+
+
+# ---- multi-device session logs ----
+def map_capture(path: str):
+    """
+    Read-only mmap of a capture file (b'' for an empty file). Slicing a
+    memoryview of it does not copy, and the pages are shared with any other
+    process mapping the same file.
+    """
+    with open(path, "rb") as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:          # empty file
+            return b""
+
+
+class DeviceCapture:
+    """
+    One device's share of a multi-device session log: the host name and the
+    (start, end) byte ranges of the shared buffer that belong to it, in log
+    order. Nothing is copied until text() / tobytes() is called.
+    """
+    __slots__ = ("host", "buf", "ranges")
+
+    def __init__(self, host: str, buf, ranges: Optional[List[Tuple[int, int]]] = None):
+        self.host = host
+        self.buf = buf
+        self.ranges = ranges if ranges is not None else []
+
+    def __len__(self):
+        return sum(b - a for a, b in self.ranges)
+
+    def views(self) -> List[memoryview]:
+        mv = memoryview(self.buf)
+        return [mv[a:b] for a, b in self.ranges]
+
+    def tobytes(self) -> bytes:
+        return b"".join(self.views())
+
+    def text(self, normalize: bool = True) -> str:
+        """The device's capture as str, normalized against its own host name by default."""
+        data = self.tobytes()
+        if normalize:
+            data = normalize_capture(data, self.host)
+        return data.decode("utf-8", "ignore")
+
+    def __repr__(self):
+        return f"DeviceCapture({self.host!r}, {len(self.ranges)} ranges, {len(self)} bytes)"
+
+
+def iter_prompts(data) -> Iterator[Tuple[int, int, bytes]]:
+    """
+    Yield (line start, '#' offset, host) for every prompt line of a capture
+    (bytes or mmap). Candidates are found with find() on '#', which is rare in
+    command output, so the scan runs at memchr speed.
+    """
+    find, rfind = data.find, data.rfind
+    i = find(b"#")
+    while i >= 0:
+        ls = rfind(b"\n", 0, i) + 1
+        m = _HOST_B.match(data, ls, i)
+        if m is not None:
+            yield ls, i, m.group(1)
+        nl = find(b"\n", i)
+        if nl < 0:
+            break
+        i = find(b"#", nl)
+
+
+def _match_host(h: bytes, known: Dict[bytes, str]) -> Optional[str]:
+    # Prompt EOS cut short with a marker ('EMEA-UK-LON...#'): credit it to the
+    # known host it is the start of. Unmarked hosts only match exactly, so
+    # leaf1 and leaf10 stay two devices.
+    piece = h.rstrip(b".")
+    if len(piece) + 3 > len(h) or not piece:
+        return None
+    for full, name in known.items():
+        if full.startswith(piece):
+            return name
+    return None
+
+
+def split_devices(data) -> Dict[str, DeviceCapture]:
+    """
+    Cut a session log that interleaves several devices into per-device byte
+    ranges, in one pass. A range starts at a prompt line and runs to the next
+    prompt of a different host; text before the first prompt (jump-host
+    banner) is dropped. `data` may be bytes or an mmap (see map_capture).
+    Prompt hosts match exactly, except for two visible truncations: a host
+    ending in '...', and a redraw that lost leading characters
+    ('MEA-UK-...#cmd' on the line right after a bare 'EMEA-UK-...#').
+    Returns {host: DeviceCapture} in order of first appearance.
+    """
+    devices: Dict[str, DeviceCapture] = {}
+    known: Dict[bytes, str] = {}       # full host names seen
+    aliases: Dict[bytes, str] = {}     # every prompt host seen -> device
+    cur, cur_b, start = None, b"", 0
+    bare_end = -1                      # offset after the last bare prompt line of `cur`
+    find = data.find
+    for ls, i, h in iter_prompts(data):
+        host = aliases.get(h)
+        if host is None:
+            if ls == bare_end and len(h) >= len(cur_b) // 2 and cur_b.endswith(h):
+                host = cur                 # redraw of the current prompt, not cached
+            else:
+                host = _match_host(h, known)
+                if host is None:
+                    host = known[h] = h.decode("ascii")
+                aliases[h] = host
+        nl = find(b"\n", i)
+        le = len(data) if nl < 0 else nl
+        if host != cur:
+            if cur is not None:
+                devices[cur].ranges.append((start, ls))
+            dev = devices.get(host)
+            if dev is None:
+                dev = devices[host] = DeviceCapture(host, data)
+            cur, cur_b, start = host, host.encode("ascii"), ls
+        bare_end = le + 1 if not data[i + 1:le].strip() else -1
+    if cur is not None:
+        devices[cur].ranges.append((start, len(data)))
+    return devices
@@ -58,13 +58,25 @@ except ImportError:
         class NetworkParsers:
             pass
 
-import io
+import contextlib
 import sys
+
+try:
+    from .render import TextSink, default_sink
+    from .records import BgpNeighbor, BgpEvpnNeighbor, Vtep, MacEntry
+    from .tables import find_table
+    from .vlans import iter_vlan_brief_rows
+except ImportError:
+    from render import TextSink, default_sink
+    from records import BgpNeighbor, BgpEvpnNeighbor, Vtep, MacEntry
+    from tables import find_table
+    from vlans import iter_vlan_brief_rows
 # NOTE: Core parsing (all regex/block extraction) resides in network_parsers.py.
 # This script mainly orchestrates reading test.txt and printing formatted summaries.
 
-def _print_route_summary_table(raw: str):
+def _print_route_summary_table(raw: str, out=None):
     # REPLACED with raw printer (no parsing)
+    out = default_sink(out)
     lines = raw.splitlines()
     start = None
     for i, l in enumerate(lines):
@@ -73,7 +85,7 @@ def _print_route_summary_table(raw: str):
             start = i + 1
             break
     if start is None:
-        print("\nIP Route Summary (raw): none")
+        out.line("\nIP Route Summary (raw): none")
         return
     block = []
     for l in lines[start:]:
@@ -89,77 +101,81 @@ def _print_route_summary_table(raw: str):
            or re.match(r'\s*External:', l) \
            or re.match(r'\s*Level-1:', l):
             wanted.append(l)
-    print("\nIP Route Summary (raw):")
+    out.line("\nIP Route Summary (raw):")
     for idx, l in enumerate(wanted):
-        print(l.lstrip() if idx == 0 else l)
+        out.line(l.lstrip() if idx == 0 else l)
 
-def _print_igmp_snooping_querier(raw: str):
+def _print_igmp_snooping_querier(raw: str, out=None):
+    out = default_sink(out)
     parser = NetworkParsers()
     result = parser.parse_igmp_snooping_querier(raw)
-    print("\nCommand executed:\nshow igmp snooping querier")
+    out.line("\nCommand executed:\nshow igmp snooping querier")
     if not result["lines"]:
-        print("No IGMP snooping querier output found.")
+        out.line("No IGMP snooping querier output found.")
         return
     for l in result["lines"]:
-        print(l)
-    print(f"\nVLAN record count: {result['vlan_count']}")
+        out.line(l)
+    out.line(f"\nVLAN record count: {result['vlan_count']}")
 
-def _print_vlan_brief(raw: str):
+def _print_vlan_brief(raw: str, out=None):
+    out = default_sink(out)
     parser = NetworkParsers()
     rows = parser.parse_vlan_brief(raw)
-    print("\nCommand executed:\nshow vlan brief")
+    out.line("\nCommand executed:\nshow vlan brief")
     if not rows:
-        print("No VLAN brief data.")
+        out.line("No VLAN brief data.")
         return
     v_w = max(len("VLAN"), *(len(r["VLAN"]) for r in rows))
     n_w = max(len("Name"), *(len(r["NAME"]) for r in rows))
     s_w = max(len("Status"), *(len(r["STATUS"]) for r in rows))
     header = f"{'VLAN'.ljust(v_w)}  {'Name'.ljust(n_w)}  {'Status'.ljust(s_w)}  Ports"
-    print(header)
-    print("-" * len(header))
+    out.line(header)
+    out.line("-" * len(header))
     for r in rows:
-        print(f"{r['VLAN'].ljust(v_w)}  {r['NAME'].ljust(n_w)}  {r['STATUS'].ljust(s_w)}  {r['PORTS']}")
-    print("-" * len(header))
-    print(f"Total VLANs: {len(rows)}")
+        out.line(f"{r['VLAN'].ljust(v_w)}  {r['NAME'].ljust(n_w)}  {r['STATUS'].ljust(s_w)}  {r['PORTS']}")
+    out.line("-" * len(header))
+    out.line(f"Total VLANs: {len(rows)}")
 
-def _print_vlan_dynamic(raw: str):
+def _print_vlan_dynamic(raw: str, out=None):
+    out = default_sink(out)
     parser = NetworkParsers()
     rows = parser.parse_vlan_dynamic(raw)
-    print("\nCommand executed:\nshow vlan dynamic")
+    out.line("\nCommand executed:\nshow vlan dynamic")
     if not rows:
-        print("No dynamic VLAN data.")
+        out.line("No dynamic VLAN data.")
         return
     v_w = max(len("VLAN"), *(len(r["VLAN"]) for r in rows))
     n_w = max(len("Name"), *(len(r["NAME"]) for r in rows))
     s_w = max(len("Status"), *(len(r["STATUS"]) for r in rows))
     header = f"{'VLAN'.ljust(v_w)}  {'Name'.ljust(n_w)}  {'Status'.ljust(s_w)}  Ports"
-    print(header)
-    print("-" * len(header))
+    out.line(header)
+    out.line("-" * len(header))
     for r in rows:
-        print(f"{r['VLAN'].ljust(v_w)}  {r['NAME'].ljust(n_w)}  {r['STATUS'].ljust(s_w)}  {r['PORTS']}")
-    print("-" * len(header))
-    print(f"Total Dynamic VLANs: {len(rows)}")
+        out.line(f"{r['VLAN'].ljust(v_w)}  {r['NAME'].ljust(n_w)}  {r['STATUS'].ljust(s_w)}  {r['PORTS']}")
+    out.line("-" * len(header))
+    out.line(f"Total Dynamic VLANs: {len(rows)}")
 
-def _print_bgp_evpn_route_type_auto_discovery_from_sample():
+def _print_bgp_evpn_route_type_auto_discovery_from_sample(out=None):
     """Load test.txt and print EVPN auto-discovery Network entries with counts."""
+    out = default_sink(out)
     sample_path = os.path.join(os.path.dirname(__file__), "test.txt")
     if not os.path.isfile(sample_path):
-        print("\n(test) sh bgp evpn route-type auto-discovery: test.txt not found.")
+        out.line("\n(test) sh bgp evpn route-type auto-discovery: test.txt not found.")
         return
     try:
         raw = open(sample_path, "r", encoding="utf-8", errors="ignore").read()
     except Exception as e:
-        print(f"\nError reading test.txt: {e}")
+        out.line(f"\nError reading test.txt: {e}")
         return
     parser = NetworkParsers()
     rows = parser.parse_bgp_evpn_route_type_auto_discovery(raw)
-    print("\nCommand executed (from test.txt):\nsh bgp evpn route-type auto-discovery")
+    out.line("\nCommand executed (from test.txt):\nsh bgp evpn route-type auto-discovery")
     if not rows:
-        print("No auto-discovery route-type data found.")
+        out.line("No auto-discovery route-type data found.")
         return
-    print("Entries (all occurrences):")
+    out.line("Entries (all occurrences):")
     for r in rows:
-        print(f"  RD {r.get('RD')}")
+        out.line(f"  RD {r.get('RD')}")
     counts = {}
     for r in rows:
         rd = r.get("RD")
@@ -168,37 +184,38 @@ def _print_bgp_evpn_route_type_auto_discovery_from_sample():
     rd_w = max(len("RD"), *(len(x) for x in counts))
     c_w = len("Count")
     header = f"{'RD'.ljust(rd_w)}  {'Count'.rjust(c_w)}"
-    print("\nSummary:")
-    print(header)
-    print("-" * len(header))
+    out.line("\nSummary:")
+    out.line(header)
+    out.line("-" * len(header))
     total = 0
     for rd in sorted(counts):
         v = counts[rd]; total += v
-        print(f"{rd.ljust(rd_w)}  {str(v).rjust(c_w)}")
-    print("-" * len(header))
-    print(f"{'TOTAL DISTINCT'.ljust(rd_w)}  {str(len(counts)).rjust(c_w)}")
-    print(f"{'TOTAL OCCURRENCES'.ljust(rd_w)}  {str(total).rjust(c_w)}")
+        out.line(f"{rd.ljust(rd_w)}  {str(v).rjust(c_w)}")
+    out.line("-" * len(header))
+    out.line(f"{'TOTAL DISTINCT'.ljust(rd_w)}  {str(len(counts)).rjust(c_w)}")
+    out.line(f"{'TOTAL OCCURRENCES'.ljust(rd_w)}  {str(total).rjust(c_w)}")
 
-def _print_bgp_evpn_route_type_mac_ip_from_sample():
+def _print_bgp_evpn_route_type_mac_ip_from_sample(out=None):
     """Load test.txt and print EVPN mac-ip Route Distinguisher entries with counts."""
+    out = default_sink(out)
     sample_path = os.path.join(os.path.dirname(__file__), "test.txt")
     if not os.path.isfile(sample_path):
-        print("\n(test) sh bgp evpn route-type mac-ip: test.txt not found.")
+        out.line("\n(test) sh bgp evpn route-type mac-ip: test.txt not found.")
         return
     try:
         raw = open(sample_path, "r", encoding="utf-8", errors="ignore").read()
     except Exception as e:
-        print(f"\nError reading test.txt: {e}")
+        out.line(f"\nError reading test.txt: {e}")
         return
     parser = NetworkParsers()
     rows = parser.parse_bgp_evpn_route_type_mac_ip(raw)
-    print("\nCommand executed (from test.txt):\nsh bgp evpn route-type mac-ip")
+    out.line("\nCommand executed (from test.txt):\nsh bgp evpn route-type mac-ip")
     if not rows:
-        print("No mac-ip route-type data found.")
+        out.line("No mac-ip route-type data found.")
         return
-    print("Entries (all occurrences):")
+    out.line("Entries (all occurrences):")
     for r in rows:
-        print(f"  RD {r.get('RD')}  MAC {r.get('MAC')}  IP {r.get('IP') or ''}")
+        out.line(f"  RD {r.get('RD')}  MAC {r.get('MAC')}  IP {r.get('IP') or ''}")
     rd_counts = {}
     for r in rows:
         rd = r.get("RD")
@@ -207,37 +224,38 @@ def _print_bgp_evpn_route_type_mac_ip_from_sample():
     rd_w = max(len("RD"), *(len(x) for x in rd_counts))
     c_w = len("Count")
     header = f"{'RD'.ljust(rd_w)}  {'Count'.rjust(c_w)}"
-    print("\nSummary:")
-    print(header)
-    print("-" * len(header))
+    out.line("\nSummary:")
+    out.line(header)
+    out.line("-" * len(header))
     total = 0
     for rd in sorted(rd_counts):
         v = rd_counts[rd]; total += v
-        print(f"{rd.ljust(rd_w)}  {str(v).rjust(c_w)}")
-    print("-" * len(header))
-    print(f"{'TOTAL DISTINCT'.ljust(rd_w)}  {str(len(rd_counts)).rjust(c_w)}")
-    print(f"{'TOTAL OCCURRENCES'.ljust(rd_w)}  {str(total).rjust(c_w)}")
+        out.line(f"{rd.ljust(rd_w)}  {str(v).rjust(c_w)}")
+    out.line("-" * len(header))
+    out.line(f"{'TOTAL DISTINCT'.ljust(rd_w)}  {str(len(rd_counts)).rjust(c_w)}")
+    out.line(f"{'TOTAL OCCURRENCES'.ljust(rd_w)}  {str(total).rjust(c_w)}")
 
-def _print_bgp_evpn_route_type_imet_from_sample():
+def _print_bgp_evpn_route_type_imet_from_sample(out=None):
     """Load test.txt and print EVPN imet RD counts."""
+    out = default_sink(out)
     sample_path = os.path.join(os.path.dirname(__file__), "test.txt")
     if not os.path.isfile(sample_path):
-        print("\n(test) sh bgp evpn route-type imet: test.txt not found.")
+        out.line("\n(test) sh bgp evpn route-type imet: test.txt not found.")
         return
     try:
         raw = open(sample_path, "r", encoding="utf-8", errors="ignore").read()
     except Exception as e:
-        print(f"\nError reading test.txt: {e}")
+        out.line(f"\nError reading test.txt: {e}")
         return
     parser = NetworkParsers()
     rows = parser.parse_bgp_evpn_route_type_imet(raw)
-    print("\nCommand executed (from test.txt):\nsh bgp evpn route-type imet")
+    out.line("\nCommand executed (from test.txt):\nsh bgp evpn route-type imet")
     if not rows:
-        print("No imet route-type data found.")
+        out.line("No imet route-type data found.")
         return
-    print("Entries (all occurrences):")
+    out.line("Entries (all occurrences):")
     for r in rows:
-        print(f"  RD {r.get('RD')}  IP {r.get('IP') or ''}")
+        out.line(f"  RD {r.get('RD')}  IP {r.get('IP') or ''}")
     counts = {}
     for r in rows:
         rd = r.get("RD")
@@ -246,41 +264,42 @@ def _print_bgp_evpn_route_type_imet_from_sample():
     rd_w = max(len("RD"), *(len(x) for x in counts))
     c_w = len("Count")
     header = f"{'RD'.ljust(rd_w)}  {'Count'.rjust(c_w)}"
-    print("\nSummary:")
-    print(header)
-    print("-" * len(header))
+    out.line("\nSummary:")
+    out.line(header)
+    out.line("-" * len(header))
     total = 0
     for rd in sorted(counts):
         v = counts[rd]; total += v
-        print(f"{rd.ljust(rd_w)}  {str(v).rjust(c_w)}")
-    print("-" * len(header))
-    print(f"{'TOTAL DISTINCT'.ljust(rd_w)}  {str(len(counts)).rjust(c_w)}")
-    print(f"{'TOTAL OCCURRENCES'.ljust(rd_w)}  {str(total).rjust(c_w)}")
+        out.line(f"{rd.ljust(rd_w)}  {str(v).rjust(c_w)}")
+    out.line("-" * len(header))
+    out.line(f"{'TOTAL DISTINCT'.ljust(rd_w)}  {str(len(counts)).rjust(c_w)}")
+    out.line(f"{'TOTAL OCCURRENCES'.ljust(rd_w)}  {str(total).rjust(c_w)}")
 
-def _print_bgp_evpn_route_type_ethernet_segment_from_sample():
+def _print_bgp_evpn_route_type_ethernet_segment_from_sample(out=None):
     """Load test.txt and print EVPN ethernet-segment RD/ESI counts."""
+    out = default_sink(out)
     sample_path = os.path.join(os.path.dirname(__file__), "test.txt")
     if not os.path.isfile(sample_path):
-        print("\n(test) sh bgp evpn route-type ethernet-segment: test.txt not found.")
+        out.line("\n(test) sh bgp evpn route-type ethernet-segment: test.txt not found.")
         return
     try:
         raw = open(sample_path, "r", encoding="utf-8", errors="ignore").read()
     except Exception as e:
-        print(f"\nError reading test.txt: {e}")
+        out.line(f"\nError reading test.txt: {e}")
         return
     parser = NetworkParsers()
     fn = getattr(parser, "parse_bgp_evpn_route_type_ethernet_segment", None)
     if not fn:
-        print("Parser for ethernet-segment not implemented.")
+        out.line("Parser for ethernet-segment not implemented.")
         return
     rows = fn(raw)
-    print("\nCommand executed (from test.txt):\nsh bgp evpn route-type ethernet-segment")
+    out.line("\nCommand executed (from test.txt):\nsh bgp evpn route-type ethernet-segment")
     if not rows:
-        print("No ethernet-segment route-type data found.")
+        out.line("No ethernet-segment route-type data found.")
         return
-    print("Entries (all occurrences):")
+    out.line("Entries (all occurrences):")
     for r in rows:
-        print(f"  RD {r.get('RD')}  ESI {r.get('ESI')}")
+        out.line(f"  RD {r.get('RD')}  ESI {r.get('ESI')}")
     counts = {}
     for r in rows:
         rd = r.get("RD")
@@ -289,35 +308,47 @@ def _print_bgp_evpn_route_type_ethernet_segment_from_sample():
     rd_w = max(len("RD"), *(len(x) for x in counts))
     c_w = len("Count")
     header = f"{'RD'.ljust(rd_w)}  {'Count'.rjust(c_w)}"
-    print("\nSummary:")
-    print(header)
-    print("-" * len(header))
+    out.line("\nSummary:")
+    out.line(header)
+    out.line("-" * len(header))
     total = 0
     for rd in sorted(counts):
         v = counts[rd]; total += v
-        print(f"{rd.ljust(rd_w)}  {str(v).rjust(c_w)}")
-    print("-" * len(header))
-    print(f"{'TOTAL DISTINCT'.ljust(rd_w)}  {str(len(counts)).rjust(c_w)}")
-    print(f"{'TOTAL OCCURRENCES'.ljust(rd_w)}  {str(total).rjust(c_w)}")
+        out.line(f"{rd.ljust(rd_w)}  {str(v).rjust(c_w)}")
+    out.line("-" * len(header))
+    out.line(f"{'TOTAL DISTINCT'.ljust(rd_w)}  {str(len(counts)).rjust(c_w)}")
+    out.line(f"{'TOTAL OCCURRENCES'.ljust(rd_w)}  {str(total).rjust(c_w)}")
 
-def _write_output_file(content: str, filename: str = "script_output.txt"):
-    """Write captured script output to a file in the same directory."""
+@contextlib.contextmanager
+def _output_sink(filename: str = "script_output.txt", echo: bool = True):
+    """
+    TextSink that streams straight into `filename` in the same directory
+    (and to stdout when `echo`), so the report is never held in memory.
+    """
     out_path = os.path.join(os.path.dirname(__file__), filename)
+    streams = [sys.stdout] if echo else []
+    f = None
     try:
-        with open(out_path, "w", encoding="utf-8") as f:
-            f.write(content)
+        f = open(out_path, "w", encoding="utf-8")
+        streams.append(f)
     except Exception as e:
         print(f"Failed writing {filename}: {e}")
+    try:
+        yield TextSink(*streams)
+    finally:
+        if f is not None:
+            f.close()
 
-def _print_bgp_evpn_summary(raw: str):
+def _print_bgp_evpn_summary(raw: str, out=None):
+    out = default_sink(out)
     parser = NetworkParsers()
     rows = parser.parse_bgp_evpn_neighbor_summary(raw)
-    print("\nCommand executed:\nsh bgp evpn summary")
+    out.line("\nCommand executed:\nsh bgp evpn summary")
     if not rows:
-        print("No EVPN summary neighbor data found.")
+        out.line("No EVPN summary neighbor data found.")
         return
     estab = sum(1 for r in rows if r["STATE"].lower().startswith("estab"))
-    print(f"Neighbor count: {len(rows)}  Established: {estab}")
+    out.line(f"Neighbor count: {len(rows)}  Established: {estab}")
 
 def _strip_plain_bgp_summary(text: str) -> str:
     """
@@ -344,55 +375,52 @@ def _strip_plain_bgp_summary(text: str) -> str:
         out.append(line)
     return "\n".join(out)
 
-def _print_bgp_summary_ipv4(raw: str):
+def _print_bgp_summary_ipv4(raw: str, out=None):
     """
     Same logic style as _print_bgp_evpn_summary but for 'sh bgp summary'.
     Uses NetworkParsers.parse_bgp_summary (neighbor table) for counts.
     Adds explicit neighbor IP list for verification.
     """
+    out = default_sink(out)
     parser = NetworkParsers()
     rows = parser.parse_bgp_summary(raw)
-    print("\nCommand executed:\nsh bgp summary")
+    out.line("\nCommand executed:\nsh bgp summary")
     if not rows:
-        print("No BGP summary neighbor data found.")
+        out.line("No BGP summary neighbor data found.")
         return
     estab = sum(1 for r in rows if (r.get("STATE","").lower().startswith("estab")))
     neighbors = [r.get("NEIGHBOR") for r in rows if r.get("NEIGHBOR")]
     # Explicit verification printout
-    print(f"Neighbor count: {len(rows)} Established: {estab}")
-    print(f"Neighbor IPs ({len(neighbors)}): {' '.join(neighbors)}")
+    out.line(f"Neighbor count: {len(rows)} Established: {estab}")
+    out.line(f"Neighbor IPs ({len(neighbors)}): {' '.join(neighbors)}")
 
 def main():
-    _buf = io.StringIO()
-    _real_stdout = sys.stdout
-    sys.stdout = _buf
-    try:
-        isc = InterfacesStatusCount()
-        isc.display_results()
-        bgp = BgpStatus(isc.content)
-        bgp.print_bgp_status()
-        # NEW unified IPv4 BGP summary using same logic style as EVPN summary
-        _print_bgp_summary_ipv4(isc.content)
-        # (old basic summary retained; can remove later)
-        from .eos_cli import BgpSummaryBasic
-        BgpSummaryBasic(isc.content).print_basic()
-        up, down = isc.count_ip_interfaces()
-        conn, dis = isc.count_interfaces()
-        est = bgp.count_established_sessions()
-        rs = RouteSummary(isc.content); rs.print()
-        ig = IgmpSnoopingQuerier(isc.content); ig.print()
-        vb = VlanBrief(isc.content); vb.print()
-        vd = VlanDynamic(isc.content); vd.print()
-        ev = EvpnRouteTypes(isc.content); ev.print_summary()
-        _print_bgp_evpn_summary(isc.content)
-        VXLAN(isc.content).print_vtep_detail()
-        _print_bgp_evpn_route_type_auto_discovery_from_sample()
-    finally:
-        sys.stdout = _real_stdout
-    _out = _buf.getvalue()
-    _out = _strip_plain_bgp_summary(_out)
-    print(_out)
-    _write_output_file(_out, "script_output.txt")
+    # REMOVED _strip_plain_bgp_summary pass: no printer emits that block any
+    # more, and the report now streams to stdout and script_output.txt.
+    with _output_sink("script_output.txt") as out:
+        _render_main(out)
+
+def _render_main(out):
+    isc = InterfacesStatusCount()
+    isc.display_results(out)
+    bgp = BgpStatus(isc.content)
+    bgp.print_bgp_status(out)
+    # NEW unified IPv4 BGP summary using same logic style as EVPN summary
+    _print_bgp_summary_ipv4(isc.content, out)
+    # (old basic summary retained; can remove later)
+    from .eos_cli import BgpSummaryBasic
+    BgpSummaryBasic(isc.content).print_basic(out)
+    up, down = isc.count_ip_interfaces()
+    conn, dis = isc.count_interfaces()
+    est = bgp.count_established_sessions()
+    rs = RouteSummary(isc.content); rs.print(out)
+    ig = IgmpSnoopingQuerier(isc.content); ig.print(out)
+    vb = VlanBrief(isc.content); vb.print(out)
+    vd = VlanDynamic(isc.content); vd.print(out)
+    ev = EvpnRouteTypes(isc.content); ev.print_summary(out)
+    _print_bgp_evpn_summary(isc.content, out)
+    VXLAN(isc.content).print_vtep_detail(out)
+    _print_bgp_evpn_route_type_auto_discovery_from_sample(out)
 
 if __name__ == "__main__":
     main()
@@ -416,7 +444,7 @@ if not hasattr(NetworkParsers, "parse_bgp_summary"):
             starting 'Neighbor' (containing NLRI columns) and the following dashed
             separator line. Parsing stops at the first line that does not start with
             an IPv4 address.
-            Returns list of dicts with NEIGHBOR, AS, STATE, NLRI_RCD, NLRI_ACC.
+            Returns list of BgpNeighbor records (NEIGHBOR, AS, STATE, NLRI_RCD, NLRI_ACC).
             """
             results = []
             if not text:
@@ -464,13 +492,7 @@ if not hasattr(NetworkParsers, "parse_bgp_summary"):
                             nlri_acc = int(ints[-1])
                         elif len(ints) == 1:
                             nlri_rcd = nlri_acc = int(ints[-1])
-                        results.append({
-                            "NEIGHBOR": neighbor,
-                            "AS": asn,
-                            "STATE": state,
-                            "NLRI_RCD": nlri_rcd,
-                            "NLRI_ACC": nlri_acc
-                        })
+                        results.append(BgpNeighbor(neighbor, asn, state, nlri_rcd, nlri_acc))
                         i += 1
                     # Continue scanning (support multiple VRF blocks)
                 i += 1
@@ -533,7 +555,7 @@ if not hasattr(NetworkParsers, "parse_bgp_evpn_neighbor_summary"):
             Parse neighbor lines from 'show bgp evpn summary'.
             Expected header then lines like:
               10.4.228.1 4 64100.21001  10817487  12924096    0    0  191d18h Estab   3839   3839
-            Returns list of dicts with keys:
+            Returns list of BgpEvpnNeighbor records with keys:
               NEIGHBOR, VERSION, AS, MSG_RCV, MSG_SNT, INQ, OUTQ, UP_DOWN, STATE, PFX_RCD, PFX_ACC
             """
             results = []
@@ -572,19 +594,10 @@ if not hasattr(NetworkParsers, "parse_bgp_evpn_neighbor_summary"):
                         pfx_acc = int(tail_nums[-1])
                     elif len(tail_nums) == 1:
                         pfx_rcd = pfx_acc = int(tail_nums[-1])
-                    results.append({
-                        "NEIGHBOR": neighbor,
-                        "VERSION": version,
-                        "AS": asn,
-                        "MSG_RCV": msg_rcv,
-                        "MSG_SNT": msg_snt,
-                        "INQ": inq,
-                        "OUTQ": outq,
-                        "UP_DOWN": up_down,
-                        "STATE": state,
-                        "PFX_RCD": pfx_rcd,
-                        "PFX_ACC": pfx_acc
-                    })
+                    results.append(BgpEvpnNeighbor(
+                        neighbor, version, asn, msg_rcv, msg_snt, inq, outq, up_down, state,
+                        pfx_rcd, pfx_acc
+                    ))
                 except Exception:
                     # Ignore malformed line
                     continue
@@ -658,7 +671,7 @@ class NetworkParsers(NetworkParsers):
     def parse_vxlan_vtep_detail(self, text: str):
         """
         Parse 'show vxlan vtep detail' output.
-        Returns list of dicts:
+        Returns list of Vtep records:
           { VTEP, LEARNED_VIA, MAC_LEARNING, TUNNEL_TYPES }
         """
         results = []
@@ -681,10 +694,14 @@ class NetworkParsers(NetworkParsers):
         if header_idx is None:
             return results
 
-        # Advance past header and any dashed separator lines
-        i = header_idx + 1
-        while i < len(lines) and re.match(r'\s*-{5,}', lines[i]):
-            i += 1
+        # Column offsets from the header + dash line; rows are sliced by offset
+        spec, i = find_table(lines, "VTEP", header_idx)
+        if spec is not None and len(spec) < 4:
+            spec = None
+        if spec is None:
+            i = header_idx + 1
+            while i < len(lines) and re.match(r'\s*-{5,}', lines[i]):
+                i += 1
 
         ip_re = re.compile(r'^\d{1,3}(?:\.\d{1,3}){3}$')
 
@@ -697,8 +714,7 @@ class NetworkParsers(NetworkParsers):
                 break
             if raw.strip().endswith("#"):  # prompt / next command
                 break
-            # Split into columns by 2+ spaces
-            parts = re.split(r'\s{2,}', raw.strip())
+            parts = spec.split(raw) if spec is not None else re.split(r'\s{2,}', raw.strip())
             if len(parts) < 4:
                 i += 1
                 continue
@@ -706,12 +722,7 @@ class NetworkParsers(NetworkParsers):
             if not ip_re.match(vtep):
                 i += 1
                 continue
-            results.append({
-                "VTEP": vtep,
-                "LEARNED_VIA": learned_via.strip(),
-                "MAC_LEARNING": mac_learning.strip(),
-                "TUNNEL_TYPES": tunnel_types.strip()
-            })
+            results.append(Vtep(vtep, learned_via.strip(), mac_learning.strip(), tunnel_types.strip()))
             i += 1
         # NEW: if no results but we saw "Total number of remote VTEPS", attempt simple IP-only extraction
         if not results:
@@ -721,14 +732,33 @@ class NetworkParsers(NetworkParsers):
                     break
                 m = ip_only.match(line)
                 if m:
-                    results.append({
-                        "VTEP": m.group(1),
-                        "LEARNED_VIA": "",
-                        "MAC_LEARNING": "",
-                        "TUNNEL_TYPES": ""
-                    })
+                    results.append(Vtep(m.group(1)))
         return results
 
+# ---- Fixed-width 'show vlan brief' parser (always replace) ----
+class NetworkParsers(NetworkParsers):
+    def parse_vlan_brief(self, raw: str):
+        """
+        Parse 'show vlan brief' with column offsets from its header / dash line.
+        Returns list of VlanRow records:
+          { VLAN, NAME, STATUS, PORTS }
+        Indented continuation lines (long port lists wrapped by EOS) are
+        joined into the previous row's PORTS (see auto.vlans.iter_vlan_brief_rows).
+        """
+        rows = []
+        if not raw:
+            return rows
+        lines = raw.splitlines()
+        start = None
+        for i, l in enumerate(lines):
+            low = l.lower()
+            if "show vlan brief" in low or "#sh vlan brief" in low:
+                start = i + 1
+                break
+        if start is None:
+            return rows
+        return list(iter_vlan_brief_rows(lines, start))
+
 # ---- Add parser for 'show mac address-table dynamic' if missing ----
 if not hasattr(NetworkParsers, "parse_mac_address_table_dynamic"):
     class NetworkParsers(NetworkParsers):
@@ -739,7 +769,7 @@ if not hasattr(NetworkParsers, "parse_mac_address_table_dynamic"):
             Parse 'show mac address-table dynamic' section.
             Returns dict:
               {
-                'entries': [ {VLAN, MAC, TYPE, PORTS, MOVES, LAST_MOVE}, ... ],
+                'entries': [ MacEntry(VLAN, MAC, TYPE, PORTS, MOVES, LAST_MOVE), ... ],
                 'total': <int|None>,
                 'per_vlan': { vlan: count, ... }
               }
@@ -777,14 +807,7 @@ if not hasattr(NetworkParsers, "parse_mac_address_table_dynamic"):
                 m = data_re.match(line)
                 if m:
                     vlan, mac, typ, ports, moves, last_move = m.groups()
-                    entries.append({
-                        "VLAN": vlan,
-                        "MAC": mac.lower(),
-                        "TYPE": typ,
-                        "PORTS": ports,
-                        "MOVES": int(moves),
-                        "LAST_MOVE": last_move
-                    })
+                    entries.append(MacEntry(vlan, mac.lower(), typ, ports, int(moves), last_move))
             per_vlan = {}
             for e in entries:
                 per_vlan[e["VLAN"]] = per_vlan.get(e["VLAN"], 0) + 1
@@ -904,7 +927,7 @@ class NetworkParsers(NetworkParsers):
         Fallback: if header not found, scan the command block following the
         'show bgp summary' line and treat consecutive IP-starting lines as
         neighbor rows.
-        Returns list of dicts:
+        Returns list of BgpNeighbor records:
           NEIGHBOR, AS, STATE, NLRI_RCD, NLRI_ACC
         """
         results = []
@@ -957,13 +980,7 @@ class NetworkParsers(NetworkParsers):
                 state_tok = parts[2]
                 state = _normalize_state(state_tok)
                 nlri_rcd, nlri_acc = _extract_nlri(parts)
-                results.append({
-                    "NEIGHBOR": neighbor,
-                    "AS": asn,
-                    "STATE": state,
-                    "NLRI_RCD": nlri_rcd,
-                    "NLRI_ACC": nlri_acc
-                })
+                results.append(BgpNeighbor(neighbor, asn, state, nlri_rcd, nlri_acc))
                 i += 1
             if results:
                 return results  # success
@@ -992,13 +1009,7 @@ class NetworkParsers(NetworkParsers):
                     state_tok = parts[2]
                     state = _normalize_state(state_tok)
                     nlri_rcd, nlri_acc = _extract_nlri(parts)
-                    results.append({
-                        "NEIGHBOR": neighbor,
-                        "AS": asn,
-                        "STATE": state,
-                        "NLRI_RCD": nlri_rcd,
-                        "NLRI_ACC": nlri_acc
-                    })
+                    results.append(BgpNeighbor(neighbor, asn, state, nlri_rcd, nlri_acc))
                 i += 1
                 continue
             # stop fallback block when first non-IP, non-empty encountered after some rows
@@ -2,6 +2,23 @@ import os
 import re
 from typing import List, Dict
 
+try:
+    from .render import default_sink
+    from .mac_table import MacTable
+    from .evpn import parse_evpn_paths, route_type
+    from .capture import normalize_capture
+    from .tables import find_table
+    from .route_summary import RouteSummaryMatrix
+    from .vlans import VlanSet, vlan_brief_vlans, vlan_dynamic_vlans, igmp_querier_vlans
+except ImportError:
+    from render import default_sink
+    from mac_table import MacTable
+    from evpn import parse_evpn_paths, route_type
+    from capture import normalize_capture
+    from tables import find_table
+    from route_summary import RouteSummaryMatrix
+    from vlans import VlanSet, vlan_brief_vlans, vlan_dynamic_vlans, igmp_querier_vlans
+
 __all__ = [
     "InterfacesStatusCount",
     "BgpStatus",
@@ -111,8 +128,8 @@ class InterfacesStatusCount:
     def read_pre_check_file(self):
         file_path = os.path.join(os.path.dirname(__file__), 'test.txt')
         try:
-            with open(file_path, 'r') as f:
-                return f.read()
+            with open(file_path, 'rb') as f:
+                return normalize_capture(f.read()).decode('utf-8', 'ignore')
         except FileNotFoundError:
             print(f"Error: The file 'test.txt' was not found in {os.path.dirname(__file__)}")
         except Exception as e:
@@ -141,8 +158,28 @@ class InterfacesStatusCount:
     def _ip_brief_lines(self):
         block = self._extract_block(["#sh ip int br","#sh ip interface brief","show ip interface brief"])
         return [l for l in block if l.strip() and not l.lower().startswith("interface") and not set(l.strip()) <= {"-"}]
+    def _column_counts(self, markers, first_column, values):
+        """
+        Count rows of a fixed-width table by the value of its Status column
+        (offsets from the header / dash line, see auto.tables).
+        Returns None when the table header is not found.
+        """
+        block = self._extract_block(markers)
+        spec, start = find_table(block, first_column)
+        if spec is None or "Status" not in spec.names:
+            return None
+        status = spec.column("Status")
+        counts = dict.fromkeys(values, 0)
+        for line in block[start:]:
+            s = status(line).lower()
+            if s in counts:
+                counts[s] += 1
+        return tuple(counts[v] for v in values)
     def count_interfaces(self):
         # ...existing code...
+        counts = self._column_counts(["#sh interfaces status","show interfaces status"], "Port", ("connected", "disabled"))
+        if counts is not None:
+            return counts
         connected=disabled=0
         for line in self._status_lines():
             parts=re.split(r'\s{2,}',line.strip())
@@ -152,6 +189,9 @@ class InterfacesStatusCount:
                 elif s=="disabled": disabled+=1
         return connected,disabled
     def count_ip_interfaces(self):
+        counts = self._column_counts(["#sh ip int br","#sh ip interface brief","show ip interface brief"], "Interface", ("up", "down"))
+        if counts is not None:
+            return counts
         up=down=0
         for line in self._ip_brief_lines():
             parts=re.split(r'\s{2,}',line.strip())
@@ -160,21 +200,26 @@ class InterfacesStatusCount:
                 if s=="up": up+=1
                 elif s=="down": down+=1
         return up,down
-    def print_commands(self):
-        print("\nCommands executed:")
-        print("1. show interfaces status")
-        print("2. show ip interface brief")
-    def display_results(self):
+    def print_commands(self, out=None):
+        out = default_sink(out)
+        out.line("\nCommands executed:")
+        out.line("1. show interfaces status")
+        out.line("2. show ip interface brief")
+    def display_results(self, out=None):
+        out = default_sink(out)
         if self.content:
-            self.print_commands()
+            out.section("show interfaces status / show ip interface brief")
+            self.print_commands(out)
             connected,disabled=self.count_interfaces()
             up,down=self.count_ip_interfaces()
-            print("\nFrom 'show interfaces status':")
-            print(f"Number of interfaces CONNECTED: {connected}")
-            print(f"Number of interfaces DISABLED: {disabled}")
-            print("\nFrom 'show ip interface brief':")
-            print(f"Number of interfaces UP: {up}")
-            print(f"Number of interfaces DOWN: {down}")
+            out.record("connected", connected); out.record("disabled", disabled)
+            out.record("up", up); out.record("down", down)
+            out.line("\nFrom 'show interfaces status':")
+            out.line(f"Number of interfaces CONNECTED: {connected}")
+            out.line(f"Number of interfaces DISABLED: {disabled}")
+            out.line("\nFrom 'show ip interface brief':")
+            out.line(f"Number of interfaces UP: {up}")
+            out.line(f"Number of interfaces DOWN: {down}")
 
 class BgpStatus:
     # ...existing code...
@@ -256,32 +301,34 @@ class BgpStatus:
                 "accepted": acc
             })
         return info
-    def _print_nlri_table(self,nlri_rows):
+    def _print_nlri_table(self,nlri_rows, out=None):
+        out = default_sink(out)
         if not nlri_rows:
-            print("No NLRI data."); return
+            out.line("No NLRI data."); return
         n_w=max(len("Neighbor"),*(len(r["neighbor"]) for r in nlri_rows))
         r_w=max(len("NLRI Rcd"),*(len(str(r["received"])) for r in nlri_rows))
         a_w=max(len("NLRI Acc"),*(len(str(r["accepted"])) for r in nlri_rows))
         header=f"{'Neighbor'.ljust(n_w)}  {'NLRI Rcd'.rjust(r_w)}  {'NLRI Acc'.rjust(a_w)}"
-        print("\nNLRI Table:"); print(header); print("-"*len(header))
+        out.line("\nNLRI Table:"); out.line(header); out.line("-"*len(header))
         for r in nlri_rows:
-            print(f"{r['neighbor'].ljust(n_w)}  {str(r['received']).rjust(r_w)}  {str(r['accepted']).rjust(a_w)}")
+            out.line(f"{r['neighbor'].ljust(n_w)}  {str(r['received']).rjust(r_w)}  {str(r['accepted']).rjust(a_w)}")
         total_rcd=sum(r["received"] for r in nlri_rows)
         total_acc=sum(r["accepted"] for r in nlri_rows)
-        print("-"*len(header))
-        print(f"{'TOTAL'.ljust(n_w)}  {str(total_rcd).rjust(r_w)}  {str(total_acc).rjust(a_w)}")
-    def _print_evpn_table(self,rows):
+        out.line("-"*len(header))
+        out.line(f"{'TOTAL'.ljust(n_w)}  {str(total_rcd).rjust(r_w)}  {str(total_acc).rjust(a_w)}")
+    def _print_evpn_table(self,rows, out=None):
+        out = default_sink(out)
         if not rows:
-            print("EVPN Prefix Table: none"); return
+            out.line("EVPN Prefix Table: none"); return
         n_w=max(len("Neighbor"),*(len(r["neighbor"]) for r in rows))
         r_w=max(len("PfxRcd"),*(len(str(r["pfx_rcd"])) for r in rows))
         a_w=max(len("PfxAcc"),*(len(str(r["pfx_acc"])) for r in rows))
         header=f"{'Neighbor'.ljust(n_w)}  {'PfxRcd'.rjust(r_w)}  {'PfxAcc'.rjust(a_w)}"
-        print("\nEVPN Prefix Table:"); print(header); print("-"*len(header))
+        out.line("\nEVPN Prefix Table:"); out.line(header); out.line("-"*len(header))
         for r in rows:
-            print(f"{r['neighbor'].ljust(n_w)}  {str(r['pfx_rcd']).rjust(r_w)}  {str(r['pfx_acc']).rjust(a_w)}")
-        print("-" * len(header))
-        print(f"{'TOTAL'.ljust(n_w)}  {str(sum(r['pfx_rcd'] for r in rows)).rjust(r_w)}  {str(sum(r['pfx_acc'] for r in rows)).rjust(a_w)}")
+            out.line(f"{r['neighbor'].ljust(n_w)}  {str(r['pfx_rcd']).rjust(r_w)}  {str(r['pfx_acc']).rjust(a_w)}")
+        out.line("-" * len(header))
+        out.line(f"{'TOTAL'.ljust(n_w)}  {str(sum(r['pfx_rcd'] for r in rows)).rjust(r_w)}  {str(sum(r['pfx_acc'] for r in rows)).rjust(a_w)}")
 
     def _parse_bgp_summary_table(self):
         """
@@ -341,7 +388,7 @@ class BgpStatus:
             i += 1
         return results
 
-    def print_bgp_status(self):
+    def print_bgp_status(self, out=None):
         """
         Print basic BGP summary using internal parser.
         """
@@ -355,12 +402,16 @@ class BgpSummaryBasic:
         parser = _get_parser()
         return parser.parse_bgp_summary(self.text) if parser else []
 
-    def print_basic(self):
+    def print_basic(self, out=None):
+        out = default_sink(out)
         rows = self._rows()
         neighbor_count = len(rows)
         established_count = sum(1 for r in rows if r["STATE"].lower().startswith("estab"))
-        print("\ncommand executed: sh bgp summary")
-        print(f"Neighbor count: {neighbor_count} Established: {established_count}")
+        out.section("sh bgp summary")
+        out.record("neighbor_count", neighbor_count)
+        out.record("established", established_count)
+        out.line("\ncommand executed: sh bgp summary")
+        out.line(f"Neighbor count: {neighbor_count} Established: {established_count}")
 
 # --- Added simple print helper classes (minimal) ---
 class RouteSummary:
@@ -397,19 +448,25 @@ class RouteSummary:
                 out.append(l)
         return out
 
-    def print(self):
+    def matrix(self) -> RouteSummaryMatrix:
+        """Every VRF's source counts (also 'sh ip route vrf all summary') as one matrix."""
+        return RouteSummaryMatrix.from_text(self.content)
+
+    def print(self, out=None):
+        out = default_sink(out)
+        out.section("sh ip route summary")
         raw = self._raw_lines()
         if raw:
-            print("\ncommand executed: sh ip route summary")
-            print("\nIP Route Summary (raw):")
+            out.line("\ncommand executed: sh ip route summary")
+            out.line("\nIP Route Summary (raw):")
             for l in raw:
-                print(l.lstrip())
+                out.line(l.lstrip())
             return
         parser = _get_parser()
         rows = parser.parse_ip_route_summary(self.content) if parser else []
-        print("\nRoute Summary (class):")
+        out.line("\nRoute Summary (class):")
         if not rows:
-            print("None"); return
+            out.line("None"); return
         # SAFEGUARD: rows should be list of dicts; never call sorted() on dict objects themselves
         for r in rows:
             if not isinstance(r, dict):
@@ -417,70 +474,95 @@ class RouteSummary:
             src = r.get("SOURCE")
             cnt = r.get("COUNT")
             if cnt is None:
-                print(src)
+                out.line(src)
             else:
-                print(f"{src}: {cnt}")
+                out.line(f"{src}: {cnt}")
 
 class IgmpSnoopingQuerier:
     def __init__(self, content: str):
         self.content = content or ""
 
-    def print(self):
+    def vlans(self) -> VlanSet:
+        """VLANs with a querier entry, as a VlanSet."""
+        return igmp_querier_vlans(self.content)
+
+    def print(self, out=None):
+        out = default_sink(out)
         parser = _get_parser()
         parse_fn = getattr(parser, "parse_igmp_snooping_querier", None) if parser else None
         result = parse_fn(self.content) if parse_fn else {"lines": [], "vlan_count": 0}
-        print("\nIGMP Snooping Querier (class):")
+        out.section("sh igmp snooping querier")
+        out.record("vlan_count", result.get("vlan_count"))
+        out.line("\nIGMP Snooping Querier (class):")
         lines = result.get("lines", [])
         if not lines:
-            print("None")
+            out.line("None")
             return
         for l in lines:
-            print(l)
-        print(f"VLAN count: {result.get('vlan_count')}")
+            out.line(l)
+        out.line(f"VLAN count: {result.get('vlan_count')}")
 
 class VlanBrief:
     def __init__(self, content: str):
         self.content = content or ""
 
-    def print(self):
-        print("\ncommand executed : show vlan brief")
+    def vlans(self) -> VlanSet:
+        """VLAN ids of the table, as a VlanSet."""
+        return vlan_brief_vlans(self.content)
+
+    def print(self, out=None):
+        out = default_sink(out)
+        out.section("show vlan brief")
+        out.line("\ncommand executed : show vlan brief")
         parser = _get_parser()
         parse_fn = getattr(parser, "parse_vlan_brief", None) if parser else None
         rows = parse_fn(self.content) if parse_fn else []
-        print("\nVLAN Brief (class):")
+        out.line("\nVLAN Brief (class):")
         if not rows:
             # Fallback: derive total from raw block
             total = _count_vlans_in_show_vlan_brief_block(self.content)
             if total:
-                print(f"Total VLANs: {total}")
+                out.record("vlan_count", total)
+                out.line(f"Total VLANs: {total}")
             else:
-                print("None")
+                out.line("None")
             return
         for r in rows:
-            print(f"{r.get('VLAN')} {r.get('NAME')} {r.get('STATUS')} {r.get('PORTS')}")
+            out.line(f"{r.get('VLAN')} {r.get('NAME')} {r.get('STATUS')} {r.get('PORTS')}")
         # Also print total when rows exist
-        print(f"Total VLANs: {len(rows)}")
+        out.record("vlan_count", len(rows))
+        out.line(f"Total VLANs: {len(rows)}")
 
 class VlanDynamic:
     def __init__(self, content: str):
         self.content = content or ""
 
-    def print(self):
+    def vlans(self):
+        """{source: VlanSet}, e.g. {'evpn': VlanSet('4054-4064,...'), 'vccbfd': VlanSet('4082')}."""
+        return vlan_dynamic_vlans(self.content)
+
+    def print(self, out=None):
+        out = default_sink(out)
         parser = _get_parser()
         parse_fn = getattr(parser, "parse_vlan_dynamic", None) if parser else None
         rows = parse_fn(self.content) if parse_fn else []
-        print("\nVLAN Dynamic (class):")
+        out.section("show vlan dynamic")
+        out.record("dynamic_vlan_rows", len(rows))
+        out.line("\nVLAN Dynamic (class):")
         if not rows:
-            print("None")
+            out.line("None")
             return
         for r in rows:
-            print(f"{r.get('VLAN')} {r.get('NAME')} {r.get('STATUS')} {r.get('PORTS')}")
+            out.line(f"{r.get('VLAN')} {r.get('NAME')} {r.get('STATUS')} {r.get('PORTS')}")
 
 class EvpnRouteTypes:
-    def __init__(self, content: str):
+    """`stats` ({route type: EvpnRouteStats}, e.g. from auto.parallel) replaces the path parse of `content`."""
+    def __init__(self, content: str, stats: Dict[str, object] = None):
         self.content = content or ""
+        self.stats = stats
 
-    def print_summary(self):
+    def print_summary(self, out=None):
+        out = default_sink(out)
         parser = _get_parser()
         counts = {}
         if parser:
@@ -493,21 +575,43 @@ class EvpnRouteTypes:
             for key, fn_name in mapping.items():
                 fn = getattr(parser, fn_name, None)
                 if not fn:
-                    counts[key] = 0
                     continue
                 try:
                     data = fn(self.content) or []
                     counts[key] = len(data) if not isinstance(data, dict) else len(data)
                 except Exception:
                     counts[key] = 0
-        print("\nEVPN Route-Type Summary (class):")
+        # Best / ECMP breakdown from the two-line path parser (one pass over all types).
+        stats = {}
+        if self.stats is not None:
+            for k, st in self.stats.items():
+                if len(st):
+                    stats[k] = {"paths": sum(st.paths), "routes": len(st), "best": sum(st.best),
+                                "ecmp": sum(st.ecmp)}
+        else:
+            for key, r in parse_evpn_paths(self.content)["routes"].items():
+                st = stats.setdefault(route_type(key), {"paths": 0, "routes": 0, "best": 0, "ecmp": 0})
+                st["paths"] += r["PATHS"]
+                st["routes"] += 1
+                st["best"] += r["BEST"]
+                st["ecmp"] += r["ECMP"]
+        for k, st in stats.items():
+            counts.setdefault(k, st["paths"])
+        out.section("EVPN route-type summary")
+        for k, v in counts.items():
+            out.record(k, v)
+        out.line("\nEVPN Route-Type Summary (class):")
         if not counts:
-            print("None")
+            out.line("None")
             return
         # DEFENSIVE: iterate keys explicitly (avoid accidental list of dicts scenario)
         for k in sorted(counts.keys()):
             v = counts[k]
-            print(f"{k}: {v} entries")
+            st = stats.get(k)
+            if st:
+                out.line(f"{k}: {v} entries (routes {st['routes']}, best {st['best']}, ecmp paths {st['ecmp']})")
+            else:
+                out.line(f"{k}: {v} entries")
 
 class VXLAN:
     """Wrapper for 'show vxlan vtep detail' output."""
@@ -522,13 +626,16 @@ class VXLAN:
             except Exception:
                 self.vteps = []
 
-    def print_vtep_detail(self):
-        print("while parsing command: show vxlan vtep detail")
-        print(f"number of VTEP record = {len(self.vteps)}")
-        print("\nCommand executed:\nshow vxlan vtep detail")
-        print(f"VTEP count: {len(self.vteps)}")
+    def print_vtep_detail(self, out=None):
+        out = default_sink(out)
+        out.section("show vxlan vtep detail")
+        out.record("vtep_count", len(self.vteps))
+        out.line("while parsing command: show vxlan vtep detail")
+        out.line(f"number of VTEP record = {len(self.vteps)}")
+        out.line("\nCommand executed:\nshow vxlan vtep detail")
+        out.line(f"VTEP count: {len(self.vteps)}")
         if not self.vteps:
-            print("No VTEP entries parsed.")
+            out.line("No VTEP entries parsed.")
             return
         col_w = {
             "VTEP": max(len("VTEP"), *(len(r["VTEP"]) for r in self.vteps)),
@@ -542,42 +649,62 @@ class VXLAN:
             f"{'MAC_Learn'.ljust(col_w['MAC_LEARNING'])}  "
             f"{'TunnelTypes'.ljust(col_w['TUNNEL_TYPES'])}"
         )
-        print(header)
-        print("-" * len(header))
+        out.line(header)
+        out.line("-" * len(header))
         for r in self.vteps:
-            print(f"{r['VTEP'].ljust(col_w['VTEP'])}  "
+            out.line(f"{r['VTEP'].ljust(col_w['VTEP'])}  "
                   f"{r['LEARNED_VIA'].ljust(col_w['LEARNED_VIA'])}  "
                   f"{r['MAC_LEARNING'].ljust(col_w['MAC_LEARNING'])}  "
                   f"{r['TUNNEL_TYPES'].ljust(col_w['TUNNEL_TYPES'])}")
-        print("-" * len(header))
+        out.line("-" * len(header))
 
 class MacAddressTableDynamic:
-    """Wrapper / printer for 'show mac address-table dynamic'."""
-    def __init__(self, content: str):
+    """
+    Wrapper / printer for 'show mac address-table dynamic'. `table` is a
+    MacTable already built from the capture (e.g. by auto.parallel), used
+    instead of parsing the text again.
+    """
+    def __init__(self, content: str, table: MacTable = None):
         self.content = content or ""
         parser = _get_parser()
         parse_fn = getattr(parser, "parse_mac_address_table_dynamic", None) if parser else None
-        self.data = parse_fn(self.content) if parse_fn else {"entries": [], "total": None, "per_vlan": {}}
-
-    def print(self):
-        print("\nCommand executed:\nshow mac address-table dynamic")
+        self._table = table
+        if parse_fn and table is None:
+            self.data = parse_fn(self.content)
+        else:
+            # No NetworkParsers available: use the MacTable column store directly.
+            t = self.table
+            self.data = {"entries": list(t.rows()), "total": t.total, "per_vlan": t.per_vlan()}
+
+    @property
+    def table(self) -> MacTable:
+        """Integer-keyed MacTable (indexed by port / VLAN / moves), built on first use."""
+        if self._table is None:
+            self._table = MacTable.from_text(self.content)
+        return self._table
+
+    def print(self, out=None):
+        out = default_sink(out)
+        out.section("show mac address-table dynamic")
+        out.line("\nCommand executed:\nshow mac address-table dynamic")
         entries = self.data.get("entries", [])
         total = self.data.get("total")
         if not entries:
-            print("No dynamic MAC address entries found.")
+            out.line("No dynamic MAC address entries found.")
             return
-        print(f"Total Dynamic MACs: {total if total is not None else len(entries)}")
+        out.record("mac_dynamic_total", total if total is not None else len(entries))
+        out.line(f"Total Dynamic MACs: {total if total is not None else len(entries)}")
         # Per-VLAN summary
         per_vlan = self.data.get("per_vlan", {})
         vlan_w = max(len("VLAN"), *(len(v) for v in per_vlan)) if per_vlan else 4
         cnt_w = len("Count")
         header = f"{'VLAN'.ljust(vlan_w)}  {'Count'.rjust(cnt_w)}"
-        print("\nPer-VLAN MAC counts:")
-        print(header)
-        print("-" * len(header))
+        out.line("\nPer-VLAN MAC counts:")
+        out.line(header)
+        out.line("-" * len(header))
         for vlan in sorted(per_vlan, key=lambda x: int(x)):
-            print(f"{vlan.ljust(vlan_w)}  {str(per_vlan[vlan]).rjust(cnt_w)}")
-        print("-" * len(header))
+            out.line(f"{vlan.ljust(vlan_w)}  {str(per_vlan[vlan]).rjust(cnt_w)}")
+        out.line("-" * len(header))
 
 class VrfReservedPorts:
     """Wrapper / printer for 'show vrf reserved-ports'."""
@@ -587,11 +714,13 @@ class VrfReservedPorts:
         parse_fn = getattr(parser, "parse_vrf_reserved_ports", None) if parser else None
         self.data = parse_fn(self.content) if parse_fn else {"entries": [], "total_ports": 0, "total_entries": 0}
 
-    def print(self):
-        print("\nCommand executed:\nshow vrf reserved-ports")
+    def print(self, out=None):
+        out = default_sink(out)
+        out.section("show vrf reserved-ports")
+        out.line("\nCommand executed:\nshow vrf reserved-ports")
         entries = self.data.get("entries", [])
         if not entries:
-            print("No VRF reserved ports data found.")
+            out.line("No VRF reserved ports data found.")
             return
         total_entries = self.data.get("total_entries", len(entries))
         total_ports = self.data.get("total_ports", sum(e.get("COUNT", 0) for e in entries))
@@ -599,13 +728,15 @@ class VrfReservedPorts:
         ports_w = max(len("Ports"), *(len(e.get("PORT_STR","")) for e in entries))
         cnt_w = max(len("Count"), *(len(str(e.get("COUNT",0))) for e in entries))
         header = f"{'VRF'.ljust(vrf_w)}  {'Ports'.ljust(ports_w)}  {'Count'.rjust(cnt_w)}"
-        print(header)
-        print("-" * len(header))
+        out.line(header)
+        out.line("-" * len(header))
         for e in entries:
-            print(f"{e['VRF'].ljust(vrf_w)}  {e['PORT_STR'].ljust(ports_w)}  {str(e['COUNT']).rjust(cnt_w)}")
-        print("-" * len(header))
-        print(f"Total Entries: {total_entries}")
-        print(f"Total Reserved Ports: {total_ports}")
+            out.line(f"{e['VRF'].ljust(vrf_w)}  {e['PORT_STR'].ljust(ports_w)}  {str(e['COUNT']).rjust(cnt_w)}")
+        out.line("-" * len(header))
+        out.record("total_entries", total_entries)
+        out.record("total_ports", total_ports)
+        out.line(f"Total Entries: {total_entries}")
+        out.line(f"Total Reserved Ports: {total_ports}")
 
 # --- Added IPv4 summary printer class (supplement BgpSummaryBasic) ---
 class BgpSummaryIpv4:
@@ -619,12 +750,14 @@ class BgpSummaryIpv4:
         parser = _get_parser()
         return parser.parse_bgp_summary(self.content) if parser else []
 
-    def print(self):
+    def print(self, out=None):
+        out = default_sink(out)
         import re
         rows = self._rows()
-        print("\nCommand executed:\nsh bgp summary")
+        out.section("sh bgp summary")
+        out.line("\nCommand executed:\nsh bgp summary")
         if not rows:
-            print("No BGP summary neighbor data found.")
+            out.line("No BGP summary neighbor data found.")
             return
         estab = sum(
             1 for r in rows
@@ -632,8 +765,10 @@ class BgpSummaryIpv4:
         )
         neighbors = [r.get("NEIGHBOR") for r in rows if r.get("NEIGHBOR")]
         neighbors = sorted(dict.fromkeys(neighbors))
-        print(f"Neighbor count: {len(neighbors)} Established: {estab}")
-        print(f"Neighbor IPs ({len(neighbors)}): {' '.join(neighbors)}")
+        out.record("neighbor_count", len(neighbors))
+        out.record("established", estab)
+        out.line(f"Neighbor count: {len(neighbors)} Established: {estab}")
+        out.line(f"Neighbor IPs ({len(neighbors)}): {' '.join(neighbors)}")
 
 def parse_vlan_brief_from_text(raw: str) -> List[Dict[str, str]]:
     """
@@ -0,0 +1,318 @@
+from array import array
+from typing import Dict, Iterator, List
+
+try:
+    from .records import EvpnPath, intern
+except ImportError:
+    from records import EvpnPath, intern
+
+__all__ = [
+    "EVPN_ROUTE_TYPES",
+    "VALID",
+    "BEST",
+    "STALE",
+    "ECMP_HEAD",
+    "ECMP",
+    "CONTRIB",
+    "PENDING",
+    "decode_status",
+    "iter_evpn_paths",
+    "parse_evpn_paths",
+    "EvpnRouteStats",
+    "iter_route_keys",
+    "route_key_counts",
+    "route_type",
+    "diff_evpn_routes",
+]
+
+EVPN_ROUTE_TYPES = ("auto-discovery", "mac-ip", "imet", "ethernet-segment", "ip-prefix")
+
+# Characters allowed in the status column in front of 'RD:' (' * >Ec    RD: ...')
+_STATUS_CHARS = frozenset(" *>SEec%#")
+
+# Route key: one string "<type> <RD> <NLRI fields>", e.g.
+#   'mac-ip 10.4.228.5:1400 0009.0f09.081e'
+#   'auto-discovery 10.4.228.5:1400 0 0011:1111:1111:1111:0000'
+#   'ethernet-segment 10.4.228.106:1 0011:1111:1111:1111:0000 10.4.228.106'
+# A flat str rather than a tuple: its hash is cached and it is not tracked
+# by the garbage collector, which keeps million-route multisets cheap.
+
+
+def _key_from_line(line: str):
+    pos = line.find("RD:")
+    if pos < 0 or not _STATUS_CHARS.issuperset(line[:pos]):
+        return None
+    parts = line[pos + 3:].split()
+    if len(parts) < 2:
+        return None
+    parts[0], parts[1] = parts[1], parts[0]
+    return " ".join(parts)
+
+
+def iter_route_keys(text: str) -> Iterator[str]:
+    """
+    Yield one key per 'RD:' line of 'show bgp evpn route-type ...' output.
+    ECMP paths repeat the same RD line, so a route with three paths yields
+    its key three times.
+    """
+    if not text:
+        return
+    for line in text.splitlines():
+        key = _key_from_line(line)
+        if key is not None:
+            yield key
+
+
+def route_key_counts(text: str) -> Dict[str, int]:
+    """Multiset of route keys: {key: number of paths}."""
+    counts: Dict[str, int] = {}
+    get = counts.get
+    for key in iter_route_keys(text):
+        counts[key] = get(key, 0) + 1
+    return counts
+
+
+def route_type(key: str) -> str:
+    """'mac-ip 10.4.228.5:1400 0009.0f09.081e' -> 'mac-ip'"""
+    return key.partition(" ")[0]
+
+
+def diff_evpn_routes(pre: Dict[str, int], post: Dict[str, int]) -> Dict[str, dict]:
+    """
+    Compare two route multisets (see route_key_counts) by hashing.
+    Returns dict:
+      {
+        'withdrawn':     {key: pre_count},      present before, gone after
+        'new':           {key: post_count},     only after
+        'paths_changed': {key: (pre, post)},    same route, different path (ECMP) count
+        'per_type':      {type: {'withdrawn': n, 'new': n, 'paths_lost': n, 'paths_gained': n}}
+      }
+    """
+    withdrawn, changed = {}, {}
+    post_get = post.get
+    for key, a in pre.items():
+        b = post_get(key)
+        if b is None:
+            withdrawn[key] = a
+        elif b != a:
+            changed[key] = (a, b)
+    new = {}
+    if len(post) > len(pre) - len(withdrawn):
+        new = {key: post[key] for key in post.keys() - pre.keys()}
+
+    per_type: Dict[str, Dict[str, int]] = {}
+
+    def _bucket(key):
+        rtype = route_type(key)
+        b = per_type.get(rtype)
+        if b is None:
+            b = per_type[rtype] = {"withdrawn": 0, "new": 0, "paths_lost": 0, "paths_gained": 0}
+        return b
+
+    for key in withdrawn:
+        _bucket(key)["withdrawn"] += 1
+    for key in new:
+        _bucket(key)["new"] += 1
+    for key, (a, b) in changed.items():
+        if b < a:
+            _bucket(key)["paths_lost"] += a - b
+        else:
+            _bucket(key)["paths_gained"] += b - a
+    return {"withdrawn": withdrawn, "new": new, "paths_changed": changed, "per_type": per_type}
+
+
+# ---- full two-line path records ----
+# Route status codes: * - valid, > - active, S - Stale, E - ECMP head, e - ECMP
+#                     c - Contributing to ECMP, % - Pending best path selection
+VALID = 0x01
+BEST = 0x02
+STALE = 0x04
+ECMP_HEAD = 0x08
+ECMP = 0x10
+CONTRIB = 0x20
+PENDING = 0x40
+
+_STATUS_BITS = {"*": VALID, ">": BEST, "S": STALE, "E": ECMP_HEAD, "e": ECMP, "c": CONTRIB, "%": PENDING}
+_ORIGINS = frozenset(("i", "e", "?"))
+
+
+def decode_status(status: str) -> int:
+    """' * >Ec' -> VALID | BEST | ECMP_HEAD | CONTRIB"""
+    flags = 0
+    for ch in status:
+        flags |= _STATUS_BITS.get(ch, 0)
+    return flags
+
+
+def _attr(tok: str):
+    if tok == "-":
+        return None
+    return int(tok) if tok.isdigit() else tok
+
+
+def _path_record(key: str, flags: int) -> EvpnPath:
+    rtype, _, rest = key.partition(" ")
+    rd, _, fields = rest.partition(" ")
+    return EvpnPath(key, rtype, rd, fields, flags)
+
+
+def iter_evpn_paths(text: str) -> Iterator[EvpnPath]:
+    """
+    Paired-line state machine over 'show bgp evpn route-type ...' output:
+
+       * >Ec    RD: 10.4.228.27:3043 imet 10.4.228.116                       <- route line
+                                 10.4.228.116  -  100  0  64100.21001 64100.21016 i  <- attributes
+
+    Yields one EvpnPath record per path: KEY (as route_key_counts), TYPE, RD, NLRI,
+    FLAGS (VALID/BEST/... bits), NEXT_HOP, METRIC, LOCPREF, WEIGHT, PATH,
+    ORIGIN. A route line without its attribute line (truncated capture,
+    next prompt) is still emitted with the attributes left as None.
+    """
+    if not text:
+        return
+    pending = None
+    for line in text.splitlines():
+        pos = line.find("RD:")
+        if pos >= 0 and _STATUS_CHARS.issuperset(line[:pos]):
+            if pending is not None:
+                yield pending
+            key = _key_from_line(line)
+            pending = _path_record(key, decode_status(line[:pos])) if key else None
+            continue
+        if pending is None:
+            continue
+        toks = line.split()
+        if line[:1] == " " and len(toks) >= 4:
+            pending.NEXT_HOP = intern(_attr(toks[0]))
+            pending.METRIC = _attr(toks[1])
+            pending.LOCPREF = _attr(toks[2])
+            pending.WEIGHT = _attr(toks[3])
+            rest = toks[4:]
+            if rest and rest[-1] in _ORIGINS:
+                pending.ORIGIN = intern(rest.pop())
+            pending.PATH = intern(" ".join(rest))
+        yield pending
+        pending = None
+    if pending is not None:
+        yield pending
+
+
+def parse_evpn_paths(text: str) -> dict:
+    """
+    Single pass over the capture.
+    Returns dict:
+      {
+        'paths':  [EvpnPath records, see iter_evpn_paths],
+        'routes': {key: {'PATHS': n, 'BEST': n, 'ECMP': n}}   # ECMP = E or e paths
+      }
+    """
+    paths = []
+    routes: Dict[str, Dict[str, int]] = {}
+    ecmp_bits = ECMP_HEAD | ECMP
+    for p in iter_evpn_paths(text):
+        paths.append(p)
+        r = routes.get(p.KEY)
+        if r is None:
+            r = routes[p.KEY] = {"PATHS": 0, "BEST": 0, "ECMP": 0}
+        r["PATHS"] += 1
+        flags = p.FLAGS
+        if flags & BEST:
+            r["BEST"] += 1
+        if flags & ecmp_bits:
+            r["ECMP"] += 1
+    return {"paths": paths, "routes": routes}
+
+
+# ---- mergeable per-route / per-RD counters ----
+class EvpnRouteStats:
+    """
+    Route-level counters of 'show bgp evpn route-type ...' in columns:
+      keys             route keys (as route_key_counts), first-seen order
+      paths/best/ecmp  array('I') per key
+      per_rd           {RD: paths}
+    Built from any slice of a section that starts on a route line
+    (from_text), and merged with merge(): counters add, so chunks parsed
+    separately and merged in any grouping give the same result as one pass.
+    """
+    __slots__ = ("keys", "paths", "best", "ecmp", "per_rd", "_index")
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self.paths = array("I")
+        self.best = array("I")
+        self.ecmp = array("I")
+        self.per_rd: Dict[str, int] = {}
+        self._index: Dict[str, int] = {}
+
+    @classmethod
+    def from_text(cls, text: str) -> "EvpnRouteStats":
+        st = cls()
+        keys, paths, best, ecmp, per_rd, index = st.keys, st.paths, st.best, st.ecmp, st.per_rd, st._index
+        status_ok = _STATUS_CHARS.issuperset
+        for line in text.splitlines():
+            pos = line.find("RD:")
+            if pos < 0:
+                continue
+            status = line[:pos]
+            if not status_ok(status):
+                continue
+            parts = line[pos + 3:].split()
+            if len(parts) < 2:
+                continue
+            rd = parts[0]
+            parts[0], parts[1] = parts[1], rd
+            key = " ".join(parts)
+            i = index.get(key)
+            if i is None:
+                i = index[key] = len(keys)
+                keys.append(key)
+                paths.append(0)
+                best.append(0)
+                ecmp.append(0)
+            paths[i] += 1
+            if ">" in status:
+                best[i] += 1
+            if "E" in status or "e" in status:
+                ecmp[i] += 1
+            per_rd[rd] = per_rd.get(rd, 0) + 1
+        return st
+
+    def merge(self, other: "EvpnRouteStats") -> "EvpnRouteStats":
+        """Add `other` into self (in place) and return self."""
+        index, keys = self._index, self.keys
+        paths, best, ecmp = self.paths, self.best, self.ecmp
+        for j, key in enumerate(other.keys):
+            i = index.get(key)
+            if i is None:
+                i = index[key] = len(keys)
+                keys.append(key)
+                paths.append(other.paths[j])
+                best.append(other.best[j])
+                ecmp.append(other.ecmp[j])
+            else:
+                paths[i] += other.paths[j]
+                best[i] += other.best[j]
+                ecmp[i] += other.ecmp[j]
+        per_rd = self.per_rd
+        for rd, n in other.per_rd.items():
+            per_rd[rd] = per_rd.get(rd, 0) + n
+        return self
+
+    def __len__(self):
+        return len(self.keys)
+
+    def counts(self) -> Dict[str, int]:
+        """{key: paths}, same as route_key_counts() over the same text."""
+        return dict(zip(self.keys, self.paths))
+
+    def routes(self) -> Dict[str, Dict[str, int]]:
+        """{key: {'PATHS', 'BEST', 'ECMP'}}, same shape as parse_evpn_paths()['routes']."""
+        return {k: {"PATHS": p, "BEST": b, "ECMP": e}
+                for k, p, b, e in zip(self.keys, self.paths, self.best, self.ecmp)}
+
+    def __getstate__(self):
+        return (self.keys, self.paths, self.best, self.ecmp, self.per_rd)
+
+    def __setstate__(self, state):
+        self.keys, self.paths, self.best, self.ecmp, self.per_rd = state
+        self._index = {k: i for i, k in enumerate(self.keys)}
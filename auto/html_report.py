@@ -0,0 +1,231 @@
+import html
+import json
+import os
+import re
+from typing import Dict, List, Optional, Sequence
+
+__all__ = [
+    "HtmlReport",
+    "DevicePage",
+    "TableWriter",
+]
+
+# Layout written by HtmlReport:
+#   <index>.html            one row per device with PASS/FAIL/WARN/SKIP counts
+#   <index>/<device>.html   one page per device, tables streamed row by row
+# Tables longer than `page_rows` are split into chunks. The first chunk is a
+# normal <tbody>; the rest go into inert <template> elements that the browser
+# parses but does not lay out until the pager asks for them, so a 100k-row
+# MAC diff opens as fast as a 15-row summary.
+
+_STYLE = (
+    "body{font-family:Arial,sans-serif;margin:20px}"
+    "table{border-collapse:collapse;width:100%;max-width:1100px;margin-bottom:8px}"
+    "th,td{border:1px solid #ccc;padding:6px 10px;text-align:left;font-size:13px}"
+    "th{background:#f5f5f5}tr:nth-child(even){background:#fafafa}"
+    ".pass{color:#0a0;font-weight:600}.fail,.skip{color:#c00;font-weight:600}.warn{color:#c80;font-weight:600}"
+    ".pager button{margin:0 2px 16px 0;font-size:12px}.pager .cur{font-weight:700}"
+)
+
+# Swap the visible <tbody> for the requested chunk (cloned from its <template>).
+# Chunk 0 is the streamed <tbody>; a template copy of it is made on load.
+_PAGER_JS = """<script>
+function rptInit(ids){
+  for(var i=0;i<ids.length;i++){
+    var tp=document.createElement('template');
+    tp.id=ids[i]+'-c0';tp.innerHTML=document.getElementById(ids[i]).tBodies[0].innerHTML;
+    document.body.appendChild(tp);
+  }
+}
+function rptPage(id,n){
+  var t=document.getElementById(id);
+  var nb=document.createElement('tbody');
+  nb.appendChild(document.getElementById(id+'-c'+n).content.cloneNode(true));
+  t.replaceChild(nb,t.tBodies[0]);
+  var btns=document.querySelectorAll('#'+id+'-pager button');
+  for(var i=0;i<btns.length;i++){btns[i].className=(i===n)?'cur':'';}
+}
+</script>
+"""
+
+
+def _safe_name(name: str) -> str:
+    s = re.sub(r"[^A-Za-z0-9._-]+", "_", name or "").strip("._")
+    return s or "device"
+
+
+def _cell(v) -> str:
+    return "-" if v is None else html.escape(str(v))
+
+
+def _status_cell(status: str) -> str:
+    cls = "pass" if status == "PASS" else "fail" if status == "FAIL" else "warn" if status == "WARN" else "skip"
+    return f"<span class='{cls}'>{html.escape(status)}</span>"
+
+
+class TableWriter:
+    """
+    Stream one table into a device page. Rows are written as they arrive;
+    nothing but the current chunk's row count is kept in memory.
+    A column named 'status' is rendered with PASS/FAIL/WARN/SKIP colouring and
+    counted towards the device totals on the index page.
+    """
+
+    def __init__(self, page: "DevicePage", table_id: str, title: str, columns: Sequence[str], page_rows: int):
+        self.page = page
+        self.id = table_id
+        self.columns = list(columns)
+        self.page_rows = max(1, page_rows)
+        self.rows = 0
+        self._status_idx = next((i for i, c in enumerate(self.columns) if c.lower() == "status"), None)
+        self._chunks = 1
+        w = page.stream.write
+        w(f"<h3>{html.escape(title)}</h3>\n")
+        w(f"<table id='{self.id}'><thead><tr>")
+        w("".join(f"<th>{html.escape(c)}</th>" for c in self.columns))
+        w("</tr></thead>\n<tbody>")
+
+    def row(self, values: Sequence):
+        if self.rows and self.rows % self.page_rows == 0:
+            self._next_chunk()
+        cells = []
+        for i, v in enumerate(values):
+            if i == self._status_idx and v is not None:
+                status = str(v)
+                self.page.counts[status] = self.page.counts.get(status, 0) + 1
+                cells.append(_status_cell(status))
+            else:
+                cells.append(_cell(v))
+        self.page.stream.write("<tr><td>" + "</td><td>".join(cells) + "</td></tr>\n")
+        self.rows += 1
+
+    def _next_chunk(self):
+        w = self.page.stream.write
+        if self._chunks == 1:
+            # close the visible first chunk; the table body is now complete
+            w("</tbody></table>\n")
+        else:
+            w("</template>\n")
+        w(f"<template id='{self.id}-c{self._chunks}'>")
+        self._chunks += 1
+
+    def close(self):
+        w = self.page.stream.write
+        if self._chunks == 1:
+            w("</tbody></table>\n")
+            return
+        w("</template>\n")
+        w(f"<div class='pager' id='{self.id}-pager'>")
+        for n in range(self._chunks):
+            first = n * self.page_rows + 1
+            last = min((n + 1) * self.page_rows, self.rows)
+            cls = " class='cur'" if n == 0 else ""
+            w(f"<button{cls} onclick=\"rptPage('{self.id}',{n})\">{first}-{last}</button>")
+        w(f"</div>\n<p>{self.rows} rows</p>\n")
+        self.page.paged.append(self.id)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class DevicePage:
+    """One streamed HTML page for a device. Use report.device(name)."""
+
+    def __init__(self, report: "HtmlReport", name: str, path: str):
+        self.report = report
+        self.name = name
+        self.path = path
+        self.counts: Dict[str, int] = {}
+        self.paged: List[str] = []
+        self._tables = 0
+        self.stream = open(path, "w", encoding="utf-8")
+        self.stream.write(
+            "<!DOCTYPE html>\n<html><head><meta charset='utf-8'/>"
+            f"<title>{html.escape(name)} - {html.escape(report.title)}</title>"
+            f"<style>{_STYLE}</style></head><body>\n"
+            f"<p><a href='../{html.escape(os.path.basename(report.index_path))}'>index</a></p>\n"
+            f"<h2>{html.escape(name)}</h2>\n"
+        )
+
+    def table(self, title: str, columns: Sequence[str], page_rows: Optional[int] = None) -> TableWriter:
+        self._tables += 1
+        return TableWriter(self, f"t{self._tables}", title, columns, page_rows or self.report.page_rows)
+
+    def text(self, line: str):
+        self.stream.write(f"<p>{html.escape(line)}</p>\n")
+
+    def close(self):
+        if self.stream.closed:
+            return
+        if self.paged:
+            self.stream.write(_PAGER_JS)
+            self.stream.write(f"<script>rptInit({json.dumps(self.paged)});</script>\n")
+        self.stream.write("</body></html>\n")
+        self.stream.close()
+        self.report._device_done(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class HtmlReport:
+    """
+    Streamed, paginated HTML report.
+
+        report = HtmlReport("/tmp/test_results.html")
+        with report.device("leaf1") as page:
+            with page.table("MAC diff", ["MAC", "VLAN", "pre", "post", "status"]) as t:
+                for row in rows:
+                    t.row(row)
+        report.close()          # writes the index page
+
+    Device pages go in a directory named after the index file
+    (test_results.html -> test_results/leaf1.html).
+    """
+
+    def __init__(self, index_path: str, title: str = "Pre / Post Check Test Results", page_rows: int = 500):
+        self.index_path = index_path
+        self.title = title
+        self.page_rows = page_rows
+        self.pages_dir = os.path.splitext(index_path)[0]
+        self._devices: List[tuple] = []   # (name, relative href, counts)
+        self._used = set()
+
+    def device(self, name: str) -> DevicePage:
+        os.makedirs(self.pages_dir, exist_ok=True)
+        fname = _safe_name(name)
+        base, n = fname, 2
+        while fname in self._used:
+            fname = f"{base}_{n}"; n += 1
+        self._used.add(fname)
+        return DevicePage(self, name, os.path.join(self.pages_dir, fname + ".html"))
+
+    def _device_done(self, page: DevicePage):
+        rel = f"{os.path.basename(self.pages_dir)}/{os.path.basename(page.path)}"
+        self._devices.append((page.name, rel, dict(page.counts)))
+
+    def close(self, footer: str = "Generated from script_output.txt and post_check_output.txt."):
+        with open(self.index_path, "w", encoding="utf-8") as f:
+            f.write(
+                "<!DOCTYPE html>\n<html><head><meta charset='utf-8'/>"
+                f"<title>{html.escape(self.title)}</title><style>{_STYLE}</style></head><body>\n"
+                f"<h2>{html.escape(self.title)}</h2><table><thead><tr>"
+                "<th>Device</th><th>PASS</th><th>FAIL</th><th>WARN</th><th>SKIP</th><th>status</th>"
+                "</tr></thead><tbody>\n"
+            )
+            for name, rel, counts in self._devices:
+                p, fl, sk = counts.get("PASS", 0), counts.get("FAIL", 0), counts.get("SKIP", 0)
+                wn = counts.get("WARN", 0)
+                status = "FAIL" if fl else "WARN" if wn else "SKIP" if sk else "PASS"
+                f.write(
+                    f"<tr><td><a href='{html.escape(rel)}'>{html.escape(name)}</a></td>"
+                    f"<td>{p}</td><td>{fl}</td><td>{wn}</td><td>{sk}</td><td>{_status_cell(status)}</td></tr>\n"
+                )
+            f.write(f"</tbody></table>\n<p>{html.escape(footer)}</p></body></html>\n")
+        return self.index_path
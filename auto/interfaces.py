@@ -0,0 +1,282 @@
+import re
+from typing import Dict, Iterator, List, Optional
+
+try:
+    from .records import InterfacePort
+    from .sections import iter_command_blocks, PROMPT_RE
+    from .tables import find_table
+except ImportError:
+    from records import InterfacePort
+    from sections import iter_command_blocks, PROMPT_RE
+    from tables import find_table
+
+__all__ = [
+    "port_id",
+    "port_name",
+    "InterfaceIndex",
+    "InterfaceDiff",
+    "INTERFACE_DIFF_KINDS",
+    "INTERFACE_DIFF_FIELDS",
+    "diff_interfaces",
+]
+
+# Per-port state from 'show interfaces status' and 'show ip interface brief'.
+#
+# Ports are keyed by an int that encodes the canonical name, so 'Et49/1' (status
+# table) and 'Ethernet49/1' (ip brief) land on the same key, and sorting the
+# keys gives the natural port order (Et2 before Et10, Et49/1 before Et49/1.100):
+#
+#   bits 56-63  interface type (Ethernet 1, Port-Channel 2, Vlan 3, ...)
+#   bits 40-55  first number   (module or port, up to 65535: Loopback8191, Vlan4094)
+#   bits 28-39  second number  (port on a module, 0 when absent)
+#   bits 16-27  third number   (lane, 0 when absent)
+#   bits  0-15  subinterface   (Ethernet1.100, 0 when absent)
+
+_TYPES = (
+    # (code, long name, lower-case spellings)
+    (1, "Ethernet", ("et", "eth", "ethernet")),
+    (2, "Port-Channel", ("po", "port-channel", "portchannel")),
+    (3, "Vlan", ("vl", "vlan")),
+    (4, "Loopback", ("lo", "loopback")),
+    (5, "Management", ("ma", "mgmt", "management")),
+    (6, "Vxlan", ("vx", "vxlan")),
+    (7, "Tunnel", ("tu", "tunnel")),
+    (8, "Recirc-Channel", ("rc", "recirc-channel")),
+    (9, "Dps", ("dp", "dps")),
+    (10, "Fabric", ("fa", "fabric")),
+    (11, "Switch", ("sw", "switch")),
+)
+_TYPE_CODE = {spelling: code for code, _, names in _TYPES for spelling in names}
+_TYPE_NAME = {code: name for code, name, _ in _TYPES}
+
+_PORT_RE = re.compile(r'^([A-Za-z][A-Za-z-]*?)-?(\d+)(?:/(\d+))?(?:/(\d+))?(?:\.(\d+))?$')
+_LIMITS = (0xFFFF, 0xFFF, 0xFFF, 0xFFFF)
+
+# Memo of port_id() per spelling, bounded for long-running processes.
+_ID_CACHE: Dict[str, int] = {}
+_ID_CACHE_MAX = 1 << 16
+
+
+def port_id(name: str) -> int:
+    """
+    'Et49/1' / 'Ethernet49/1' / 'ethernet 49/1' -> the same int (see the layout
+    above). Cached per spelling. ValueError for names that are not interfaces.
+    """
+    pid = _ID_CACHE.get(name)
+    if pid is not None:
+        return pid
+    m = _PORT_RE.match(name.replace(" ", ""))
+    code = _TYPE_CODE.get(m.group(1).lower()) if m else None
+    if code is None:
+        raise ValueError(f"not an interface name: {name!r}")
+    nums = [int(g) if g else 0 for g in m.group(2, 3, 4, 5)]
+    if any(n > lim for n, lim in zip(nums, _LIMITS)):
+        raise ValueError(f"interface number out of range: {name!r}")
+    pid = code << 56 | nums[0] << 40 | nums[1] << 28 | nums[2] << 16 | nums[3]
+    if len(_ID_CACHE) < _ID_CACHE_MAX:
+        _ID_CACHE[name] = pid
+    return pid
+
+
+def port_name(pid: int) -> str:
+    """Inverse of port_id(): the long name, e.g. 'Ethernet49/1.100'."""
+    name = f"{_TYPE_NAME[pid >> 56]}{pid >> 40 & 0xFFFF}"
+    second, third, sub = pid >> 28 & 0xFFF, pid >> 16 & 0xFFF, pid & 0xFFFF
+    if second or third:
+        name += f"/{second}"
+    if third:
+        name += f"/{third}"
+    if sub:
+        name += f".{sub}"
+    return name
+
+
+def _port_key(name: str) -> Optional[int]:
+    try:
+        return port_id(name)
+    except ValueError:
+        return None
+
+
+def _blank(value: str) -> Optional[str]:
+    return value or None
+
+
+class InterfaceIndex:
+    """
+    {port id: InterfacePort} built from 'show interfaces status' and/or
+    'show ip interface brief' (either may be missing). Both tables are cut
+    by column offsets (auto.tables), one split per row, so a chassis with
+    thousands of ports and subinterfaces is a single linear pass.
+    """
+    __slots__ = ("ports",)
+
+    def __init__(self):
+        self.ports: Dict[int, InterfacePort] = {}
+
+    @classmethod
+    def from_text(cls, text: str) -> "InterfaceIndex":
+        """Index every interfaces-status / ip-interface-brief block of a capture."""
+        index = cls()
+        for block in iter_command_blocks(text):
+            if block.key == "interfaces_status":
+                index.feed_status(block.lines)
+            elif block.key == "ip_interface_brief":
+                index.feed_ip_brief(block.lines)
+        return index
+
+    def _get(self, pid: int) -> InterfacePort:
+        rec = self.ports.get(pid)
+        if rec is None:
+            rec = self.ports[pid] = InterfacePort(port_name(pid))
+        return rec
+
+    def _rows(self, lines: List[str], first_column: str) -> Iterator[tuple]:
+        spec, start = find_table(lines, first_column)
+        if spec is None:
+            return
+        names = spec.names
+        for line in lines[start:]:
+            if not line.strip():
+                continue
+            if "#" in line and PROMPT_RE.match(line):
+                break
+            fields = spec.split(line)
+            pid = _port_key(fields[0])
+            if pid is not None:
+                yield pid, dict(zip(names, fields))
+
+    def feed_status(self, lines) -> "InterfaceIndex":
+        """Rows of 'show interfaces status' (text or list of lines)."""
+        if isinstance(lines, str):
+            lines = lines.splitlines()
+        for pid, row in self._rows(lines, "Port"):
+            rec = self._get(pid)
+            rec.NAME = _blank(row.get("Name", ""))
+            rec.STATUS = _blank(row.get("Status", ""))
+            rec.VLAN = _blank(row.get("Vlan", ""))
+            rec.DUPLEX = _blank(row.get("Duplex", ""))
+            rec.SPEED = _blank(row.get("Speed", ""))
+            rec.TYPE = _blank(row.get("Type", ""))
+        return self
+
+    def feed_ip_brief(self, lines) -> "InterfaceIndex":
+        """Rows of 'show ip interface brief' (text or list of lines)."""
+        if isinstance(lines, str):
+            lines = lines.splitlines()
+        for pid, row in self._rows(lines, "Interface"):
+            rec = self._get(pid)
+            rec.IP = _blank(row.get("IP Address", ""))
+            rec.IP_STATUS = _blank(row.get("Status", ""))
+            rec.PROTOCOL = _blank(row.get("Protocol", ""))
+            mtu = row.get("MTU", "")
+            rec.MTU = int(mtu) if mtu.isdigit() else None
+        return self
+
+    def merge(self, other: "InterfaceIndex") -> "InterfaceIndex":
+        """
+        Add the ports of `other` into self (in place) and return self; fields
+        `other` has a value for win, so an index of 'show interfaces status'
+        merged with one of 'show ip interface brief' equals from_text of both.
+        """
+        for pid, rec in other.ports.items():
+            mine = self.ports.get(pid)
+            if mine is None:
+                mine = self.ports[pid] = InterfacePort(rec.PORT)
+            for field in InterfacePort.__slots__[1:]:
+                value = getattr(rec, field)
+                if value is not None:
+                    setattr(mine, field, value)
+        return self
+
+    # ---- lookups ----
+    def __len__(self):
+        return len(self.ports)
+
+    def __iter__(self) -> Iterator[InterfacePort]:
+        """Ports in natural order (Et1, Et2, ..., Et49/1, Po1, Vlan10)."""
+        ports = self.ports
+        return (ports[pid] for pid in sorted(ports))
+
+    def get(self, name: str) -> Optional[InterfacePort]:
+        pid = _port_key(name)
+        return None if pid is None else self.ports.get(pid)
+
+    def counts(self, field: str = "STATUS") -> Dict[str, int]:
+        """{value: ports}, e.g. counts()['connected'] or counts('IP_STATUS')['up']."""
+        out: Dict[str, int] = {}
+        for rec in self.ports.values():
+            v = getattr(rec, field)
+            if v is not None:
+                out[v] = out.get(v, 0) + 1
+        return out
+
+
+# diff kind -> fields compared
+INTERFACE_DIFF_FIELDS = {
+    "status": ("STATUS", "IP_STATUS"),
+    "vlan": ("VLAN",),
+    "speed": ("SPEED",),
+    "ip": ("IP",),
+    "protocol": ("PROTOCOL",),
+}
+INTERFACE_DIFF_KINDS = ("missing", "new") + tuple(INTERFACE_DIFF_FIELDS)
+
+
+def _show(rec: Optional[InterfacePort], fields) -> str:
+    values = [getattr(rec, f) for f in fields] if rec is not None else []
+    return "/".join(str(v) for v in values if v is not None) or "-"
+
+
+class InterfaceDiff:
+    """
+    Port-level difference of two InterfaceIndexes (see diff_interfaces).
+    Each kind is a list of port ids; a port can appear under several kinds.
+    """
+    __slots__ = ("pre", "post") + INTERFACE_DIFF_KINDS
+
+    def __init__(self, pre: InterfaceIndex, post: InterfaceIndex):
+        self.pre = pre
+        self.post = post
+        for kind in INTERFACE_DIFF_KINDS:
+            setattr(self, kind, [])
+
+    def counts(self) -> Dict[str, int]:
+        return {kind: len(getattr(self, kind)) for kind in INTERFACE_DIFF_KINDS}
+
+    def entries(self, kind: str) -> Iterator[dict]:
+        """Yield {PORT, PRE, POST} for one kind, in port order ('-' for no value)."""
+        fields = INTERFACE_DIFF_FIELDS.get(kind, ("STATUS",))
+        pre, post = self.pre.ports, self.post.ports
+        for pid in sorted(getattr(self, kind)):
+            a, b = pre.get(pid), post.get(pid)
+            yield {"PORT": port_name(pid), "PRE": _show(a, fields), "POST": _show(b, fields)}
+
+
+def diff_interfaces(pre: InterfaceIndex, post: InterfaceIndex) -> InterfaceDiff:
+    """
+    Hash join of two interface indexes on port id.
+      missing   port only in pre
+      new       port only in post
+      status    link status (interfaces status) or ip brief Status changed
+      vlan / speed / ip / protocol   that column changed
+    A value missing on one side (table not captured) is not a change.
+    """
+    d = InterfaceDiff(pre, post)
+    checks = [(getattr(d, kind), fields) for kind, fields in INTERFACE_DIFF_FIELDS.items()]
+    post_get = post.ports.get
+    for pid, a in pre.ports.items():
+        b = post_get(pid)
+        if b is None:
+            d.missing.append(pid)
+            continue
+        for out, fields in checks:
+            for f in fields:
+                x, y = getattr(a, f), getattr(b, f)
+                if x != y and x is not None and y is not None:
+                    out.append(pid)
+                    break
+    if len(post.ports) > len(pre.ports) - len(d.missing):
+        pre_ports = pre.ports
+        d.new.extend(pid for pid in post.ports if pid not in pre_ports)
+    return d
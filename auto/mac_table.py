@@ -0,0 +1,292 @@
+import re
+import sys
+from array import array
+from typing import Dict, Iterator, List, Optional
+
+try:
+    from .sections import PROMPT_RE
+    from .records import MacEntry
+except ImportError:
+    from sections import PROMPT_RE
+    from records import MacEntry
+
+__all__ = [
+    "MacTable",
+    "MacDiff",
+    "MAC_DIFF_KINDS",
+    "diff_mac_tables",
+    "mac_to_int",
+    "int_to_mac",
+]
+
+# Start of the 'show mac address-table dynamic' output in a full capture.
+_DYNAMIC_MARKER = re.compile(r'#\s*sh(?:ow)?\s+mac\s+address-table\s+dynamic\b', re.IGNORECASE)
+_TOTAL_MARKER = "Total Mac Addresses for this criterion:"
+
+
+def mac_to_int(mac: str) -> int:
+    """'0094.a134.8e6b' / '00:94:a1:34:8e:6b' / '00-94-A1-34-8E-6B' -> 48-bit int."""
+    return int(mac.replace(".", "").replace(":", "").replace("-", ""), 16)
+
+
+def int_to_mac(value: int) -> str:
+    """48-bit int -> EOS dotted form '0094.a134.8e6b'."""
+    h = f"{value:012x}"
+    return f"{h[0:4]}.{h[4:8]}.{h[8:12]}"
+
+
+class MacTable:
+    """
+    Column store for a MAC address table.
+
+    One row per (VLAN, MAC). Columns are typed arrays:
+      macs  array('Q')  48-bit MAC as int
+      vlans array('H')
+      ports array('H')  index into port_names (each port string stored once)
+      moves array('I')
+    Indexes kept up to date on add():
+      (vlan, mac) -> row      dict keyed by vlan << 48 | mac
+      port -> rows            array('I') per port
+      vlan -> rows            array('I') per VLAN
+      moved rows              rows with Moves > 1
+    so "which MACs are behind Po1028", "what is in VLAN 1406" and "what
+    moved" are dict lookups. About 16 bytes of column data per row plus the
+    key dict, which keeps a 500k-entry border leaf table well under 100 MB.
+    """
+
+    def __init__(self):
+        self.macs = array("Q")
+        self.vlans = array("H")
+        self.ports = array("H")
+        self.moves = array("I")
+        self.port_names: List[str] = []
+        self._port_ids: Dict[str, int] = {}
+        self._key: Dict[int, int] = {}
+        self._by_port: Dict[int, array] = {}
+        self._by_vlan: Dict[int, array] = {}
+        self._moved = array("I")
+        self.total: Optional[int] = None     # 'Total Mac Addresses for this criterion' if seen
+
+    # ---- building ----
+    def _port_id(self, port: str) -> int:
+        pid = self._port_ids.get(port)
+        if pid is None:
+            pid = len(self.port_names)
+            self.port_names.append(sys.intern(port))
+            self._port_ids[port] = pid
+        return pid
+
+    def add(self, vlan: int, mac: int, port: str, moves: int = 1) -> int:
+        """
+        Add one entry (MAC as int). A repeated (vlan, mac) overwrites port /
+        moves in place. Returns the row index.
+        """
+        key = (vlan << 48) | mac
+        pid = self._port_id(port)
+        row = self._key.get(key)
+        if row is not None:
+            old_pid = self.ports[row]
+            if old_pid != pid:
+                rows = self._by_port[old_pid]
+                del rows[rows.index(row)]
+                self._by_port.setdefault(pid, array("I")).append(row)
+                self.ports[row] = pid
+            if moves > 1 and self.moves[row] <= 1:
+                self._moved.append(row)
+            self.moves[row] = moves
+            return row
+        row = len(self.macs)
+        self.macs.append(mac)
+        self.vlans.append(vlan)
+        self.ports.append(pid)
+        self.moves.append(moves)
+        self._key[key] = row
+        self._by_port.setdefault(pid, array("I")).append(row)
+        self._by_vlan.setdefault(vlan, array("I")).append(row)
+        if moves > 1:
+            self._moved.append(row)
+        return row
+
+    @classmethod
+    def from_text(cls, text: str) -> "MacTable":
+        """
+        Build from 'show mac address-table dynamic' output (a full capture is
+        fine: parsing starts at the command and stops at the first
+        'Total Mac Addresses for this criterion' line, i.e. the unicast table).
+        """
+        table = cls()
+        if not text:
+            return table
+        m = _DYNAMIC_MARKER.search(text)
+        start = m.end() if m else 0
+        # Hot loop: columns and indexes are appended directly; repeated
+        # (vlan, mac) rows fall back to add() which handles the update.
+        macs, vlans, ports, moves_col = table.macs, table.vlans, table.ports, table.moves
+        key_idx, by_port, by_vlan, moved = table._key, table._by_port, table._by_vlan, table._moved
+        port_ids, port_id = table._port_ids, table._port_id
+        for line in text[start:].splitlines():
+            parts = line.split()
+            # 1406    0094.a134.8e6b    DYNAMIC     Po1028     1       193 days, 4:11:50 ago
+            if len(parts) >= 4 and parts[0].isdigit() and len(parts[1]) == 14 and parts[1][4] == ".":
+                try:
+                    mac = int(parts[1].replace(".", ""), 16)
+                except ValueError:
+                    continue
+                vlan = int(parts[0])
+                mv = int(parts[4]) if len(parts) > 4 and parts[4].isdigit() else 1
+                key = (vlan << 48) | mac
+                if key in key_idx:
+                    table.add(vlan, mac, parts[3], mv)
+                    continue
+                pid = port_ids.get(parts[3])
+                if pid is None:
+                    pid = port_id(parts[3])
+                row = len(macs)
+                macs.append(mac)
+                vlans.append(vlan)
+                ports.append(pid)
+                moves_col.append(mv)
+                key_idx[key] = row
+                rows = by_port.get(pid)
+                if rows is None:
+                    rows = by_port[pid] = array("I")
+                rows.append(row)
+                rows = by_vlan.get(vlan)
+                if rows is None:
+                    rows = by_vlan[vlan] = array("I")
+                rows.append(row)
+                if mv > 1:
+                    moved.append(row)
+            elif line.startswith(_TOTAL_MARKER):
+                tail = line[len(_TOTAL_MARKER):].strip()
+                table.total = int(tail) if tail.isdigit() else None
+                break
+            elif PROMPT_RE.match(line):
+                # next command reached without a Total line
+                break
+        return table
+
+    @classmethod
+    def from_entries(cls, entries) -> "MacTable":
+        """Build from parse_mac_address_table_dynamic() 'entries' (dicts with VLAN/MAC/PORTS/MOVES)."""
+        table = cls()
+        for e in entries:
+            table.add(int(e["VLAN"]), mac_to_int(e["MAC"]), e["PORTS"], int(e.get("MOVES") or 1))
+        return table
+
+    # ---- lookups ----
+    def __len__(self):
+        return len(self.macs)
+
+    def row(self, i: int) -> MacEntry:
+        """Row as a parser-style MacEntry record (LAST_MOVE is not kept)."""
+        return MacEntry(str(self.vlans[i]), int_to_mac(self.macs[i]), "DYNAMIC",
+                        self.port_names[self.ports[i]], self.moves[i])
+
+    def rows(self, indexes=None) -> Iterator[MacEntry]:
+        for i in (range(len(self.macs)) if indexes is None else indexes):
+            yield self.row(i)
+
+    def find(self, mac, vlan: int) -> Optional[int]:
+        """Row index of (vlan, mac) or None. `mac` may be a string or an int."""
+        if isinstance(mac, str):
+            mac = mac_to_int(mac)
+        return self._key.get((int(vlan) << 48) | mac)
+
+    def on_port(self, port: str) -> array:
+        """Row indexes of MACs learned on `port` (exact port name, e.g. 'Po1028')."""
+        pid = self._port_ids.get(port)
+        return self._by_port.get(pid, array("I")) if pid is not None else array("I")
+
+    def in_vlan(self, vlan: int) -> array:
+        """Row indexes of MACs in `vlan`."""
+        return self._by_vlan.get(int(vlan), array("I"))
+
+    def moved(self) -> array:
+        """Row indexes of entries with Moves > 1."""
+        return self._moved
+
+    def port_of(self, i: int) -> str:
+        return self.port_names[self.ports[i]]
+
+    def per_vlan(self) -> Dict[str, int]:
+        """{vlan: count} in the same shape as parse_mac_address_table_dynamic()['per_vlan']."""
+        return {str(v): len(rows) for v, rows in self._by_vlan.items()}
+
+    def per_port(self) -> Dict[str, int]:
+        return {self.port_names[p]: len(rows) for p, rows in self._by_port.items() if rows}
+
+
+# ---- pre/post diff ----
+MAC_DIFF_KINDS = ("missing", "new", "port_changed", "moves_increased")
+
+
+class MacDiff:
+    """
+    Entry-level difference between two MacTables (see diff_mac_tables).
+    Each kind holds (vlan << 48 | mac) keys in an array('Q'); per_vlan
+    holds {vlan: {kind: count}} for VLANs with at least one change.
+    """
+    __slots__ = ("pre", "post", "missing", "new", "port_changed", "moves_increased", "per_vlan")
+
+    def __init__(self, pre: MacTable, post: MacTable):
+        self.pre = pre
+        self.post = post
+        for kind in MAC_DIFF_KINDS:
+            setattr(self, kind, array("Q"))
+        self.per_vlan: Dict[int, Dict[str, int]] = {}
+
+    def counts(self) -> Dict[str, int]:
+        return {kind: len(getattr(self, kind)) for kind in MAC_DIFF_KINDS}
+
+    def entries(self, kind: str) -> Iterator[dict]:
+        """Yield {VLAN, MAC, PRE_PORT, POST_PORT, PRE_MOVES, POST_MOVES} for one kind."""
+        pre, post = self.pre, self.post
+        for key in sorted(getattr(self, kind)):
+            i, j = pre._key.get(key), post._key.get(key)
+            yield {
+                "VLAN": str(key >> 48),
+                "MAC": int_to_mac(key & 0xFFFFFFFFFFFF),
+                "PRE_PORT": pre.port_of(i) if i is not None else None,
+                "POST_PORT": post.port_of(j) if j is not None else None,
+                "PRE_MOVES": pre.moves[i] if i is not None else None,
+                "POST_MOVES": post.moves[j] if j is not None else None,
+            }
+
+
+def diff_mac_tables(pre: MacTable, post: MacTable) -> MacDiff:
+    """
+    Hash join of two MAC tables on (vlan, mac).
+      missing         in pre, not in post
+      new             in post, not in pre
+      port_changed    in both, learned on a different port
+      moves_increased in both, Moves went up
+    One pass over the pre keys with dict probes into post; the 'new' set
+    difference is only computed when post has keys pre does not.
+    """
+    d = MacDiff(pre, post)
+    pre_key, post_key = pre._key, post._key
+    # pre port id -> post port id (-1 when the port name is unknown in post)
+    port_map = [post._port_ids.get(name, -1) for name in pre.port_names]
+    pre_ports, post_ports = pre.ports, post.ports
+    pre_moves, post_moves = pre.moves, post.moves
+    missing, changed, moved = d.missing, d.port_changed, d.moves_increased
+    post_get = post_key.get
+    for key, i in pre_key.items():
+        j = post_get(key)
+        if j is None:
+            missing.append(key)
+            continue
+        if port_map[pre_ports[i]] != post_ports[j]:
+            changed.append(key)
+        if post_moves[j] > pre_moves[i]:
+            moved.append(key)
+    if len(post_key) > len(pre_key) - len(missing):
+        d.new.extend(post_key.keys() - pre_key.keys())
+    for kind in MAC_DIFF_KINDS:
+        for key in getattr(d, kind):
+            per = d.per_vlan.get(key >> 48)
+            if per is None:
+                per = d.per_vlan[key >> 48] = dict.fromkeys(MAC_DIFF_KINDS, 0)
+            per[kind] += 1
+    return d
@@ -0,0 +1,289 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+try:
+    from .sections import classify_command
+    from .capture import normalize_capture, iter_prompts
+    from .mac_table import MacTable
+    from .evpn import EvpnRouteStats
+    from .routes import route_summary_counts, RouteTable
+    from .bgp import parse_bgp_summaries
+    from .interfaces import InterfaceIndex
+    from .vxlan import VxlanIndex, ImetIndex
+    from .vlans import vlan_brief_vlans, capture_vlan_sets, PortVlanMatrix
+    from .route_summary import RouteSummaryMatrix
+    from .consistency import EvpnMacIndex
+except ImportError:
+    from sections import classify_command
+    from capture import normalize_capture, iter_prompts
+    from mac_table import MacTable
+    from evpn import EvpnRouteStats
+    from routes import route_summary_counts, RouteTable
+    from bgp import parse_bgp_summaries
+    from interfaces import InterfaceIndex
+    from vxlan import VxlanIndex, ImetIndex
+    from vlans import vlan_brief_vlans, capture_vlan_sets, PortVlanMatrix
+    from route_summary import RouteSummaryMatrix
+    from consistency import EvpnMacIndex
+
+__all__ = [
+    "SECTION_PARSERS",
+    "SECTION_SOURCES",
+    "section_ranges",
+    "parse_sections",
+    "record_chunks",
+    "parse_evpn_chunked",
+]
+
+# Parallel parsing of the independent sections of one capture.
+#
+# The capture is copied once into a multiprocessing.shared_memory block; each
+# worker gets (block name, section key, byte ranges) and slices the block
+# itself, so the text is never pickled. Results (MacTable columns, route
+# multisets, ...) come back through the pool and are merged into one
+# snapshot dict in the parent.
+
+def _bgp_summary(text: str):
+    return parse_bgp_summaries(text).get("bgp_summary")
+
+
+def _bgp_evpn_summary(text: str):
+    return parse_bgp_summaries(text).get("bgp_evpn_summary")
+
+
+def _evpn_macs(text: str):
+    # type-2 RDs may carry VNIs: key the routes by VLAN through the VNI table
+    return EvpnMacIndex.from_text(text, VxlanIndex.from_text(text).vlan_of)
+
+
+_VXLAN_SECTIONS = ("vxlan_vtep_detail", "vxlan_vni", "vxlan_flood_vtep", "vxlan_address_table")
+
+# section key (auto.sections), or an index built from several sections
+# (SECTION_SOURCES) -> parser(text) returning a picklable result
+SECTION_PARSERS: Dict[str, Callable[[str], object]] = {
+    "interfaces_status": InterfaceIndex.from_text,
+    "ip_interface_brief": InterfaceIndex.from_text,
+    "bgp_summary": _bgp_summary,
+    "bgp_evpn_summary": _bgp_evpn_summary,
+    "vxlan_vtep_detail": VxlanIndex.from_text,
+    "vlan_brief": vlan_brief_vlans,
+    "mac_address_table_dynamic": MacTable.from_text,
+    "evpn_auto_discovery": EvpnRouteStats.from_text,
+    "evpn_mac_ip": EvpnRouteStats.from_text,
+    "evpn_imet": EvpnRouteStats.from_text,
+    "evpn_ethernet_segment": EvpnRouteStats.from_text,
+    "ip_route_summary": route_summary_counts,
+    "ip_route": RouteTable.from_text,
+    # indexes over one or more sections, as OutputTests / auto.api build them
+    "route_summary_matrix": RouteSummaryMatrix.from_text,
+    "vlan_sets": capture_vlan_sets,
+    "vlan_ports": PortVlanMatrix.from_text,
+    "vxlan": VxlanIndex.from_text,
+    "imet": ImetIndex.from_text,
+    "evpn_macs": _evpn_macs,
+}
+
+# SECTION_PARSERS keys that are not a command section -> the sections whose
+# blocks their parser reads (each block keeps its prompt line)
+SECTION_SOURCES: Dict[str, Tuple[str, ...]] = {
+    "route_summary_matrix": ("ip_route_summary",),
+    "vlan_sets": ("vlan_brief", "vlan_dynamic", "igmp_snooping_querier"),
+    "vlan_ports": ("vlan_brief",),
+    "vxlan": _VXLAN_SECTIONS,
+    "imet": ("evpn_imet",),
+    "evpn_macs": ("evpn_mac_ip", "evpn_ethernet_segment", "vxlan_vni"),
+}
+
+_EVPN_SECTIONS = ("evpn_auto_discovery", "evpn_mac_ip", "evpn_imet", "evpn_ethernet_segment")
+
+# Below this many bytes a pool costs more than it saves.
+_MIN_PARALLEL_BYTES = 4 << 20
+
+
+def section_ranges(data) -> Dict[str, List[Tuple[int, int]]]:
+    """
+    {section key: [(start, end), ...]} byte ranges of the command blocks in a
+    capture, one pass over the prompt lines (see capture.iter_prompts). A block runs
+    from its prompt line to the next prompt; unknown commands are skipped.
+    """
+    ranges: Dict[str, List[Tuple[int, int]]] = {}
+    key, start = None, 0
+    for ls, i, _ in iter_prompts(data):
+        if key is not None:
+            ranges.setdefault(key, []).append((start, ls))
+        nl = data.find(b"\n", i)
+        cmd = bytes(data[i + 1:nl if nl >= 0 else len(data)]).decode("utf-8", "ignore")
+        key, start = classify_command(cmd), ls
+    if key is not None:
+        ranges.setdefault(key, []).append((start, len(data)))
+    ranges.pop(None, None)
+    return ranges
+
+
+def _parse_block(buf, key: str, ranges) -> object:
+    text = b"\n".join(bytes(buf[a:b]) for a, b in ranges).decode("utf-8", "ignore")
+    return SECTION_PARSERS[key](text)
+
+
+def _parse_shared(shm_name: str, key: str, ranges):
+    """Worker: attach to the shared block, parse one section, detach."""
+    # Pool workers share the parent's resource tracker, which already knows
+    # the block; the parent unlinks it once all sections are back.
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        return key, _parse_block(shm.buf, key, ranges)
+    finally:
+        shm.close()
+
+
+def _merge(snapshot: dict) -> dict:
+    # All EVPN route types in one multiset (keys start with the type, so no clashes).
+    routes: Dict[str, int] = {}
+    for key in _EVPN_SECTIONS:
+        part = snapshot.get(key)
+        if part:
+            routes.update(part.counts())
+    snapshot["evpn_route_counts"] = routes
+    # The two interface tables joined per port, and the BGP summaries in the
+    # shape of parse_bgp_summaries(), so consumers never parse them again.
+    status, brief = snapshot.get("interfaces_status"), snapshot.get("ip_interface_brief")
+    if status is not None or brief is not None:
+        index = InterfaceIndex()
+        for part in (status, brief):
+            if part is not None:
+                index.merge(part)
+        snapshot["interfaces"] = index
+    bgp = {key: snapshot[key] for key in ("bgp_summary", "bgp_evpn_summary") if snapshot.get(key) is not None}
+    if bgp:
+        snapshot["bgp_summaries"] = bgp
+    return snapshot
+
+
+def parse_sections(data: Union[bytes, str], keys=None, jobs: Optional[int] = None,
+                   normalize: bool = True) -> dict:
+    """
+    Parse the independent heavy sections of one capture (SECTION_PARSERS,
+    or the subset `keys`) and merge the results into one snapshot:
+      {section key: parser result, ...,
+       'vxlan' / 'imet' / 'evpn_macs' / ...: index    built from SECTION_SOURCES
+       'evpn_route_counts': {route key: paths},       all EVPN route types
+       'interfaces': InterfaceIndex,                  both interface tables
+       'bgp_summaries': {section key: BgpSummary}}    as parse_bgp_summaries()
+    Sections run in a process pool of `jobs` workers (default: CPU count)
+    reading a shared memory copy of the capture; with jobs=1, a single
+    section, or a small capture everything runs in this process.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8", "surrogateescape")
+    if normalize:
+        data = normalize_capture(data)
+    wanted = SECTION_PARSERS if keys is None else {k: SECTION_PARSERS[k] for k in keys}
+    found = section_ranges(data)
+    ranges = {}
+    for key in wanted:
+        r = sorted(rr for src in SECTION_SOURCES.get(key, (key,)) for rr in found.get(src, ()))
+        if r:
+            ranges[key] = r
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(ranges)))
+    snapshot = {}
+    if jobs == 1 or len(data) < _MIN_PARALLEL_BYTES:
+        for key, r in ranges.items():
+            snapshot[key] = _parse_block(data, key, r)
+        return _merge(snapshot)
+
+    shm = shared_memory.SharedMemory(create=True, size=len(data))
+    try:
+        shm.buf[:len(data)] = data
+        # largest sections first so the long poles start early
+        order = sorted(ranges.items(), key=lambda kv: -sum(b - a for a, b in kv[1]))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(_parse_shared, shm.name, key, r) for key, r in order]
+            for fut in futures:
+                key, result = fut.result()
+                snapshot[key] = result
+    finally:
+        shm.close()
+        shm.unlink()
+    return _merge(snapshot)
+
+
+# ---- one big EVPN section across cores ----
+def _is_route_line(data, ls: int, rd: int) -> bool:
+    # status column between line start and 'RD:' is only ' *>SEec%#'
+    return all(c in b" *>SEec%#" for c in bytes(data[ls:rd]))
+
+
+def record_chunks(data, start: int, end: int, parts: int) -> List[Tuple[int, int]]:
+    """
+    Cut data[start:end] into about `parts` ranges that each begin on an EVPN
+    route line ('  * >Ec    RD: ...'), so a route line and its attribute
+    continuation line always land in the same chunk.
+    """
+    if parts <= 1 or end - start < 2:
+        return [(start, end)]
+    step = (end - start) // parts
+    bounds = [start]
+    for k in range(1, parts):
+        pos = max(start + k * step, bounds[-1] + 1)
+        while True:
+            rd = data.find(b"RD:", pos, end)
+            if rd < 0:
+                pos = end
+                break
+            ls = data.rfind(b"\n", start, rd) + 1
+            if ls > bounds[-1] and _is_route_line(data, ls, rd):
+                pos = ls
+                break
+            pos = rd + 3
+        if pos >= end:
+            break
+        bounds.append(pos)
+    bounds.append(end)
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def _evpn_chunk(buf, a: int, b: int) -> EvpnRouteStats:
+    return EvpnRouteStats.from_text(bytes(buf[a:b]).decode("utf-8", "ignore"))
+
+
+def _evpn_chunk_shared(shm_name: str, a: int, b: int) -> EvpnRouteStats:
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        return _evpn_chunk(shm.buf, a, b)
+    finally:
+        shm.close()
+
+
+def parse_evpn_chunked(data: Union[bytes, str], section: str = "evpn_mac_ip", jobs: Optional[int] = None,
+                       chunks_per_job: int = 4) -> EvpnRouteStats:
+    """
+    Parse one EVPN route-type section (by default 'sh bgp evpn route-type
+    mac-ip'; the whole buffer when the capture has no such prompt) in
+    route-aligned chunks across a process pool, and merge the per-chunk
+    EvpnRouteStats. Chunks are merged in order, though merge() is
+    associative, so the result equals EvpnRouteStats.from_text of the section.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8", "surrogateescape")
+    ranges = section_ranges(data).get(section) or [(0, len(data))]
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    pieces = [c for a, b in ranges for c in record_chunks(data, a, b, jobs * chunks_per_job)]
+    total = EvpnRouteStats()
+    if jobs == 1 or len(pieces) == 1:
+        for a, b in pieces:
+            total.merge(_evpn_chunk(data, a, b))
+        return total
+
+    shm = shared_memory.SharedMemory(create=True, size=len(data))
+    try:
+        shm.buf[:len(data)] = data
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(_evpn_chunk_shared, shm.name, a, b) for a, b in pieces]
+            for fut in futures:
+                total.merge(fut.result())
+    finally:
+        shm.close()
+        shm.unlink()
+    return total
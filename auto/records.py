@@ -0,0 +1,219 @@
+import sys
+
+__all__ = [
+    "Record",
+    "BgpNeighbor",
+    "BgpEvpnNeighbor",
+    "BgpSession",
+    "Vtep",
+    "InterfacePort",
+    "MacEntry",
+    "VlanRow",
+    "RouteEntry",
+    "EvpnPath",
+    "intern",
+]
+
+# Parser output records. Each record is a __slots__ class whose slot names are
+# the upper-case keys the parsers used to put in dicts, and it answers the
+# same read calls as those dicts (r["STATE"], r.get("STATE"), "STATE" in r,
+# keys/items), so existing callers keep working. A slotted instance has no
+# per-row __dict__, and low-cardinality values (states, port names, RDs,
+# next hops, AS paths) are interned so a million rows share a few hundred
+# string objects. `python -m auto.bench records` measures the difference.
+
+
+def intern(value):
+    """sys.intern for str values, anything else passed through."""
+    return sys.intern(value) if value.__class__ is str else value
+
+
+class Record:
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def keys(self):
+        return self.__slots__
+
+    def values(self):
+        return [getattr(self, k) for k in self.__slots__]
+
+    def items(self):
+        return [(k, getattr(self, k)) for k in self.__slots__]
+
+    def as_dict(self) -> dict:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            return self.__class__ is other.__class__ and self.values() == other.values()
+        if isinstance(other, dict):
+            return self.as_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        body = ", ".join(f"{k}={getattr(self, k)!r}" for k in self.__slots__)
+        return f"{self.__class__.__name__}({body})"
+
+
+class BgpNeighbor(Record):
+    """Row of 'show bgp summary'."""
+    __slots__ = ("NEIGHBOR", "AS", "STATE", "NLRI_RCD", "NLRI_ACC")
+
+    def __init__(self, NEIGHBOR, AS, STATE, NLRI_RCD=None, NLRI_ACC=None, _si=sys.intern):
+        self.NEIGHBOR = NEIGHBOR
+        self.AS = _si(AS)
+        self.STATE = _si(STATE)
+        self.NLRI_RCD = NLRI_RCD
+        self.NLRI_ACC = NLRI_ACC
+
+
+class BgpEvpnNeighbor(Record):
+    """Row of 'show bgp evpn summary'."""
+    __slots__ = ("NEIGHBOR", "VERSION", "AS", "MSG_RCV", "MSG_SNT", "INQ", "OUTQ",
+                 "UP_DOWN", "STATE", "PFX_RCD", "PFX_ACC")
+
+    def __init__(self, NEIGHBOR, VERSION, AS, MSG_RCV, MSG_SNT, INQ, OUTQ, UP_DOWN, STATE,
+                 PFX_RCD=None, PFX_ACC=None, _si=sys.intern):
+        self.NEIGHBOR = NEIGHBOR
+        self.VERSION = _si(VERSION)
+        self.AS = _si(AS)
+        self.MSG_RCV = MSG_RCV
+        self.MSG_SNT = MSG_SNT
+        self.INQ = INQ
+        self.OUTQ = OUTQ
+        self.UP_DOWN = UP_DOWN
+        self.STATE = _si(STATE)
+        self.PFX_RCD = PFX_RCD
+        self.PFX_ACC = PFX_ACC
+
+
+class BgpSession(Record):
+    """
+    One BGP peer of one VRF (see auto.bgp). AFI_SAFI lists the negotiated
+    address families ('IPv4 Unicast, L2VPN EVPN'); NLRI_RCD / NLRI_ACC are
+    summed over them. UP_DOWN / MSG_* only exist in the classic table layout.
+    """
+    __slots__ = ("VRF", "NEIGHBOR", "AS", "STATE", "AFI_SAFI", "NLRI_RCD", "NLRI_ACC", "UP_DOWN",
+                 "MSG_RCV", "MSG_SNT")
+
+    def __init__(self, VRF, NEIGHBOR, AS, STATE, AFI_SAFI="", NLRI_RCD=None, NLRI_ACC=None, UP_DOWN=None,
+                 MSG_RCV=None, MSG_SNT=None, _si=sys.intern):
+        self.VRF = _si(VRF)
+        self.NEIGHBOR = NEIGHBOR
+        self.AS = _si(AS)
+        self.STATE = _si(STATE)
+        self.AFI_SAFI = _si(AFI_SAFI)
+        self.NLRI_RCD = NLRI_RCD
+        self.NLRI_ACC = NLRI_ACC
+        self.UP_DOWN = UP_DOWN
+        self.MSG_RCV = MSG_RCV
+        self.MSG_SNT = MSG_SNT
+
+
+class Vtep(Record):
+    """Row of 'show vxlan vtep detail'."""
+    __slots__ = ("VTEP", "LEARNED_VIA", "MAC_LEARNING", "TUNNEL_TYPES")
+
+    def __init__(self, VTEP, LEARNED_VIA="", MAC_LEARNING="", TUNNEL_TYPES="", _si=sys.intern):
+        self.VTEP = VTEP
+        self.LEARNED_VIA = _si(LEARNED_VIA)
+        self.MAC_LEARNING = _si(MAC_LEARNING)
+        self.TUNNEL_TYPES = _si(TUNNEL_TYPES)
+
+
+class InterfacePort(Record):
+    """
+    One port of 'show interfaces status' joined with its 'show ip interface
+    brief' row (see auto.interfaces). PORT is the long name ('Ethernet49/1');
+    IP_STATUS / PROTOCOL / IP / MTU stay None for ports without an IP row.
+    """
+    __slots__ = ("PORT", "NAME", "STATUS", "VLAN", "DUPLEX", "SPEED", "TYPE", "IP", "IP_STATUS",
+                 "PROTOCOL", "MTU")
+
+    def __init__(self, PORT, NAME=None, STATUS=None, VLAN=None, DUPLEX=None, SPEED=None, TYPE=None,
+                 IP=None, IP_STATUS=None, PROTOCOL=None, MTU=None):
+        self.PORT = PORT
+        self.NAME = NAME
+        self.STATUS = intern(STATUS)
+        self.VLAN = intern(VLAN)
+        self.DUPLEX = intern(DUPLEX)
+        self.SPEED = intern(SPEED)
+        self.TYPE = intern(TYPE)
+        self.IP = IP
+        self.IP_STATUS = intern(IP_STATUS)
+        self.PROTOCOL = intern(PROTOCOL)
+        self.MTU = MTU
+
+
+class MacEntry(Record):
+    """Row of 'show mac address-table dynamic'."""
+    __slots__ = ("VLAN", "MAC", "TYPE", "PORTS", "MOVES", "LAST_MOVE")
+
+    def __init__(self, VLAN, MAC, TYPE="DYNAMIC", PORTS="", MOVES=None, LAST_MOVE=None, _si=sys.intern):
+        self.VLAN = _si(VLAN)
+        self.MAC = MAC
+        self.TYPE = _si(TYPE)
+        self.PORTS = _si(PORTS)
+        self.MOVES = MOVES
+        self.LAST_MOVE = LAST_MOVE
+
+
+class VlanRow(Record):
+    """Row of 'show vlan brief' (PORTS is the joined port list)."""
+    __slots__ = ("VLAN", "NAME", "STATUS", "PORTS")
+
+    def __init__(self, VLAN, NAME, STATUS, PORTS="", _si=sys.intern):
+        self.VLAN = _si(VLAN)
+        self.NAME = _si(NAME)
+        self.STATUS = _si(STATUS)
+        self.PORTS = PORTS
+
+
+class RouteEntry(Record):
+    """One next hop of one prefix in 'show ip route [vrf ...]'."""
+    __slots__ = ("VRF", "PREFIX", "SOURCE", "CODES", "DISTANCE", "METRIC", "NEXT_HOP", "INTERFACE")
+
+    def __init__(self, VRF, PREFIX, SOURCE, CODES="", DISTANCE=None, METRIC=None, NEXT_HOP=None,
+                 INTERFACE=None, _si=sys.intern):
+        self.VRF = _si(VRF)
+        self.PREFIX = PREFIX
+        self.SOURCE = _si(SOURCE)
+        self.CODES = _si(CODES)
+        self.DISTANCE = DISTANCE
+        self.METRIC = METRIC
+        self.NEXT_HOP = intern(NEXT_HOP)
+        self.INTERFACE = intern(INTERFACE)
+
+
+class EvpnPath(Record):
+    """One path of 'show bgp evpn route-type ...' (see auto.evpn.iter_evpn_paths)."""
+    __slots__ = ("KEY", "TYPE", "RD", "NLRI", "FLAGS", "NEXT_HOP", "METRIC", "LOCPREF",
+                 "WEIGHT", "PATH", "ORIGIN")
+
+    def __init__(self, KEY, TYPE, RD, NLRI, FLAGS=0, NEXT_HOP=None, METRIC=None, LOCPREF=None,
+                 WEIGHT=None, PATH="", ORIGIN=None, _si=sys.intern):
+        self.KEY = KEY
+        self.TYPE = _si(TYPE)
+        self.RD = _si(RD)
+        self.NLRI = NLRI
+        self.FLAGS = FLAGS
+        self.NEXT_HOP = intern(NEXT_HOP)
+        self.METRIC = METRIC
+        self.LOCPREF = LOCPREF
+        self.WEIGHT = WEIGHT
+        self.PATH = intern(PATH)
+        self.ORIGIN = intern(ORIGIN)
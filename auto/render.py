@@ -0,0 +1,148 @@
+import html
+import json
+import sys
+
+__all__ = [
+    "TextSink",
+    "JsonSink",
+    "HtmlSink",
+    "MultiSink",
+    "default_sink",
+]
+
+# Printers (BgpStatus.print_bgp_status, RouteSummary.print, VXLAN.print_vtep_detail,
+# the _print_* helpers, ...) take an optional `out` sink instead of writing to
+# sys.stdout. A sink has three calls:
+#   section(title)    - start of a command section (structure for JSON/HTML)
+#   line(text)        - one line of human readable output
+#   record(key, value)- a machine readable value (counts, totals)
+# Each report owns its sink, so several reports can render concurrently in one
+# process without touching sys.stdout or the builtin print.
+
+
+class TextSink:
+    """
+    Plain text sink. Every line is written straight to each stream (pass an
+    open file to stream to disk). With no streams, lines go to whatever
+    sys.stdout is at call time, i.e. the old print() behaviour.
+    """
+
+    def __init__(self, *streams):
+        self.streams = streams
+
+    def section(self, title: str):
+        # Text printers already print their own "Command executed:" headings.
+        pass
+
+    def line(self, text: str = ""):
+        s = f"{text}\n"
+        for st in (self.streams or (sys.stdout,)):
+            st.write(s)
+
+    def record(self, key: str, value):
+        pass
+
+    def close(self):
+        for st in self.streams:
+            st.flush()
+
+
+class JsonSink:
+    """
+    JSON Lines sink: one object per event, e.g.
+      {"section": "show bgp summary", "key": "neighbor_count", "value": 6}
+      {"section": "show bgp summary", "line": "Neighbor count: 6 Established: 6"}
+    Streamable to disk; set lines=False to keep only section/record events.
+    """
+
+    def __init__(self, stream, lines: bool = True):
+        self.stream = stream
+        self.lines = lines
+        self._section = None
+
+    def _emit(self, obj):
+        self.stream.write(json.dumps(obj, default=str) + "\n")
+
+    def section(self, title: str):
+        self._section = title
+        self._emit({"section": title})
+
+    def line(self, text: str = ""):
+        if self.lines:
+            self._emit({"section": self._section, "line": text})
+
+    def record(self, key: str, value):
+        self._emit({"section": self._section, "key": key, "value": value})
+
+    def close(self):
+        self.stream.flush()
+
+
+class HtmlSink:
+    """
+    HTML sink: each section becomes an <h3> followed by a <pre> block. The page
+    header is written on construction and the footer on close(), so rows stream
+    to disk as they are produced.
+    """
+
+    def __init__(self, stream, title: str = "Script Output"):
+        self.stream = stream
+        self._open_pre = False
+        self.stream.write(
+            "<!DOCTYPE html>\n<html><head><meta charset='utf-8'/>"
+            f"<title>{html.escape(title)}</title>"
+            "<style>body{font-family:Arial,sans-serif;margin:16px}"
+            "pre{font-family:monospace;white-space:pre-wrap;margin:4px 0 16px}"
+            "dl{font-size:13px}dt{font-weight:600}</style></head><body>\n"
+        )
+
+    def _close_pre(self):
+        if self._open_pre:
+            self.stream.write("</pre>\n")
+            self._open_pre = False
+
+    def section(self, title: str):
+        self._close_pre()
+        self.stream.write(f"<h3>{html.escape(title)}</h3>\n")
+
+    def line(self, text: str = ""):
+        if not self._open_pre:
+            self.stream.write("<pre>")
+            self._open_pre = True
+        self.stream.write(html.escape(str(text)) + "\n")
+
+    def record(self, key: str, value):
+        pass
+
+    def close(self):
+        self._close_pre()
+        self.stream.write("</body></html>\n")
+        self.stream.flush()
+
+
+class MultiSink:
+    """Fan out to several sinks (e.g. text to the console and HTML to disk)."""
+
+    def __init__(self, *sinks):
+        self.sinks = sinks
+
+    def section(self, title: str):
+        for s in self.sinks:
+            s.section(title)
+
+    def line(self, text: str = ""):
+        for s in self.sinks:
+            s.line(text)
+
+    def record(self, key: str, value):
+        for s in self.sinks:
+            s.record(key, value)
+
+    def close(self):
+        for s in self.sinks:
+            s.close()
+
+
+def default_sink(out=None):
+    """Return `out`, or a stdout TextSink when the caller passed none."""
+    return out if out is not None else TextSink()
@@ -0,0 +1,238 @@
+import re
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:          # optional: the array('q') fallback gives the same results
+    np = None
+
+try:
+    from .sections import iter_command_blocks
+except ImportError:
+    from sections import iter_command_blocks
+
+__all__ = [
+    "SUMMARY_SOURCES",
+    "RouteSummaryMatrix",
+    "RouteSummaryDelta",
+    "diff_route_summaries",
+]
+
+# 'show ip route [vrf all] summary' as one dense VRF x source matrix of route
+# counts. Rows are VRFs in output order, columns the sources below (sub-counters
+# such as bgp External / Internal and isis Level-1 / Level-2 are columns too),
+# followed by any source this list does not know. With NumPy the counts are an
+# int64 ndarray and pre/post deltas, totals and tolerance checks are single
+# array expressions over all VRFs; without it the same numbers come from a
+# flat row-major array('q').
+
+SUMMARY_SOURCES = (
+    "connected", "static (persistent)", "static (non-persistent)", "VXLAN Control Service",
+    "static nexthop-group", "ospf", "Intra-area", "Inter-area", "External-1", "External-2",
+    "NSSA External-1", "NSSA External-2", "ospfv3", "bgp", "External", "Internal",
+    "isis", "Level-1", "Level-2", "rip", "internal", "attached", "aggregate",
+    "dynamic policy", "gribi", "Total Routes",
+)
+
+_VRF_LINE = re.compile(r'^VRF:\s*(\S+)')
+_SOURCE_LINE = re.compile(r'^\s*([A-Za-z][A-Za-z0-9 ()-]*?)\s+(\d+)\s*$')
+_SUB_COUNTER = re.compile(r'((?:NSSA )?[A-Za-z][A-Za-z0-9-]*):\s*(\d+)')
+_TOTAL = "Total Routes"
+
+
+class RouteSummaryMatrix:
+    """
+    Route counts by (VRF, source).
+      vrfs     [vrf, ...]                 row order
+      sources  [source, ...]              column order (SUMMARY_SOURCES first)
+      counts   ndarray (len(vrfs), len(sources)) int64, or array('q') row-major
+    A source a VRF does not print counts as 0.
+    """
+    __slots__ = ("vrfs", "sources", "counts", "_vrf_index", "_source_index")
+
+    def __init__(self, vrfs: Sequence[str] = (), sources: Sequence[str] = SUMMARY_SOURCES, counts=None):
+        self.vrfs = list(vrfs)
+        self.sources = list(sources)
+        self._vrf_index = {v: i for i, v in enumerate(self.vrfs)}
+        self._source_index = {s: j for j, s in enumerate(self.sources)}
+        size = len(self.vrfs) * len(self.sources)
+        if counts is None:
+            counts = array("q", bytes(8 * size))
+        if np is not None:
+            counts = np.asarray(counts, dtype=np.int64).reshape(len(self.vrfs), len(self.sources))
+        self.counts = counts
+
+    @classmethod
+    def from_text(cls, text: str) -> "RouteSummaryMatrix":
+        """
+        Every route summary block of a capture ('sh ip route summary',
+        'sh ip route vrf all summary'), or bare summary output without a prompt.
+        A capture with prompts but no summary block gives an empty matrix.
+        """
+        all_blocks = list(iter_command_blocks(text))
+        blocks = [b.text for b in all_blocks if b.key == "ip_route_summary"]
+        if not all_blocks:
+            blocks = [text]
+        cells: Dict[Tuple[str, str], int] = {}
+        vrfs: Dict[str, None] = {}
+        extra: Dict[str, None] = {}
+        known = set(SUMMARY_SOURCES)
+        for block in blocks:
+            vrf = "default"
+            for line in block.splitlines():
+                m = _VRF_LINE.match(line)
+                if m:
+                    vrf = m.group(1)
+                    continue
+                if ":" in line:
+                    # sub-counters: '  External: 58 Internal: 0' (skips '/31: 37' mask lines)
+                    for label, n in _SUB_COUNTER.findall(line):
+                        if label in known:
+                            cells[vrf, label] = int(n)
+                            vrfs[vrf] = None
+                    continue
+                m = _SOURCE_LINE.match(line)
+                if m:
+                    source = " ".join(m.group(1).split())
+                    cells[vrf, source] = int(m.group(2))
+                    vrfs[vrf] = None
+                    if source not in known:
+                        extra[source] = None
+        matrix = cls(vrfs, SUMMARY_SOURCES + tuple(extra))
+        ncols = len(matrix.sources)
+        vi, si = matrix._vrf_index, matrix._source_index
+        if np is not None:
+            if cells:
+                keys = list(cells)
+                rows = np.fromiter((vi[v] for v, _ in keys), dtype=np.intp, count=len(keys))
+                cols = np.fromiter((si[s] for _, s in keys), dtype=np.intp, count=len(keys))
+                matrix.counts[rows, cols] = np.fromiter(cells.values(), dtype=np.int64, count=len(keys))
+        else:
+            flat = matrix.counts
+            for (v, s), n in cells.items():
+                flat[vi[v] * ncols + si[s]] = n
+        return matrix
+
+    # ---- lookups ----
+    def __len__(self):
+        return len(self.vrfs)
+
+    def get(self, vrf: str, source: str) -> Optional[int]:
+        i, j = self._vrf_index.get(vrf), self._source_index.get(source)
+        if i is None or j is None:
+            return None
+        if np is not None:
+            return int(self.counts[i, j])
+        return self.counts[i * len(self.sources) + j]
+
+    def row(self, vrf: str) -> Dict[str, int]:
+        """{source: routes} of one VRF."""
+        i = self._vrf_index[vrf]
+        n = len(self.sources)
+        values = self.counts[i].tolist() if np is not None else self.counts[i * n:(i + 1) * n].tolist()
+        return dict(zip(self.sources, values))
+
+    def column(self, source: str) -> Dict[str, int]:
+        """{vrf: routes} of one source."""
+        j, n = self._source_index[source], len(self.sources)
+        values = self.counts[:, j].tolist() if np is not None else self.counts[j::n].tolist()
+        return dict(zip(self.vrfs, values))
+
+    def totals(self) -> Dict[str, int]:
+        """{vrf: Total Routes}."""
+        return self.column(_TOTAL)
+
+    def as_dict(self) -> Dict[str, Dict[str, int]]:
+        return {vrf: self.row(vrf) for vrf in self.vrfs}
+
+    def reindex(self, vrfs: Sequence[str], sources: Sequence[str]) -> "RouteSummaryMatrix":
+        """Same counts laid out on `vrfs` x `sources` (cells this matrix lacks are 0)."""
+        out = RouteSummaryMatrix(vrfs, sources)
+        rows = [(i, out._vrf_index[v]) for i, v in enumerate(self.vrfs) if v in out._vrf_index]
+        cols = [(j, out._source_index[s]) for j, s in enumerate(self.sources) if s in out._source_index]
+        if not rows or not cols:
+            return out
+        if np is not None:
+            src_r, dst_r = (np.array(x, dtype=np.intp) for x in zip(*rows))
+            src_c, dst_c = (np.array(x, dtype=np.intp) for x in zip(*cols))
+            out.counts[np.ix_(dst_r, dst_c)] = self.counts[np.ix_(src_r, src_c)]
+        else:
+            n_in, n_out = len(self.sources), len(out.sources)
+            for i, k in rows:
+                for j, m in cols:
+                    out.counts[k * n_out + m] = self.counts[i * n_in + j]
+        return out
+
+
+class RouteSummaryDelta:
+    """
+    post - pre of two route summary matrices on the union of their VRFs and
+    sources (see diff_route_summaries). `changed` marks the cells whose
+    delta exceeds the tolerance; VRFs only on one side count as all-zero there.
+    """
+    __slots__ = ("vrfs", "sources", "pre", "post", "delta", "changed")
+
+    def __init__(self, vrfs, sources, pre, post, delta, changed):
+        self.vrfs = vrfs
+        self.sources = sources
+        self.pre = pre
+        self.post = post
+        self.delta = delta
+        self.changed = changed
+
+    def _cells(self) -> Iterator[Tuple[int, int]]:
+        n = len(self.sources)
+        if np is not None:
+            for i, j in np.argwhere(self.changed).tolist():
+                yield i, j
+        else:
+            for k, bad in enumerate(self.changed):
+                if bad:
+                    yield divmod(k, n)
+
+    def _at(self, values, i: int, j: int) -> int:
+        if np is not None:
+            return int(values[i, j])
+        return values[i * len(self.sources) + j]
+
+    def changes(self) -> Iterator[dict]:
+        """Yield {VRF, SOURCE, PRE, POST, DELTA} for every cell out of tolerance."""
+        for i, j in self._cells():
+            yield {"VRF": self.vrfs[i], "SOURCE": self.sources[j], "PRE": self._at(self.pre, i, j),
+                   "POST": self._at(self.post, i, j), "DELTA": self._at(self.delta, i, j)}
+
+    def count(self) -> int:
+        """Number of cells out of tolerance."""
+        return int(self.changed.sum()) if np is not None else sum(self.changed)
+
+    def changed_vrfs(self) -> List[str]:
+        if np is not None:
+            return [self.vrfs[i] for i in np.flatnonzero(self.changed.any(axis=1)).tolist()]
+        return list(dict.fromkeys(self.vrfs[i] for i, _ in self._cells()))
+
+    def vrf_totals(self) -> Dict[str, Tuple[int, int, int]]:
+        """{vrf: (pre Total Routes, post Total Routes, delta)}."""
+        j = self.sources.index(_TOTAL)
+        return {vrf: (self._at(self.pre, i, j), self._at(self.post, i, j), self._at(self.delta, i, j))
+                for i, vrf in enumerate(self.vrfs)}
+
+
+def diff_route_summaries(pre: RouteSummaryMatrix, post: RouteSummaryMatrix, tolerance: float = 0.0,
+                         min_delta: int = 0) -> RouteSummaryDelta:
+    """
+    Cell-wise post - pre over the union of VRFs and sources. A cell is
+    changed when |delta| > max(min_delta, tolerance * pre).
+    """
+    vrfs = list(dict.fromkeys(pre.vrfs + post.vrfs))
+    sources = list(dict.fromkeys(pre.sources + post.sources))
+    a = pre if (pre.vrfs, pre.sources) == (vrfs, sources) else pre.reindex(vrfs, sources)
+    b = post if (post.vrfs, post.sources) == (vrfs, sources) else post.reindex(vrfs, sources)
+    if np is not None:
+        delta = b.counts - a.counts
+        allowed = np.maximum(min_delta, tolerance * a.counts)
+        changed = np.abs(delta) > allowed
+    else:
+        delta = array("q", [y - x for x, y in zip(a.counts, b.counts)])
+        changed = [abs(d) > max(min_delta, tolerance * x) for d, x in zip(delta, a.counts)]
+    return RouteSummaryDelta(vrfs, sources, a.counts, b.counts, delta, changed)
@@ -0,0 +1,244 @@
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from .records import RouteEntry
+    from .sections import PROMPT_RE, classify_command
+except ImportError:
+    from records import RouteEntry
+    from sections import PROMPT_RE, classify_command
+
+__all__ = [
+    "CODE_SOURCES",
+    "route_source",
+    "route_summary_counts",
+    "RouteTable",
+]
+
+# EOS 'show ip route [vrf all]':
+#
+#   VRF: default
+#   Codes: C - connected, S - static, K - kernel, ...
+#
+#    B E      0.0.0.0/0 [200/0] via 10.4.224.1, Ethernet49/1
+#                               via 10.4.224.129, Ethernet50/1
+#    C        10.4.231.2/31 is directly connected, Ethernet3
+#    B I      10.1.2.0/24 [200/0] via VTEP 10.4.228.10 VNI 10100 router-mac 00:1c:73:aa:bb:cc
+#
+# One pass over the lines: a route line starts a prefix, indented 'via' lines
+# add ECMP next hops to it. Each prefix is counted once under the
+# 'show ip route summary' source its code belongs to, so the counters can be
+# checked against the summary without going over the routes again.
+
+# route code -> 'show ip route summary' source
+CODE_SOURCES = {
+    "C": "connected",
+    "S": "static",
+    "NG": "static nexthop-group",
+    "V": "VXLAN Control Service",
+    "O": "ospf", "IA": "ospf", "E1": "ospf", "E2": "ospf", "N1": "ospf", "N2": "ospf",
+    "O3": "ospfv3",
+    "B": "bgp", "B I": "bgp", "B E": "bgp",
+    "I L1": "isis", "I L2": "isis",
+    "R": "rip",
+    "A B": "aggregate", "A O": "aggregate",
+    "DP": "dynamic policy",
+    "G": "gribi",
+    "K": "kernel",
+}
+
+# Summary sources that 'show ip route' does not list, and summary sources
+# reported as one ('S' covers persistent and non-persistent statics).
+_NOT_LISTED = ("internal", "attached", "Total Routes")
+_SUMMARY_GROUPS = {"static (persistent)": "static", "static (non-persistent)": "static"}
+
+_ROUTE_RE = re.compile(r'^ {0,2}([A-Z][A-Z0-9]*(?: [A-Z][A-Z0-9]*)*)\s+(\d{1,3}(?:\.\d{1,3}){3}/\d{1,2})\s+(.*)$')
+_VIA_RE = re.compile(r'via (?:VTEP )?(\d{1,3}(?:\.\d{1,3}){3})(?:,\s*(\S+))?')
+_DIST_RE = re.compile(r'\[(\d+)/(\d+)\]')
+_CONNECTED = "directly connected,"
+
+_RS_LINE = re.compile(r'^\s*([A-Za-z][A-Za-z0-9 ()-]*?)\s+(\d+)\s*$')
+_RS_VRF = re.compile(r'^VRF:\s*(\S+)')
+
+
+def route_source(codes: str) -> str:
+    """'B E' -> 'bgp', 'C' -> 'connected'; unknown codes map to 'other'."""
+    source = CODE_SOURCES.get(codes)
+    if source is None:
+        # trailing flags ('B E L' leaked, 'S *' ...) are not part of the code
+        source = CODE_SOURCES.get(" ".join(codes.split()[:2])) or CODE_SOURCES.get(codes.split()[0], "other")
+    return source
+
+
+def route_summary_counts(text: str) -> Dict[str, Dict[str, int]]:
+    """'sh ip route [vrf all] summary' -> {vrf: {source: routes}} (sub-counter lines skipped)."""
+    result: Dict[str, Dict[str, int]] = {}
+    cur = result.setdefault("default", {})
+    for line in text.splitlines():
+        m = _RS_VRF.match(line)
+        if m:
+            cur = result.setdefault(m.group(1), {})
+            continue
+        if ":" in line:
+            continue
+        m = _RS_LINE.match(line)
+        if m:
+            cur[" ".join(m.group(1).split())] = int(m.group(2))
+    return {vrf: counts for vrf, counts in result.items() if counts}
+
+
+def _next_hop(rest: str) -> Tuple[Optional[str], Optional[str]]:
+    if _CONNECTED in rest:
+        return None, rest.rsplit(",", 1)[-1].strip() or None
+    m = _VIA_RE.search(rest)
+    if m is None:
+        return None, None
+    return m.group(1), m.group(2)
+
+
+class RouteTable:
+    """
+    Per-VRF route tables of 'show ip route [vrf all]', plus counters:
+      routes   {vrf: {prefix: [RouteEntry, ...]}}   one entry per next hop
+      counts   {vrf: {source: prefixes}}            sources as in the summary
+      summary  {vrf: {source: routes}}              'sh ip route summary' counters
+                                                    of the same capture, if any
+    Next hops, interfaces, codes and sources are interned, so a large table
+    holds one string object per distinct value.
+    """
+    __slots__ = ("routes", "counts", "summary")
+
+    def __init__(self):
+        self.routes: Dict[str, Dict[str, List[RouteEntry]]] = {}
+        self.counts: Dict[str, Dict[str, int]] = {}
+        self.summary: Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def from_text(cls, text: str) -> "RouteTable":
+        return cls().feed_lines(text.splitlines())
+
+    @classmethod
+    def from_file(cls, path: str) -> "RouteTable":
+        """Stream a (normalized) capture file line by line."""
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            return cls().feed_lines(f)
+
+    def feed_lines(self, lines: Iterable[str], vrf: str = "default") -> "RouteTable":
+        """
+        Parse route blocks and route summary blocks from an iterable of lines
+        (a capture, or bare 'show ip route' output when it has no prompt).
+        """
+        mode = "ip_route"             # section of the current block
+        summary_lines: List[str] = []
+        table = self._vrf(vrf)
+        counts = self.counts[vrf]
+        last: Optional[List[RouteEntry]] = None
+        route_match, via_search = _ROUTE_RE.match, _VIA_RE.search
+        for line in lines:
+            line = line.rstrip("\n")
+            if "#" in line:
+                m = PROMPT_RE.match(line)
+                if m:
+                    if summary_lines:
+                        self._add_summary(summary_lines)
+                        summary_lines = []
+                    mode, last = classify_command(m.group("cmd").strip()), None
+                    vrf = "default"
+                    table, counts = self._vrf(vrf), self.counts[vrf]
+                    continue
+            if mode == "ip_route_summary":
+                summary_lines.append(line)
+                continue
+            if mode != "ip_route":
+                continue
+            if line.startswith("VRF: "):
+                vrf = line[5:].split()[0] if line[5:].split() else "default"
+                table, counts, last = self._vrf(vrf), self.counts[vrf], None
+                continue
+            m = route_match(line)
+            if m is not None:
+                codes, prefix, rest = m.groups()
+                source = route_source(codes)
+                d = _DIST_RE.search(rest)
+                hop, intf = _next_hop(rest)
+                entry = RouteEntry(vrf, prefix, source, codes,
+                                   int(d.group(1)) if d else None, int(d.group(2)) if d else None,
+                                   hop, intf)
+                last = table.get(prefix)
+                if last is None:
+                    last = table[prefix] = [entry]
+                    counts[source] = counts.get(source, 0) + 1
+                else:
+                    last.append(entry)
+                continue
+            if last is not None and line[:1] == " " and "via " in line:
+                v = via_search(line)
+                if v is not None:
+                    first = last[0]
+                    last.append(RouteEntry(vrf, first.PREFIX, first.SOURCE, first.CODES,
+                                           first.DISTANCE, first.METRIC, v.group(1), v.group(2)))
+                continue
+            if not line.strip():
+                last = None
+        if summary_lines:
+            self._add_summary(summary_lines)
+        for name in [v for v, t in self.routes.items() if not t and not self.counts[v]]:
+            del self.routes[name], self.counts[name]
+        return self
+
+    def _vrf(self, vrf: str) -> Dict[str, List[RouteEntry]]:
+        table = self.routes.get(vrf)
+        if table is None:
+            table = self.routes[vrf] = {}
+            self.counts[vrf] = {}
+        return table
+
+    def _add_summary(self, lines: List[str]):
+        for vrf, counts in route_summary_counts("\n".join(lines)).items():
+            self.summary.setdefault(vrf, {}).update(counts)
+
+    # ---- lookups ----
+    def __len__(self):
+        return sum(len(t) for t in self.routes.values())
+
+    def vrfs(self) -> List[str]:
+        return list(self.routes)
+
+    def get(self, prefix: str, vrf: str = "default") -> List[RouteEntry]:
+        return self.routes.get(vrf, {}).get(prefix, [])
+
+    def __iter__(self) -> Iterator[RouteEntry]:
+        for table in self.routes.values():
+            for entries in table.values():
+                yield from entries
+
+    def reconcile(self, summary: Optional[Dict[str, Dict[str, int]]] = None) -> List[dict]:
+        """
+        Per-VRF, per-source prefix counts against the route summary counters
+        (`summary`, default: the summary parsed from the same capture).
+        Returns [{VRF, SOURCE, ROUTES, SUMMARY, MATCH}] for every source
+        either side has; sources 'show ip route' never lists are skipped, and
+        so are VRFs the summary does not cover.
+        """
+        summary = self.summary if summary is None else summary
+        rows = []
+        if not self.routes:
+            return rows
+        for vrf in summary:
+            expected: Dict[str, int] = {}
+            for source, n in summary.get(vrf, {}).items():
+                if source in _NOT_LISTED:
+                    continue
+                source = _SUMMARY_GROUPS.get(source, source)
+                expected[source] = expected.get(source, 0) + n
+            parsed = self.counts.get(vrf, {})
+            for source in list(expected) + [s for s in parsed if s not in expected]:
+                a, b = parsed.get(source, 0), expected.get(source)
+                if b is None and not a:
+                    continue
+                rows.append({"VRF": vrf, "SOURCE": source, "ROUTES": a, "SUMMARY": b,
+                             "MATCH": b is not None and a == b})
+        return rows
+
+    def mismatches(self, summary: Optional[Dict[str, Dict[str, int]]] = None) -> List[dict]:
+        return [r for r in self.reconcile(summary) if not r["MATCH"]]
@@ -0,0 +1,276 @@
+import os
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    from .parallel import SECTION_PARSERS
+except ImportError:
+    from parallel import SECTION_PARSERS
+
+try:
+    import tomllib
+except ImportError:          # Python < 3.11: the tomli backport has the same API
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+try:
+    import yaml
+except ImportError:          # optional: only needed for .yaml / .yml rule files
+    yaml = None
+
+__all__ = [
+    "METRICS",
+    "COMPARATORS",
+    "SEVERITIES",
+    "Rule",
+    "RulePlan",
+    "load_rules",
+    "compile_rules",
+]
+
+# Declarative pre/post checks. A rule names a metric of the parsed snapshot
+# (auto.parallel.parse_sections), a comparator and a severity:
+#
+#   [[rule]]
+#   name = "evpn_mac_ip_routes"
+#   metric = "evpn_routes:mac-ip"        # metric name, ':'-separated arguments
+#   compare = "within"
+#   percent = 2                          # within 2% of the pre value
+#   severity = "warning"
+#
+# compile_rules() turns the rule list into one plan: every distinct
+# (metric, arguments) cell is computed once per snapshot however many rules
+# read it, the sections the plan needs are known up front (so a capture is
+# parsed once, for those sections only), and each rule is left as an index
+# into the cell values plus a pre-bound comparator.
+
+
+# ---- metrics: name -> (snapshot sections read, fn(snapshot, *args) -> number) ----
+def _evpn_section(rtype: str) -> str:
+    return "evpn_" + rtype.replace("-", "_")
+
+
+def _evpn_routes(snap, rtype):
+    routes = snap.get(_evpn_section(rtype))
+    return None if routes is None else len(routes)
+
+
+def _evpn_paths(snap, rtype):
+    routes = snap.get(_evpn_section(rtype))
+    return None if routes is None else sum(routes.paths)
+
+
+def _mac_table(snap):
+    return snap.get("mac_address_table_dynamic")
+
+
+def _route_summary(snap, vrf="default", source="Total Routes"):
+    summary = snap.get("ip_route_summary")
+    if summary is None or vrf not in summary:
+        return None
+    return summary[vrf].get(source, 0)
+
+
+def _ip_route_prefixes(snap, vrf=None):
+    table = snap.get("ip_route")
+    if table is None:
+        return None
+    return len(table) if vrf is None else len(table.routes.get(vrf, {}))
+
+
+def _count(section, field, default):
+    def metric(snap, value=default):
+        index = snap.get(section)
+        return None if index is None else index.counts(field).get(value, 0)
+    return metric
+
+
+def _size(value):
+    return None if value is None else len(value)
+
+
+def _sized(section, attr=None):
+    def metric(snap):
+        value = snap.get(section)
+        if value is None:
+            return None
+        return len(value) if attr is None else getattr(value, attr)()
+    return metric
+
+
+# The section function takes the rule arguments, so it also checks their number.
+METRICS: Dict[str, Tuple[Callable[..., Tuple[str, ...]], Callable]] = {
+    "mac_dynamic_total": (lambda: ("mac_address_table_dynamic",), lambda s: _size(_mac_table(s))),
+    "mac_moved": (lambda: ("mac_address_table_dynamic",),
+                  lambda s: None if _mac_table(s) is None else len(_mac_table(s).moved())),
+    "mac_vlan": (lambda vlan: ("mac_address_table_dynamic",),
+                 lambda s, vlan: None if _mac_table(s) is None else len(_mac_table(s).in_vlan(int(vlan)))),
+    "mac_port": (lambda port: ("mac_address_table_dynamic",),
+                 lambda s, port: None if _mac_table(s) is None else len(_mac_table(s).on_port(port))),
+    "evpn_routes": (lambda rtype: (_evpn_section(rtype),), _evpn_routes),
+    "evpn_paths": (lambda rtype: (_evpn_section(rtype),), _evpn_paths),
+    "route_summary": (lambda vrf="default", source="": ("ip_route_summary",), _route_summary),
+    "ip_route_prefixes": (lambda vrf=None: ("ip_route",), _ip_route_prefixes),
+    "interfaces": (lambda status="": ("interfaces_status",), _count("interfaces_status", "STATUS", "connected")),
+    "ip_interfaces": (lambda status="": ("ip_interface_brief",), _count("ip_interface_brief", "IP_STATUS", "up")),
+    "bgp_neighbors": (lambda: ("bgp_summary",), _sized("bgp_summary")),
+    "bgp_established": (lambda: ("bgp_summary",), _sized("bgp_summary", "established")),
+    "bgp_evpn_neighbors": (lambda: ("bgp_evpn_summary",), _sized("bgp_evpn_summary")),
+    "bgp_evpn_established": (lambda: ("bgp_evpn_summary",), _sized("bgp_evpn_summary", "established")),
+    "vteps": (lambda: ("vxlan_vtep_detail",), _sized("vxlan_vtep_detail")),
+    "vlans": (lambda: ("vlan_brief",), _sized("vlan_brief")),
+}
+
+
+# ---- comparators: name -> fn(pre, post, rule) -> bool ----
+def _within(a, b, rule):
+    return abs(b - a) <= max(rule.min_delta, rule.percent / 100.0 * abs(a))
+
+
+COMPARATORS: Dict[str, Callable] = {
+    "equal": lambda a, b, rule: a == b,
+    "non_decreasing": lambda a, b, rule: b >= a,
+    "non_increasing": lambda a, b, rule: b <= a,
+    "within": _within,
+    "at_least": lambda a, b, rule: b >= rule.value,
+    "at_most": lambda a, b, rule: b <= rule.value,
+}
+# comparators that only look at the post value
+_POST_ONLY = ("at_least", "at_most")
+
+SEVERITIES = ("error", "warning", "info")
+
+
+class Rule:
+    """One rule as declared (see load_rules for the file format)."""
+    __slots__ = ("name", "metric", "args", "compare", "severity", "percent", "min_delta", "value")
+
+    def __init__(self, metric: str, compare: str = "equal", severity: str = "error", name: Optional[str] = None,
+                 args: Sequence = (), percent: float = 0.0, min_delta: float = 0, value: Optional[float] = None):
+        metric, *inline = metric.split(":")
+        self.metric = metric
+        self.args = tuple(str(a) for a in inline) + tuple(str(a) for a in args)
+        self.name = name or ":".join((metric,) + self.args)
+        self.compare = compare
+        self.severity = severity
+        self.percent = float(percent)
+        self.min_delta = min_delta
+        self.value = value
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "Rule":
+        if "metric" not in d:
+            raise ValueError(f"rule without a metric: {d!r}")
+        known = {k: d[k] for k in cls.__slots__ if k in d}
+        unknown = set(d) - set(known)
+        if unknown:
+            raise ValueError(f"rule {d.get('name') or d['metric']!r}: unknown keys {sorted(unknown)}")
+        return cls(**known)
+
+    def __repr__(self):
+        return f"Rule({self.name!r}, {self.compare!r}, {self.severity!r})"
+
+
+def load_rules(path: str) -> List[Rule]:
+    """
+    Rules from a TOML file ('[[rule]]' tables) or a YAML file (a 'rules:' list,
+    or a bare list). Keys: metric (required), compare, severity, name, args,
+    percent, min_delta, value.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".yaml", ".yml"):
+        if yaml is None:
+            raise ImportError("PyYAML is required for YAML rule files (pip install pyyaml)")
+        with open(path, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f) or []
+    else:
+        if tomllib is None:
+            raise ImportError("tomllib (Python 3.11+) or tomli is required for TOML rule files")
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    if isinstance(data, dict):
+        data = data.get("rule", data.get("rules", []))
+    return [Rule.from_dict(d) for d in data]
+
+
+class RulePlan:
+    """
+    Compiled rules (see compile_rules):
+      sections  snapshot section keys the plan reads, for parse_sections(keys=...)
+      cells     [(metric fn, args)]   one per distinct metric + arguments
+      steps     [(rule, cell index, comparator)]
+    """
+    __slots__ = ("sections", "cells", "steps")
+
+    def __init__(self):
+        self.sections: List[str] = []
+        self.cells: List[Tuple[Callable, tuple]] = []
+        self.steps: List[Tuple[Rule, int, Callable]] = []
+
+    def __len__(self):
+        return len(self.steps)
+
+    def values(self, snapshot: Optional[dict]) -> List[Optional[float]]:
+        """Every cell of one snapshot (None where the section was not captured)."""
+        if snapshot is None:
+            return [None] * len(self.cells)
+        return [fn(snapshot, *args) for fn, args in self.cells]
+
+    def evaluate(self, pre: Optional[dict], post: Optional[dict]) -> List[tuple]:
+        """
+        Run every rule against two snapshots. Returns
+        [(name, pre value, post value, status, severity)] in rule order;
+        status is PASS, FAIL for a failed "error" rule, WARN for a failed
+        "warning" / "info" rule, or SKIP when a value the rule needs is missing.
+        """
+        a, b = self.values(pre), self.values(post)
+        out = []
+        for rule, cell, compare in self.steps:
+            x, y = a[cell], b[cell]
+            if y is None or (x is None and rule.compare not in _POST_ONLY):
+                status = "SKIP"
+            else:
+                status = "PASS" if compare(x, y, rule) else "FAIL" if rule.severity == "error" else "WARN"
+            out.append((rule.name, x, y, status, rule.severity))
+        return out
+
+
+def compile_rules(rules: Iterable) -> RulePlan:
+    """
+    Validate rules (Rule objects or dicts) and build one RulePlan. Raises
+    ValueError naming the rule for an unknown metric, comparator or severity,
+    or arguments the metric does not take.
+    """
+    plan = RulePlan()
+    cell_index: Dict[Tuple[str, tuple], int] = {}
+    sections: Dict[str, None] = {}
+    for rule in rules:
+        if isinstance(rule, dict):
+            rule = Rule.from_dict(rule)
+        entry = METRICS.get(rule.metric)
+        if entry is None:
+            raise ValueError(f"rule {rule.name!r}: unknown metric {rule.metric!r}")
+        compare = COMPARATORS.get(rule.compare)
+        if compare is None:
+            raise ValueError(f"rule {rule.name!r}: unknown comparator {rule.compare!r}")
+        if rule.severity not in SEVERITIES:
+            raise ValueError(f"rule {rule.name!r}: unknown severity {rule.severity!r}")
+        if rule.compare in _POST_ONLY and rule.value is None:
+            raise ValueError(f"rule {rule.name!r}: {rule.compare} needs a value")
+        needs, fn = entry
+        try:
+            keys = needs(*rule.args)
+        except TypeError:
+            raise ValueError(f"rule {rule.name!r}: bad arguments {list(rule.args)} for {rule.metric!r}") from None
+        missing = [k for k in keys if k not in SECTION_PARSERS]
+        if missing:
+            raise ValueError(f"rule {rule.name!r}: no parser for section {missing[0]!r}")
+        sections.update(dict.fromkeys(keys))
+        cell = cell_index.get((rule.metric, rule.args))
+        if cell is None:
+            cell = cell_index[rule.metric, rule.args] = len(plan.cells)
+            plan.cells.append((fn, rule.args))
+        plan.steps.append((rule, cell, compare))
+    plan.sections = list(sections)
+    return plan
@@ -2,6 +2,7 @@ import os
 import re
 import io
 import sys
+import contextlib
 # --- TextFSM compatibility shim (handles missing attributes) ---
 try:
     import textfsm  # type: ignore
@@ -59,10 +60,17 @@ except Exception:
         VrfReservedPorts
     )
 
+try:
+    from .render import TextSink, default_sink
+    from .capture import read_capture
+except Exception:
+    from render import TextSink, default_sink
+    from capture import read_capture
+
 # NOTE: Core parsing (all regex/block extraction) resides in network_parsers.py.
 # This script mainly orchestrates reading test.txt and printing formatted summaries.
 
-def _print_route_summary_table(raw: str):
+def _print_route_summary_table(raw: str, out=None):
     # parser = NetworkParsers()
     # rows = parser.parse_ip_route_summary(raw)
     # if not rows:
@@ -84,6 +92,7 @@ def _print_route_summary_table(raw: str):
     #         print(f"{src.ljust(target_width)}{str(cnt).rjust(4)}")
     # print("")
     # REPLACED: print raw lines (no re-parsing) matching expected format
+    out = default_sink(out)
     lines = raw.splitlines()
     start = None
     for i, l in enumerate(lines):
@@ -94,7 +103,7 @@ def _print_route_summary_table(raw: str):
             start = i + 1
             break
     if start is None:
-        print("\nIP Route Summary (raw): none")
+        out.line("\nIP Route Summary (raw): none")
         return
     block = []
     for l in lines[start:]:
@@ -112,10 +121,10 @@ def _print_route_summary_table(raw: str):
            or re.match(r'\s*External:', l) \
            or re.match(r'\s*Level-1:', l):
             wanted.append(l)
-    print("\nIP Route Summary (raw):")
+    out.line("\nIP Route Summary (raw):")
     for idx, l in enumerate(wanted):
         # First line without leading spaces (as per expected snippet)
-        print(l.lstrip() if idx == 0 else l)
+        out.line(l.lstrip() if idx == 0 else l)
     # Added parsed values
     rgx = re.compile(r'^\s*([A-Za-z][A-Za-z0-9 ()/_-]*?)\s+(\d+)\s*$')
     allowed = {
@@ -129,77 +138,81 @@ def _print_route_summary_table(raw: str):
         if m and m.group(1) in allowed:
             parsed[m.group(1)] = int(m.group(2))
     if parsed:
-        print("\nIP Route Summary (values):")
+        out.line("\nIP Route Summary (values):")
         for k in sorted(parsed):
-            print(f"{k} {parsed[k]}")
+            out.line(f"{k} {parsed[k]}")
 
-def _print_igmp_snooping_querier(raw: str):
+def _print_igmp_snooping_querier(raw: str, out=None):
+    out = default_sink(out)
     parser = NetworkParsers()
     result = parser.parse_igmp_snooping_querier(raw)
-    print("\nCommand executed:\nshow igmp snooping querier")
+    out.line("\nCommand executed:\nshow igmp snooping querier")
     if not result["lines"]:
-        print("No IGMP snooping querier output found.")
+        out.line("No IGMP snooping querier output found.")
         return
     for l in result["lines"]:
-        print(l)
-    print(f"\nVLAN record count: {result['vlan_count']}")
+        out.line(l)
+    out.line(f"\nVLAN record count: {result['vlan_count']}")
 
-def _print_vlan_brief(raw: str):
+def _print_vlan_brief(raw: str, out=None):
+    out = default_sink(out)
     parser = NetworkParsers()
     rows = parser.parse_vlan_brief(raw)
-    print("\nCommand executed:\nshow vlan brief")
+    out.line("\nCommand executed:\nshow vlan brief")
     if not rows:
-        print("No VLAN brief data.")
+        out.line("No VLAN brief data.")
         return
     v_w = max(len("VLAN"), *(len(r["VLAN"]) for r in rows))
     n_w = max(len("Name"), *(len(r["NAME"]) for r in rows))
     s_w = max(len("Status"), *(len(r["STATUS"]) for r in rows))
     header = f"{'VLAN'.ljust(v_w)}  {'Name'.ljust(n_w)}  {'Status'.ljust(s_w)}  Ports"
-    print(header)
-    print("-" * len(header))
+    out.line(header)
+    out.line("-" * len(header))
     for r in rows:
-        print(f"{r['VLAN'].ljust(v_w)}  {r['NAME'].ljust(n_w)}  {r['STATUS'].ljust(s_w)}  {r['PORTS']}")
-    print("-" * len(header))
-    print(f"Total VLANs: {len(rows)}")
+        out.line(f"{r['VLAN'].ljust(v_w)}  {r['NAME'].ljust(n_w)}  {r['STATUS'].ljust(s_w)}  {r['PORTS']}")
+    out.line("-" * len(header))
+    out.line(f"Total VLANs: {len(rows)}")
 
-def _print_vlan_dynamic(raw: str):
+def _print_vlan_dynamic(raw: str, out=None):
+    out = default_sink(out)
     parser = NetworkParsers()
     rows = parser.parse_vlan_dynamic(raw)
-    print("\nCommand executed:\nshow vlan dynamic")
+    out.line("\nCommand executed:\nshow vlan dynamic")
     if not rows:
-        print("No dynamic VLAN data.")
+        out.line("No dynamic VLAN data.")
         return
     v_w = max(len("VLAN"), *(len(r["VLAN"]) for r in rows))
     n_w = max(len("Name"), *(len(r["NAME"]) for r in rows))
     s_w = max(len("Status"), *(len(r["STATUS"]) for r in rows))
     header = f"{'VLAN'.ljust(v_w)}  {'Name'.ljust(n_w)}  {'Status'.ljust(s_w)}  Ports"
-    print(header)
-    print("-" * len(header))
+    out.line(header)
+    out.line("-" * len(header))
     for r in rows:
-        print(f"{r['VLAN'].ljust(v_w)}  {r['NAME'].ljust(n_w)}  {r['STATUS'].ljust(s_w)}  {r['PORTS']}")
-    print("-" * len(header))
-    print(f"Total Dynamic VLANs: {len(rows)}")
+        out.line(f"{r['VLAN'].ljust(v_w)}  {r['NAME'].ljust(n_w)}  {r['STATUS'].ljust(s_w)}  {r['PORTS']}")
+    out.line("-" * len(header))
+    out.line(f"Total Dynamic VLANs: {len(rows)}")
 
-def _print_bgp_evpn_route_type_auto_discovery_from_sample():
+def _print_bgp_evpn_route_type_auto_discovery_from_sample(out=None):
     """Load test.txt and print EVPN auto-discovery Network entries with counts."""
+    out = default_sink(out)
     sample_path = os.path.join(os.path.dirname(__file__), "test.txt")
     if not os.path.isfile(sample_path):
-        print("\n(test) sh bgp evpn route-type auto-discovery: test.txt not found.")
+        out.line("\n(test) sh bgp evpn route-type auto-discovery: test.txt not found.")
         return
     try:
         raw = open(sample_path, "r", encoding="utf-8", errors="ignore").read()
     except Exception as e:
-        print(f"\nError reading test.txt: {e}")
+        out.line(f"\nError reading test.txt: {e}")
         return
     parser = NetworkParsers()
     rows = parser.parse_bgp_evpn_route_type_auto_discovery(raw)
-    print("\nCommand executed (from test.txt):\nsh bgp evpn route-type auto-discovery")
+    out.line("\nCommand executed (from test.txt):\nsh bgp evpn route-type auto-discovery")
     if not rows:
-        print("No auto-discovery route-type data found.")
+        out.line("No auto-discovery route-type data found.")
         return
-    print("Entries (all occurrences):")
+    out.line("Entries (all occurrences):")
     for r in rows:
-        print(f"  RD {r.get('RD')}")
+        out.line(f"  RD {r.get('RD')}")
     counts = {}
     for r in rows:
         rd = r.get("RD")
@@ -208,37 +221,38 @@ def _print_bgp_evpn_route_type_auto_discovery_from_sample():
     rd_w = max(len("RD"), *(len(x) for x in counts))
     c_w = len("Count")
     header = f"{'RD'.ljust(rd_w)}  {'Count'.rjust(c_w)}"
-    print("\nSummary:")
-    print(header)
-    print("-" * len(header))
+    out.line("\nSummary:")
+    out.line(header)
+    out.line("-" * len(header))
     total = 0
     for rd in sorted(counts):
         v = counts[rd]; total += v
-        print(f"{rd.ljust(rd_w)}  {str(v).rjust(c_w)}")
-    print("-" * len(header))
-    print(f"{'TOTAL DISTINCT'.ljust(rd_w)}  {str(len(counts)).rjust(c_w)}")
-    print(f"{'TOTAL OCCURRENCES'.ljust(rd_w)}  {str(total).rjust(c_w)}")
+        out.line(f"{rd.ljust(rd_w)}  {str(v).rjust(c_w)}")
+    out.line("-" * len(header))
+    out.line(f"{'TOTAL DISTINCT'.ljust(rd_w)}  {str(len(counts)).rjust(c_w)}")
+    out.line(f"{'TOTAL OCCURRENCES'.ljust(rd_w)}  {str(total).rjust(c_w)}")
 
-def _print_bgp_evpn_route_type_mac_ip_from_sample():
+def _print_bgp_evpn_route_type_mac_ip_from_sample(out=None):
     """Load test.txt and print EVPN mac-ip Route Distinguisher entries with counts."""
+    out = default_sink(out)
     sample_path = os.path.join(os.path.dirname(__file__), "test.txt")
     if not os.path.isfile(sample_path):
-        print("\n(test) sh bgp evpn route-type mac-ip: test.txt not found.")
+        out.line("\n(test) sh bgp evpn route-type mac-ip: test.txt not found.")
         return
     try:
         raw = open(sample_path, "r", encoding="utf-8", errors="ignore").read()
     except Exception as e:
-        print(f"\nError reading test.txt: {e}")
+        out.line(f"\nError reading test.txt: {e}")
         return
     parser = NetworkParsers()
     rows = parser.parse_bgp_evpn_route_type_mac_ip(raw)
-    print("\nCommand executed (from test.txt):\nsh bgp evpn route-type mac-ip")
+    out.line("\nCommand executed (from test.txt):\nsh bgp evpn route-type mac-ip")
     if not rows:
-        print("No mac-ip route-type data found.")
+        out.line("No mac-ip route-type data found.")
         return
-    print("Entries (all occurrences):")
+    out.line("Entries (all occurrences):")
     for r in rows:
-        print(f"  RD {r.get('RD')}  MAC {r.get('MAC')}  IP {r.get('IP') or ''}")
+        out.line(f"  RD {r.get('RD')}  MAC {r.get('MAC')}  IP {r.get('IP') or ''}")
     rd_counts = {}
     for r in rows:
         rd = r.get("RD")
@@ -247,37 +261,38 @@ def _print_bgp_evpn_route_type_mac_ip_from_sample():
     rd_w = max(len("RD"), *(len(x) for x in rd_counts))
     c_w = len("Count")
     header = f"{'RD'.ljust(rd_w)}  {'Count'.rjust(c_w)}"
-    print("\nSummary:")
-    print(header)
-    print("-" * len(header))
+    out.line("\nSummary:")
+    out.line(header)
+    out.line("-" * len(header))
     total = 0
     for rd in sorted(rd_counts):
         v = rd_counts[rd]; total += v
-        print(f"{rd.ljust(rd_w)}  {str(v).rjust(c_w)}")
-    print("-" * len(header))
-    print(f"{'TOTAL DISTINCT'.ljust(rd_w)}  {str(len(rd_counts)).rjust(c_w)}")
-    print(f"{'TOTAL OCCURRENCES'.ljust(rd_w)}  {str(total).rjust(c_w)}")
+        out.line(f"{rd.ljust(rd_w)}  {str(v).rjust(c_w)}")
+    out.line("-" * len(header))
+    out.line(f"{'TOTAL DISTINCT'.ljust(rd_w)}  {str(len(rd_counts)).rjust(c_w)}")
+    out.line(f"{'TOTAL OCCURRENCES'.ljust(rd_w)}  {str(total).rjust(c_w)}")
 
-def _print_bgp_evpn_route_type_imet_from_sample():
+def _print_bgp_evpn_route_type_imet_from_sample(out=None):
     """Load test.txt and print EVPN imet RD counts."""
+    out = default_sink(out)
     sample_path = os.path.join(os.path.dirname(__file__), "test.txt")
     if not os.path.isfile(sample_path):
-        print("\n(test) sh bgp evpn route-type imet: test.txt not found.")
+        out.line("\n(test) sh bgp evpn route-type imet: test.txt not found.")
         return
     try:
         raw = open(sample_path, "r", encoding="utf-8", errors="ignore").read()
     except Exception as e:
-        print(f"\nError reading test.txt: {e}")
+        out.line(f"\nError reading test.txt: {e}")
         return
     parser = NetworkParsers()
     rows = parser.parse_bgp_evpn_route_type_imet(raw)
-    print("\nCommand executed (from test.txt):\nsh bgp evpn route-type imet")
+    out.line("\nCommand executed (from test.txt):\nsh bgp evpn route-type imet")
     if not rows:
-        print("No imet route-type data found.")
+        out.line("No imet route-type data found.")
         return
-    print("Entries (all occurrences):")
+    out.line("Entries (all occurrences):")
     for r in rows:
-        print(f"  RD {r.get('RD')}  IP {r.get('IP') or ''}")
+        out.line(f"  RD {r.get('RD')}  IP {r.get('IP') or ''}")
     counts = {}
     for r in rows:
         rd = r.get("RD")
@@ -286,41 +301,42 @@ def _print_bgp_evpn_route_type_imet_from_sample():
     rd_w = max(len("RD"), *(len(x) for x in counts))
     c_w = len("Count")
     header = f"{'RD'.ljust(rd_w)}  {'Count'.rjust(c_w)}"
-    print("\nSummary:")
-    print(header)
-    print("-" * len(header))
+    out.line("\nSummary:")
+    out.line(header)
+    out.line("-" * len(header))
     total = 0
     for rd in sorted(counts):
         v = counts[rd]; total += v
-        print(f"{rd.ljust(rd_w)}  {str(v).rjust(c_w)}")
-    print("-" * len(header))
-    print(f"{'TOTAL DISTINCT'.ljust(rd_w)}  {str(len(counts)).rjust(c_w)}")
-    print(f"{'TOTAL OCCURRENCES'.ljust(rd_w)}  {str(total).rjust(c_w)}")
+        out.line(f"{rd.ljust(rd_w)}  {str(v).rjust(c_w)}")
+    out.line("-" * len(header))
+    out.line(f"{'TOTAL DISTINCT'.ljust(rd_w)}  {str(len(counts)).rjust(c_w)}")
+    out.line(f"{'TOTAL OCCURRENCES'.ljust(rd_w)}  {str(total).rjust(c_w)}")
 
-def _print_bgp_evpn_route_type_ethernet_segment_from_sample():
+def _print_bgp_evpn_route_type_ethernet_segment_from_sample(out=None):
     """Load test.txt and print EVPN ethernet-segment RD/ESI counts."""
+    out = default_sink(out)
     sample_path = os.path.join(os.path.dirname(__file__), "test.txt")
     if not os.path.isfile(sample_path):
-        print("\n(test) sh bgp evpn route-type ethernet-segment: test.txt not found.")
+        out.line("\n(test) sh bgp evpn route-type ethernet-segment: test.txt not found.")
         return
     try:
         raw = open(sample_path, "r", encoding="utf-8", errors="ignore").read()
     except Exception as e:
-        print(f"\nError reading test.txt: {e}")
+        out.line(f"\nError reading test.txt: {e}")
         return
     parser = NetworkParsers()
     fn = getattr(parser, "parse_bgp_evpn_route_type_ethernet_segment", None)
     if not fn:
-        print("Parser for ethernet-segment not implemented.")
+        out.line("Parser for ethernet-segment not implemented.")
         return
     rows = fn(raw)
-    print("\nCommand executed (from test.txt):\nsh bgp evpn route-type ethernet-segment")
+    out.line("\nCommand executed (from test.txt):\nsh bgp evpn route-type ethernet-segment")
     if not rows:
-        print("No ethernet-segment route-type data found.")
+        out.line("No ethernet-segment route-type data found.")
         return
-    print("Entries (all occurrences):")
+    out.line("Entries (all occurrences):")
     for r in rows:
-        print(f"  RD {r.get('RD')}  ESI {r.get('ESI')}")
+        out.line(f"  RD {r.get('RD')}  ESI {r.get('ESI')}")
     counts = {}
     for r in rows:
         rd = r.get("RD")
@@ -329,88 +345,102 @@ def _print_bgp_evpn_route_type_ethernet_segment_from_sample():
     rd_w = max(len("RD"), *(len(x) for x in counts))
     c_w = len("Count")
     header = f"{'RD'.ljust(rd_w)}  {'Count'.rjust(c_w)}"
-    print("\nSummary:")
-    print(header)
-    print("-" * len(header))
+    out.line("\nSummary:")
+    out.line(header)
+    out.line("-" * len(header))
     total = 0
     for rd in sorted(counts):
         v = counts[rd]; total += v
-        print(f"{rd.ljust(rd_w)}  {str(v).rjust(c_w)}")
-    print("-" * len(header))
-    print(f"{'TOTAL DISTINCT'.ljust(rd_w)}  {str(len(counts)).rjust(c_w)}")
-    print(f"{'TOTAL OCCURRENCES'.ljust(rd_w)}  {str(total).rjust(c_w)}")
+        out.line(f"{rd.ljust(rd_w)}  {str(v).rjust(c_w)}")
+    out.line("-" * len(header))
+    out.line(f"{'TOTAL DISTINCT'.ljust(rd_w)}  {str(len(counts)).rjust(c_w)}")
+    out.line(f"{'TOTAL OCCURRENCES'.ljust(rd_w)}  {str(total).rjust(c_w)}")
 
-def _write_output_file(content: str, filename: str):
-    """Write captured script output to a file in the same directory."""
+@contextlib.contextmanager
+def _output_sink(filename: str, echo: bool = True):
+    """
+    TextSink that streams straight into `filename` in the same directory
+    (and to stdout when `echo`), so the report is never held in memory.
+    """
     out_path = os.path.join(os.path.dirname(__file__), filename)
+    streams = [sys.stdout] if echo else []
+    f = None
     try:
-        with open(out_path, "w", encoding="utf-8") as f:
-            f.write(content)
+        f = open(out_path, "w", encoding="utf-8")
+        streams.append(f)
     except Exception as e:
         print(f"Failed writing {filename}: {e}")
+    try:
+        yield TextSink(*streams)
+    finally:
+        if f is not None:
+            f.close()
 
 def _run_parsing(raw: str):
     isc = InterfacesStatusCount()  # reuse object for methods; override content
     isc.content = raw or ""
     buf = io.StringIO()
-    # Start capture
+    out = TextSink(buf)
     up, down = isc.count_ip_interfaces()
     conn, dis = isc.count_interfaces()
-    isc.display_results()
+    isc.display_results(out)
     bgp = BgpStatus(isc.content)
-    bgp.print_bgp_status()
+    bgp.print_bgp_status(out)
     up, down = isc.count_ip_interfaces()
     conn, dis = isc.count_interfaces()
     est = bgp.count_established_sessions()
-    print("\n--- Summary ---")
-    print(f"UP: {up} DOWN: {down} CONNECTED: {conn} DISABLED: {dis} ESTABLISHED BGP: {est}")
+    out.line("\n--- Summary ---")
+    out.line(f"UP: {up} DOWN: {down} CONNECTED: {conn} DISABLED: {dis} ESTABLISHED BGP: {est}")
     # Class-based tables
-    rs = RouteSummary(isc.content); rs.print()
-    ig = IgmpSnoopingQuerier(isc.content); ig.print()
-    vb = VlanBrief(isc.content); vb.print()
-    vd = VlanDynamic(isc.content); vd.print()
-    ev = EvpnRouteTypes(isc.content); ev.print_summary()
+    rs = RouteSummary(isc.content); rs.print(out)
+    ig = IgmpSnoopingQuerier(isc.content); ig.print(out)
+    vb = VlanBrief(isc.content); vb.print(out)
+    vd = VlanDynamic(isc.content); vd.print(out)
+    ev = EvpnRouteTypes(isc.content); ev.print_summary(out)
     # EVPN detailed
-    _print_bgp_evpn_route_type_auto_discovery_from_sample()
-    _print_bgp_evpn_route_type_mac_ip_from_sample()
-    _print_bgp_evpn_route_type_imet_from_sample()
-    _print_bgp_evpn_route_type_ethernet_segment_from_sample()
+    _print_bgp_evpn_route_type_auto_discovery_from_sample(out)
+    _print_bgp_evpn_route_type_mac_ip_from_sample(out)
+    _print_bgp_evpn_route_type_imet_from_sample(out)
+    _print_bgp_evpn_route_type_ethernet_segment_from_sample(out)
     # Non-class helpers
-    _print_route_summary_table(isc.content)
-    _print_igmp_snooping_querier(isc.content)
-    _print_vlan_brief(isc.content)
-    _print_vlan_dynamic(isc.content)
+    _print_route_summary_table(isc.content, out)
+    _print_igmp_snooping_querier(isc.content, out)
+    _print_vlan_brief(isc.content, out)
+    _print_vlan_dynamic(isc.content, out)
     return buf.getvalue()
 
-def _print_interface_sections(isc: InterfacesStatusCount):
+def _print_interface_sections(isc: InterfacesStatusCount, out=None):
     # Count interface states once and print in requested format.
+    out = default_sink(out)
     up, down = isc.count_ip_interfaces()
     conn, dis = isc.count_interfaces()
-    print("command executed: show interfaces status")
-    print(f"Number of interfaces CONNECTED: {conn}")
-    print(f"Number of interfaces DISABLED: {dis}")
-    print("\ncommand executed: show ip interface brief")
-    print(f"Number of interfaces UP: {up}")
-    print(f"Number of interfaces DOWN: {down}")
+    out.line("command executed: show interfaces status")
+    out.line(f"Number of interfaces CONNECTED: {conn}")
+    out.line(f"Number of interfaces DISABLED: {dis}")
+    out.line("\ncommand executed: show ip interface brief")
+    out.line(f"Number of interfaces UP: {up}")
+    out.line(f"Number of interfaces DOWN: {down}")
     return up, down, conn, dis
 
-def _print_bgp_evpn_summary(raw: str):
+def _print_bgp_evpn_summary(raw: str, out=None):
+    out = default_sink(out)
     parser = NetworkParsers()
     rows = parser.parse_bgp_evpn_neighbor_summary(raw)
-    print("\nCommand executed:\nsh bgp evpn summary")
+    out.line("\nCommand executed:\nsh bgp evpn summary")
     if not rows:
-        print("No EVPN summary neighbor data found.")
+        out.line("No EVPN summary neighbor data found.")
         return
     estab = sum(1 for r in rows if r["STATE"].lower().startswith("estab"))
-    print(f"Neighbor count: {len(rows)}  Established: {estab}")
+    out.line(f"Neighbor count: {len(rows)}  Established: {estab}")
 
-def _print_bgp_summary(raw: str):
+def _print_bgp_summary(raw: str, out=None):
     """Use BgpStatus internal parser (_records) for accurate neighbor / established counts."""
+    out = default_sink(out)
     bs = BgpStatus(raw)
     rows = bs._records()
     estab = sum(1 for r in rows if r[2].lower().startswith("estab"))
-    print("\ncommand executed: show bgp summary")
-    print(f"Neighbor count: {len(rows)} Established: {estab}")
+    out.line("\ncommand executed: show bgp summary")
+    out.line(f"Neighbor count: {len(rows)} Established: {estab}")
 
 def _manual_bgp_summary_neighbors(raw: str):
     """
@@ -474,25 +504,26 @@ def _manual_bgp_summary_neighbors(raw: str):
         i += 1
     return results
 
-def _print_bgp_summary_ipv4(raw: str):
+def _print_bgp_summary_ipv4(raw: str, out=None):
     """
     Same style as _print_bgp_evpn_summary: counts neighbors & established.
     """
+    out = default_sink(out)
     parser = NetworkParsers()
     rows = parser.parse_bgp_summary(raw)
-    print("\nCommand executed:\nsh bgp summary")
+    out.line("\nCommand executed:\nsh bgp summary")
     if not rows:
-        print("No BGP summary neighbor data found.")
+        out.line("No BGP summary neighbor data found.")
         return
     estab = sum(1 for r in rows if (r.get("STATE","").lower().startswith("estab")))
-    print(f"Neighbor count: {len(rows)} Established: {estab}")
+    out.line(f"Neighbor count: {len(rows)} Established: {estab}")
 
 def main():
     # Run for test.txt (existing behavior)
     test_path = os.path.join(os.path.dirname(__file__), "test.txt")
     test_raw = ""
     if os.path.isfile(test_path):
-        test_raw = open(test_path, "r", encoding="utf-8", errors="ignore").read()
+        test_raw = read_capture(test_path)
     # Fallback: if route summary missing, try script_output.txt
     if "ip route summary" not in test_raw.lower():
         fallback_path = os.path.join(os.path.dirname(__file__), "script_output.txt")
@@ -503,22 +534,15 @@ def main():
                     test_raw += "\n" + extra
             except Exception:
                 pass
-    _buf = io.StringIO()
-    _real_stdout = sys.stdout
-    sys.stdout = _buf
-    try:
+    # Streamed to file (for review, if needed); returns the interface counts.
+    with _output_sink("parsed_output.txt", echo=False) as out:
         isc = InterfacesStatusCount()
         isc.content = test_raw
-        up, down, conn, dis = _print_interface_sections(isc)
+        up, down, conn, dis = _print_interface_sections(isc, out)
         bgp = BgpStatus(isc.content)
-        _print_bgp_summary_ipv4(isc.content)
-        bgp.print_bgp_status()
+        _print_bgp_summary_ipv4(isc.content, out)
+        bgp.print_bgp_status(out)
         # --- ADDED: print IP route summary block ---
         rs = RouteSummary(isc.content)
-        rs.print()
-    finally:
-        sys.stdout = _real_stdout
-    output = _buf.getvalue()
-    # Write to file (for review, if needed)
-    _write_output_file(output, "parsed_output.txt")
-    return output
\ No newline at end of file
+        rs.print(out)
+    return up, down, conn, dis
\ No newline at end of file
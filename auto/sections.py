@@ -0,0 +1,95 @@
+import re
+from typing import Iterator, List, Optional
+
+__all__ = [
+    "PROMPT_RE",
+    "SECTION_PATTERNS",
+    "CommandBlock",
+    "classify_command",
+    "iter_command_blocks",
+]
+
+# Device prompt at the start of a line, e.g.
+#   EMEA-UK-LON-THN2-MBL51#sh bgp summary
+#   MEA-UK-LON-THN2-MBL51#sh bgp evpn route-type auto-discovery   (truncated host)
+#   leaf1(config)#show vlan brief
+PROMPT_RE = re.compile(r'^(?P<host>[A-Za-z0-9][A-Za-z0-9._-]*)(?:\([^)]*\))?#(?P<cmd>.*)$')
+
+# Ordered (section key, command regex). More specific commands come first
+# ("bgp evpn summary" before "bgp summary").
+SECTION_PATTERNS = [
+    ("interfaces_status", re.compile(r'^sh(?:ow)?\s+int(?:erfaces?)?\s+status\b', re.IGNORECASE)),
+    ("ip_interface_brief", re.compile(r'^sh(?:ow)?\s+ip\s+int(?:erface)?\s+br(?:ief)?\b', re.IGNORECASE)),
+    ("bgp_evpn_summary", re.compile(r'^sh(?:ow)?\s+bgp\s+evpn\s+summary\b', re.IGNORECASE)),
+    ("bgp_summary", re.compile(r'^sh(?:ow)?\s+(?:ip\s+)?bgp\s+summary\b', re.IGNORECASE)),
+    ("vxlan_vtep_detail", re.compile(r'^sh(?:ow)?\s+vxlan\s+vtep\s+detail\b', re.IGNORECASE)),
+    ("vxlan_vni", re.compile(r'^sh(?:ow)?\s+vxlan\s+vni\b', re.IGNORECASE)),
+    ("vxlan_flood_vtep", re.compile(r'^sh(?:ow)?\s+vxlan\s+flood\s+vtep\b', re.IGNORECASE)),
+    ("vxlan_address_table", re.compile(r'^sh(?:ow)?\s+vxlan\s+address-table\b', re.IGNORECASE)),
+    ("mac_address_table_dynamic", re.compile(r'^sh(?:ow)?\s+mac\s+address-table\s+dynamic\b', re.IGNORECASE)),
+    ("mac_address_table_static", re.compile(r'^sh(?:ow)?\s+mac\s+address-table\s+static\b', re.IGNORECASE)),
+    ("vrf_summary", re.compile(r'^sh(?:ow)?\s+vrf\s+summary\b', re.IGNORECASE)),
+    ("vrf_reserved_ports", re.compile(r'^sh(?:ow)?\s+vrf\s+reserved-ports\b', re.IGNORECASE)),
+    ("ip_route_summary", re.compile(r'^sh(?:ow)?\s+ip\s+route\s+(?:vrf\s+\S+\s+)?summary\b', re.IGNORECASE)),
+    ("ip_route", re.compile(r'^sh(?:ow)?\s+ip\s+route\b(?!.*\bsummary\b)', re.IGNORECASE)),
+    ("igmp_snooping_querier", re.compile(r'^sh(?:ow)?\s+igmp\s+snooping\s+querier\b', re.IGNORECASE)),
+    ("vlan_brief", re.compile(r'^sh(?:ow)?\s+vlan\s+brief\b', re.IGNORECASE)),
+    ("vlan_dynamic", re.compile(r'^sh(?:ow)?\s+vlan\s+dynamic\b', re.IGNORECASE)),
+    ("evpn_auto_discovery", re.compile(r'^sh(?:ow)?\s+bgp\s+evpn\s+route-type\s+auto-discovery\b', re.IGNORECASE)),
+    ("evpn_mac_ip", re.compile(r'^sh(?:ow)?\s+bgp\s+evpn\s+route-type\s+mac-ip\b', re.IGNORECASE)),
+    ("evpn_imet", re.compile(r'^sh(?:ow)?\s+bgp\s+evpn\s+route-type\s+imet\b', re.IGNORECASE)),
+    ("evpn_ethernet_segment", re.compile(r'^sh(?:ow)?\s+bgp\s+evpn\s+route-type\s+ethernet-segment\b', re.IGNORECASE)),
+]
+
+
+def classify_command(cmd: str) -> Optional[str]:
+    """
+    Map a command as typed at the prompt to a section key (see SECTION_PATTERNS).
+    Whitespace is collapsed first, so 'sh bgp evpn route-type  mac-ip' still matches.
+    Returns None for commands no parser cares about.
+    """
+    if not cmd:
+        return None
+    norm = " ".join(cmd.split())
+    for key, pat in SECTION_PATTERNS:
+        if pat.match(norm):
+            return key
+    return None
+
+
+class CommandBlock:
+    """One prompt-delimited command block: the prompt line plus its output lines."""
+    __slots__ = ("host", "command", "key", "lines")
+
+    def __init__(self, host: str, command: str, lines: Optional[List[str]] = None):
+        self.host = host
+        self.command = " ".join(command.split())
+        self.key = classify_command(self.command)
+        self.lines = lines if lines is not None else []
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+    def __repr__(self):
+        return f"CommandBlock(host={self.host!r}, command={self.command!r}, lines={len(self.lines)})"
+
+
+def iter_command_blocks(text: str) -> Iterator[CommandBlock]:
+    """
+    Split a capture into prompt-delimited command blocks.
+    Each block's lines start with its prompt line, so existing marker-based
+    parsers ('#sh bgp summary' etc.) work on block.text unchanged.
+    Lines before the first prompt are dropped; bare prompts (no command) are skipped.
+    """
+    block = None
+    for line in text.splitlines():
+        m = PROMPT_RE.match(line)
+        if m:
+            if block is not None and block.command:
+                yield block
+            block = CommandBlock(m.group("host"), m.group("cmd"), [line])
+        elif block is not None:
+            block.lines.append(line)
+    if block is not None and block.command:
+        yield block
@@ -0,0 +1,322 @@
+"""
+Local check service: snapshot / diff JSON over HTTP from warm workers.
+
+    python -m auto.service                         # 127.0.0.1:8765, one worker per core
+    python -m auto.service --port 0 --workers 2 --queue 8
+
+    curl --data-binary @leaf1.txt http://127.0.0.1:8765/snapshot
+    curl -H 'Content-Type: application/json' -d '{"pre": "...", "post": "..."}' \\
+         'http://127.0.0.1:8765/diff?limit=20'
+    curl http://127.0.0.1:8765/health
+
+Every response is JSON; results come back under "result" with the request
+timings (milliseconds) under "timings" and in a Server-Timing header.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+try:
+    from .api import summarize_capture, diff_captures
+    from .bench import synthetic_mac_table, synthetic_evpn_mac_ip, synthetic_bgp_summary
+except ImportError:
+    from api import summarize_capture, diff_captures
+    from bench import synthetic_mac_table, synthetic_evpn_mac_ip, synthetic_bgp_summary
+
+__all__ = ["CheckService", "ServiceBusy", "make_server", "main"]
+
+# Parsing a small capture takes milliseconds; starting an interpreter and
+# importing the parsers per device takes far longer. The service keeps a
+# ProcessPoolExecutor whose workers import auto.api and run it once on a
+# synthetic capture before the first request (regexes compiled, caches and
+# code paths warm), and the HTTP threads only read bodies and hand them over.
+#
+# Admission is bounded: at most `workers` requests run and `queue` more wait
+# for a worker. A request beyond that is refused at once with 503 and a
+# Retry-After header rather than queued without limit, so a burst from a
+# fleet-wide collection run slows the caller down instead of the host.
+# The slot is taken before the body is read (before '100 Continue' for
+# clients that send Expect), so refused requests are never buffered, and it
+# is held until the job is done, even when the request has timed out.
+#
+# The server binds 127.0.0.1 by default and never opens a file or reaches
+# the network on its own; make_server(port=0) is enough to test it offline.
+
+DEFAULT_PORT = 8765
+MAX_BODY = 64 << 20
+
+
+# ---- worker side (runs in the pool processes) ----
+def _warm() -> None:
+    sample = "\n".join((
+        "leaf1#show mac address-table dynamic",
+        synthetic_mac_table(64),
+        "leaf1#show bgp evpn route-type mac-ip detail",
+        synthetic_evpn_mac_ip(16),
+        "leaf1#show ip bgp summary vrf all",
+        synthetic_bgp_summary(2, 4),
+    ))
+    summarize_capture(sample)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _snapshot_job(data: bytes) -> Tuple[dict, float, float]:
+    started = time.time()
+    result = summarize_capture(data)
+    return result, started, time.time() - started
+
+
+def _diff_job(pre: str, post: str, limit: Optional[int], bgp_tolerance: float) -> Tuple[dict, float, float]:
+    started = time.time()
+    result = diff_captures(pre, post, limit=limit, bgp_tolerance=bgp_tolerance)
+    return result, started, time.time() - started
+
+
+# ---- server side ----
+class ServiceBusy(Exception):
+    """Raised by CheckService.admit / run when every worker and queue slot is taken."""
+
+
+class CheckService:
+    """
+    Warm worker pool with bounded admission. start() spawns and warms the
+    workers; admit() takes a slot (or raises ServiceBusy) and run(fn, *args)
+    executes one job in it, returning (result, timings). A slot is held
+    until the job's future is done, so a request that timed out keeps
+    counting against the bound while its job still occupies a worker.
+    """
+
+    def __init__(self, workers: Optional[int] = None, queue: int = 16, timeout: float = 120.0):
+        self.workers = workers or os.cpu_count() or 1
+        self.queue = queue
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(self.workers + queue)
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.pending = 0
+        self.counters = {"ok": 0, "rejected": 0, "failed": 0}
+
+    def start(self) -> "CheckService":
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm)
+        # one job per worker so every process is spawned (and warmed) now
+        for fut in [self._pool.submit(_ping) for _ in range(self.workers)]:
+            fut.result()
+        return self
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.counters[key] += 1
+
+    def admit(self) -> None:
+        """Take one slot without waiting; release() or run() gives it back."""
+        if not self._slots.acquire(blocking=False):
+            self._count("rejected")
+            raise ServiceBusy()
+        with self._lock:
+            self.pending += 1
+
+    def release(self, _future=None) -> None:
+        with self._lock:
+            self.pending -= 1
+        self._slots.release()
+
+    def run(self, fn, *args) -> Tuple[dict, dict]:
+        """
+        Run fn(*args) on a worker in a slot taken by admit(). timings:
+        queue_ms (submit to worker start) and parse_ms (inside the worker).
+        """
+        submitted = time.time()
+        try:
+            fut = self._pool.submit(fn, *args)
+        except Exception:
+            self.release()
+            self._count("failed")
+            raise
+        fut.add_done_callback(self.release)
+        try:
+            result, started, took = fut.result(self.timeout)
+        except Exception:
+            fut.cancel()        # frees the slot now if the job never started
+            self._count("failed")
+            raise
+        self._count("ok")
+        return result, {"queue_ms": max(0.0, started - submitted) * 1000, "parse_ms": took * 1000}
+
+    def health(self) -> dict:
+        with self._lock:
+            return {"workers": self.workers, "capacity": self.workers + self.queue,
+                    "pending": self.pending, **self.counters}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "auto-check/1"
+    protocol_version = "HTTP/1.1"
+    _admitted = False
+    _content_length = 0
+
+    def log_message(self, fmt, *args):
+        if not self.server.quiet:
+            super().log_message(fmt, *args)
+
+    def _send(self, status: int, payload: dict, timings: Optional[dict] = None, headers: Tuple = (),
+              close: bool = False) -> None:
+        if timings is not None:
+            payload["timings"] = {k: round(v, 3) for k, v in timings.items()}
+        body = json.dumps(payload, default=str).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if timings:
+            self.send_header("Server-Timing", ", ".join(f"{k[:-3]};dur={v:.3f}" for k, v in timings.items()))
+        for name, value in headers:
+            self.send_header(name, value)
+        if close:
+            # the request body was not read, so the connection cannot be reused
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _length(self) -> Optional[int]:
+        """Validated Content-Length, or None after answering 411 / 400 / 413."""
+        value = self.headers.get("Content-Length")
+        if value is None:
+            self._send(411, {"error": "Content-Length required"}, close=True)
+            return None
+        value = value.strip()
+        if not value.isdigit():
+            self._send(400, {"error": f"bad Content-Length {value!r}"}, close=True)
+            return None
+        length = int(value)
+        if length > self.server.max_body:
+            self._send(413, {"error": f"body over {self.server.max_body} bytes"}, close=True)
+            return None
+        return length
+
+    def _admit(self) -> bool:
+        """Validate the request line and headers, then take a slot; False once answered."""
+        if urlsplit(self.path).path not in ("/snapshot", "/diff"):
+            self._send(404, {"error": "unknown path"}, close=True)
+            return False
+        self._content_length = self._length()
+        if self._content_length is None:
+            return False
+        try:
+            self.server.service.admit()
+        except ServiceBusy:
+            self._send(503, {"error": "busy"}, headers=(("Retry-After", "1"),), close=True)
+            return False
+        return True
+
+    def handle_expect_100(self):
+        # 'Expect: 100-continue' clients learn about 4xx / 503 before sending the body
+        if self.command != "POST":
+            return super().handle_expect_100()
+        self._admitted = self._admit()
+        return self._admitted and super().handle_expect_100()
+
+    def do_GET(self):
+        if urlsplit(self.path).path == "/health":
+            self._send(200, self.server.service.health())
+        else:
+            self._send(404, {"error": "unknown path"})
+
+    def do_POST(self):
+        t0 = time.perf_counter()
+        # admission before the body is read: a refused request costs no buffer
+        if not self._admitted and not self._admit():
+            return
+        self._admitted = False
+        url, length, service = urlsplit(self.path), self._content_length, self.server.service
+        try:
+            data = self.rfile.read(length)
+            query = parse_qs(url.query)
+            if url.path == "/snapshot":
+                job = (_snapshot_job, data)
+            else:
+                pair = json.loads(data)
+                limit = query.get("limit", ["100"])[0]
+                job = (_diff_job, pair["pre"], pair["post"], None if limit == "all" else int(limit),
+                       float(query.get("bgp_tolerance", ["0"])[0]))
+        except (ValueError, KeyError, TypeError) as e:
+            service.release()
+            self._send(400, {"error": f"bad request: {e}"})
+            return
+        except Exception:
+            service.release()
+            raise
+        timings = {"read_ms": (time.perf_counter() - t0) * 1000}
+        try:
+            result, job_timings = service.run(*job)
+        except FutureTimeout:
+            self._send(504, {"error": "parse timed out"})
+            return
+        except BrokenProcessPool:
+            self._send(500, {"error": "worker pool broken"})
+            return
+        except Exception as e:
+            self._send(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        timings.update(job_timings)
+        timings["total_ms"] = (time.perf_counter() - t0) * 1000
+        self._send(200, {"result": result}, timings)
+
+
+def make_server(host: str = "127.0.0.1", port: int = DEFAULT_PORT, workers: Optional[int] = None,
+                queue: int = 16, max_body: int = MAX_BODY, quiet: bool = False) -> ThreadingHTTPServer:
+    """
+    HTTP server with a started CheckService on server.service (port 0 picks
+    a free port: server.server_address). Call serve_forever(), then
+    shutdown() and server.service.close().
+    """
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.max_body = max_body
+    server.quiet = quiet
+    server.service = CheckService(workers, queue).start()
+    return server
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m auto.service", description="local snapshot/diff check service")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT)
+    ap.add_argument("--workers", type=int, default=None, help="worker processes (default: one per core)")
+    ap.add_argument("--queue", type=int, default=16, help="requests allowed to wait for a worker")
+    ap.add_argument("--quiet", action="store_true", help="no per-request log lines")
+    args = ap.parse_args(argv if argv is not None else sys.argv[1:])
+    server = make_server(args.host, args.port, args.workers, args.queue, quiet=args.quiet)
+    host, port = server.server_address[:2]
+    print(f"serving on http://{host}:{port} ({server.service.workers} warm workers, queue {args.queue})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.close()
+
+
+if __name__ == "__main__":
+    main()
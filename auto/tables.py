@@ -0,0 +1,185 @@
+import re
+from operator import itemgetter
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+try:
+    from .sections import PROMPT_RE
+except ImportError:
+    from sections import PROMPT_RE
+
+__all__ = [
+    "ColumnSpec",
+    "is_dash_line",
+    "find_table",
+    "iter_table_rows",
+]
+
+# Fixed-width EOS tables. Column offsets are taken once from the dashed
+# separator line ('---------- ------- ...') or, when a table has none
+# ('sh interfaces status'), from the header words; every row is then cut
+# with plain slices. Free-text columns such as the interface Name
+# ('[DXC][BW]10G[RED]EMEA-UK-...  ') keep their inner spacing, which a
+# re.split(r'\s{2,}') would break apart.
+
+_DASH_LINE = re.compile(r'^\s*-+(?: +-+)*\s*$')
+_DASH_RUN = re.compile(r'-+')
+_WORD = re.compile(r'\S+')
+
+
+def is_dash_line(line: str) -> bool:
+    return bool(line) and _DASH_LINE.match(line) is not None
+
+
+def _tuple_getter(items):
+    # itemgetter always returning a tuple (a single-item itemgetter returns the bare item)
+    if len(items) >= 2:
+        return itemgetter(*items)
+    if items:
+        item = items[0]
+        return lambda obj: (obj[item],)
+    return lambda obj: ()
+
+
+class ColumnSpec:
+    """
+    Column names and start offsets of one fixed-width table.
+    split(line) returns one stripped field per column; a value that spills
+    past its column (no blank at the boundary) is kept whole and the
+    following column boundaries move right with it.
+    """
+    __slots__ = ("names", "starts", "_bounds", "_index", "_get", "_seps", "_blanks")
+
+    def __init__(self, names: Sequence[str], starts: Sequence[int]):
+        self.names = tuple(names)
+        self.starts = tuple(starts)
+        self._bounds = tuple(zip(self.starts, self.starts[1:] + (None,)))
+        self._index = {n: i for i, n in enumerate(self.names)}
+        # itemgetter over slice objects cuts every column in one C call; the
+        # separator getter picks the character in front of each column start.
+        self._get = _tuple_getter([slice(a, b) for a, b in self._bounds])
+        self._seps = _tuple_getter([a - 1 for a in self.starts[1:]])
+        self._blanks = (" ",) * (len(self.starts) - 1 if self.starts else 0)
+
+    @classmethod
+    def from_dashes(cls, dash_line: str, header: str = "") -> "ColumnSpec":
+        """
+        'Interface              IP Address            Status ...'
+        '----------------------- --------------------- ------------ ...'
+        One column per run of dashes, named from the header text above it.
+        """
+        spans = [m.span() for m in _DASH_RUN.finditer(dash_line)]
+        starts = [a for a, _ in spans]
+        names = []
+        for k, (a, b) in enumerate(spans):
+            end = spans[k + 1][0] if k + 1 < len(spans) else None
+            names.append(" ".join(header[a:end].split()))
+        return cls(names, starts)
+
+    @classmethod
+    def from_header(cls, header: str, names: Optional[Sequence[str]] = None) -> "ColumnSpec":
+        """
+        Offsets from the header alone. Each header word starts a column unless
+        `names` lists the (possibly multi-word) column titles to look up.
+        """
+        if names is None:
+            found = [(m.start(), m.group()) for m in _WORD.finditer(header)]
+        else:
+            found, pos = [], 0
+            for n in names:
+                at = header.find(n, pos)
+                if at < 0:
+                    continue
+                found.append((at, n))
+                pos = at + len(n)
+        return cls([n for _, n in found], [a for a, _ in found])
+
+    def __len__(self):
+        return len(self.names)
+
+    def index(self, name: str) -> int:
+        return self._index[name]
+
+    def split(self, line: str) -> List[str]:
+        # Fast path: a blank in front of every column start (the usual padded
+        # row). Short rows and spilled values take the slow path.
+        try:
+            if self._seps(line) == self._blanks:
+                return list(map(str.strip, self._get(line)))
+        except IndexError:
+            pass
+        return self._split_spill(line)
+
+    def field(self, line: str, name: str) -> str:
+        """One column of a row, e.g. spec.field(line, 'Status')."""
+        return self.split(line)[self._index[name]]
+
+    def column(self, name: str):
+        """
+        Fast single-column reader: returns fn(line) -> stripped field. Only
+        that column's slice is taken when its edges fall on blanks; anything
+        else goes through split().
+        """
+        k = self._index[name]
+        a, b = self._bounds[k]
+        split = self.split
+        if b is None:
+            return lambda line: line[a:].strip() if line[a - 1:a] in (" ", "") else split(line)[k]
+
+        def _col(line):
+            if line[a - 1:a] in (" ", "") and line[b - 1:b] in (" ", ""):
+                return line[a:b].strip()
+            return split(line)[k]
+        return _col
+
+    def _split_spill(self, line: str) -> List[str]:
+        # A value ran into the next column: end it at the next blank and push
+        # the remaining column starts right by the same amount, as the device
+        # did when it printed the row.
+        if not self.starts:
+            return []
+        fields, prev, shift, n = [], self.starts[0], 0, len(line)
+        for a in self.starts[1:]:
+            a = max(a + shift, prev)
+            if 0 < a < n and line[a] != " " and line[a - 1] != " ":
+                end = line.find(" ", a)
+                end = n if end < 0 else end
+                shift += end - a
+                a = end
+            fields.append(line[prev:a].strip())
+            prev = a
+        fields.append(line[prev:].strip())
+        return fields
+
+    def __repr__(self):
+        return f"ColumnSpec({list(zip(self.names, self.starts))})"
+
+
+def find_table(lines: Sequence[str], first_column: str = "", start: int = 0,
+               names: Optional[Sequence[str]] = None) -> Tuple[Optional[ColumnSpec], int]:
+    """
+    Locate a table in `lines[start:]`: the first dashed separator line (its
+    header is the line above), or the first header line starting with
+    `first_column` when no separator follows it.
+    Returns (spec, index of the first data row), or (None, start).
+    """
+    for i in range(start, len(lines)):
+        line = lines[i]
+        if is_dash_line(line):
+            header = lines[i - 1] if i > start else ""
+            return ColumnSpec.from_dashes(line, header), i + 1
+        if first_column and line.lstrip().startswith(first_column):
+            if i + 1 < len(lines) and is_dash_line(lines[i + 1]):
+                return ColumnSpec.from_dashes(lines[i + 1], line), i + 2
+            return ColumnSpec.from_header(line, names), i + 1
+    return None, start
+
+
+def iter_table_rows(lines: Sequence[str], spec: ColumnSpec, start: int) -> Iterator[List[str]]:
+    """Split rows from `start` until a blank line or the next prompt ('...#')."""
+    for i in range(start, len(lines)):
+        line = lines[i]
+        if not line.strip():
+            return
+        if "#" in line and PROMPT_RE.match(line):
+            return
+        yield spec.split(line)
@@ -0,0 +1,403 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+try:
+    from .sections import iter_command_blocks, PROMPT_RE
+    from .records import VlanRow
+    from .tables import find_table
+    from .interfaces import port_id, port_name
+except ImportError:
+    from sections import iter_command_blocks, PROMPT_RE
+    from records import VlanRow
+    from tables import find_table
+    from interfaces import port_id, port_name
+
+__all__ = [
+    "VlanSet",
+    "diff_vlan_sets",
+    "vlan_brief_vlans",
+    "vlan_dynamic_vlans",
+    "igmp_querier_vlans",
+    "capture_vlan_sets",
+    "iter_vlan_brief_rows",
+    "PortVlanMatrix",
+    "PortVlanDiff",
+    "diff_port_vlans",
+]
+
+# VLAN sets as 4096-bit bitmaps (bit n = VLAN n) held in one Python int.
+# Union / intersection / difference are a handful of machine-word operations
+# on 64 words, ranges are built with a shift and a mask ('1-4094' never
+# becomes a 4094-item list), and formatting walks runs of set bits, so the
+# cost follows the number of ranges, not the number of VLANs.
+
+_MAX_VLAN = 4095
+_ALL = (1 << (_MAX_VLAN + 1)) - 1
+_NONE_WORDS = ("", "none", "-")
+
+
+def _range_mask(a: int, b: int) -> int:
+    if not 0 <= a <= b <= _MAX_VLAN:
+        raise ValueError(f"bad VLAN range {a}-{b}")
+    return ((1 << (b - a + 1)) - 1) << a
+
+
+class VlanSet:
+    """
+    Set of VLAN ids 0-4095.
+      VlanSet.parse('10,20-30')   VlanSet.parse('4054-4064,4066-4071')   VlanSet.parse('NONE')
+      str(s) -> '10,20-30'        s | t, s & t, s - t, s ^ t, 20 in s, len(s)
+    """
+    __slots__ = ("bits",)
+
+    def __init__(self, bits: int = 0):
+        self.bits = bits & _ALL
+
+    @classmethod
+    def parse(cls, text: str) -> "VlanSet":
+        """'1-4094' / '10,20-30' / '10 20 30' / 'NONE' / 'all'; '4054*' (dynamic mark) is accepted."""
+        text = text.strip()
+        low = text.lower()
+        if low in _NONE_WORDS:
+            return cls()
+        if low == "all":
+            return cls(_range_mask(1, 4094))
+        bits = 0
+        for part in text.replace(" ", ",").split(","):
+            part = part.strip().rstrip("*")
+            if not part:
+                continue
+            a, sep, b = part.partition("-")
+            try:
+                lo = int(a)
+                hi = int(b) if sep else lo
+            except ValueError:
+                raise ValueError(f"bad VLAN list {text!r}") from None
+            bits |= _range_mask(lo, hi)
+        return cls(bits)
+
+    @classmethod
+    def from_iterable(cls, vlans: Iterable) -> "VlanSet":
+        """VLAN ids as ints or strings ('4054*' accepted)."""
+        bits = 0
+        for v in vlans:
+            if v.__class__ is not int:
+                v = int(str(v).strip().rstrip("*"))
+            if not 0 <= v <= _MAX_VLAN:
+                raise ValueError(f"bad VLAN id {v}")
+            bits |= 1 << v
+        return cls(bits)
+
+    def add(self, vlan: int):
+        self.bits |= 1 << vlan
+
+    def add_range(self, a: int, b: int):
+        self.bits |= _range_mask(a, b)
+
+    def discard(self, vlan: int):
+        self.bits &= ~(1 << vlan)
+
+    # ---- set protocol ----
+    def __contains__(self, vlan) -> bool:
+        return 0 <= vlan <= _MAX_VLAN and (self.bits >> vlan) & 1 == 1
+
+    def __len__(self):
+        return self.bits.bit_count()
+
+    def __bool__(self):
+        return self.bits != 0
+
+    def __iter__(self) -> Iterator[int]:
+        for a, b in self.ranges():
+            yield from range(a, b + 1)
+
+    def __or__(self, other: "VlanSet") -> "VlanSet":
+        return VlanSet(self.bits | other.bits)
+
+    def __and__(self, other: "VlanSet") -> "VlanSet":
+        return VlanSet(self.bits & other.bits)
+
+    def __sub__(self, other: "VlanSet") -> "VlanSet":
+        return VlanSet(self.bits & ~other.bits)
+
+    def __xor__(self, other: "VlanSet") -> "VlanSet":
+        return VlanSet(self.bits ^ other.bits)
+
+    def __le__(self, other: "VlanSet") -> bool:
+        return self.bits & ~other.bits == 0
+
+    def __ge__(self, other: "VlanSet") -> bool:
+        return other.bits & ~self.bits == 0
+
+    def __eq__(self, other):
+        if isinstance(other, VlanSet):
+            return self.bits == other.bits
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.bits)
+
+    def ranges(self) -> List[Tuple[int, int]]:
+        """[(first, last), ...] runs of consecutive VLANs, ascending."""
+        out = []
+        x, base = self.bits, 0
+        while x:
+            low = (x & -x).bit_length() - 1          # first set bit
+            x >>= low
+            base += low
+            run = (x ^ (x + 1)).bit_length() - 1     # length of the run of ones
+            out.append((base, base + run - 1))
+            x >>= run
+            base += run
+        return out
+
+    def format(self) -> str:
+        """'10,20-30' (empty string for an empty set)."""
+        return ",".join(str(a) if a == b else f"{a}-{b}" for a, b in self.ranges())
+
+    __str__ = format
+
+    def __repr__(self):
+        return f"VlanSet({self.format()!r})"
+
+
+def diff_vlan_sets(pre: VlanSet, post: VlanSet) -> Tuple[VlanSet, VlanSet]:
+    """(missing, added): VLANs only in pre, VLANs only in post."""
+    return pre - post, post - pre
+
+
+# ---- VLAN sets of a capture ----
+def _first_column_vlans(lines: List[str]) -> VlanSet:
+    bits = 0
+    for line in lines[1:]:
+        tok = line.split(None, 1)[0] if line[:1].isdigit() else ""
+        tok = tok.rstrip("*")
+        if tok.isdigit() and int(tok) <= _MAX_VLAN:
+            bits |= 1 << int(tok)
+    return VlanSet(bits)
+
+
+def vlan_brief_vlans(text: str) -> VlanSet:
+    """VLANs listed by 'show vlan brief' (dynamic ones included)."""
+    out = VlanSet()
+    for block in iter_command_blocks(text):
+        if block.key == "vlan_brief":
+            out.bits |= _first_column_vlans(block.lines).bits
+    return out
+
+
+def vlan_dynamic_vlans(text: str) -> Dict[str, VlanSet]:
+    """{source: VlanSet} of 'show vlan dynamic' ('evpn', 'vccbfd', ...); ranges are never expanded."""
+    out: Dict[str, VlanSet] = {}
+    for block in iter_command_blocks(text):
+        if block.key != "vlan_dynamic":
+            continue
+        for line in block.lines[1:]:
+            parts = line.split()
+            if len(parts) != 2 or parts[0] == "Dynamic":
+                continue
+            try:
+                vlans = VlanSet.parse(parts[1])
+            except ValueError:
+                continue
+            prev = out.get(parts[0])
+            out[parts[0]] = vlans if prev is None else prev | vlans
+    return out
+
+
+def igmp_querier_vlans(text: str) -> VlanSet:
+    """VLANs with a querier row in 'show igmp snooping querier'."""
+    out = VlanSet()
+    for block in iter_command_blocks(text):
+        if block.key == "igmp_snooping_querier":
+            out.bits |= _first_column_vlans(block.lines).bits
+    return out
+
+
+def capture_vlan_sets(text: str) -> Dict[str, VlanSet]:
+    """
+    VLAN sets of one capture in a single pass over its command blocks:
+      {'vlan_brief': VlanSet, 'vlan_dynamic': VlanSet (all sources), 'igmp_snooping_querier': VlanSet}
+    Sections the capture lacks are missing from the result.
+    """
+    out: Dict[str, VlanSet] = {}
+    for block in iter_command_blocks(text):
+        key = block.key
+        if key in ("vlan_brief", "igmp_snooping_querier"):
+            part = _first_column_vlans(block.lines)
+        elif key == "vlan_dynamic":
+            part = VlanSet()
+            for vlans in vlan_dynamic_vlans(block.text).values():
+                part.bits |= vlans.bits
+        else:
+            continue
+        prev = out.get(key)
+        out[key] = part if prev is None else prev | part
+    return out
+
+
+# ---- port x VLAN membership ('show vlan brief') ----
+def _join_ports(a: str, b: str) -> str:
+    a, b = a.rstrip(", "), b.lstrip(", ")
+    return f"{a}, {b}" if a and b else a or b
+
+
+def iter_vlan_brief_rows(lines: Sequence[str], start: int = 0) -> Iterator[VlanRow]:
+    """
+    VlanRow per VLAN of the 'show vlan brief' table in lines[start:], with
+    the port lists EOS wraps onto indented continuation lines joined back:
+      1400  NAME                             active    Cpu, Et1, Et2, Et3, Et4, Et5,
+                                                       Et6, Po1027, Vx1
+    A row is yielded once its continuation lines have been read.
+    """
+    spec, i = find_table(lines, "VLAN", start)
+    if spec is None or len(spec) < 3:
+        return
+    row: Optional[VlanRow] = None
+    for k in range(i, len(lines)):
+        line = lines[k]
+        if not line.strip():
+            break
+        if "#" in line and PROMPT_RE.match(line):
+            break
+        if line[:1] in (" ", "\t"):
+            if row is not None:
+                row.PORTS = _join_ports(row.PORTS, line.strip())
+            continue
+        fields = spec.split(line)
+        vlan = fields[0]
+        if not vlan.rstrip("*").isdigit():
+            continue
+        if row is not None:
+            yield row
+        row = VlanRow(vlan, fields[1], fields[2], fields[3] if len(fields) > 3 else "")
+    if row is not None:
+        yield row
+
+
+class PortVlanMatrix:
+    """
+    Sparse port x VLAN membership of 'show vlan brief'.
+      port_vlans  {port: VlanSet}     row index: the VLANs of one port as a bitmap
+      vlan_ports  {vlan: {port, ...}} column index: the member ports of one VLAN
+    Port names are canonical where they are interface names ('Po1027' ->
+    'Port-Channel1027', 'Vx1' -> 'Vxlan1'); others ('Cpu') are kept as printed.
+    """
+    __slots__ = ("port_vlans", "vlan_ports")
+
+    def __init__(self):
+        self.port_vlans: Dict[str, VlanSet] = {}
+        self.vlan_ports: Dict[int, Set[str]] = {}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable) -> "PortVlanMatrix":
+        """From VlanRow records (or dicts with VLAN and PORTS)."""
+        matrix = cls()
+        names: Dict[str, str] = {}
+        for r in rows:
+            vlan = int(r["VLAN"].rstrip("*"))
+            for p in r["PORTS"].split(","):
+                p = p.strip()
+                if not p:
+                    continue
+                name = names.get(p)
+                if name is None:
+                    try:
+                        name = port_name(port_id(p))
+                    except ValueError:
+                        name = p
+                    names[p] = name
+                matrix.add(name, vlan)
+        return matrix
+
+    @classmethod
+    def from_text(cls, text: str) -> "PortVlanMatrix":
+        """Every 'show vlan brief' block of a capture."""
+        rows: List[VlanRow] = []
+        for block in iter_command_blocks(text):
+            if block.key == "vlan_brief":
+                rows.extend(iter_vlan_brief_rows(block.lines, 1))
+        return cls.from_rows(rows)
+
+    def add(self, port: str, vlan: int):
+        vlans = self.port_vlans.get(port)
+        if vlans is None:
+            vlans = self.port_vlans[port] = VlanSet()
+        vlans.add(vlan)
+        members = self.vlan_ports.get(vlan)
+        if members is None:
+            members = self.vlan_ports[vlan] = set()
+        members.add(port)
+
+    def __len__(self):
+        """Number of (port, VLAN) memberships."""
+        return sum(len(v) for v in self.vlan_ports.values())
+
+    def vlans_of(self, port: str) -> VlanSet:
+        vlans = self.port_vlans.get(port)
+        if vlans is None:
+            try:
+                vlans = self.port_vlans.get(port_name(port_id(port)))
+            except ValueError:
+                pass
+        return vlans if vlans is not None else VlanSet()
+
+    def ports_of(self, vlan: int) -> Set[str]:
+        return self.vlan_ports.get(vlan, set())
+
+
+class PortVlanDiff:
+    """
+    Membership changes between two PortVlanMatrix tables (see diff_port_vlans).
+      lost    {vlan: [ports]}   member ports the VLAN no longer has
+      gained  {vlan: [ports]}   member ports the VLAN did not have before
+    """
+    __slots__ = ("lost", "gained")
+
+    def __init__(self):
+        self.lost: Dict[int, List[str]] = {}
+        self.gained: Dict[int, List[str]] = {}
+
+    def counts(self) -> Dict[str, int]:
+        return {"lost": sum(map(len, self.lost.values())), "gained": sum(map(len, self.gained.values()))}
+
+    def vlans_lost_members(self) -> VlanSet:
+        return VlanSet.from_iterable(self.lost)
+
+    def vlans_gained_members(self) -> VlanSet:
+        return VlanSet.from_iterable(self.gained)
+
+
+def _spread(out: Dict[int, List[str]], port: str, bits: int):
+    # one entry per set bit: cost follows the answer, not the 4096 VLAN ids
+    base = 0
+    while bits:
+        low = (bits & -bits).bit_length() - 1
+        bits >>= low + 1
+        base += low
+        out.setdefault(base, []).append(port)
+        base += 1
+
+
+def diff_port_vlans(pre: PortVlanMatrix, post: PortVlanMatrix) -> PortVlanDiff:
+    """
+    Per port, lost = pre & ~post and gained = post & ~pre on the VLAN
+    bitmaps (a few word operations; unchanged ports compare equal and are
+    skipped), then only the changed bits are listed per VLAN. Time is
+    linear in the number of ports plus the size of the answer.
+    """
+    d = PortVlanDiff()
+    empty = VlanSet()
+    post_get = post.port_vlans.get
+    for port, a in pre.port_vlans.items():
+        b = post_get(port, empty)
+        if a.bits == b.bits:
+            continue
+        if a.bits & ~b.bits:
+            _spread(d.lost, port, a.bits & ~b.bits)
+        if b.bits & ~a.bits:
+            _spread(d.gained, port, b.bits & ~a.bits)
+    pre_ports = pre.port_vlans
+    for port, b in post.port_vlans.items():
+        if port not in pre_ports:
+            _spread(d.gained, port, b.bits)
+    return d
@@ -0,0 +1,353 @@
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+try:
+    from .records import Vtep
+    from .sections import iter_command_blocks, PROMPT_RE
+    from .tables import find_table, is_dash_line, iter_table_rows
+    from .evpn import iter_evpn_paths
+    from .vlans import VlanSet
+    from .mac_table import mac_to_int
+except ImportError:
+    from records import Vtep
+    from sections import iter_command_blocks, PROMPT_RE
+    from tables import find_table, is_dash_line, iter_table_rows
+    from evpn import iter_evpn_paths
+    from vlans import VlanSet
+    from mac_table import mac_to_int
+
+__all__ = [
+    "VxlanIndex",
+    "ImetIndex",
+    "VxlanImetJoin",
+    "VXLAN_JOIN_KINDS",
+    "join_imet",
+]
+
+# VNI / VTEP state of Vxlan1 from
+#   show vxlan vtep detail      remote VTEPs and their tunnel types (unicast, flood)
+#   show vxlan vni              VNI <-> VLAN mapping (static and dynamic tables)
+#   show vxlan flood vtep       per-VLAN head-end replication (flood) lists
+#   show vxlan address-table    remote MACs per VLAN and VTEP
+# joined with the EVPN type-3 (IMET) routes that should have built the flood
+# lists. VLANs are the join key: IMET RDs, flood lists and the address table
+# all name the VLAN, the VNI table translates. Both sides are dicts of sets,
+# so the join is one pass over each and stays linear at thousands of VNIs.
+
+
+def _ip_key(ip: str) -> Tuple[int, ...]:
+    parts = ip.split(".")
+    return tuple(int(p) for p in parts) if all(p.isdigit() for p in parts) else (0,)
+
+
+def _table_lines(lines: Sequence[str], header: str) -> Iterator[str]:
+    """
+    Data lines of every table in a block whose header starts with `header`
+    (header line, dash line, rows up to a blank line or the next prompt).
+    Banner dash lines ('-----' under 'Vxlan Mac Address Table') are skipped.
+    """
+    on = False
+    for i, line in enumerate(lines):
+        if is_dash_line(line):
+            on = i > 0 and lines[i - 1].lstrip().startswith(header)
+            continue
+        if not line.strip() or ("#" in line and PROMPT_RE.match(line)):
+            on = False
+            continue
+        if on:
+            yield line
+
+
+def _vlan(token: str) -> Optional[int]:
+    token = token.rstrip("*")
+    return int(token) if token.isdigit() else None
+
+
+class VxlanIndex:
+    """
+    VXLAN state keyed for joins:
+      vteps        {vtep ip: Vtep}                     'show vxlan vtep detail'
+      vni_vlan     {vni: vlan}, vlan_vni {vlan: vni}   'show vxlan vni'
+      flood        {vlan: {vtep ip, ...}}              'show vxlan flood vtep'
+      remote_macs  {vlan: {vtep ip: MACs}}             'show vxlan address-table'
+      addresses    {vlan << 48 | mac: vtep ip}         same table, per MAC
+    Any of the tables may be missing from a capture; lookups then return
+    empty results rather than failing.
+    """
+    __slots__ = ("vteps", "vni_vlan", "vlan_vni", "flood", "remote_macs", "addresses")
+
+    def __init__(self):
+        self.vteps: Dict[str, Vtep] = {}
+        self.vni_vlan: Dict[int, int] = {}
+        self.vlan_vni: Dict[int, int] = {}
+        self.flood: Dict[int, Set[str]] = {}
+        self.remote_macs: Dict[int, Dict[str, int]] = {}
+        self.addresses: Dict[int, str] = {}
+
+    @classmethod
+    def from_text(cls, text: str) -> "VxlanIndex":
+        """Index every VXLAN block of a capture."""
+        index = cls()
+        feeds = {
+            "vxlan_vtep_detail": index.feed_vtep_detail,
+            "vxlan_vni": index.feed_vni,
+            "vxlan_flood_vtep": index.feed_flood_vtep,
+            "vxlan_address_table": index.feed_address_table,
+        }
+        for block in iter_command_blocks(text):
+            feed = feeds.get(block.key)
+            if feed is not None:
+                feed(block.lines)
+        return index
+
+    def feed_vtep_detail(self, lines) -> "VxlanIndex":
+        """
+        VTEP               Learned Via         MAC Address Learning       Tunnel Type(s)
+        ------------------ ------------------- -------------------------- --------------
+        10.4.228.106       control plane       control plane              unicast, flood
+        """
+        if isinstance(lines, str):
+            lines = lines.splitlines()
+        spec, start = find_table(lines, "VTEP")
+        if spec is None or len(spec) < 4:
+            return self
+        for fields in iter_table_rows(lines, spec, start):
+            if fields[0][:1].isdigit():
+                self.vteps[fields[0]] = Vtep(*fields[:4])
+        return self
+
+    def feed_vni(self, lines) -> "VxlanIndex":
+        """
+        VNI          VLAN        Source       Interface       802.1Q Tag
+        ------------ ----------- ------------ --------------- ----------
+        10140        140         static       Port-Channel1   140
+                                              Vxlan1          140
+        50001        4094*       evpn         Vxlan1          4094
+        (the dynamic 'VNI  VLAN  VRF  Source' table is read the same way)
+        """
+        if isinstance(lines, str):
+            lines = lines.splitlines()
+        for line in _table_lines(lines, "VNI"):
+            if line[:1] == " ":
+                continue                      # further interfaces of the row above
+            parts = line.split()
+            if len(parts) < 2 or not parts[0].isdigit():
+                continue
+            vlan = _vlan(parts[1])
+            if vlan is not None:
+                vni = int(parts[0])
+                self.vni_vlan[vni] = vlan
+                self.vlan_vni[vlan] = vni
+        return self
+
+    def feed_flood_vtep(self, lines) -> "VxlanIndex":
+        """
+        VLANS                            Ip Address
+        -----------------------------   ------------------------------------
+        1400-1413                        10.4.228.106    10.4.228.107
+                                         10.4.228.108
+        """
+        if isinstance(lines, str):
+            lines = lines.splitlines()
+        current: List[Set[str]] = []
+        for line in _table_lines(lines, "VLAN"):
+            parts = line.split()
+            if line[:1] != " ":
+                try:
+                    vlans = VlanSet.parse(parts[0])
+                except ValueError:
+                    current = []
+                    continue
+                current = [self.flood.setdefault(v, set()) for v in vlans]
+                parts = parts[1:]
+            for vteps in current:
+                vteps.update(parts)
+        return self
+
+    def feed_address_table(self, lines) -> "VxlanIndex":
+        """
+        VLAN  Mac Address     Type      Prt  VTEP             Moves   Last Move
+        ----  -----------     ----      ---  ----             -----   ---------
+        1406  0094.a134.a86b  EVPN      Vx1  10.4.228.106     1       193 days, 3:36:03 ago
+        """
+        if isinstance(lines, str):
+            lines = lines.splitlines()
+        for line in _table_lines(lines, "VLAN"):
+            parts = line.split()
+            if len(parts) < 5 or not parts[0].isdigit():
+                continue
+            try:
+                mac = mac_to_int(parts[1])
+            except ValueError:
+                continue
+            vlan, vtep = int(parts[0]), sys.intern(parts[4])
+            per_vtep = self.remote_macs.setdefault(vlan, {})
+            per_vtep[vtep] = per_vtep.get(vtep, 0) + 1
+            self.addresses[vlan << 48 | mac] = vtep
+        return self
+
+    # ---- lookups ----
+    def __len__(self):
+        return len(self.vteps)
+
+    def flood_vteps(self) -> Set[str]:
+        """VTEPs whose tunnel types include flood (vtep detail)."""
+        return {ip for ip, v in self.vteps.items() if "flood" in v.TUNNEL_TYPES}
+
+    def vlan_of(self, ref: int) -> int:
+        """
+        VLAN behind an IMET RD suffix or Ethernet tag, which is either the VLAN
+        or the VNI depending on the EVPN config: a number the VNI table knows
+        as a VNI (and not as a VLAN) is translated, anything else is the VLAN.
+        """
+        if ref in self.vlan_vni:
+            return ref
+        return self.vni_vlan.get(ref, ref)
+
+    def flood_list(self, vni: int) -> Set[str]:
+        vlan = self.vni_vlan.get(vni)
+        return set(self.flood.get(vlan, ())) if vlan is not None else set()
+
+    def vni_flood(self) -> Dict[int, Set[str]]:
+        """{vni: flood VTEPs} for every VLAN with both a VNI and a flood list."""
+        vlan_vni = self.vlan_vni
+        return {vlan_vni[vlan]: vteps for vlan, vteps in self.flood.items() if vlan in vlan_vni}
+
+    def mac_vteps(self, vlan: int) -> Dict[str, int]:
+        """{vtep ip: remote MACs} learned in one VLAN."""
+        return self.remote_macs.get(vlan, {})
+
+
+class ImetIndex:
+    """
+    EVPN type-3 routes by segment:
+      routes  {ref: {originating vtep ip: paths}}   ref = RD suffix, or the
+                                                    Ethernet tag when non-zero
+      local   {vtep ip}                             originated here (next hop '-')
+    """
+    __slots__ = ("routes", "local")
+
+    def __init__(self):
+        self.routes: Dict[int, Dict[str, int]] = {}
+        self.local: Set[str] = set()
+
+    def add(self, rd: str, nlri: str, local: bool = False):
+        """One path: RD '10.4.228.5:1400', NLRI '10.4.228.106' or '<tag> 10.4.228.106'."""
+        fields = nlri.split()
+        if not fields:
+            return
+        vtep = fields[-1]
+        tag = fields[0] if len(fields) > 1 and fields[0].isdigit() and fields[0] != "0" else None
+        ref = tag or rd.rpartition(":")[2]
+        if not ref.isdigit():
+            return
+        per_vtep = self.routes.setdefault(int(ref), {})
+        per_vtep[vtep] = per_vtep.get(vtep, 0) + 1
+        if local:
+            self.local.add(vtep)
+
+    @classmethod
+    def from_text(cls, text: str) -> "ImetIndex":
+        """'show bgp evpn route-type imet' output, or a capture containing it."""
+        blocks = [b.text for b in iter_command_blocks(text) if b.key == "evpn_imet"]
+        index = cls()
+        for block in blocks or [text]:
+            for p in iter_evpn_paths(block):
+                if p.TYPE == "imet":
+                    index.add(p.RD, p.NLRI, p.NEXT_HOP is None)
+        return index
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[dict], local: Iterable[str] = ()) -> "ImetIndex":
+        """Rows of NetworkParsers.parse_bgp_evpn_route_type_imet ({RD, IP})."""
+        index = cls()
+        for r in rows:
+            if r.get("RD") and r.get("IP"):
+                index.add(r["RD"], r["IP"])
+        index.local.update(local)
+        return index
+
+    def __len__(self):
+        return sum(len(v) for v in self.routes.values())
+
+    def vteps(self) -> Set[str]:
+        """Every originating VTEP, local ones included."""
+        out: Set[str] = set()
+        for per_vtep in self.routes.values():
+            out.update(per_vtep)
+        return out
+
+
+VXLAN_JOIN_KINDS = ("flood_without_imet", "imet_without_flood", "imet_unmapped")
+
+
+class VxlanImetJoin:
+    """
+    Result of join_imet(). Each kind is a list of (vlan, vtep ip) pairs;
+    vlan is None for the VLAN-less check made when no per-VLAN flood lists
+    were captured.
+    """
+    __slots__ = ("index", "imet") + VXLAN_JOIN_KINDS
+
+    def __init__(self, index: VxlanIndex, imet: ImetIndex):
+        self.index = index
+        self.imet = imet
+        for kind in VXLAN_JOIN_KINDS:
+            setattr(self, kind, [])
+
+    def counts(self) -> Dict[str, int]:
+        return {kind: len(getattr(self, kind)) for kind in VXLAN_JOIN_KINDS}
+
+    def entries(self, kind: str) -> Iterator[dict]:
+        """Yield {VNI, VLAN, VTEP} for one kind, by VLAN then VTEP (None when unknown)."""
+        vlan_vni = self.index.vlan_vni
+        pairs = sorted(getattr(self, kind), key=lambda p: (-1 if p[0] is None else p[0], _ip_key(p[1])))
+        for vlan, vtep in pairs:
+            yield {"VNI": vlan_vni.get(vlan), "VLAN": vlan, "VTEP": vtep}
+
+
+def join_imet(index: VxlanIndex, imet: ImetIndex) -> VxlanImetJoin:
+    """
+    Hash join of VXLAN flood lists and remote IMET routes on (VLAN, VTEP).
+      flood_without_imet   VTEP in a VLAN's flood list with no IMET route for
+                           that VLAN from it (stale or static flood entry)
+      imet_without_flood   IMET route whose VTEP is missing from the VLAN's
+                           flood list (BUM traffic will not reach it)
+      imet_unmapped        IMET route for a VLAN the VNI table does not map
+                           (only checked when 'show vxlan vni' was captured)
+    Without 'show vxlan flood vtep' the flood list is the flood-capable VTEPs
+    of 'show vxlan vtep detail' for every VLAN, and the first check falls
+    back to "flood VTEP with no IMET route in any VLAN" (vlan None).
+    Locally originated IMET routes are not compared, and with neither table
+    captured there is no flood list to compare against.
+    """
+    j = VxlanImetJoin(index, imet)
+    local = imet.local
+    vlan_of = index.vlan_of
+    remote: Dict[int, Set[str]] = {}
+    for ref, per_vtep in imet.routes.items():
+        vteps = remote.setdefault(vlan_of(ref), set())
+        vteps.update(v for v in per_vtep if v not in local)
+
+    flood = index.flood
+    empty: Set[str] = set()
+    if not flood and not index.vteps:
+        return j
+    if flood:
+        for vlan, vteps in flood.items():
+            have = remote.get(vlan, empty)
+            j.flood_without_imet.extend((vlan, v) for v in vteps if v not in have and v not in local)
+    else:
+        fallback = index.flood_vteps()
+        seen: Set[str] = set()
+        for vteps in remote.values():
+            seen |= vteps
+        j.flood_without_imet.extend((None, v) for v in fallback if v not in seen)
+
+    mapped = index.vlan_vni
+    for vlan, vteps in remote.items():
+        expected = flood.get(vlan, empty) if flood else fallback
+        j.imet_without_flood.extend((vlan, v) for v in vteps if v not in expected)
+        if mapped and vlan not in mapped:
+            j.imet_unmapped.extend((vlan, v) for v in vteps)
+    return j
@@ -0,0 +1,90 @@
+import os
+import time
+from typing import Callable, Optional
+
+try:
+    from .sections import PROMPT_RE, CommandBlock
+    from .capture import detect_hostname, normalize_capture
+except ImportError:
+    from sections import PROMPT_RE, CommandBlock
+    from capture import detect_hostname, normalize_capture
+
+__all__ = ["SessionLogWatcher"]
+
+
+class SessionLogWatcher:
+    """
+    Tail a growing terminal session log (e.g. `tee` of an SSH session) and
+    hand every newly completed prompt-delimited command block to `on_block`.
+
+    A block is complete once the next prompt line appears, so the command
+    still being typed / printed is never emitted half-way. Only bytes appended
+    since the previous poll are read; the file is never re-read from the start
+    unless it was truncated or rotated.
+    """
+
+    def __init__(self, path: str, on_block: Callable[[CommandBlock], None], encoding: str = "utf-8"):
+        self.path = path
+        self.on_block = on_block
+        self.encoding = encoding
+        self.hostname = None       # detected from the first prompts seen
+        self._reset()
+
+    def _reset(self):
+        self.offset = 0
+        self._inode = None
+        self._partial = b""        # trailing bytes without a newline yet
+        self._block = None         # currently open CommandBlock
+
+    def poll(self) -> int:
+        """
+        Read whatever was appended since the last call.
+        Returns the number of completed blocks passed to on_block.
+        """
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return 0
+        if st.st_size < self.offset or (self._inode is not None and st.st_ino != self._inode):
+            # truncated or replaced: start over
+            self._reset()
+        self._inode = st.st_ino
+        if st.st_size == self.offset:
+            return 0
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(st.st_size - self.offset)
+        self.offset += len(data)
+        data = self._partial + data
+        cut = data.rfind(b"\n") + 1
+        self._partial = data[cut:]
+        if self.hostname is None:
+            self.hostname = detect_hostname(data[:cut])
+        data = normalize_capture(data[:cut], self.hostname, repair_prompts=self.hostname is not None)
+        emitted = 0
+        for raw in data.split(b"\n")[:-1]:
+            line = raw.decode(self.encoding, "ignore")
+            m = PROMPT_RE.match(line)
+            if m:
+                if self._emit():
+                    emitted += 1
+                self._block = CommandBlock(m.group("host"), m.group("cmd"), [line])
+            elif self._block is not None:
+                self._block.lines.append(line)
+        return emitted
+
+    def _emit(self) -> bool:
+        block, self._block = self._block, None
+        if block is None or not block.command:
+            return False
+        self.on_block(block)
+        return True
+
+    def run(self, interval: float = 1.0, stop: Optional[Callable[[], bool]] = None):
+        """Poll every `interval` seconds until stop() returns True (or Ctrl-C)."""
+        try:
+            while not (stop and stop()):
+                self.poll()
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
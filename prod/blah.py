@@ -10,13 +10,16 @@ except Exception:
 from datetime import datetime
 import pandas as pd
 
+try:
+    from auto.capture import normalize_text
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "auto"))
+    from capture import normalize_text
+
 
 def clean_text(s: str) -> str:
-    # remove common control sequences
-    s = re.sub(r'\x1b\].*?\x07', '', s, flags=re.DOTALL)
-    s = re.sub(r'\x1b\[[0-9;]*[A-Za-z]', '', s)
-    s = ''.join(ch for ch in s if ch in '\n\r\t' or ord(ch) >= 32)
-    return s
+    # ANSI / pager residue / CRLF / control chars, truncated prompts (auto.capture)
+    return normalize_text(s)
 
 
 def parse_with_textfsm(template_path: Path, input_path: Path):
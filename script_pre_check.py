@@ -2,6 +2,7 @@ import os
 import re
 import io
 import sys
+import contextlib
 # --- TextFSM compatibility shim (handles missing attributes) ---
 try:
     import textfsm  # type: ignore
@@ -40,6 +41,22 @@ try:
         MacAddressTableDynamic,
         VrfReservedPorts
     )
+    from auto.watch import SessionLogWatcher
+    from auto.render import TextSink, default_sink
+    from auto.html_report import HtmlReport
+    from auto.sections import PROMPT_RE, iter_command_blocks
+    from auto.mac_table import MacTable, diff_mac_tables, MAC_DIFF_KINDS
+    from auto.evpn import route_key_counts, diff_evpn_routes, route_type, EvpnRouteStats
+    from auto.capture import read_capture, map_capture, split_devices, DeviceCapture
+    from auto.parallel import parse_sections
+    from auto.bgp import parse_bgp_summaries, diff_bgp_summaries, BGP_DIFF_KINDS
+    from auto.interfaces import InterfaceIndex, diff_interfaces, INTERFACE_DIFF_KINDS
+    from auto.routes import RouteTable
+    from auto.route_summary import RouteSummaryMatrix, diff_route_summaries
+    from auto.vlans import capture_vlan_sets, diff_vlan_sets, PortVlanMatrix, diff_port_vlans
+    from auto.vxlan import VxlanIndex, ImetIndex, join_imet, VXLAN_JOIN_KINDS
+    from auto.consistency import EvpnMacIndex, check_consistency, CONSISTENCY_KINDS
+    from auto.rules import load_rules, compile_rules
 except ModuleNotFoundError:
     # Fallback when 'auto' package not discoverable (direct execution)
     import sys as _sys, os as _os
@@ -60,13 +77,69 @@ except ModuleNotFoundError:
         VXLAN = eos_cli.VXLAN  # type: ignore
         MacAddressTableDynamic = eos_cli.MacAddressTableDynamic  # type: ignore
         VrfReservedPorts = eos_cli.VrfReservedPorts  # type: ignore
+        import watch  # type: ignore
+        SessionLogWatcher = watch.SessionLogWatcher  # type: ignore
+        import render  # type: ignore
+        TextSink = render.TextSink  # type: ignore
+        default_sink = render.default_sink  # type: ignore
+        import html_report  # type: ignore
+        HtmlReport = html_report.HtmlReport  # type: ignore
+        import sections  # type: ignore
+        PROMPT_RE = sections.PROMPT_RE  # type: ignore
+        iter_command_blocks = sections.iter_command_blocks  # type: ignore
+        import mac_table  # type: ignore
+        MacTable = mac_table.MacTable  # type: ignore
+        diff_mac_tables = mac_table.diff_mac_tables  # type: ignore
+        MAC_DIFF_KINDS = mac_table.MAC_DIFF_KINDS  # type: ignore
+        import evpn  # type: ignore
+        route_key_counts = evpn.route_key_counts  # type: ignore
+        diff_evpn_routes = evpn.diff_evpn_routes  # type: ignore
+        route_type = evpn.route_type  # type: ignore
+        EvpnRouteStats = evpn.EvpnRouteStats  # type: ignore
+        import capture  # type: ignore
+        read_capture = capture.read_capture  # type: ignore
+        map_capture = capture.map_capture  # type: ignore
+        split_devices = capture.split_devices  # type: ignore
+        DeviceCapture = capture.DeviceCapture  # type: ignore
+        import parallel  # type: ignore
+        parse_sections = parallel.parse_sections  # type: ignore
+        import bgp  # type: ignore
+        parse_bgp_summaries = bgp.parse_bgp_summaries  # type: ignore
+        diff_bgp_summaries = bgp.diff_bgp_summaries  # type: ignore
+        BGP_DIFF_KINDS = bgp.BGP_DIFF_KINDS  # type: ignore
+        import interfaces  # type: ignore
+        InterfaceIndex = interfaces.InterfaceIndex  # type: ignore
+        diff_interfaces = interfaces.diff_interfaces  # type: ignore
+        INTERFACE_DIFF_KINDS = interfaces.INTERFACE_DIFF_KINDS  # type: ignore
+        import routes  # type: ignore
+        RouteTable = routes.RouteTable  # type: ignore
+        import route_summary  # type: ignore
+        RouteSummaryMatrix = route_summary.RouteSummaryMatrix  # type: ignore
+        diff_route_summaries = route_summary.diff_route_summaries  # type: ignore
+        import vlans  # type: ignore
+        capture_vlan_sets = vlans.capture_vlan_sets  # type: ignore
+        diff_vlan_sets = vlans.diff_vlan_sets  # type: ignore
+        PortVlanMatrix = vlans.PortVlanMatrix  # type: ignore
+        diff_port_vlans = vlans.diff_port_vlans  # type: ignore
+        import vxlan  # type: ignore
+        VxlanIndex = vxlan.VxlanIndex  # type: ignore
+        ImetIndex = vxlan.ImetIndex  # type: ignore
+        join_imet = vxlan.join_imet  # type: ignore
+        VXLAN_JOIN_KINDS = vxlan.VXLAN_JOIN_KINDS  # type: ignore
+        import consistency  # type: ignore
+        EvpnMacIndex = consistency.EvpnMacIndex  # type: ignore
+        check_consistency = consistency.check_consistency  # type: ignore
+        CONSISTENCY_KINDS = consistency.CONSISTENCY_KINDS  # type: ignore
+        import rules  # type: ignore
+        load_rules = rules.load_rules  # type: ignore
+        compile_rules = rules.compile_rules  # type: ignore
     except Exception as _e:
         print(f"Import fallback failed: {_e}")
 
 # NOTE: Core parsing (all regex/block extraction) resides in network_parsers.py.
 # This script mainly orchestrates reading test.txt and printing formatted summaries.
 
-def _print_route_summary_table(raw: str):
+def _print_route_summary_table(raw: str, out=None):
     # parser = NetworkParsers()
     # rows = parser.parse_ip_route_summary(raw)
     # if not rows:
@@ -88,6 +161,7 @@ def _print_route_summary_table(raw: str):
     #         print(f"{src.ljust(target_width)}{str(cnt).rjust(4)}")
     # print("")
     # REPLACED: print raw lines (no re-parsing) matching expected format
+    out = default_sink(out)
     lines = raw.splitlines()
     start = None
     for i, l in enumerate(lines):
@@ -96,7 +170,7 @@ def _print_route_summary_table(raw: str):
             start = i + 1
             break
     if start is None:
-        print("\nIP Route Summary (raw): none")
+        out.line("\nIP Route Summary (raw): none")
         return
     block = []
     for l in lines[start:]:
@@ -112,78 +186,109 @@ def _print_route_summary_table(raw: str):
            or re.match(r'\s*External:', l) \
            or re.match(r'\s*Level-1:', l):
             wanted.append(l)
-    print("\nIP Route Summary (raw):")
+    out.line("\nIP Route Summary (raw):")
     for idx, l in enumerate(wanted):
         # First line without leading spaces (as per expected snippet)
-        print(l.lstrip() if idx == 0 else l)
+        out.line(l.lstrip() if idx == 0 else l)
 
-def _print_igmp_snooping_querier(raw: str):
+def _print_igmp_snooping_querier(raw: str, out=None):
+    out = default_sink(out)
     parser = NetworkParsers()
     result = parser.parse_igmp_snooping_querier(raw)
-    print("\ncommand executed :sh igmp snooping querier")
+    out.line("\ncommand executed :sh igmp snooping querier")
     if not result["lines"]:
-        print("No IGMP snooping querier output found.")
+        out.line("No IGMP snooping querier output found.")
         return
     for l in result["lines"]:
-        print(l)
-    print(f"\nVLAN record count: {result['vlan_count']}")
+        out.line(l)
+    out.line(f"\nVLAN record count: {result['vlan_count']}")
 
-def _print_vlan_brief(raw: str):
+def _print_vlan_brief(raw: str, out=None):
+    out = default_sink(out)
     parser = NetworkParsers()
     rows = parser.parse_vlan_brief(raw)
-    print("\nCommand executed:\nshow vlan brief")
+    out.line("\nCommand executed:\nshow vlan brief")
     if not rows:
-        print("No VLAN brief data.")
+        out.line("No VLAN brief data.")
         return
     v_w = max(len("VLAN"), *(len(r["VLAN"]) for r in rows))
     n_w = max(len("Name"), *(len(r["NAME"]) for r in rows))
     s_w = max(len("Status"), *(len(r["STATUS"]) for r in rows))
     header = f"{'VLAN'.ljust(v_w)}  {'Name'.ljust(n_w)}  {'Status'.ljust(s_w)}  Ports"
-    print(header)
-    print("-" * len(header))
+    out.line(header)
+    out.line("-" * len(header))
     for r in rows:
-        print(f"{r['VLAN'].ljust(v_w)}  {r['NAME'].ljust(n_w)}  {r['STATUS'].ljust(s_w)}  {r['PORTS']}")
-    print("-" * len(header))
-    print(f"Total VLANs: {len(rows)}")
+        out.line(f"{r['VLAN'].ljust(v_w)}  {r['NAME'].ljust(n_w)}  {r['STATUS'].ljust(s_w)}  {r['PORTS']}")
+    out.line("-" * len(header))
+    out.line(f"Total VLANs: {len(rows)}")
 
-def _print_vlan_dynamic(raw: str):
+def _print_vlan_dynamic(raw: str, out=None):
+    out = default_sink(out)
     parser = NetworkParsers()
     rows = parser.parse_vlan_dynamic(raw)
-    print("\nCommand executed:\nshow vlan dynamic")
+    out.line("\nCommand executed:\nshow vlan dynamic")
     if not rows:
-        print("No dynamic VLAN data.")
+        out.line("No dynamic VLAN data.")
         return
     v_w = max(len("VLAN"), *(len(r["VLAN"]) for r in rows))
     n_w = max(len("Name"), *(len(r["NAME"]) for r in rows))
     s_w = max(len("Status"), *(len(r["STATUS"]) for r in rows))
     header = f"{'VLAN'.ljust(v_w)}  {'Name'.ljust(n_w)}  {'Status'.ljust(s_w)}  Ports"
-    print(header)
-    print("-" * len(header))
+    out.line(header)
+    out.line("-" * len(header))
     for r in rows:
-        print(f"{r['VLAN'].ljust(v_w)}  {r['NAME'].ljust(n_w)}  {r['STATUS'].ljust(s_w)}  {r['PORTS']}")
-    print("-" * len(header))
-    print(f"Total Dynamic VLANs: {len(rows)}")
-
-def _print_bgp_evpn_route_type_auto_discovery_from_sample():
-    """Load test.txt and print EVPN auto-discovery Network entries with counts."""
-    sample_path = os.path.join(os.path.dirname(__file__), "test.txt")
-    if not os.path.isfile(sample_path):
-        print("\n(test) sh bgp evpn route-type auto-discovery: test.txt not found.")
-        return
-    try:
-        raw = open(sample_path, "r", encoding="utf-8", errors="ignore").read()
-    except Exception as e:
-        print(f"\nError reading test.txt: {e}")
-        return
-    parser = NetworkParsers()
-    rows = parser.parse_bgp_evpn_route_type_auto_discovery(raw)
-    print("\nCommand executed (from test.txt):\nsh bgp evpn route-type auto-discovery")
+        out.line(f"{r['VLAN'].ljust(v_w)}  {r['NAME'].ljust(n_w)}  {r['STATUS'].ljust(s_w)}  {r['PORTS']}")
+    out.line("-" * len(header))
+    out.line(f"Total Dynamic VLANs: {len(rows)}")
+
+def _evpn_stat_rows(stats, rtype: str):
+    """
+    One row per path of `rtype` from an EvpnRouteStats, in the shape of
+    NetworkParsers.parse_bgp_evpn_route_type_* (RD, plus MAC / IP / ESI).
+    """
+    rows = []
+    for key, n in zip(stats.keys, stats.paths):
+        t, rd, *rest = key.split()
+        if t != rtype:
+            continue
+        if t == "mac-ip":
+            row = {"RD": rd, "MAC": rest[0], "IP": rest[1] if len(rest) > 1 and rest[1].count(".") == 3 else None}
+        elif t == "imet":
+            row = {"RD": rd, "IP": rest[0] if rest and rest[0].count(".") == 3 else None}
+        elif t == "ethernet-segment":
+            row = {"RD": rd, "ESI": rest[0] if rest else None}
+        else:
+            row = {"RD": rd}
+        rows.extend([row] * n)
+    return rows
+
+def _print_bgp_evpn_route_type_auto_discovery_from_sample(raw=None, source="test.txt", out=None, stats=None):
+    """
+    Load test.txt (or use `raw`) and print EVPN auto-discovery Network entries with counts.
+    `stats` (EvpnRouteStats of the section, e.g. from the parallel snapshot) replaces the parse of `raw`.
+    """
+    out = default_sink(out)
+    if raw is None:
+        sample_path = os.path.join(os.path.dirname(__file__), "test.txt")
+        if not os.path.isfile(sample_path):
+            out.line("\n(test) sh bgp evpn route-type auto-discovery: test.txt not found.")
+            return
+        try:
+            raw = open(sample_path, "r", encoding="utf-8", errors="ignore").read()
+        except Exception as e:
+            out.line(f"\nError reading test.txt: {e}")
+            return
+    if stats is not None:
+        rows = _evpn_stat_rows(stats, "auto-discovery")
+    else:
+        rows = NetworkParsers().parse_bgp_evpn_route_type_auto_discovery(raw)
+    out.line(f"\nCommand executed (from {source}):\nsh bgp evpn route-type auto-discovery")
     if not rows:
-        print("No auto-discovery route-type data found.")
+        out.line("No auto-discovery route-type data found.")
         return
-    print("Entries (all occurrences):")
+    out.line("Entries (all occurrences):")
     for r in rows:
-        print(f"  RD {r.get('RD')}")
+        out.line(f"  RD {r.get('RD')}")
     counts = {}
     for r in rows:
         rd = r.get("RD")
@@ -192,37 +297,41 @@ def _print_bgp_evpn_route_type_auto_discovery_from_sample():
     rd_w = max(len("RD"), *(len(x) for x in counts))
     c_w = len("Count")
     header = f"{'RD'.ljust(rd_w)}  {'Count'.rjust(c_w)}"
-    print("\nSummary:")
-    print(header)
-    print("-" * len(header))
+    out.line("\nSummary:")
+    out.line(header)
+    out.line("-" * len(header))
     total = 0
     for rd in sorted(counts):
         v = counts[rd]; total += v
-        print(f"{rd.ljust(rd_w)}  {str(v).rjust(c_w)}")
-    print("-" * len(header))
-    print(f"{'TOTAL DISTINCT'.ljust(rd_w)}  {str(len(counts)).rjust(c_w)}")
-    print(f"{'TOTAL OCCURRENCES'.ljust(rd_w)}  {str(total).rjust(c_w)}")
-
-def _print_bgp_evpn_route_type_mac_ip_from_sample():
-    """Load test.txt and print EVPN mac-ip Route Distinguisher entries with counts."""
-    sample_path = os.path.join(os.path.dirname(__file__), "test.txt")
-    if not os.path.isfile(sample_path):
-        print("\n(test) sh bgp evpn route-type mac-ip: test.txt not found.")
-        return
-    try:
-        raw = open(sample_path, "r", encoding="utf-8", errors="ignore").read()
-    except Exception as e:
-        print(f"\nError reading test.txt: {e}")
-        return
-    parser = NetworkParsers()
-    rows = parser.parse_bgp_evpn_route_type_mac_ip(raw)
-    print("\nCommand executed (from test.txt):\nsh bgp evpn route-type mac-ip")
+        out.line(f"{rd.ljust(rd_w)}  {str(v).rjust(c_w)}")
+    out.line("-" * len(header))
+    out.line(f"{'TOTAL DISTINCT'.ljust(rd_w)}  {str(len(counts)).rjust(c_w)}")
+    out.line(f"{'TOTAL OCCURRENCES'.ljust(rd_w)}  {str(total).rjust(c_w)}")
+
+def _print_bgp_evpn_route_type_mac_ip_from_sample(raw=None, source="test.txt", out=None, stats=None):
+    """Load test.txt (or use `raw`, or `stats`) and print EVPN mac-ip Route Distinguisher entries with counts."""
+    out = default_sink(out)
+    if raw is None:
+        sample_path = os.path.join(os.path.dirname(__file__), "test.txt")
+        if not os.path.isfile(sample_path):
+            out.line("\n(test) sh bgp evpn route-type mac-ip: test.txt not found.")
+            return
+        try:
+            raw = open(sample_path, "r", encoding="utf-8", errors="ignore").read()
+        except Exception as e:
+            out.line(f"\nError reading test.txt: {e}")
+            return
+    if stats is not None:
+        rows = _evpn_stat_rows(stats, "mac-ip")
+    else:
+        rows = NetworkParsers().parse_bgp_evpn_route_type_mac_ip(raw)
+    out.line(f"\nCommand executed (from {source}):\nsh bgp evpn route-type mac-ip")
     if not rows:
-        print("No mac-ip route-type data found.")
+        out.line("No mac-ip route-type data found.")
         return
-    print("Entries (all occurrences):")
+    out.line("Entries (all occurrences):")
     for r in rows:
-        print(f"  RD {r.get('RD')}  MAC {r.get('MAC')}  IP {r.get('IP') or ''}")
+        out.line(f"  RD {r.get('RD')}  MAC {r.get('MAC')}  IP {r.get('IP') or ''}")
     rd_counts = {}
     for r in rows:
         rd = r.get("RD")
@@ -231,37 +340,41 @@ def _print_bgp_evpn_route_type_mac_ip_from_sample():
     rd_w = max(len("RD"), *(len(x) for x in rd_counts))
     c_w = len("Count")
     header = f"{'RD'.ljust(rd_w)}  {'Count'.rjust(c_w)}"
-    print("\nSummary:")
-    print(header)
-    print("-" * len(header))
+    out.line("\nSummary:")
+    out.line(header)
+    out.line("-" * len(header))
     total = 0
     for rd in sorted(rd_counts):
         v = rd_counts[rd]; total += v
-        print(f"{rd.ljust(rd_w)}  {str(v).rjust(c_w)}")
-    print("-" * len(header))
-    print(f"{'TOTAL DISTINCT'.ljust(rd_w)}  {str(len(rd_counts)).rjust(c_w)}")
-    print(f"{'TOTAL OCCURRENCES'.ljust(rd_w)}  {str(total).rjust(c_w)}")
-
-def _print_bgp_evpn_route_type_imet_from_sample():
-    """Load test.txt and print EVPN imet RD counts."""
-    sample_path = os.path.join(os.path.dirname(__file__), "test.txt")
-    if not os.path.isfile(sample_path):
-        print("\n(test) sh bgp evpn route-type imet: test.txt not found.")
-        return
-    try:
-        raw = open(sample_path, "r", encoding="utf-8", errors="ignore").read()
-    except Exception as e:
-        print(f"\nError reading test.txt: {e}")
-        return
-    parser = NetworkParsers()
-    rows = parser.parse_bgp_evpn_route_type_imet(raw)
-    print("\nCommand executed (from test.txt):\nsh bgp evpn route-type imet")
+        out.line(f"{rd.ljust(rd_w)}  {str(v).rjust(c_w)}")
+    out.line("-" * len(header))
+    out.line(f"{'TOTAL DISTINCT'.ljust(rd_w)}  {str(len(rd_counts)).rjust(c_w)}")
+    out.line(f"{'TOTAL OCCURRENCES'.ljust(rd_w)}  {str(total).rjust(c_w)}")
+
+def _print_bgp_evpn_route_type_imet_from_sample(raw=None, source="test.txt", out=None, stats=None):
+    """Load test.txt (or use `raw`, or `stats`) and print EVPN imet RD counts."""
+    out = default_sink(out)
+    if raw is None:
+        sample_path = os.path.join(os.path.dirname(__file__), "test.txt")
+        if not os.path.isfile(sample_path):
+            out.line("\n(test) sh bgp evpn route-type imet: test.txt not found.")
+            return
+        try:
+            raw = open(sample_path, "r", encoding="utf-8", errors="ignore").read()
+        except Exception as e:
+            out.line(f"\nError reading test.txt: {e}")
+            return
+    if stats is not None:
+        rows = _evpn_stat_rows(stats, "imet")
+    else:
+        rows = NetworkParsers().parse_bgp_evpn_route_type_imet(raw)
+    out.line(f"\nCommand executed (from {source}):\nsh bgp evpn route-type imet")
     if not rows:
-        print("No imet route-type data found.")
+        out.line("No imet route-type data found.")
         return
-    print("Entries (all occurrences):")
+    out.line("Entries (all occurrences):")
     for r in rows:
-        print(f"  RD {r.get('RD')}  IP {r.get('IP') or ''}")
+        out.line(f"  RD {r.get('RD')}  IP {r.get('IP') or ''}")
     counts = {}
     for r in rows:
         rd = r.get("RD")
@@ -270,41 +383,46 @@ def _print_bgp_evpn_route_type_imet_from_sample():
     rd_w = max(len("RD"), *(len(x) for x in counts))
     c_w = len("Count")
     header = f"{'RD'.ljust(rd_w)}  {'Count'.rjust(c_w)}"
-    print("\nSummary:")
-    print(header)
-    print("-" * len(header))
+    out.line("\nSummary:")
+    out.line(header)
+    out.line("-" * len(header))
     total = 0
     for rd in sorted(counts):
         v = counts[rd]; total += v
-        print(f"{rd.ljust(rd_w)}  {str(v).rjust(c_w)}")
-    print("-" * len(header))
-    print(f"{'TOTAL DISTINCT'.ljust(rd_w)}  {str(len(counts)).rjust(c_w)}")
-    print(f"{'TOTAL OCCURRENCES'.ljust(rd_w)}  {str(total).rjust(c_w)}")
-
-def _print_bgp_evpn_route_type_ethernet_segment_from_sample():
-    """Load test.txt and print EVPN ethernet-segment RD/ESI counts."""
-    sample_path = os.path.join(os.path.dirname(__file__), "test.txt")
-    if not os.path.isfile(sample_path):
-        print("\n(test) sh bgp evpn route-type ethernet-segment: test.txt not found.")
-        return
-    try:
-        raw = open(sample_path, "r", encoding="utf-8", errors="ignore").read()
-    except Exception as e:
-        print(f"\nError reading test.txt: {e}")
-        return
-    parser = NetworkParsers()
-    fn = getattr(parser, "parse_bgp_evpn_route_type_ethernet_segment", None)
-    if not fn:
-        print("Parser for ethernet-segment not implemented.")
-        return
-    rows = fn(raw)
-    print("\nCommand executed (from test.txt):\nsh bgp evpn route-type ethernet-segment")
+        out.line(f"{rd.ljust(rd_w)}  {str(v).rjust(c_w)}")
+    out.line("-" * len(header))
+    out.line(f"{'TOTAL DISTINCT'.ljust(rd_w)}  {str(len(counts)).rjust(c_w)}")
+    out.line(f"{'TOTAL OCCURRENCES'.ljust(rd_w)}  {str(total).rjust(c_w)}")
+
+def _print_bgp_evpn_route_type_ethernet_segment_from_sample(raw=None, source="test.txt", out=None, stats=None):
+    """Load test.txt (or use `raw`, or `stats`) and print EVPN ethernet-segment RD/ESI counts."""
+    out = default_sink(out)
+    if raw is None:
+        sample_path = os.path.join(os.path.dirname(__file__), "test.txt")
+        if not os.path.isfile(sample_path):
+            out.line("\n(test) sh bgp evpn route-type ethernet-segment: test.txt not found.")
+            return
+        try:
+            raw = open(sample_path, "r", encoding="utf-8", errors="ignore").read()
+        except Exception as e:
+            out.line(f"\nError reading test.txt: {e}")
+            return
+    if stats is not None:
+        rows = _evpn_stat_rows(stats, "ethernet-segment")
+    else:
+        parser = NetworkParsers()
+        fn = getattr(parser, "parse_bgp_evpn_route_type_ethernet_segment", None)
+        if not fn:
+            out.line("Parser for ethernet-segment not implemented.")
+            return
+        rows = fn(raw)
+    out.line(f"\nCommand executed (from {source}):\nsh bgp evpn route-type ethernet-segment")
     if not rows:
-        print("No ethernet-segment route-type data found.")
+        out.line("No ethernet-segment route-type data found.")
         return
-    print("Entries (all occurrences):")
+    out.line("Entries (all occurrences):")
     for r in rows:
-        print(f"  RD {r.get('RD')}  ESI {r.get('ESI')}")
+        out.line(f"  RD {r.get('RD')}  ESI {r.get('ESI')}")
     counts = {}
     for r in rows:
         rd = r.get("RD")
@@ -313,88 +431,111 @@ def _print_bgp_evpn_route_type_ethernet_segment_from_sample():
     rd_w = max(len("RD"), *(len(x) for x in counts))
     c_w = len("Count")
     header = f"{'RD'.ljust(rd_w)}  {'Count'.rjust(c_w)}"
-    print("\nSummary:")
-    print(header)
-    print("-" * len(header))
+    out.line("\nSummary:")
+    out.line(header)
+    out.line("-" * len(header))
     total = 0
     for rd in sorted(counts):
         v = counts[rd]; total += v
-        print(f"{rd.ljust(rd_w)}  {str(v).rjust(c_w)}")
-    print("-" * len(header))
-    print(f"{'TOTAL DISTINCT'.ljust(rd_w)}  {str(len(counts)).rjust(c_w)}")
-    print(f"{'TOTAL OCCURRENCES'.ljust(rd_w)}  {str(total).rjust(c_w)}")
+        out.line(f"{rd.ljust(rd_w)}  {str(v).rjust(c_w)}")
+    out.line("-" * len(header))
+    out.line(f"{'TOTAL DISTINCT'.ljust(rd_w)}  {str(len(counts)).rjust(c_w)}")
+    out.line(f"{'TOTAL OCCURRENCES'.ljust(rd_w)}  {str(total).rjust(c_w)}")
 
-def _write_output_file(content: str, filename: str):
-    """Write captured script output to a file in the same directory."""
+@contextlib.contextmanager
+def _output_sink(filename: str, echo: bool = True):
+    """
+    TextSink that streams straight into `filename` in the same directory
+    (and to stdout when `echo`), so the report is never held in memory.
+    """
     out_path = os.path.join(os.path.dirname(__file__), filename)
+    streams = [sys.stdout] if echo else []
+    f = None
     try:
-        with open(out_path, "w", encoding="utf-8") as f:
-            f.write(content)
+        f = open(out_path, "w", encoding="utf-8")
+        streams.append(f)
     except Exception as e:
         print(f"Failed writing {filename}: {e}")
+    try:
+        yield TextSink(*streams)
+    finally:
+        if f is not None:
+            f.close()
 
 def _run_parsing(raw: str):
     isc = InterfacesStatusCount()  # reuse object for methods; override content
     isc.content = raw or ""
     buf = io.StringIO()
-    # Start capture
+    out = TextSink(buf)
     up, down = isc.count_ip_interfaces()
     conn, dis = isc.count_interfaces()
-    isc.display_results()
+    isc.display_results(out)
     bgp = BgpStatus(isc.content)
-    bgp.print_bgp_status()
+    bgp.print_bgp_status(out)
     up, down = isc.count_ip_interfaces()
     conn, dis = isc.count_interfaces()
     est = bgp.count_established_sessions()
-    print("\n--- Summary ---")
-    print(f"UP: {up} DOWN: {down} CONNECTED: {conn} DISABLED: {dis} ESTABLISHED BGP: {est}")
+    out.line("\n--- Summary ---")
+    out.line(f"UP: {up} DOWN: {down} CONNECTED: {conn} DISABLED: {dis} ESTABLISHED BGP: {est}")
     # Class-based tables
-    rs = RouteSummary(isc.content); rs.print()
-    ig = IgmpSnoopingQuerier(isc.content); ig.print()
-    vb = VlanBrief(isc.content); vb.print()
-    vd = VlanDynamic(isc.content); vd.print()
-    ev = EvpnRouteTypes(isc.content); ev.print_summary()
+    rs = RouteSummary(isc.content); rs.print(out)
+    ig = IgmpSnoopingQuerier(isc.content); ig.print(out)
+    vb = VlanBrief(isc.content); vb.print(out)
+    vd = VlanDynamic(isc.content); vd.print(out)
+    ev = EvpnRouteTypes(isc.content); ev.print_summary(out)
     # EVPN detailed
-    _print_bgp_evpn_route_type_auto_discovery_from_sample()
-    _print_bgp_evpn_route_type_mac_ip_from_sample()
-    _print_bgp_evpn_route_type_imet_from_sample()
-    _print_bgp_evpn_route_type_ethernet_segment_from_sample()
+    _print_bgp_evpn_route_type_auto_discovery_from_sample(isc.content, out=out)
+    _print_bgp_evpn_route_type_mac_ip_from_sample(isc.content, out=out)
+    _print_bgp_evpn_route_type_imet_from_sample(isc.content, out=out)
+    _print_bgp_evpn_route_type_ethernet_segment_from_sample(isc.content, out=out)
     # Non-class helpers
-    _print_route_summary_table(isc.content)
-    _print_igmp_snooping_querier(isc.content)
-    _print_vlan_brief(isc.content)
-    _print_vlan_dynamic(isc.content)
+    _print_route_summary_table(isc.content, out)
+    _print_igmp_snooping_querier(isc.content, out)
+    _print_vlan_brief(isc.content, out)
+    _print_vlan_dynamic(isc.content, out)
     return buf.getvalue()
 
-def _print_interface_sections(isc: InterfacesStatusCount):
+def _print_interface_sections(isc: InterfacesStatusCount, out=None, index=None):
     # Count interface states once and print in requested format.
-    up, down = isc.count_ip_interfaces()
-    conn, dis = isc.count_interfaces()
-    print("command executed: show interfaces status")
-    print(f"Number of interfaces CONNECTED: {conn}")
-    print(f"Number of interfaces DISABLED: {dis}")
-    print("\ncommand executed: show ip interface brief")
-    print(f"Number of interfaces UP: {up}")
-    print(f"Number of interfaces DOWN: {down}")
+    # `index`: InterfaceIndex of both tables (parallel snapshot) instead of the text.
+    out = default_sink(out)
+    if index is not None:
+        status, ip_status = index.counts("STATUS"), index.counts("IP_STATUS")
+        up, down = ip_status.get("up", 0), ip_status.get("down", 0)
+        conn, dis = status.get("connected", 0), status.get("disabled", 0)
+    else:
+        up, down = isc.count_ip_interfaces()
+        conn, dis = isc.count_interfaces()
+    out.line("command executed: show interfaces status")
+    out.line(f"Number of interfaces CONNECTED: {conn}")
+    out.line(f"Number of interfaces DISABLED: {dis}")
+    out.line("\ncommand executed: show ip interface brief")
+    out.line(f"Number of interfaces UP: {up}")
+    out.line(f"Number of interfaces DOWN: {down}")
     return up, down, conn, dis
 
-def _print_bgp_evpn_summary(raw: str):
-    parser = NetworkParsers()
-    rows = parser.parse_bgp_evpn_neighbor_summary(raw)
-    print("\nCommand executed:\nsh bgp evpn summary")
-    if not rows:
-        print("No EVPN summary neighbor data found.")
+def _print_bgp_evpn_summary(raw: str, out=None, summary=None):
+    out = default_sink(out)
+    if summary is not None:
+        count, estab = len(summary), summary.established()
+    else:
+        rows = NetworkParsers().parse_bgp_evpn_neighbor_summary(raw)
+        count = len(rows)
+        estab = sum(1 for r in rows if r["STATE"].lower().startswith("estab"))
+    out.line("\nCommand executed:\nsh bgp evpn summary")
+    if not count:
+        out.line("No EVPN summary neighbor data found.")
         return
-    estab = sum(1 for r in rows if r["STATE"].lower().startswith("estab"))
-    print(f"Neighbor count: {len(rows)}  Established: {estab}")
+    out.line(f"Neighbor count: {count}  Established: {estab}")
 
-def _print_bgp_summary(raw: str):
+def _print_bgp_summary(raw: str, out=None):
     """Use BgpStatus internal parser (_records) for accurate neighbor / established counts."""
+    out = default_sink(out)
     bs = BgpStatus(raw)
     rows = bs._records()
     estab = sum(1 for r in rows if r[2].lower().startswith("estab"))
-    print("\ncommand executed: show bgp summary")
-    print(f"Neighbor count: {len(rows)} Established: {estab}")
+    out.line("\ncommand executed: show bgp summary")
+    out.line(f"Neighbor count: {len(rows)} Established: {estab}")
 
 def _manual_bgp_summary_neighbors(raw: str):
     """
@@ -458,21 +599,27 @@ def _manual_bgp_summary_neighbors(raw: str):
         i += 1
     return results
 
-def _print_bgp_summary_ipv4(raw: str):
+def _print_bgp_summary_ipv4(raw: str, out=None, summary=None):
     """
     Same style as _print_bgp_evpn_summary: counts neighbors & established.
     Adds neighbor IP list for validation (expect 6 in test.txt).
+    `summary`: BgpSummary of the section (parallel snapshot) instead of the text.
     """
-    parser = NetworkParsers()
-    rows = parser.parse_bgp_summary(raw)
-    print("\nCommand executed:\nsh bgp summary")
-    if not rows:
-        print("No BGP summary neighbor data found.")
+    out = default_sink(out)
+    if summary is not None:
+        count, estab = len(summary), summary.established()
+        neighbors = [s.NEIGHBOR for s in summary]
+    else:
+        rows = NetworkParsers().parse_bgp_summary(raw)
+        count = len(rows)
+        estab = sum(1 for r in rows if (r.get("STATE","").lower().startswith("estab")))
+        neighbors = [r.get("NEIGHBOR") for r in rows if r.get("NEIGHBOR")]
+    out.line("\nCommand executed:\nsh bgp summary")
+    if not count:
+        out.line("No BGP summary neighbor data found.")
         return
-    estab = sum(1 for r in rows if (r.get("STATE","").lower().startswith("estab")))
-    neighbors = [r.get("NEIGHBOR") for r in rows if r.get("NEIGHBOR")]
-    print(f"Neighbor count: {len(rows)} Established: {estab}")
-    print(f"Neighbor IPs ({len(neighbors)}): {' '.join(neighbors)}")
+    out.line(f"Neighbor count: {count} Established: {estab}")
+    out.line(f"Neighbor IPs ({len(neighbors)}): {' '.join(neighbors)}")
 
 # INSERT: define VLAN brief counter BEFORE main so it's available when called
 def _count_vlans_in_show_vlan_brief_block(text: str) -> int:
@@ -538,221 +685,127 @@ def _count_vlans_in_show_vlan_brief_block(text: str) -> int:
         j += 1
     return count
 
-def main():
+_EVPN_SNAPSHOT_KEYS = (("auto-discovery", "evpn_auto_discovery"), ("mac-ip", "evpn_mac_ip"),
+                       ("imet", "evpn_imet"), ("ethernet-segment", "evpn_ethernet_segment"))
+
+def _render_check(raw: str, source: str, out, snapshot: dict = None):
+    """
+    Render every pre/post check section for one capture into `out`.
+    With a parse_sections() snapshot of the capture, the sections it holds
+    (interfaces, BGP summaries, MAC table, EVPN route types) are rendered
+    from it instead of being parsed from `raw` again.
+    """
+    snap = snapshot or {}
+    evpn = None
+    if snapshot is not None:
+        evpn = {rtype: snap.get(key) or EvpnRouteStats() for rtype, key in _EVPN_SNAPSHOT_KEYS}
+    isc = InterfacesStatusCount()
+    isc.content = raw
+    up, down, conn, dis = _print_interface_sections(isc, out, snap.get("interfaces"))
+    bgp = BgpStatus(isc.content)
+    # REMOVED obsolete enhanced summary call:
+    # bgp.print_bgp_summary_enhanced()
+    _print_bgp_summary_ipv4(isc.content, out, snap.get("bgp_summary"))
+    bgp.print_bgp_status(out)
+    _print_bgp_evpn_summary(isc.content, out, snap.get("bgp_evpn_summary"))
+    VXLAN(isc.content).print_vtep_detail(out)
+    MacAddressTableDynamic(isc.content, snap.get("mac_address_table_dynamic")).print(out)
+    VrfReservedPorts(isc.content).print(out)
+    RouteSummary(isc.content).print(out)
+    IgmpSnoopingQuerier(isc.content).print(out)
+    VlanBrief(isc.content).print(out)
+    VlanDynamic(isc.content).print(out)
+    EvpnRouteTypes(isc.content, evpn).print_summary(out)
+    evpn = evpn or {}
+    _print_bgp_evpn_route_type_auto_discovery_from_sample(raw, source, out, evpn.get("auto-discovery"))
+    _print_bgp_evpn_route_type_mac_ip_from_sample(raw, source, out, evpn.get("mac-ip"))
+    _print_bgp_evpn_route_type_imet_from_sample(raw, source, out, evpn.get("imet"))
+    _print_bgp_evpn_route_type_ethernet_segment_from_sample(raw, source, out, evpn.get("ethernet-segment"))
+    # add explicit command executed line before route summary raw
+    out.line("\ncommand executed: sh ip route summary")
+    _print_route_summary_table(isc.content, out)
+    _print_igmp_snooping_querier(isc.content, out)
+    _print_vlan_brief(isc.content, out)
+    _print_vlan_dynamic(isc.content, out)
+    return up, down, conn, dis
+
+def main(parallel: bool = False, jobs: int = None):
+    """
+    Render the pre (test.txt) and post (post_check.txt) checks. With
+    parallel=True the sections of each capture are first parsed in a process
+    pool (auto.parallel); the report is rendered from that snapshot and it is
+    returned as {'pre': snapshot, 'post': snapshot} for OutputTests, so each
+    section is parsed once.
+    """
+    snapshots = {}
     # Run for test.txt (existing behavior)
     test_path = os.path.join(os.path.dirname(__file__), "test.txt")
     test_raw = ""
     if os.path.isfile(test_path):
-        test_raw = open(test_path, "r", encoding="utf-8", errors="ignore").read()
+        test_raw = read_capture(test_path)
     else:
         print("test.txt not found.")
-    _buf = io.StringIO()
-    _real_stdout = sys.stdout
-    sys.stdout = _buf
-    try:
-        isc = InterfacesStatusCount()
-        isc.content = test_raw
-        up, down, conn, dis = _print_interface_sections(isc)
-        bgp = BgpStatus(isc.content)
-        # REMOVED obsolete enhanced summary call:
-        # bgp.print_bgp_summary_enhanced()
-        _print_bgp_summary_ipv4(isc.content)
-        bgp.print_bgp_status()
-        _print_bgp_evpn_summary(isc.content)
-        VXLAN(isc.content).print_vtep_detail()
-        MacAddressTableDynamic(isc.content).print()
-        VrfReservedPorts(isc.content).print()
-        est = bgp.count_established_sessions()
-        RouteSummary(isc.content).print()
-        IgmpSnoopingQuerier(isc.content).print()
-        VlanBrief(isc.content).print()
-        VlanDynamic(isc.content).print()
-        EvpnRouteTypes(isc.content).print_summary()
-        _print_bgp_evpn_route_type_auto_discovery_from_sample()
-        _print_bgp_evpn_route_type_mac_ip_from_sample()
-        _print_bgp_evpn_route_type_imet_from_sample()
-        _print_bgp_evpn_route_type_ethernet_segment_from_sample()
-        # PRE CHECK: add explicit command executed line before route summary raw
-        print("\ncommand executed: sh ip route summary")  # NEW
-        _print_route_summary_table(isc.content)            # already present but now preceded by command line
-        _print_igmp_snooping_querier(isc.content)
-        _print_vlan_brief(isc.content)
-        _print_vlan_dynamic(isc.content)
-    finally:
-        sys.stdout = _real_stdout
-    test_out = _buf.getvalue()
+    if parallel and test_raw:
+        snapshots["pre"] = parse_sections(test_raw, jobs=jobs, normalize=False)
     # REMOVED _strip_plain_bgp_summary call to preserve neighbor / established lines
-    # test_out = _strip_plain_bgp_summary(test_out)
-    print(test_out)
+    with _output_sink("script_output.txt") as out:
+        _render_check(test_raw, "test.txt", out, snapshots.get("pre"))
 
     # NEW: append explicit VLAN count from 'show vlan brief' for pre (script_output)
     if test_raw:
         pre_vlan_cnt = _count_vlans_in_show_vlan_brief_block(test_raw)
         print(f"\nVLAN count (show vlan brief): {pre_vlan_cnt}")
 
-    _write_output_file(test_out, "script_output.txt")
-
     # Run for post_check.txt (new)
     post_path = os.path.join(os.path.dirname(__file__), "post_check.txt")
     if os.path.isfile(post_path):
-        post_raw = open(post_path, "r", encoding="utf-8", errors="ignore").read()
-        # Reuse same functions but need EVPN sample readers to point at post file temporarily
-        # Simplest: temporarily rename expected file references
-        _buf2 = io.StringIO()
-        sys.stdout = _buf2
-        try:
-            # Override sample-based functions to read post_check.txt by monkey patching path lookups
-            def _load_and_replace(func, new_file):
-                # Wrap original function to force reading new_file
-                def wrapper():
-                    # Replace internal sample_path usage by reading new_file directly
-                    raw_local = post_raw
-                    parser = NetworkParsers()
-                    if func.__name__.endswith("auto_discovery_from_sample"):
-                        rows = parser.parse_bgp_evpn_route_type_auto_discovery(raw_local)
-                        print("\nCommand executed (from post_check.txt):\nsh bgp evpn route-type auto-discovery")
-                        if not rows:
-                            print("No auto-discovery route-type data found."); return
-                        print("Entries (all occurrences):")
-                        for r in rows: print(f"  RD {r.get('RD')}")
-                        counts={}
-                        for r in rows:
-                            rd=r.get("RD")
-                            if rd: counts[rd]=counts.get(rd,0)+1
-                        rd_w=max(len("RD"),*(len(x) for x in counts))
-                        c_w=len("Count")
-                        header=f"{'RD'.ljust(rd_w)}  {'Count'.rjust(c_w)}"
-                        print("\nSummary:"); print(header); print("-"*len(header))
-                        total=0
-                        for rd in sorted(counts):
-                            v=counts[rd]; total+=v
-                            print(f"{rd.ljust(rd_w)}  {str(v).rjust(c_w)}")
-                        print("-"*len(header))
-                        print(f"{'TOTAL DISTINCT'.ljust(rd_w)}  {str(len(counts)).rjust(c_w)}")
-                        print(f"{'TOTAL OCCURRENCES'.ljust(rd_w)}  {str(total).rjust(c_w)}")
-                    elif func.__name__.endswith("mac_ip_from_sample"):
-                        rows = parser.parse_bgp_evpn_route_type_mac_ip(raw_local)
-                        print("\nCommand executed (from post_check.txt):\nsh bgp evpn route-type mac-ip")
-                        if not rows:
-                            print("No mac-ip route-type data found."); return
-                        print("Entries (all occurrences):")
-                        for r in rows: print(f"  RD {r.get('RD')}  MAC {r.get('MAC')}  IP {r.get('IP') or ''}")
-                        counts={}
-                        for r in rows:
-                            rd=r.get("RD")
-                            if rd: counts[rd]=counts.get(rd,0)+1
-                        rd_w=max(len("RD"),*(len(x) for x in counts))
-                        c_w=len("Count"); header=f"{'RD'.ljust(rd_w)}  {'Count'.rjust(c_w)}"
-                        print("\nSummary:"); print(header); print("-"*len(header))
-                        total=0
-                        for rd in sorted(counts):
-                            v=counts[rd]; total+=v
-                            print(f"{rd.ljust(rd_w)}  {str(v).rjust(c_w)}")
-                        print("-"*len(header))
-                        print(f"{'TOTAL DISTINCT'.ljust(rd_w)}  {str(len(counts)).rjust(c_w)}")
-                        print(f"{'TOTAL OCCURRENCES'.ljust(rd_w)}  {str(total).rjust(c_w)}")
-                    elif func.__name__.endswith("imet_from_sample"):
-                        rows = parser.parse_bgp_evpn_route_type_imet(raw_local)
-                        print("\nCommand executed (from post_check.txt):\nsh bgp evpn route-type imet")
-                        if not rows:
-                            print("No imet route-type data found."); return
-                        print("Entries (all occurrences):")
-                        for r in rows: print(f"  RD {r.get('RD')}  IP {r.get('IP') or ''}")
-                        counts={}
-                        for r in rows:
-                            rd=r.get("RD")
-                            if rd: counts[rd]=counts.get(rd,0)+1
-                        rd_w=max(len("RD"),*(len(x) for x in counts))
-                        c_w=len("Count"); header=f"{'RD'.ljust(rd_w)}  {'Count'.rjust(c_w)}"
-                        print("\nSummary:"); print(header); print("-"*len(header))
-                        total=0
-                        for rd in sorted(counts):
-                            v=counts[rd]; total+=v
-                            print(f"{rd.ljust(rd_w)}  {str(v).rjust(c_w)}")
-                        print("-"*len(header))
-                        print(f"{'TOTAL DISTINCT'.ljust(rd_w)}  {str(len(counts)).rjust(c_w)}")
-                        print(f"{'TOTAL OCCURRENCES'.ljust(rd_w)}  {str(total).rjust(c_w)}")
-                    elif func.__name__.endswith("ethernet_segment_from_sample"):
-                        rows = parser.parse_bgp_evpn_route_type_ethernet_segment(raw_local)
-                        print("\nCommand executed (from post_check.txt):\nsh bgp evpn route-type ethernet-segment")
-                        if not rows:
-                            print("No ethernet-segment route-type data found."); return
-                        print("Entries (all occurrences):")
-                        for r in rows: print(f"  RD {r.get('RD')}  ESI {r.get('ESI')}")
-                        counts={}
-                        for r in rows:
-                            rd=r.get("RD")
-                            if rd: counts[rd]=counts.get(rd,0)+1
-                        rd_w=max(len("RD"),*(len(x) for x in counts))
-                        c_w=len("Count"); header=f"{'RD'.ljust(rd_w)}  {'Count'.rjust(c_w)}"
-                        print("\nSummary:"); print(header); print("-"*len(header))
-                        total=0
-                        for rd in sorted(counts):
-                            v=counts[rd]; total+=v
-                            print(f"{rd.ljust(rd_w)}  {str(v).rjust(c_w)}")
-                        print("-"*len(header))
-                        print(f"{'TOTAL DISTINCT'.ljust(rd_w)}  {str(len(counts)).rjust(c_w)}")
-                        print(f"{'TOTAL OCCURRENCES'.ljust(rd_w)}  {str(total).rjust(c_w)}")
-                return wrapper
-
-            # Run same high-level summary for post_check
-            isc_post = InterfacesStatusCount()
-            isc_post.content = post_raw
-            # REPLACED isc_post.display_results() with custom formatting
-            up_p, down_p, conn_p, dis_p = _print_interface_sections(isc_post)
-            bgp_post = BgpStatus(isc_post.content)
-            # REMOVED obsolete enhanced summary call:
-            # bgp_post.print_bgp_summary_enhanced()
-            _print_bgp_summary_ipv4(isc_post.content)
-            bgp_post.print_bgp_status()
-            # EVPN detailed for post_check
-            for func in (
-                _print_bgp_evpn_route_type_auto_discovery_from_sample,
-                _print_bgp_evpn_route_type_mac_ip_from_sample,
-                _print_bgp_evpn_route_type_imet_from_sample,
-                _print_bgp_evpn_route_type_ethernet_segment_from_sample,
-            ):
-                wrapped = _load_and_replace(func, post_path)
-                wrapped()
-            # NEW: invoke VXLAN VTEP detail for post_check
-            VXLAN(isc_post.content).print_vtep_detail()
-            # NEW: print MAC address-table dynamic for post_check
-            MacAddressTableDynamic(isc_post.content).print()
-            VrfReservedPorts(isc_post.content).print()  # NEW: print vrf reserved-ports
-            print("command executed:show mac address-table dynamic")
-            # POST CHECK: add missing route summary command + raw table
-            print("\ncommand executed: sh ip route summary")  # NEW
-            _print_route_summary_table(isc_post.content)      # NEW
-            RouteSummary(isc_post.content).print()            # existing class summary
-            IgmpSnoopingQuerier(isc_post.content).print()
-            VlanBrief(isc_post.content).print()
-            VlanDynamic(isc_post.content).print()
-            EvpnRouteTypes(isc_post.content).print_summary()
-            # ...existing code...
-        finally:
-            sys.stdout = _real_stdout
-        post_out = _buf2.getvalue()
-        # REMOVED _strip_plain_bgp_summary call
-        # post_out = _strip_plain_bgp_summary(post_out)
-        print(post_out)
+        post_raw = read_capture(post_path)
+        # Same sections as the pre check; EVPN printers take the post capture directly.
+        if parallel and post_raw:
+            snapshots["post"] = parse_sections(post_raw, jobs=jobs, normalize=False)
+        with _output_sink("post_check_output.txt") as out:
+            _render_check(post_raw, "post_check.txt", out, snapshots.get("post"))
 
         # NEW: append explicit VLAN count from 'show vlan brief' for post (post_check_output)
         if post_raw:
             post_vlan_cnt = _count_vlans_in_show_vlan_brief_block(post_raw)
             print(f"\nVLAN count (show vlan brief): {post_vlan_cnt}")
-
-        _write_output_file(post_out, "post_check_output.txt")
     else:
         print("post_check.txt not found; skipping second pass.")
+    return snapshots
 
 # ---- Test class addition ----
 class OutputTests:
-    def __init__(self, base_dir: str):
+    def __init__(self, base_dir: str, snapshots: dict = None):
         self.base_dir = base_dir
+        # Pre-parsed sections from main(parallel=True): {'pre': {...}, 'post': {...}}
+        self.snapshots = snapshots or {}
         self.script_content = self._read("script_output.txt")
         self.post_content = self._read("post_check_output.txt")
+        # Raw captures, for entry-level comparisons the rendered output does not carry.
+        self.pre_raw = read_capture(os.path.join(base_dir, "test.txt"))
+        self.post_raw = read_capture(os.path.join(base_dir, "post_check.txt"))
+        self.mac_diff = None
+        self.evpn_diff = None
+        self.bgp_diff = {}
+        self.intf_diff = None
+        self.route_tables = {}
+        self.route_summary_delta = None
+        self.vlan_diff = {}
+        self.port_vlan_diff = None
+        self.vxlan_join = {}
+        self.consistency = {}
+        self.rule_plan = None
+        self.rule_results = []
         self.results = []
 
+    def _section(self, side, key, raw, parse):
+        """Section result from the parallel snapshot, else parsed from the raw capture."""
+        snap = self.snapshots.get(side)
+        if snap is not None and key in snap:
+            return snap[key]
+        return parse(raw)
+
     def _read(self, fname):
         path = os.path.join(self.base_dir, fname)
         if not os.path.isfile(path):
@@ -864,7 +917,7 @@ class OutputTests:
             "PASS" if (
                 pre["neighbor_count"] == post["neighbor_count"] and
                 pre["established"] == post["established"] and
-                pre["neighbors"] == post["neighbors"]
+                set(pre["neighbors"]) == set(post["neighbors"])
             ) else "FAIL"
         )
         self.results.append((
@@ -872,12 +925,12 @@ class OutputTests:
             {
                 "neighbor_count": pre["neighbor_count"],
                 "established": pre["established"],
-                "neighbors": pre["neighbors"],
+                "neighbors": sorted(pre["neighbors"]),
             },
             {
                 "neighbor_count": post["neighbor_count"],
                 "established": post["established"],
-                "neighbors": post["neighbors"],
+                "neighbors": sorted(post["neighbors"]),
             },
             status
         ))
@@ -899,6 +952,13 @@ class OutputTests:
             status = "PASS" if a == b else "FAIL"
             self.results.append((label, a, b, status))
 
+    def _record_no_increase(self, label, a, b):
+        """Like _record for problem counts: FAIL only when post (b) has more than pre (a)."""
+        if a is None or b is None:
+            self.results.append((label, a, b, "SKIP"))
+        else:
+            self.results.append((label, a, b, "FAIL" if b > a else "PASS"))
+
     def _vtep_count(self, content):
         m = re.search(r"VTEP count:\s*(\d+)", content)
         if not m:
@@ -1115,6 +1175,33 @@ content)
             self._mac_dynamic_total(self.post_content)
         )
 
+    def test_mac_entries_diff(self):
+        """Entry-level MAC diff: every kind must be 0 (pre column is the expected count)."""
+        if not self.pre_raw or not self.post_raw:
+            for kind in MAC_DIFF_KINDS:
+                self._record(f"mac_{kind}", None, None)
+            return
+        self.mac_diff = diff_mac_tables(
+            self._section("pre", "mac_address_table_dynamic", self.pre_raw, MacTable.from_text),
+            self._section("post", "mac_address_table_dynamic", self.post_raw, MacTable.from_text),
+        )
+        for kind, n in self.mac_diff.counts().items():
+            self._record(f"mac_{kind}", 0, n)
+
+    def print_mac_diff(self, out=None):
+        out = default_sink(out)
+        d = self.mac_diff
+        if d is None or not d.per_vlan:
+            return
+        header = f"{'VLAN'.ljust(6)}" + "".join(k.rjust(17) for k in MAC_DIFF_KINDS)
+        out.line("\nMAC diff per VLAN:")
+        out.line(header)
+        out.line("-" * len(header))
+        for vlan in sorted(d.per_vlan):
+            per = d.per_vlan[vlan]
+            out.line(f"{str(vlan).ljust(6)}" + "".join(str(per[k]).rjust(17) for k in MAC_DIFF_KINDS))
+        out.line("-" * len(header))
+
     def test_vrf_reserved_ports_entries_equal(self):
         """Compare 'Total Entries' extracted from vrf reserved-ports output."""
         pre = self._vrf_reserved_ports_entry_count(self.script_content)
@@ -1131,7 +1218,7 @@ content)
             "PASS" if (
                 pre["neighbor_count"] == post["neighbor_count"] and
                 pre["established"] == post["established"] and
-                pre["neighbors"] == post["neighbors"]
+                set(pre["neighbors"]) == set(post["neighbors"])
             ) else "FAIL"
         )
         self.results.append((
@@ -1139,12 +1226,12 @@ content)
             {
                 "neighbor_count": pre["neighbor_count"],
                 "established": pre["established"],
-                "neighbors": pre["neighbors"],
+                "neighbors": sorted(pre["neighbors"]),
             },
             {
                 "neighbor_count": post["neighbor_count"],
                 "established": post["established"],
-                "neighbors": post["neighbors"],
+                "neighbors": sorted(post["neighbors"]),
             },
             status
         ))
@@ -1250,12 +1337,200 @@ content)
             status = "PASS" if (post_d == pre_d and post_o == pre_o) else "FAIL"
             self.results.append(("evpn_ethernet_segment_totals", (pre_d, pre_o), (post_d, post_o), status))
 
+    EVPN_DIFF_TYPES = ("auto-discovery", "mac-ip", "imet", "ethernet-segment")
+
+    @staticmethod
+    def _evpn_types_captured(raw):
+        """Route types whose 'show bgp evpn route-type ...' block is in the capture."""
+        keys = {b.key for b in iter_command_blocks(raw)}
+        return {t for t in OutputTests.EVPN_DIFF_TYPES if "evpn_" + t.replace("-", "_") in keys}
+
+    def test_evpn_route_diff(self):
+        """
+        Route-level EVPN diff keyed on (type, RD, MAC/IP/ESI) with ECMP path counts.
+        One row per route type: withdrawn routes + lost ECMP paths, expected 0.
+        A type missing from either capture (e.g. not yet seen in watch mode) is SKIP.
+        """
+        if not self.pre_raw or not self.post_raw:
+            for rtype in self.EVPN_DIFF_TYPES:
+                self._record(f"evpn_{rtype}_route_diff", None, None)
+            return
+        both = self._evpn_types_captured(self.pre_raw) & self._evpn_types_captured(self.post_raw)
+        self.evpn_diff = diff_evpn_routes(
+            self._section("pre", "evpn_route_counts", self.pre_raw, route_key_counts),
+            self._section("post", "evpn_route_counts", self.post_raw, route_key_counts),
+        )
+        per_type = self.evpn_diff["per_type"]
+        for rtype in self.EVPN_DIFF_TYPES:
+            if rtype not in both:
+                self._record(f"evpn_{rtype}_route_diff", None, None)
+                continue
+            b = per_type.get(rtype, {})
+            self._record(f"evpn_{rtype}_route_diff", 0, b.get("withdrawn", 0) + b.get("paths_lost", 0))
+
+    def print_evpn_diff(self, out=None):
+        out = default_sink(out)
+        d = self.evpn_diff
+        if d is None or not d["per_type"]:
+            return
+        cols = ("withdrawn", "new", "paths_lost", "paths_gained")
+        header = f"{'Route type'.ljust(18)}" + "".join(c.rjust(14) for c in cols)
+        out.line("\nEVPN route diff:")
+        out.line(header)
+        out.line("-" * len(header))
+        for rtype in sorted(d["per_type"]):
+            b = d["per_type"][rtype]
+            out.line(f"{rtype.ljust(18)}" + "".join(str(b[c]).rjust(14) for c in cols))
+        out.line("-" * len(header))
+        for key in sorted(d["withdrawn"]):
+            out.line(f"  withdrawn: {key} (paths {d['withdrawn'][key]})")
+        for key in sorted(d["paths_changed"]):
+            a, b = d["paths_changed"][key]
+            out.line(f"  paths {a} -> {b}: {key}")
+
+    def test_interface_diff(self):
+        """Per-port diff (interfaces status + ip interface brief): every kind must be 0."""
+        if not self.pre_raw or not self.post_raw:
+            for kind in INTERFACE_DIFF_KINDS:
+                self._record(f"intf_{kind}", None, None)
+            return
+        self.intf_diff = diff_interfaces(
+            self._section("pre", "interfaces", self.pre_raw, InterfaceIndex.from_text),
+            self._section("post", "interfaces", self.post_raw, InterfaceIndex.from_text))
+        for kind, n in self.intf_diff.counts().items():
+            self._record(f"intf_{kind}", 0, n)
+
+    def print_interface_diff(self, out=None):
+        out = default_sink(out)
+        d = self.intf_diff
+        if d is None or not any(d.counts().values()):
+            return
+        header = f"{'Change'.ljust(10)}{'Port'.ljust(22)}{'pre'.ljust(20)}post"
+        out.line("\nInterface diff:")
+        out.line(header)
+        out.line("-" * len(header))
+        for kind in INTERFACE_DIFF_KINDS:
+            for e in d.entries(kind):
+                out.line(f"{kind.ljust(10)}{e['PORT'].ljust(22)}{e['PRE'].ljust(20)}{e['POST']}")
+        out.line("-" * len(header))
+
+    # NLRI Rcd/Acc may move by this fraction of the pre count (or BGP_NLRI_MIN_DELTA) per peer
+    BGP_NLRI_TOLERANCE = 0.05
+    BGP_NLRI_MIN_DELTA = 0
+
+    def test_bgp_session_diff(self):
+        """Per-session BGP diff (sh bgp summary + sh bgp evpn summary): every kind must be 0."""
+        if not self.pre_raw or not self.post_raw:
+            for kind in BGP_DIFF_KINDS:
+                self._record(f"bgp_{kind}", None, None)
+            return
+        pre = self._section("pre", "bgp_summaries", self.pre_raw, parse_bgp_summaries)
+        post = self._section("post", "bgp_summaries", self.post_raw, parse_bgp_summaries)
+        self.bgp_diff = {}
+        totals = dict.fromkeys(BGP_DIFF_KINDS, 0)
+        for key in pre.keys() & post.keys():
+            d = self.bgp_diff[key] = diff_bgp_summaries(
+                pre[key], post[key], self.BGP_NLRI_TOLERANCE, self.BGP_NLRI_MIN_DELTA)
+            for kind, n in d.counts().items():
+                totals[kind] += n
+        for kind in BGP_DIFF_KINDS:
+            self._record(f"bgp_{kind}", 0, totals[kind] if self.bgp_diff else None)
+
+    def _bgp_diff_rows(self):
+        for section in sorted(self.bgp_diff):
+            d = self.bgp_diff[section]
+            for kind in BGP_DIFF_KINDS:
+                for e in d.entries(kind):
+                    yield section, kind, e
+
+    def print_bgp_diff(self, out=None):
+        out = default_sink(out)
+        rows = list(self._bgp_diff_rows())
+        if not rows:
+            return
+        header = (f"{'Section'.ljust(18)}{'Change'.ljust(14)}{'VRF'.ljust(12)}"
+                  f"{'Neighbor'.ljust(18)}{'pre'.ljust(14)}post")
+        out.line("\nBGP session diff:")
+        out.line(header)
+        out.line("-" * len(header))
+        for section, kind, e in rows:
+            out.line(f"{section.ljust(18)}{kind.ljust(14)}{e['VRF'].ljust(12)}"
+                  f"{e['NEIGHBOR'].ljust(18)}{str(e['PRE']).ljust(14)}{e['POST']}")
+        out.line("-" * len(header))
+
     def test_ip_route_count(self):
         """Compare Total Routes between pre (script) and post outputs."""
         pre = self._route_source_counts(self.script_content).get("Total Routes")
         post = self._route_source_counts(self.post_content).get("Total Routes")
         self._record("ip_route_total", pre, post)
 
+    def test_route_table_reconcile(self):
+        """
+        'show ip route vrf all' prefixes per VRF and source against the
+        'sh ip route summary' counters of the same capture. PASS when both
+        captures reconcile; SKIP when a capture has no route table.
+        """
+        for side, raw in (("pre", self.pre_raw), ("post", self.post_raw)):
+            table = self._section(side, "ip_route", raw, RouteTable.from_text) if raw else None
+            self.route_tables[side] = table if table is not None and len(table) else None
+        pre, post = self.route_tables["pre"], self.route_tables["post"]
+        self._record("ip_route_prefixes",
+                     len(pre) if pre is not None else None, len(post) if post is not None else None)
+        bad = [None if t is None else len(t.mismatches()) for t in (pre, post)]
+        if None in bad:
+            self.results.append(("ip_route_reconcile_mismatches", bad[0], bad[1], "SKIP"))
+        else:
+            self.results.append(("ip_route_reconcile_mismatches", bad[0], bad[1],
+                                 "PASS" if bad == [0, 0] else "FAIL"))
+
+    # Route counts may move by this fraction of the pre count per (VRF, source) cell
+    ROUTE_SUMMARY_TOLERANCE = 0.0
+
+    def test_route_summary_matrix(self):
+        """VRF x source route counts of 'sh ip route [vrf all] summary': no cell may move."""
+        pre = post = None
+        if self.pre_raw:
+            pre = self._section("pre", "route_summary_matrix", self.pre_raw, RouteSummaryMatrix.from_text)
+        if self.post_raw:
+            post = self._section("post", "route_summary_matrix", self.post_raw, RouteSummaryMatrix.from_text)
+        if not pre or not post:
+            self._record("route_summary_vrfs", len(pre) if pre else None, len(post) if post else None)
+            self._record("route_summary_cells_changed", None, None)
+            return
+        self.route_summary_delta = diff_route_summaries(pre, post, self.ROUTE_SUMMARY_TOLERANCE)
+        self._record("route_summary_vrfs", len(pre), len(post))
+        self._record("route_summary_cells_changed", 0, self.route_summary_delta.count())
+
+    def print_route_summary_delta(self, out=None):
+        out = default_sink(out)
+        d = self.route_summary_delta
+        if d is None or not d.count():
+            return
+        header = f"{'VRF'.ljust(16)}{'Source'.ljust(26)}{'pre'.rjust(10)}{'post'.rjust(10)}{'delta'.rjust(10)}"
+        out.line("\nRoute summary changes (VRF x source):")
+        out.line(header)
+        out.line("-" * len(header))
+        for c in d.changes():
+            out.line(f"{c['VRF'].ljust(16)}{c['SOURCE'].ljust(26)}{str(c['PRE']).rjust(10)}"
+                  f"{str(c['POST']).rjust(10)}{c['DELTA']:+10d}")
+        out.line("-" * len(header))
+
+    def print_route_reconcile(self, out=None):
+        out = default_sink(out)
+        rows = [(side, r) for side in ("pre", "post") if self.route_tables.get(side) is not None
+                for r in self.route_tables[side].mismatches()]
+        if not rows:
+            return
+        header = f"{'Side'.ljust(6)}{'VRF'.ljust(16)}{'Source'.ljust(26)}{'routes'.rjust(10)}{'summary'.rjust(10)}"
+        out.line("\nRoute table vs route summary (mismatches):")
+        out.line(header)
+        out.line("-" * len(header))
+        for side, r in rows:
+            summary = "-" if r["SUMMARY"] is None else str(r["SUMMARY"])
+            out.line(f"{side.ljust(6)}{r['VRF'].ljust(16)}{r['SOURCE'].ljust(26)}"
+                  f"{str(r['ROUTES']).rjust(10)}{summary.rjust(10)}")
+        out.line("-" * len(header))
+
     # --- NEW (re-added) helpers ---
     def print_route_source_counts_table(self):
         sources = self._route_source_counts(self.script_content)
@@ -1286,33 +1561,88 @@ content)
         else:
             print("\nPost Route Sources: none")
 
+    def _device_name(self):
+        """Hostname from the first prompt in test.txt (falls back to 'device')."""
+        for line in self._read("test.txt").splitlines():
+            m = PROMPT_RE.match(line)
+            if m:
+                return m.group("host")
+        return "device"
+
     def write_html(self, filename="test_results.html"):
         if not self.results:
             return
         path = os.path.join(self.base_dir, filename)
-        rows = []
-        for label, pre_val, post_val, status in self.results:
-            pre_s = "-" if pre_val is None else str(pre_val)
-            post_s = "-" if post_val is None else str(post_val)
-            match_word = "match" if status == "PASS" else "mismatch" if status == "FAIL" else "skip"
-            cls = "pass" if status == "PASS" else "fail" if status == "FAIL" else "skip"
-            rows.append(
-                f"<tr><td>{label}</td><td>{pre_s}</td><td>{post_s}</td>"
-                f"<td>{match_word}</td><td><span class='{cls}'>{status}</span></td></tr>"
-            )
-        html = f"""<!DOCTYPE html>
-<html><head><meta charset='utf-8'/><title>Pre/Post Check Test Results</title>
-<style>body{{font-family:Arial,sans-serif;margin:20px}}table{{border-collapse:collapse;width:100%;max-width:1100px}}
-th,td{{border:1px solid #ccc;padding:6px 10px;text-align:left;font-size:13px}}th{{background:#f5f5f5}}
-tr:nth-child(even){{background:#fafafa}}.pass{{color:#0a0;font-weight:600}}
-.fail,.skip{{color:#c00;font-weight:600}}</style></head><body>
-<h2>Pre / Post Check Test Results</h2><table><thead><tr>
-<th>Metric</th><th>pre_check</th><th>post_check</th><th>match</th><th>status</th>
-</tr></thead><tbody>{''.join(rows)}</tbody></table>
-<p>Generated from script_output.txt and post_check_output.txt.</p></body></html>"""
         try:
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(html)
+            report = HtmlReport(path)
+            with report.device(self._device_name()) as page:
+                with page.table("Pre / Post metrics", ["Metric", "pre_check", "post_check", "match", "status"]) as t:
+                    for label, pre_val, post_val, status in self.results:
+                        match_word = "match" if status == "PASS" else "mismatch" if status in ("FAIL", "WARN") else "skip"
+                        t.row((label, pre_val, post_val, match_word, status))
+                pre = self._route_source_counts(self.script_content)
+                post = self._route_source_counts(self.post_content)
+                with page.table("Route sources", ["Source", "pre_check", "post_check"]) as t:
+                    for k in sorted(set(pre) | set(post)):
+                        t.row((k, pre.get(k), post.get(k)))
+                if self.mac_diff is not None and any(self.mac_diff.counts().values()):
+                    with page.table("MAC diff", ["Change", "VLAN", "MAC", "pre port", "post port",
+                                                 "pre moves", "post moves"]) as t:
+                        for kind in MAC_DIFF_KINDS:
+                            for e in self.mac_diff.entries(kind):
+                                t.row((kind, e["VLAN"], e["MAC"], e["PRE_PORT"], e["POST_PORT"],
+                                       e["PRE_MOVES"], e["POST_MOVES"]))
+                d = self.evpn_diff
+                if d is not None and (d["withdrawn"] or d["new"] or d["paths_changed"]):
+                    with page.table("EVPN route diff", ["Change", "Route type", "Route", "pre paths", "post paths"]) as t:
+                        for key in sorted(d["withdrawn"]):
+                            t.row(("withdrawn", route_type(key), key, d["withdrawn"][key], 0))
+                        for key in sorted(d["new"]):
+                            t.row(("new", route_type(key), key, 0, d["new"][key]))
+                        for key in sorted(d["paths_changed"]):
+                            t.row(("paths_changed", route_type(key), key, *d["paths_changed"][key]))
+                if self.intf_diff is not None and any(self.intf_diff.counts().values()):
+                    with page.table("Interface diff", ["Change", "Port", "pre", "post"]) as t:
+                        for kind in INTERFACE_DIFF_KINDS:
+                            for e in self.intf_diff.entries(kind):
+                                t.row((kind, e["PORT"], e["PRE"], e["POST"]))
+                rsd = self.route_summary_delta
+                if rsd is not None and rsd.count():
+                    with page.table("Route summary changes", ["VRF", "Source", "pre", "post", "delta"]) as t:
+                        for c in rsd.changes():
+                            t.row((c["VRF"], c["SOURCE"], c["PRE"], c["POST"], c["DELTA"]))
+                vlan_rows = [(key, m, a) for key, (m, a) in self.vlan_diff.items() if m or a]
+                if vlan_rows:
+                    with page.table("VLAN set changes", ["Section", "missing", "added"]) as t:
+                        for key, missing, added in vlan_rows:
+                            t.row((key, str(missing) or "-", str(added) or "-"))
+                port_vlan_rows = list(self._port_vlan_rows())
+                if port_vlan_rows:
+                    with page.table("VLAN member ports", ["Change", "VLAN", "Ports"]) as t:
+                        for row in port_vlan_rows:
+                            t.row(row)
+                vxlan_rows = list(self._vxlan_join_rows())
+                if vxlan_rows:
+                    with page.table("VXLAN flood list / IMET join", ["Capture", "Problem", "VNI", "VLAN", "VTEP"]) as t:
+                        for side, kind, e in vxlan_rows:
+                            t.row((side, kind, e["VNI"], e["VLAN"], e["VTEP"]))
+                xtable_rows = list(self._consistency_rows())
+                if xtable_rows:
+                    with page.table("Cross-table consistency", ["Capture", "Problem", "VLAN", "MAC / ESI", "Port",
+                                                                "type-2 VTEP", "table VTEP"]) as t:
+                        for side, kind, e in xtable_rows:
+                            t.row((side, kind, e["VLAN"], e["MAC"] or e["ESI"], e["PORT"], e["VTEP"], e["TABLE_VTEP"]))
+                if self.rule_results:
+                    # 'result', not 'status': the rows are already counted via self.results
+                    with page.table("Rules", ["Rule", "Severity", "pre_check", "post_check", "result"]) as t:
+                        for name, a, b, status, severity in self.rule_results:
+                            t.row((name, severity, a, b, status))
+                bgp_rows = list(self._bgp_diff_rows())
+                if bgp_rows:
+                    with page.table("BGP session diff", ["Section", "Change", "VRF", "Neighbor", "pre", "post"]) as t:
+                        for section, kind, e in bgp_rows:
+                            t.row((section, kind, e["VRF"], e["NEIGHBOR"], e["PRE"], e["POST"]))
+            report.close()
             print(f"\nHTML report written: file://{path}")
         except Exception as e:
             print(f"Failed writing HTML report: {e}")
@@ -1386,6 +1716,216 @@ tr:nth-child(even){{background:#fafafa}}.pass{{color:#0a0;font-weight:600}}
         post = self._vlan_count(self.post_content)
         self._record("vlan_count", pre, post)
 
+    VLAN_SET_SECTIONS = ("vlan_brief", "vlan_dynamic", "igmp_snooping_querier")
+
+    def test_vlan_set_diff(self):
+        """VLANs missing / added per section (vlan brief, vlan dynamic, igmp querier) as bitmaps."""
+        pre = self._section("pre", "vlan_sets", self.pre_raw, capture_vlan_sets) if self.pre_raw else {}
+        post = self._section("post", "vlan_sets", self.post_raw, capture_vlan_sets) if self.post_raw else {}
+        self.vlan_diff = {}
+        for key in self.VLAN_SET_SECTIONS:
+            if key not in pre or key not in post:
+                self._record(f"vlans_{key}_missing", None, None)
+                self._record(f"vlans_{key}_added", None, None)
+                continue
+            missing, added = self.vlan_diff[key] = diff_vlan_sets(pre[key], post[key])
+            self._record(f"vlans_{key}_missing", 0, len(missing))
+            self._record(f"vlans_{key}_added", 0, len(added))
+
+    def test_port_vlan_diff(self):
+        """VLAN member ports lost / gained (port x VLAN matrix of 'show vlan brief')."""
+        if not self.pre_raw or not self.post_raw:
+            self._record("vlan_member_ports_lost", None, None)
+            self._record("vlan_member_ports_gained", None, None)
+            return
+        self.port_vlan_diff = diff_port_vlans(
+            self._section("pre", "vlan_ports", self.pre_raw, PortVlanMatrix.from_text),
+            self._section("post", "vlan_ports", self.post_raw, PortVlanMatrix.from_text))
+        counts = self.port_vlan_diff.counts()
+        self._record("vlan_member_ports_lost", 0, counts["lost"])
+        self._record("vlan_member_ports_gained", 0, counts["gained"])
+
+    def _port_vlan_rows(self):
+        d = self.port_vlan_diff
+        if d is None:
+            return
+        for kind, per_vlan in (("lost", d.lost), ("gained", d.gained)):
+            for vlan in sorted(per_vlan):
+                yield kind, vlan, ", ".join(per_vlan[vlan])
+
+    def print_vlan_diff(self, out=None):
+        out = default_sink(out)
+        rows = [(key, m, a) for key, (m, a) in self.vlan_diff.items() if m or a]
+        member_rows = list(self._port_vlan_rows())
+        if not rows and not member_rows:
+            return
+        out.line("\nVLAN set changes:")
+        for key, missing, added in rows:
+            if missing:
+                out.line(f"  {key} missing: {missing}")
+            if added:
+                out.line(f"  {key} added: {added}")
+        for kind, vlan, ports in member_rows:
+            out.line(f"  VLAN {vlan} {kind} member ports: {ports}")
+
+    def test_vxlan_imet_join(self):
+        """
+        VXLAN flood lists (vtep detail / flood vtep, vni) joined with the IMET
+        routes of the same capture. FAIL when the post capture has more flood
+        VTEPs without an IMET route (or IMET routes outside the flood list)
+        than the pre capture; mismatches already in the pre capture pass and
+        are listed by print_vxlan_join. SKIP when a capture has neither VXLAN
+        tables nor IMET routes.
+        """
+        self.vxlan_join = {}
+        for side, raw in (("pre", self.pre_raw), ("post", self.post_raw)):
+            index = self._section(side, "vxlan", raw, VxlanIndex.from_text) if raw else None
+            imet = self._section(side, "imet", raw, ImetIndex.from_text) if raw else None
+            if index is None or (not index.vteps and not index.flood) or not len(imet):
+                self.vxlan_join[side] = None
+            else:
+                self.vxlan_join[side] = join_imet(index, imet)
+        pre, post = self.vxlan_join["pre"], self.vxlan_join["post"]
+        for kind in VXLAN_JOIN_KINDS:
+            a = len(getattr(pre, kind)) if pre is not None else None
+            b = len(getattr(post, kind)) if post is not None else None
+            self._record_no_increase(f"vxlan_{kind}", a, b)
+
+    def _vxlan_join_rows(self):
+        for side in ("pre", "post"):
+            j = self.vxlan_join.get(side)
+            if j is None:
+                continue
+            for kind in VXLAN_JOIN_KINDS:
+                for e in j.entries(kind):
+                    yield side, kind, e
+
+    def print_vxlan_join(self, out=None):
+        out = default_sink(out)
+        rows = list(self._vxlan_join_rows())
+        if not rows:
+            return
+        header = f"{'Capture'.ljust(8)}{'Problem'.ljust(20)}{'VNI'.rjust(9)}{'VLAN'.rjust(6)}  VTEP"
+        out.line("\nVXLAN flood list / IMET join:")
+        out.line(header)
+        out.line("-" * len(header))
+        for side, kind, e in rows:
+            vni = "-" if e["VNI"] is None else str(e["VNI"])
+            vlan = "-" if e["VLAN"] is None else str(e["VLAN"])
+            out.line(f"{side.ljust(8)}{kind.ljust(20)}{vni.rjust(9)}{vlan.rjust(6)}  {e['VTEP']}")
+        out.line("-" * len(header))
+
+    def _consistency_report(self, side, raw):
+        """auto.consistency.check_capture, from the snapshot where it has the indexes."""
+        vxlan = self._section(side, "vxlan", raw, VxlanIndex.from_text)
+        return check_consistency(
+            self._section(side, "mac_address_table_dynamic", raw, MacTable.from_text),
+            self._section(side, "evpn_macs", raw, lambda text: EvpnMacIndex.from_text(text, vxlan.vlan_of)),
+            vxlan)
+
+    def test_cross_table_consistency(self):
+        """
+        MAC table vs EVPN type-2 / type-4 routes vs VXLAN tables, per capture.
+        FAIL when the post capture has more contradictions of a kind than the
+        pre capture; pre-existing ones pass and are listed by
+        print_consistency. SKIP when a capture has neither a MAC table nor
+        EVPN MAC routes.
+        """
+        self.consistency = {}
+        for side, raw in (("pre", self.pre_raw), ("post", self.post_raw)):
+            report = self._consistency_report(side, raw) if raw else None
+            if report is not None and not len(report.macs) and not len(report.evpn):
+                report = None
+            self.consistency[side] = report
+        pre, post = self.consistency["pre"], self.consistency["post"]
+        for kind in CONSISTENCY_KINDS:
+            a = len(getattr(pre, kind)) if pre is not None else None
+            b = len(getattr(post, kind)) if post is not None else None
+            self._record_no_increase(f"xtable_{kind}", a, b)
+
+    def _consistency_rows(self):
+        for side in ("pre", "post"):
+            report = self.consistency.get(side)
+            if report is None:
+                continue
+            for kind in CONSISTENCY_KINDS:
+                for e in report.entries(kind):
+                    yield side, kind, e
+
+    def print_consistency(self, out=None):
+        out = default_sink(out)
+        rows = list(self._consistency_rows())
+        if not rows:
+            return
+        header = (f"{'Capture'.ljust(8)}{'Problem'.ljust(24)}{'VLAN'.rjust(5)}  {'MAC / ESI'.ljust(26)}"
+                  f"{'Port'.ljust(10)}{'type-2 VTEP'.ljust(16)}table VTEP")
+        out.line("\nCross-table consistency (MAC table / EVPN / VXLAN):")
+        out.line(header)
+        out.line("-" * len(header))
+        for side, kind, e in rows:
+            vlan = "-" if e["VLAN"] is None else str(e["VLAN"])
+            out.line(f"{side.ljust(8)}{kind.ljust(24)}{vlan.rjust(5)}  {(e['MAC'] or e['ESI']).ljust(26)}"
+                  f"{(e['PORT'] or '-').ljust(10)}{(e['VTEP'] or '-').ljust(16)}{e['TABLE_VTEP'] or '-'}")
+        out.line("-" * len(header))
+
+    # Declarative rules (auto.rules) read from base_dir, if the file exists
+    RULES_FILE = "rules.toml"
+
+    def _rule_snapshot(self, side, raw):
+        """Snapshot with every section the rule plan reads, parsing only what is missing."""
+        snap = dict(self.snapshots.get(side) or {})
+        missing = [k for k in self.rule_plan.sections if k not in snap]
+        if missing and raw:
+            snap.update(parse_sections(raw, keys=missing, jobs=1, normalize=False))
+        return snap if raw else None
+
+    def test_rules(self, out=None):
+        """One row per rule of RULES_FILE, evaluated as one compiled plan."""
+        path = os.path.join(self.base_dir, self.RULES_FILE)
+        if not os.path.isfile(path):
+            return
+        if self.rule_plan is None:
+            try:
+                self.rule_plan = compile_rules(load_rules(path))
+            except (ValueError, ImportError) as e:
+                default_sink(out).line(f"[rules] {self.RULES_FILE}: {e}")
+                return
+        self.rule_results = self.rule_plan.evaluate(self._rule_snapshot("pre", self.pre_raw),
+                                                    self._rule_snapshot("post", self.post_raw))
+        for name, a, b, status, severity in self.rule_results:
+            self.results.append((f"rule_{name}", a, b, status))
+
+    def print_rules(self, out=None):
+        out = default_sink(out)
+        failed = [r for r in self.rule_results if r[3] in ("FAIL", "WARN")]
+        if not failed:
+            return
+        header = f"{'Severity'.ljust(10)}{'Rule'.ljust(34)}{'pre'.rjust(10)}{'post'.rjust(10)}"
+        out.line("\nFailed rules (FAIL for errors, WARN otherwise):")
+        out.line(header)
+        out.line("-" * len(header))
+        for name, a, b, _, severity in failed:
+            out.line(f"{severity.ljust(10)}{name.ljust(34)}{str(a).rjust(10)}{str(b).rjust(10)}")
+        out.line("-" * len(header))
+
+    def refresh(self, method_names):
+        """
+        Re-run only the named test_* methods (watch mode).
+        Their previous rows in self.results are replaced in place; rows for
+        metrics seen for the first time are appended. Returns the fresh rows.
+        """
+        saved = self.results
+        fresh = []
+        for name in method_names:
+            self.results = []
+            getattr(self, name)()
+            fresh.extend(self.results)
+        by_label = {r[0]: r for r in fresh}
+        merged = [by_label.pop(r[0], r) for r in saved]
+        merged.extend(by_label.values())
+        self.results = merged
+        return fresh
+
     def run_all(self):
         if not self.script_content or not self.post_content:
             print("\n[Tests] SKIP: One or both output files missing.")
@@ -1394,28 +1934,191 @@ tr:nth-child(even){{background:#fafafa}}.pass{{color:#0a0;font-weight:600}}
         self.test_disabled_interfaces_equal()
         self.test_up_interfaces_equal()
         self.test_down_interfaces_equal()
+        self.test_interface_diff()
         self.test_evpn_mac_ip_non_decrease()
         self.test_bgp_neighbor_count_equal()
         self.test_bgp_established_count_equal()
         self.test_vtep_count_equal()
         self.test_mac_dynamic_total_equal()
+        self.test_mac_entries_diff()
+        self.test_evpn_route_diff()
         # INSERT: vrf reserved-ports Total Entries comparison
         self.test_vrf_reserved_ports_entries_equal()
         self.test_bgp_all_summary()
+        self.test_bgp_session_diff()
         self.test_route_source_extended_counts_equal()  # NEW
+        self.test_route_summary_matrix()
+        self.test_route_table_reconcile()
         # INSERT: VLAN count equality test
         self.test_vlan_counts_equal()
+        self.test_vlan_set_diff()
+        self.test_port_vlan_diff()
+        self.test_vxlan_imet_join()
+        self.test_cross_table_consistency()
+        self.test_rules()
         print("\n=== Test Results (tabular) ===")
         for label, pre_val, post_val, status in self.results:
             pre_s = "-" if pre_val is None else str(pre_val)
             post_s = "-" if post_val is None else str(post_val)
-            match_word = "match" if status == "PASS" else "mismatch" if status == "FAIL" else "skip"
+            match_word = "match" if status == "PASS" else "mismatch" if status in ("FAIL", "WARN") else "skip"
             print(f"{label.ljust(28)} pre_check={pre_s}  post_check={post_s}  {match_word} {status.lower()}")
+        self.print_interface_diff()
+        self.print_mac_diff()
+        self.print_evpn_diff()
+        self.print_bgp_diff()
+        self.print_route_summary_delta()
+        self.print_vlan_diff()
+        self.print_vxlan_join()
+        self.print_consistency()
+        self.print_rules()
+        self.print_route_reconcile()
         self.write_html()
         self.print_route_source_tables()
 
+# ---- Watch mode: live pre/post comparison against a growing session log ----
+def _watch_print_interfaces_status(raw: str, out=None):
+    out = default_sink(out)
+    conn, dis = InterfacesStatusCount(raw).count_interfaces()
+    out.line("command executed: show interfaces status")
+    out.line(f"Number of interfaces CONNECTED: {conn}")
+    out.line(f"Number of interfaces DISABLED: {dis}")
+
+def _watch_print_ip_interface_brief(raw: str, out=None):
+    out = default_sink(out)
+    up, down = InterfacesStatusCount(raw).count_ip_interfaces()
+    out.line("\ncommand executed: show ip interface brief")
+    out.line(f"Number of interfaces UP: {up}")
+    out.line(f"Number of interfaces DOWN: {down}")
+
+def _watch_print_route_summary(raw: str, out=None):
+    out = default_sink(out)
+    out.line("\ncommand executed: sh ip route summary")
+    _print_route_summary_table(raw, out)
+
+# section key (auto.sections) -> (printer for that block alone, OutputTests methods fed by it)
+WATCH_SECTIONS = {
+    "interfaces_status": (_watch_print_interfaces_status,
+                          ("test_connected_interfaces_equal", "test_disabled_interfaces_equal",
+                           "test_interface_diff")),
+    "ip_interface_brief": (_watch_print_ip_interface_brief,
+                           ("test_up_interfaces_equal", "test_down_interfaces_equal", "test_interface_diff")),
+    "bgp_summary": (_print_bgp_summary_ipv4,
+                    ("test_bgp_neighbor_count_equal", "test_bgp_established_count_equal", "test_bgp_all_summary",
+                     "test_bgp_session_diff")),
+    "vxlan_vtep_detail": (lambda raw, out: VXLAN(raw).print_vtep_detail(out),
+                          ("test_vtep_count_equal", "test_vxlan_imet_join")),
+    "mac_address_table_dynamic": (lambda raw, out: MacAddressTableDynamic(raw).print(out),
+                                  ("test_mac_dynamic_total_equal", "test_mac_entries_diff",
+                                   "test_cross_table_consistency")),
+    "vrf_reserved_ports": (lambda raw, out: VrfReservedPorts(raw).print(out), ("test_vrf_reserved_ports_entries_equal",)),
+    "ip_route_summary": (_watch_print_route_summary, ("test_route_source_extended_counts_equal",
+                                                          "test_route_summary_matrix")),
+    "vlan_brief": (_print_vlan_brief, ("test_vlan_counts_equal", "test_vlan_set_diff", "test_port_vlan_diff")),
+    "evpn_auto_discovery": (lambda raw, out: _print_bgp_evpn_route_type_auto_discovery_from_sample(
+                                raw, "post_check.txt", out),
+                            ("test_evpn_auto_discovery_non_decrease", "test_evpn_route_diff")),
+    "evpn_mac_ip": (lambda raw, out: _print_bgp_evpn_route_type_mac_ip_from_sample(raw, "post_check.txt", out),
+                    ("test_evpn_mac_ip_non_decrease", "test_evpn_mac_ip_totals_non_decrease",
+                     "test_evpn_route_diff", "test_cross_table_consistency")),
+    "evpn_imet": (lambda raw, out: _print_bgp_evpn_route_type_imet_from_sample(raw, "post_check.txt", out),
+                  ("test_evpn_imet_totals_non_decrease", "test_evpn_route_diff", "test_vxlan_imet_join")),
+    "evpn_ethernet_segment": (lambda raw, out: _print_bgp_evpn_route_type_ethernet_segment_from_sample(
+                                  raw, "post_check.txt", out),
+                              ("test_evpn_ethernet_segment_totals_equal", "test_evpn_route_diff",
+                               "test_cross_table_consistency")),
+}
+
+def watch_post_check(log_path: str, base_dir: str = None, interval: float = 1.0):
+    """
+    Tail a growing post-check session log and keep the pre/post comparison live.
+    Pre values come from script_output.txt as usual. Each newly completed
+    command block is rendered on its own and only the OutputTests that depend
+    on that section are re-run; the log is never re-read from the start.
+    """
+    base_dir = base_dir or os.path.dirname(os.path.abspath(__file__))
+    tester = OutputTests(base_dir)
+    tester.post_content = ""
+    tester.post_raw = ""
+    if not tester.script_content:
+        print("script_output.txt not found; run the pre check first.")
+        return tester
+    rendered = {}
+    raw_blocks = {}
+
+    def on_block(block):
+        entry = WATCH_SECTIONS.get(block.key)
+        if entry is None:
+            return
+        render, tests = entry
+        buf = io.StringIO()
+        try:
+            render(block.text, TextSink(buf))
+        except Exception as e:
+            print(f"[watch] {block.command}: render failed: {e}")
+            return
+        rendered[block.key] = buf.getvalue()
+        raw_blocks[block.key] = block.text
+        tester.post_content = "".join(rendered.values())
+        tester.post_raw = "\n".join(raw_blocks.values())
+        for label, pre_val, post_val, status in tester.refresh(tests):
+            pre_s = "-" if pre_val is None else str(pre_val)
+            post_s = "-" if post_val is None else str(post_val)
+            print(f"[watch] {label.ljust(28)} pre_check={pre_s}  post_check={post_s}  {status.lower()}")
+
+    print(f"Watching {log_path} (Ctrl-C to stop)")
+    SessionLogWatcher(log_path, on_block).run(interval)
+    return tester
+
+# ---- Multi-device mode: one jump-host log, one check per switch ----
+def _check_device(log_path: str, host: str, ranges, suffix: str):
+    """
+    Worker: render one device's share of the log into <host>_<suffix>.
+    Only the path and byte ranges cross the process boundary; the worker maps
+    the log itself, so the capture text is never pickled.
+    """
+    try:
+        raw = DeviceCapture(host, map_capture(log_path), ranges).text()
+        with _output_sink(f"{host}_{suffix}", echo=False) as out:
+            counts = _render_check(raw, host, out)
+    except Exception as e:
+        return host, None, f"{type(e).__name__}: {e}"
+    return host, counts, None
+
+def check_devices(log_path: str, suffix: str = "script_output.txt", jobs: int = None):
+    """
+    Split a multi-device session log by prompt host (auto.capture.split_devices)
+    and run the check for every device in a process pool.
+    Returns {host: (up, down, connected, disabled) or None on failure}.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    devices = split_devices(map_capture(log_path))
+    if not devices:
+        print(f"No device prompts found in {log_path}")
+        return {}
+    results = {}
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(devices)))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(_check_device, log_path, d.host, d.ranges, suffix) for d in devices.values()]
+        for fut in futures:
+            host, counts, err = fut.result()
+            results[host] = counts
+            if err:
+                print(f"{host.ljust(28)} failed: {err}")
+            else:
+                up, down, conn, dis = counts
+                print(f"{host.ljust(28)} up={up} down={down} connected={conn} disabled={dis}  -> {host}_{suffix}")
+    return results
+
 # Re-add execution guard if truncated by previous edit
 if __name__ == "__main__":
-    main()
-    tester = OutputTests(os.path.dirname(__file__))
-    tester.run_all()
\ No newline at end of file
+    if len(sys.argv) > 2 and sys.argv[1] == "--watch":
+        # python script_pre_check.py --watch <session.log>
+        watch_post_check(sys.argv[2])
+    elif len(sys.argv) > 2 and sys.argv[1] == "--devices":
+        # python script_pre_check.py --devices <jump-host session.log>
+        check_devices(sys.argv[2])
+    else:
+        # python script_pre_check.py [--parallel]
+        snapshots = main(parallel="--parallel" in sys.argv[1:])
+        tester = OutputTests(os.path.dirname(__file__), snapshots)
+        tester.run_all()
\ No newline at end of file
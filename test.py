@@ -1,20 +1,10 @@
 import re
+import sys
 from pathlib import Path
 import textfsm
 from io import StringIO
 from network_parsers import NetworkParsers
-import html  # added
-
-# Capture all printed output
-_LOG_LINES = []
-_original_print = print
-def _capture_print(*args, **kwargs):
-    _original_print(*args, **kwargs)
-    try:
-        _LOG_LINES.append(" ".join(str(a) for a in args))
-    except:
-        pass
-print = _capture_print
+from auto.render import TextSink, HtmlSink, MultiSink, default_sink
 
 PROMPT_LINE = re.compile(r'^.+#sh\s', re.IGNORECASE)
 IF_STATUS_LINE = re.compile(
@@ -42,21 +32,22 @@ def load_raw():
         raise FileNotFoundError("test.txt not found.")
     return p.read_text(encoding="utf-8")
 
-def print_nlri_table(rows):
+def print_nlri_table(rows, out=None):
+    out = default_sink(out)
     if not rows:
-        print("NLRI Table: none")
+        out.line("NLRI Table: none")
         return
     n_w = max(len("Neighbor"), *(len(r["neighbor"]) for r in rows))
     r_w = max(len("NLRI Rcd"), *(len(str(r["received"])) for r in rows))
     a_w = max(len("NLRI Acc"), *(len(str(r["accepted"])) for r in rows))
     header = f"{'Neighbor'.ljust(n_w)}  {'NLRI Rcd'.rjust(r_w)}  {'NLRI Acc'.rjust(a_w)}"
-    print("\nNLRI Table:")
-    print(header)
-    print("-" * len(header))
+    out.line("\nNLRI Table:")
+    out.line(header)
+    out.line("-" * len(header))
     for r in rows:
-        print(f"{r['neighbor'].ljust(n_w)}  {str(r['received']).rjust(r_w)}  {str(r['accepted']).rjust(a_w)}")
-    print("-" * len(header))
-    print(f"{'TOTAL'.ljust(n_w)}  {str(sum(r['received'] for r in rows)).rjust(r_w)}  {str(sum(r['accepted'] for r in rows)).rjust(a_w)}")
+        out.line(f"{r['neighbor'].ljust(n_w)}  {str(r['received']).rjust(r_w)}  {str(r['accepted']).rjust(a_w)}")
+    out.line("-" * len(header))
+    out.line(f"{'TOTAL'.ljust(n_w)}  {str(sum(r['received'] for r in rows)).rjust(r_w)}  {str(sum(r['accepted'] for r in rows)).rjust(a_w)}")
 
 class Interfaces:
     def __init__(self, raw: str):
@@ -222,21 +213,22 @@ class BGP:
                 continue
         return evpn_rows
 
-def print_evpn_table(rows):
+def print_evpn_table(rows, out=None):
+    out = default_sink(out)
     if not rows:
-        print("EVPN Prefix Table: none")
+        out.line("EVPN Prefix Table: none")
         return
     n_w = max(len("Neighbor"), *(len(r["neighbor"]) for r in rows))
     r_w = max(len("PfxRcd"), *(len(str(r["pfx_rcd"])) for r in rows))
     a_w = max(len("PfxAcc"), *(len(str(r["pfx_acc"])) for r in rows))
     header = f"{'Neighbor'.ljust(n_w)}  {'PfxRcd'.rjust(r_w)}  {'PfxAcc'.rjust(a_w)}"
-    print("\nEVPN Prefix Table:")
-    print(header)
-    print("-" * len(header))
+    out.line("\nEVPN Prefix Table:")
+    out.line(header)
+    out.line("-" * len(header))
     for r in rows:
-        print(f"{r['neighbor'].ljust(n_w)}  {str(r['pfx_rcd']).rjust(r_w)}  {str(r['pfx_acc']).rjust(a_w)}")
-    print("-" * len(header))
-    print(f"{'TOTAL'.ljust(n_w)}  {str(sum(r['pfx_rcd'] for r in rows)).rjust(r_w)}  {str(sum(r['pfx_acc'] for r in rows)).rjust(a_w)}")
+        out.line(f"{r['neighbor'].ljust(n_w)}  {str(r['pfx_rcd']).rjust(r_w)}  {str(r['pfx_acc']).rjust(a_w)}")
+    out.line("-" * len(header))
+    out.line(f"{'TOTAL'.ljust(n_w)}  {str(sum(r['pfx_rcd'] for r in rows)).rjust(r_w)}  {str(sum(r['pfx_acc'] for r in rows)).rjust(a_w)}")
 
 def parse_vxlan_vtep_detail(raw: str):
     lines = raw.splitlines()
@@ -371,9 +363,10 @@ def parse_vrf_reserved_ports(raw: str) -> list[str]:
             vrfs.append(parts[0].strip())
     return vrfs
 
-def print_route_source_table(rows):
+def print_route_source_table(rows, out=None):
+    out = default_sink(out)
     if not rows:
-        print("Route Source Table: none")
+        out.line("Route Source Table: none")
         return
     # Normalize older structure (type/name/count/raw) to new SOURCE/COUNT form
     if rows and 'SOURCE' not in rows[0]:
@@ -388,98 +381,94 @@ def print_route_source_table(rows):
     # Width based only on entries with numeric counts
     entries = [r for r in rows if 'SOURCE' in r and r.get('COUNT') is not None]
     width = max(60, max((len(r['SOURCE']) for r in entries), default=len("Source")))
-    print("\nRoute Source Table:")
+    out.line("\nRoute Source Table:")
     for r in rows:
         src = r.get('SOURCE', '')
         cnt = r.get('COUNT')
         if cnt is None:
             # Detail / continuation line
-            print(src)
+            out.line(src)
         else:
-            print(f"{src.ljust(width)}{str(cnt).rjust(4)}")
-    print("-" * (width + 4))
+            out.line(f"{src.ljust(width)}{str(cnt).rjust(4)}")
+    out.line("-" * (width + 4))
 
-def main():
+def main(out=None):
+    out = default_sink(out)
     try:
         raw = load_raw()
     except FileNotFoundError as e:
-        print(str(e))
+        out.line(str(e))
         return
     if not raw.strip():
-        print("Raw input empty.")
+        out.line("Raw input empty.")
         return
-    print(f"Raw input length: {len(raw)} characters")
+    out.line(f"Raw input length: {len(raw)} characters")
     iface = Interfaces(raw)
     bgp = BGP(raw)
 
-    print("Command: sh interfaces status")
+    out.line("Command: sh interfaces status")
     connected, disabled = iface.parse_interfaces_status()
-    print(f"Connected interfaces: {connected}")
-    print(f"Disabled interfaces: {disabled}")
+    out.line(f"Connected interfaces: {connected}")
+    out.line(f"Disabled interfaces: {disabled}")
 
-    print("\nCommand: sh ip int br")
+    out.line("\nCommand: sh ip int br")
     ip_up, ip_down = iface.parse_ip_brief()
-    print(f"IP interfaces UP: {ip_up}")
-    print(f"IP interfaces DOWN: {ip_down}")
+    out.line(f"IP interfaces UP: {ip_up}")
+    out.line(f"IP interfaces DOWN: {ip_down}")
 
-    print("\nCommand: sh bgp summary")
+    out.line("\nCommand: sh bgp summary")
     bgp_total, bgp_est, nlri_rows = bgp.parse_bgp_summary()
-    print(f"BGP neighbors total: {bgp_total}")
-    print(f"BGP neighbors established: {bgp_est}")
-    print_nlri_table(nlri_rows)
+    out.line(f"BGP neighbors total: {bgp_total}")
+    out.line(f"BGP neighbors established: {bgp_est}")
+    print_nlri_table(nlri_rows, out)
 
-    print("\nCommand: sh bgp evpn summary")
+    out.line("\nCommand: sh bgp evpn summary")
     evpn_rows = bgp.parse_bgp_evpn_summary()
-    print_evpn_table(evpn_rows)
+    print_evpn_table(evpn_rows, out)
 
-    print("\nEVPN Neighbor Prefix Detail:")
+    out.line("\nEVPN Neighbor Prefix Detail:")
     for r in evpn_rows:
-        print(f"{r['neighbor']}: PfxRcd={r['pfx_rcd']} PfxAcc={r['pfx_acc']}")
+        out.line(f"{r['neighbor']}: PfxRcd={r['pfx_rcd']} PfxAcc={r['pfx_acc']}")
 
     # MAC tables
-    print("\nCommand: show mac address-table dynamic")
+    out.line("\nCommand: show mac address-table dynamic")
     dyn_count, stat_count = parse_mac_address_tables(raw)
-    print(f"Dynamic MAC entries: {dyn_count}")
+    out.line(f"Dynamic MAC entries: {dyn_count}")
 
-    print("\nCommand: show mac address-table static")
-    print(f"Static MAC entries: {stat_count}")
+    out.line("\nCommand: show mac address-table static")
+    out.line(f"Static MAC entries: {stat_count}")
 
     # VRF summary
-    print("\nCommand: show vrf summary")
+    out.line("\nCommand: show vrf summary")
     vrf_summary = PARSER.parse_vrf_summary(raw)
     if vrf_summary.get("vrf_count") is not None:
-        print(f"VRF count: {vrf_summary['vrf_count']}")
-        print(f"VRF up count: {vrf_summary['vrf_up']}")
-        print(f"VRF IPv4 routing count: {vrf_summary['vrf_ipv4']}")
-        print(f"VRF IPv6 routing count: {vrf_summary['vrf_ipv6']}")
+        out.line(f"VRF count: {vrf_summary['vrf_count']}")
+        out.line(f"VRF up count: {vrf_summary['vrf_up']}")
+        out.line(f"VRF IPv4 routing count: {vrf_summary['vrf_ipv4']}")
+        out.line(f"VRF IPv6 routing count: {vrf_summary['vrf_ipv6']}")
     else:
-        print("VRF summary: not found")
+        out.line("VRF summary: not found")
 
     # VRF reserved-ports
-    print("\nCommand: show vrf reserved-ports")
+    out.line("\nCommand: show vrf reserved-ports")
     vrf_reserved = PARSER.parse_vrf_reserved_ports_names(raw)
     if not vrf_reserved:
         vrf_reserved = parse_vrf_reserved_ports(raw)
-    print(f"VRF reserved-ports count: {len(vrf_reserved)}")
+    out.line(f"VRF reserved-ports count: {len(vrf_reserved)}")
     for name in vrf_reserved:
-        print(name)
+        out.line(name)
 
     # IP route summary
-    print("\nCommand: sh ip route summary")
+    out.line("\nCommand: sh ip route summary")
     route_rows = PARSER.parse_ip_route_summary(raw)
-    print_route_source_table(route_rows)
+    print_route_source_table(route_rows, out)
 
 if __name__ == "__main__":
-    main()
-    # Write captured output to text file
-    Path("script_output.txt").write_text("\n".join(_LOG_LINES), encoding="utf-8")
-    # Write captured output to HTML file
-    Path("script_output.html").write_text(
-        "<html><head><meta charset='utf-8'><title>Script Output</title>"
-        "<style>body{font-family:monospace;white-space:pre-wrap;margin:16px;}</style></head><body><pre>"
-        + html.escape("\n".join(_LOG_LINES)) +
-        "</pre></body></html>",
-        encoding="utf-8"
-    )
-    _original_print("Output files generated: script_output.txt, script_output.html")
+    # Console, text file and HTML file all fed from the same sink; both files stream as lines arrive.
+    with open("script_output.txt", "w", encoding="utf-8") as txt, \
+         open("script_output.html", "w", encoding="utf-8") as htm:
+        out = MultiSink(TextSink(sys.stdout, txt), HtmlSink(htm, "Script Output"))
+        main(out)
+        out.close()
+    print("Output files generated: script_output.txt, script_output.html")
 
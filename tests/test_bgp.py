@@ -0,0 +1,45 @@
+from auto.bgp import diff_bgp_summaries, parse_bgp_summaries
+
+HEAD = ("leaf1#sh bgp evpn summary\n"
+        "BGP summary information for VRF default\n"
+        "Router identifier 10.4.228.5, local AS number 64100.21005\n"
+        "Neighbor Status Codes: m - Under maintenance\n"
+        "  Neighbor   V AS           MsgRcvd   MsgSent  InQ OutQ  Up/Down State   PfxRcd PfxAcc\n")
+PRE = HEAD + (
+    "  10.4.228.1 4 64100.21001  10817487  12924096    0    0  191d18h Estab   3839   3839\n"
+    "  10.4.228.2 4 64100.21002  11105592  12825782    0    0  191d18h Estab   3840   3840\n"
+    "  10.4.228.3 4 64100.21003  11452560  11261995    0    0  191d19h Estab   3840   3840\n"
+    "  10.4.228.4 4 64100.21004  11452560  11261995    0    0  191d19h Estab   3840   3840\n"
+    "  10.4.228.5 4 64100.21005  11452560  11261995    0    0  191d19h Estab   3840   3840\n"
+    "leaf1#\n")
+POST = HEAD + (
+    "  10.4.228.1 4 64100.21001  10817487  12924096    0    0  191d19h Estab   3839   3839\n"
+    "  10.4.228.2 4 64100.21002  11105592  12825782    0    0  00:01:10 Active   0   0\n"
+    "  10.4.228.3 4 64100.21009  11452560  11261995    0    0  191d20h Estab   3840   3840\n"
+    "  10.4.228.4 4 64100.21004  11452560  11261995    0    0  00:02:00 Estab   3900   3900\n"
+    "  10.4.228.6 4 64100.21006  11452560  11261995    0    0  00:02:00 Estab   10   10\n"
+    "leaf1#\n")
+
+
+def _pair():
+    return parse_bgp_summaries(PRE)["bgp_evpn_summary"], parse_bgp_summaries(POST)["bgp_evpn_summary"]
+
+
+def test_diff_bgp_summaries_counts():
+    d = diff_bgp_summaries(*_pair())
+    assert d.counts() == {"down": 1, "missing": 1, "new": 1, "asn_changed": 1, "nlri_changed": 2, "flapped": 1}
+    assert d.missing == [("default", "10.4.228.5")]
+    assert d.new == [("default", "10.4.228.6")]
+    assert d.nlri[("default", "10.4.228.4")] == (3840, 3900, 3840, 3900)
+
+
+def test_diff_bgp_summaries_entries():
+    d = diff_bgp_summaries(*_pair())
+    assert list(d.entries("down")) == [{"VRF": "default", "NEIGHBOR": "10.4.228.2", "PRE": "Established", "POST": "Active"}]
+    assert list(d.entries("flapped")) == [{"VRF": "default", "NEIGHBOR": "10.4.228.4", "PRE": "191d19h", "POST": "00:02:00"}]
+
+
+def test_diff_bgp_summaries_tolerance():
+    # 3840 -> 3900 is within 5%; 3840 -> 0 is not
+    d = diff_bgp_summaries(*_pair(), tolerance=0.05)
+    assert d.nlri_changed == [("default", "10.4.228.2")]
@@ -0,0 +1,51 @@
+from auto.capture import normalize_capture, split_devices
+
+
+def test_split_devices_keeps_prefix_hosts_apart():
+    data = (b"leaf10#show version\nleaf10 output\n"
+            b"leaf1#show version\nleaf1 output\n"
+            b"spine12#show version\nspine12 output\n"
+            b"spine1#show version\nspine1 output\n"
+            b"leaf10#show vlan\nmore leaf10 output\n"
+            b"leaf1#show vlan\nmore leaf1 output\n")
+    devices = split_devices(data)
+    assert list(devices) == ["leaf10", "leaf1", "spine12", "spine1"]
+    assert devices["leaf1"].tobytes() == (b"leaf1#show version\nleaf1 output\n"
+                                          b"leaf1#show vlan\nmore leaf1 output\n")
+    assert b"leaf1#" not in devices["leaf10"].tobytes()
+
+
+def test_split_devices_visible_truncation():
+    data = (b"EMEA-UK-LON-THN2-MBL51#show version\nout\n"
+            b"EMEA-UK-LON-THN2-MBL51#\n"
+            b"MEA-UK-LON-THN2-MBL51#sh bgp evpn\nroutes\n"
+            b"leaf1#show version\nleaf1 output\n"
+            b"EMEA-UK-LON...#show vlan\nvlans\n")
+    devices = split_devices(data)
+    assert list(devices) == ["EMEA-UK-LON-THN2-MBL51", "leaf1"]
+    assert devices["EMEA-UK-LON-THN2-MBL51"].tobytes().endswith(b"show vlan\nvlans\n")
+
+
+def test_normalize_keeps_other_hosts_prompts():
+    data = (b"leaf10#show version\nleaf10 output\n"
+            b"leaf10#show vlan\nvlans\n"
+            b"leaf1#show clock\nz\n"
+            b"leaf\n")
+    assert normalize_capture(data) == data
+
+
+def test_normalize_repairs_visible_truncation_only():
+    data = (b"EMEA-UK-LON-THN2-MBL51#show version\nout\n"
+            b"EMEA-UK-LON-THN2-MBL51#\n"
+            b"MEA-UK-LON-THN2-MBL51#sh bgp evpn\nroutes\n"
+            b"EMEA-UK-LON...#show vlan\nvlans\n"
+            b"EMEA-UK-LON-THN2-MBL5 \n")
+    assert normalize_capture(data) == (b"EMEA-UK-LON-THN2-MBL51#show version\nout\n"
+                                       b"EMEA-UK-LON-THN2-MBL51#\n"
+                                       b"EMEA-UK-LON-THN2-MBL51#sh bgp evpn\nroutes\n"
+                                       b"EMEA-UK-LON-THN2-MBL51#show vlan\nvlans\n"
+                                       b"EMEA-UK-LON-THN2-MBL5 \n")
+
+
+def test_normalize_lone_cr_ends_line():
+    assert normalize_capture(b"line1\rline2\r\nline3\r\r\nend\x08\x07\n") == b"line1\nline2\nline3\nend\n"
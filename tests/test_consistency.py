@@ -0,0 +1,98 @@
+from auto.consistency import EvpnMacIndex, check_capture, check_consistency
+from auto.mac_table import MacTable
+from auto.vxlan import VxlanIndex
+
+MACS = (
+    "leaf1#show mac address-table dynamic\n"
+    "          Mac Address Table\n"
+    "------------------------------------------------------------------\n\n"
+    "Vlan    Mac Address       Type        Ports      Moves   Last Move\n"
+    "----    -----------       ----        -----      -----   ---------\n"
+    "1400    aaaa.0000.0001    DYNAMIC     Et1        1       0:10:00 ago\n"
+    "1400    aaaa.0000.0002    DYNAMIC     Et2        1       0:10:00 ago\n"
+    "1500    aaaa.0000.0003    DYNAMIC     Et3        1       0:10:00 ago\n"
+    "1400    bbbb.0000.0001    DYNAMIC     Vx1        1       0:10:00 ago\n"
+    "1400    bbbb.0000.0002    DYNAMIC     Vx1        1       0:10:00 ago\n"
+    "1410    bbbb.0000.0003    DYNAMIC     Vx1        1       0:10:00 ago\n"
+    "1410    bbbb.0000.0004    DYNAMIC     Vx1        1       0:10:00 ago\n"
+    "Total Mac Addresses for this criterion: 7\n")
+
+EVPN = (
+    "leaf1#sh bgp evpn route-type mac-ip\n"
+    " * >      RD: 10.4.228.5:1400 mac-ip aaaa.0000.0001\n"
+    "                                 -                     -       -       0       i\n"
+    " * >      RD: 10.4.228.5:1410 mac-ip aaaa.0000.00ff\n"
+    "                                 -                     -       -       0       i\n"
+    " * >      RD: 10.4.228.6:1400 mac-ip bbbb.0000.0001\n"
+    "                                 10.4.228.6            -       100     0       64100.21006 i\n"
+    " * >      RD: 10.4.228.6:1410 mac-ip bbbb.0000.0003\n"
+    "                                 10.4.228.6            -       100     0       64100.21006 i\n"
+    " * >      RD: 10.4.228.9:1410 mac-ip bbbb.0000.0004\n"
+    "                                 10.4.228.9            -       100     0       64100.21009 i\n"
+    "leaf1#sh bgp evpn route-type ethernet-segment\n"
+    " * >      RD: 10.4.228.5:1 ethernet-segment 0011:1111:1111:1111:0000 10.4.228.5\n"
+    "                                 -                     -       -       0       i\n"
+    " * >      RD: 10.4.228.6:1 ethernet-segment 0011:1111:1111:1111:0000 10.4.228.6\n"
+    "                                 10.4.228.6            -       100     0       64100.21006 i\n"
+    " * >      RD: 10.4.228.9:1 ethernet-segment 0022:2222:2222:2222:0000 10.4.228.9\n"
+    "                                 10.4.228.9            -       100     0       64100.21009 i\n")
+
+VXLAN = (
+    "leaf1#show vxlan vtep detail\n"
+    "Remote VTEPS for Vxlan1:\n\n"
+    "VTEP               Learned Via         MAC Address Learning       Tunnel Type(s)\n"
+    "------------------ ------------------- -------------------------- --------------\n"
+    "10.4.228.6         control plane       control plane              unicast, flood\n"
+    "10.4.228.7         control plane       control plane              unicast, flood\n\n"
+    "leaf1#show vxlan vni\n"
+    "VNI          VLAN        Source       Interface       802.1Q Tag\n"
+    "------------ ----------- ------------ --------------- ----------\n"
+    "11400        1400        static       Vxlan1          1400\n"
+    "11410        1410        static       Vxlan1          1410\n\n"
+    "leaf1#show vxlan address-table\n"
+    "          Vxlan Mac Address Table\n"
+    "----------------------------------------------------------------------\n\n"
+    "VLAN  Mac Address     Type      Prt  VTEP             Moves   Last Move\n"
+    "----  -----------     ----      ---  ----             -----   ---------\n"
+    "1400  bbbb.0000.0001  EVPN      Vx1  10.4.228.6       1       0:10:00 ago\n"
+    "1410  bbbb.0000.0003  EVPN      Vx1  10.4.228.7       1       0:10:00 ago\n"
+    "1410  bbbb.0000.0004  EVPN      Vx1  10.4.228.9       1       0:10:00 ago\n")
+
+
+def _check():
+    vxlan = VxlanIndex.from_text(VXLAN)
+    return check_consistency(MacTable.from_text(MACS), EvpnMacIndex.from_text(EVPN, vxlan.vlan_of), vxlan)
+
+
+def test_check_consistency_counts():
+    assert _check().counts() == {
+        "local_not_advertised": 1,
+        "advertised_not_learned": 1,
+        "remote_not_advertised": 1,
+        "remote_vtep_mismatch": 1,
+        "remote_vtep_unknown": 1,
+        "segment_vtep_unknown": 1,
+    }
+
+
+def test_check_consistency_entries():
+    r = _check()
+    (local,) = r.entries("local_not_advertised")
+    assert (local["VLAN"], local["MAC"], local["PORT"]) == (1400, "aaaa.0000.0002", "Et2")
+    (ghost,) = r.entries("advertised_not_learned")
+    assert (ghost["VLAN"], ghost["MAC"], ghost["PORT"]) == (1410, "aaaa.0000.00ff", None)
+    (moved,) = r.entries("remote_vtep_mismatch")
+    assert (moved["MAC"], moved["VTEP"], moved["TABLE_VTEP"]) == ("bbbb.0000.0003", "10.4.228.6", "10.4.228.7")
+    (unknown,) = r.entries("remote_vtep_unknown")
+    assert (unknown["MAC"], unknown["VTEP"]) == ("bbbb.0000.0004", "10.4.228.9")
+    (segment,) = r.entries("segment_vtep_unknown")
+    assert (segment["ESI"], segment["VTEP"]) == ("0022:2222:2222:2222:0000", "10.4.228.9")
+
+
+def test_check_capture_matches_separate_tables():
+    assert check_capture(MACS + VXLAN + EVPN).counts() == _check().counts()
+
+
+def test_check_consistency_skips_missing_tables():
+    # no routes and no vtep detail: nothing can contradict the MAC table
+    assert not any(check_consistency(MacTable.from_text(MACS), EvpnMacIndex(), VxlanIndex()).counts().values())
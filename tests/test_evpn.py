@@ -0,0 +1,55 @@
+from auto.evpn import diff_evpn_routes, route_key_counts
+
+PRE = (
+    "leaf1#sh bgp evpn route-type mac-ip\n"
+    " * >Ec    RD: 10.4.228.5:1400 mac-ip 0009.0f09.081e\n"
+    "                                 10.4.228.5            -       100     0       64100.21005 i\n"
+    " *  ec    RD: 10.4.228.5:1400 mac-ip 0009.0f09.081e\n"
+    "                                 10.4.228.5            -       100     0       64100.21006 i\n"
+    " * >      RD: 10.4.228.6:1400 mac-ip 0009.0f09.0820\n"
+    "                                 10.4.228.6            -       100     0       64100.21005 i\n"
+    " * >      RD: 10.4.228.7:1 imet 10.4.228.7\n"
+    "                                 10.4.228.7            -       100     0       64100.21005 i\n")
+
+POST = (
+    "leaf1#sh bgp evpn route-type mac-ip\n"
+    " * >      RD: 10.4.228.5:1400 mac-ip 0009.0f09.081e\n"
+    "                                 10.4.228.5            -       100     0       64100.21005 i\n"
+    " * >      RD: 10.4.228.7:1 imet 10.4.228.7\n"
+    "                                 10.4.228.7            -       100     0       64100.21005 i\n"
+    " * >Ec    RD: 10.4.228.8:1 imet 10.4.228.8\n"
+    "                                 10.4.228.8            -       100     0       64100.21005 i\n"
+    " *  ec    RD: 10.4.228.8:1 imet 10.4.228.8\n"
+    "                                 10.4.228.8            -       100     0       64100.21006 i\n")
+
+
+def test_route_key_counts_ecmp():
+    assert route_key_counts(PRE) == {
+        "mac-ip 10.4.228.5:1400 0009.0f09.081e": 2,
+        "mac-ip 10.4.228.6:1400 0009.0f09.0820": 1,
+        "imet 10.4.228.7:1 10.4.228.7": 1,
+    }
+
+
+def test_diff_evpn_routes():
+    d = diff_evpn_routes(route_key_counts(PRE), route_key_counts(POST))
+    assert d["withdrawn"] == {"mac-ip 10.4.228.6:1400 0009.0f09.0820": 1}
+    assert d["new"] == {"imet 10.4.228.8:1 10.4.228.8": 2}
+    assert d["paths_changed"] == {"mac-ip 10.4.228.5:1400 0009.0f09.081e": (2, 1)}
+    assert d["per_type"] == {
+        "mac-ip": {"withdrawn": 1, "new": 0, "paths_lost": 1, "paths_gained": 0},
+        "imet": {"withdrawn": 0, "new": 1, "paths_lost": 0, "paths_gained": 0},
+    }
+
+
+def test_parse_evpn_chunked_matches_one_pass():
+    from auto.bench import synthetic_evpn_mac_ip
+    from auto.evpn import EvpnRouteStats
+    from auto.parallel import parse_evpn_chunked
+    text = synthetic_evpn_mac_ip(400, ecmp=3)
+    one = EvpnRouteStats.from_text(text)
+    for jobs in (1, 3):
+        chunked = parse_evpn_chunked(text, jobs=jobs, chunks_per_job=5)
+        assert chunked.counts() == one.counts() == route_key_counts(text)
+        assert chunked.routes() == one.routes()
+        assert chunked.per_rd == one.per_rd
@@ -0,0 +1,50 @@
+from auto.interfaces import InterfaceIndex, diff_interfaces
+
+STATUS_HEADER = ("leaf1#show interfaces status\n"
+                 "Port       Name        Status       Vlan       Duplex Speed  Type            Flags Encapsulation\n")
+BRIEF_HEADER = ("leaf1#sh ip int br\n"
+                "                                                                                     Address\n"
+                "Interface              IP Address            Status       Protocol            MTU    Owner  \n"
+                "---------------------- --------------------- ------------ -------------- ----------- -------\n")
+
+PRE = (STATUS_HEADER
+       + "Et1        uplink      connected    in Po1028  full   10G    10GBASE-SRL\n"
+       + "Et2        server      connected    1406       full   10G    10GBASE-SRL\n"
+       + "Et3        spare       disabled     999        full   10G    10GBASE-SRL\n"
+       + "Et4        old         connected    1406       full   10G    10GBASE-SRL\n"
+       + BRIEF_HEADER
+       + "Ethernet3              10.4.231.3/31         up           up                 1500\n"
+       + "leaf1#\n")
+
+POST = (STATUS_HEADER
+        + "Et1        uplink      notconnect   in Po1028  full   10G    10GBASE-SRL\n"
+        + "Et2        server      connected    1407       full   25G    10GBASE-SRL\n"
+        + "Et3        spare       disabled     999        full   10G    10GBASE-SRL\n"
+        + "Et5        new         connected    1406       full   10G    10GBASE-SRL\n"
+        + BRIEF_HEADER
+        + "Ethernet3              10.4.231.5/31         up           up                 1500\n"
+        + "leaf1#\n")
+
+
+def test_diff_interfaces_counts():
+    d = diff_interfaces(InterfaceIndex.from_text(PRE), InterfaceIndex.from_text(POST))
+    assert d.counts() == {"missing": 1, "new": 1, "status": 1, "vlan": 1, "speed": 1, "ip": 1, "protocol": 0}
+
+
+def test_diff_interfaces_entries():
+    d = diff_interfaces(InterfaceIndex.from_text(PRE), InterfaceIndex.from_text(POST))
+    assert list(d.entries("missing")) == [{"PORT": "Ethernet4", "PRE": "connected", "POST": "-"}]
+    assert list(d.entries("new")) == [{"PORT": "Ethernet5", "PRE": "-", "POST": "connected"}]
+    assert list(d.entries("status")) == [{"PORT": "Ethernet1", "PRE": "connected", "POST": "notconnect"}]
+    assert list(d.entries("ip")) == [{"PORT": "Ethernet3", "PRE": "10.4.231.3/31", "POST": "10.4.231.5/31"}]
+
+
+def _fields(port):
+    return tuple(getattr(port, f) for f in type(port).__slots__)
+
+
+def test_merge_equals_from_text():
+    status, brief = PRE.split("leaf1#sh ip int br")
+    merged = InterfaceIndex.from_text(status).merge(InterfaceIndex.from_text("leaf1#sh ip int br" + brief))
+    whole = InterfaceIndex.from_text(PRE)
+    assert [_fields(p) for p in merged] == [_fields(p) for p in whole]
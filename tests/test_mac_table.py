@@ -0,0 +1,44 @@
+from auto.mac_table import MacTable, diff_mac_tables
+
+HEADER = ("leaf1#show mac address-table dynamic\n"
+          "          Mac Address Table\n"
+          "------------------------------------------------------------------\n\n"
+          "Vlan    Mac Address       Type        Ports      Moves   Last Move\n"
+          "----    -----------       ----        -----      -----   ---------\n")
+
+PRE = HEADER + (
+    "1406    0094.a134.8e6b    DYNAMIC     Po1028     1       193 days, 4:11:50 ago\n"
+    "1406    0094.a134.8e6c    DYNAMIC     Po1028     1       193 days, 4:11:50 ago\n"
+    "1407    0094.a134.8e6d    DYNAMIC     Et1/1      1       2 days, 4:11:50 ago\n"
+    "1407    0094.a134.8e6e    DYNAMIC     Et3/1      2       2 days, 4:11:50 ago\n"
+    "Total Mac Addresses for this criterion: 4\n")
+
+POST = HEADER + (
+    "1406    0094.a134.8e6b    DYNAMIC     Po1028     1       193 days, 4:11:50 ago\n"
+    "1407    0094.a134.8e6d    DYNAMIC     Et2/1      1       0:00:10 ago\n"
+    "1407    0094.a134.8e6e    DYNAMIC     Et3/1      5       0:00:10 ago\n"
+    "1408    0094.a134.0001    DYNAMIC     Po1028     1       0:00:10 ago\n"
+    "Total Mac Addresses for this criterion: 4\n")
+
+
+def test_diff_mac_tables_counts():
+    d = diff_mac_tables(MacTable.from_text(PRE), MacTable.from_text(POST))
+    assert d.counts() == {"missing": 1, "new": 1, "port_changed": 1, "moves_increased": 1}
+    assert d.per_vlan[1406]["missing"] == 1
+    assert d.per_vlan[1408]["new"] == 1
+
+
+def test_diff_mac_tables_entries():
+    d = diff_mac_tables(MacTable.from_text(PRE), MacTable.from_text(POST))
+    (moved,) = d.entries("port_changed")
+    assert (moved["VLAN"], moved["MAC"], moved["PRE_PORT"], moved["POST_PORT"]) == ("1407", "0094.a134.8e6d",
+                                                                                   "Et1/1", "Et2/1")
+    (more,) = d.entries("moves_increased")
+    assert (more["PRE_MOVES"], more["POST_MOVES"]) == (2, 5)
+    (gone,) = d.entries("missing")
+    assert gone["MAC"] == "0094.a134.8e6c" and gone["POST_PORT"] is None
+
+
+def test_diff_mac_tables_same_table():
+    table = MacTable.from_text(PRE)
+    assert not any(diff_mac_tables(table, MacTable.from_text(PRE)).counts().values())
@@ -0,0 +1,51 @@
+from auto.rules import compile_rules
+
+
+def _plan(severity):
+    return compile_rules([{"name": "vlans", "metric": "vlans", "compare": "equal", "severity": severity}])
+
+
+def test_failed_error_rule_is_fail():
+    rows = _plan("error").evaluate({"vlan_brief": [1, 2, 3]}, {"vlan_brief": [1, 2]})
+    assert rows == [("vlans", 3, 2, "FAIL", "error")]
+
+
+def test_failed_warning_rule_is_warn():
+    for severity in ("warning", "info"):
+        rows = _plan(severity).evaluate({"vlan_brief": [1, 2, 3]}, {"vlan_brief": [1, 2]})
+        assert rows == [("vlans", 3, 2, "WARN", severity)]
+
+
+def test_rule_pass_and_skip():
+    plan = _plan("warning")
+    assert plan.evaluate({"vlan_brief": [1]}, {"vlan_brief": [1]})[0][3] == "PASS"
+    assert plan.evaluate(None, {"vlan_brief": [1]})[0][3] == "SKIP"
+
+
+def test_rules_counted_once_in_html_index(tmp_path):
+    import shutil
+    from script_pre_check import OutputTests
+    shutil.copy("auto/test.txt", tmp_path / "test.txt")
+    shutil.copy("auto/post_check.txt", tmp_path / "post_check.txt")
+    (tmp_path / "rules.toml").write_text(
+        '[[rule]]\nname = "many_vlans"\nmetric = "vlans"\ncompare = "at_least"\nvalue = 100000\nseverity = "warning"\n')
+    tester = OutputTests(str(tmp_path))
+    tester.test_rules()
+    assert tester.results == [("rule_many_vlans", tester.results[0][1], tester.results[0][2], "WARN")]
+    tester.write_html()
+    index = (tmp_path / "test_results.html").read_text()
+    assert "<td>0</td><td>0</td><td>1</td><td>0</td>" in index
+
+
+def test_rule_printers_write_to_the_given_sink(tmp_path, capsys):
+    import io
+    from auto.render import TextSink
+    from script_pre_check import OutputTests
+    tester = OutputTests(str(tmp_path))
+    tester.rule_results = [("many_vlans", 3, 2, "WARN", "warning")]
+    buf = io.StringIO()
+    tester.print_rules(TextSink(buf))
+    (tmp_path / "rules.toml").write_text('[[rule]]\nname = "x"\nmetric = "no_such_metric"\n')
+    tester.test_rules(TextSink(buf))
+    assert "many_vlans" in buf.getvalue() and "[rules] rules.toml:" in buf.getvalue()
+    assert capsys.readouterr().out == ""
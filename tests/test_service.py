@@ -0,0 +1,66 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from auto.bench import synthetic_mac_table
+from auto.service import make_server
+
+CAPTURE = synthetic_mac_table(32)
+
+
+@pytest.fixture(scope="module")
+def server():
+    srv = make_server(port=0, workers=1, queue=0, quiet=True)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+    srv.service.close()
+
+
+def _post(server, path, body, headers=None):
+    conn = http.client.HTTPConnection(*server.server_address[:2], timeout=30)
+    try:
+        conn.request("POST", path, body=body, headers=headers or {})
+        resp = conn.getresponse()
+        return resp.status, dict(resp.getheaders()), json.loads(resp.read())
+    finally:
+        conn.close()
+
+
+def test_snapshot(server):
+    status, headers, payload = _post(server, "/snapshot", CAPTURE.encode())
+    assert status == 200
+    assert payload["result"]["mac_table"]["total"] == 32
+    assert set(payload["timings"]) == {"read_ms", "queue_ms", "parse_ms", "total_ms"}
+    assert "parse;dur=" in headers["Server-Timing"]
+
+
+def test_diff(server):
+    body = json.dumps({"pre": CAPTURE, "post": CAPTURE})
+    status, _, payload = _post(server, "/diff?limit=5", body, {"Content-Type": "application/json"})
+    assert status == 200
+    counts = payload["result"]["mac_table"]["counts"]
+    assert counts and not any(counts.values())
+
+
+def test_diff_bad_json(server):
+    status, _, payload = _post(server, "/diff", b"{not json")
+    assert status == 400
+    assert payload["error"].startswith("bad request")
+    assert server.service.pending == 0
+
+
+def test_busy_when_every_slot_is_taken(server):
+    server.service.admit()          # the only slot (workers=1, queue=0)
+    try:
+        status, headers, payload = _post(server, "/snapshot", CAPTURE.encode())
+    finally:
+        server.service.release()
+    assert status == 503
+    assert headers["Retry-After"] == "1"
+    assert payload == {"error": "busy"}
+    assert _post(server, "/snapshot", CAPTURE.encode())[0] == 200
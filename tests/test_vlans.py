@@ -0,0 +1,37 @@
+from auto.vlans import PortVlanMatrix, diff_port_vlans
+
+HEADER = ("leaf1#sh vlan brief\n"
+          "VLAN  Name                             Status    Ports\n"
+          "----- -------------------------------- --------- -------------------------------\n")
+
+PRE = HEADER + (
+    "1     default                          active    \n"
+    "1400  TRANSIT-A                        active    Cpu, Po1027, Vx1\n"
+    "1401  TRANSIT-B                        active    Cpu, Po1027, Et7, Vx1\n"
+    "leaf1#\n")
+
+POST = HEADER + (
+    "1     default                          active    \n"
+    "1400  TRANSIT-A                        active    Cpu, Po1027, Vx1, Et8\n"
+    "1401  TRANSIT-B                        active    Cpu, Po1027, Vx1\n"
+    "1402  TRANSIT-C                        active    Po1027\n"
+    "leaf1#\n")
+
+
+def test_port_vlan_matrix_canonical_names():
+    m = PortVlanMatrix.from_text(PRE)
+    assert m.ports_of(1401) == {"Cpu", "Port-Channel1027", "Ethernet7", "Vxlan1"}
+    assert list(m.vlans_of("Port-Channel1027")) == [1400, 1401]
+
+
+def test_diff_port_vlans():
+    d = diff_port_vlans(PortVlanMatrix.from_text(PRE), PortVlanMatrix.from_text(POST))
+    assert d.counts() == {"lost": 1, "gained": 2}
+    assert d.lost == {1401: ["Ethernet7"]}
+    assert {vlan: sorted(ports) for vlan, ports in d.gained.items()} == {1400: ["Ethernet8"], 1402: ["Port-Channel1027"]}
+    assert list(d.vlans_gained_members()) == [1400, 1402]
+
+
+def test_diff_port_vlans_unchanged():
+    m = PortVlanMatrix.from_text(PRE)
+    assert diff_port_vlans(m, PortVlanMatrix.from_text(PRE)).counts() == {"lost": 0, "gained": 0}